@@ -98,6 +98,44 @@ def _dvc_remote_bootstrap():
         logger.warning("[DVC] remote bootstrap failed: %s", e)
 
 
+# ── Field drift reports — escalation counter & retention ───
+# create_all() does not add indexes to existing tables, so the escalation
+# index is created explicitly. The in-memory counter is warm-loaded before
+# requests are served; until then the engine falls back to the DB count.
+_retention_scheduler = None
+
+
+@app.on_event("startup")
+def _field_report_bootstrap():
+    global _retention_scheduler
+    from .database import SessionLocal
+    from .models import FieldDriftReport
+    from .services.escalation_counter import get_escalation_counter
+    from .services.report_retention import start_retention_scheduler
+
+    for idx in FieldDriftReport.__table__.indexes:
+        try:
+            idx.create(bind=engine, checkfirst=True)
+        except Exception as e:
+            logger.warning("[Reports] index %s not created: %s", idx.name, e)
+
+    db = SessionLocal()
+    try:
+        get_escalation_counter().warm_load(db)
+    except Exception as e:
+        logger.warning("[Reports] escalation counter warm-load failed: %s", e)
+    finally:
+        db.close()
+
+    _retention_scheduler = start_retention_scheduler(SessionLocal)
+
+
+@app.on_event("shutdown")
+def _field_report_shutdown():
+    if _retention_scheduler is not None:
+        _retention_scheduler.stop()
+
+
 @app.get("/")
 def root():
     return {
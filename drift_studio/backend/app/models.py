@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime, JSON
+from sqlalchemy import Column, String, Integer, Float, DateTime, JSON, Index
 from sqlalchemy.sql import func
 from .database import Base
 
@@ -94,6 +94,27 @@ class FieldDriftReport(Base):
     action_taken = Column(JSON, nullable=True)        # Decision engine result
     created_at = Column(DateTime, server_default=func.now())
 
+    __table_args__ = (
+        # 에스컬레이션 윈도우 조회 (agent, model, severity, 기간) 용 복합 인덱스
+        Index("ix_field_drift_reports_escalation", "agent_id", "model_name", "severity", "created_at"),
+    )
+
+
+class FieldDriftReportRollup(Base):
+    """보존 기간이 지난 drift report 의 일 단위 집계 (retention job 이 생성)."""
+    __tablename__ = "field_drift_report_rollups"
+
+    id = Column(String, primary_key=True)            # "<agent_id>|<model_name>|<severity>|<day>"
+    agent_id = Column(String, index=True)
+    model_name = Column(String, nullable=True)
+    severity = Column(String)
+    day = Column(String, index=True)                  # YYYY-MM-DD (UTC)
+    report_count = Column(Integer, default=0)
+    overall_sum = Column(Float, default=0.0)          # 평균 = overall_sum / overall_count
+    overall_count = Column(Integer, default=0)
+    overall_max = Column(Float, nullable=True)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
 
 class TrainerAgent(Base):
     """학습 전문 에이전트 등록 (e.g. alpr training server)."""
@@ -125,4 +146,26 @@ class TrainingJob(Base):
     error = Column(String, nullable=True)
     created_at = Column(DateTime, server_default=func.now())
     started_at = Column(DateTime, nullable=True)
-    completed_at = Column(DateTime, nullable=True)
\ No newline at end of file
+    completed_at = Column(DateTime, nullable=True)
+
+
+class ModelDeployment(Base):
+    """필드 에이전트별 모델 배포 상태 (rollout 진행 중 실시간 갱신)."""
+    __tablename__ = "model_deployments"
+
+    id = Column(String, primary_key=True)
+    rollout_id = Column(String, index=True)              # 한 번의 fan-out 배포 단위
+    training_job_id = Column(String, index=True)         # FK → training_jobs.id
+    agent_id = Column(String, index=True)                # FK → field_agents.id
+    agent_app_id = Column(String, nullable=True)
+    model_name = Column(String, nullable=True)
+    version = Column(String, nullable=True)
+    wave = Column(Integer, default=0)                    # canary 사용 시 0 = canary
+    status = Column(String, default="pending")           # pending / deploying / deployed / rejected / error / skipped
+    attempts = Column(Integer, default=0)
+    status_code = Column(Integer, nullable=True)
+    detail = Column(String, nullable=True)
+    response_json = Column(JSON, nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+    started_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
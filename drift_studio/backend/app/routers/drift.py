@@ -10,12 +10,21 @@ from sqlalchemy.orm import Session
 from app.database import SessionLocal
 from app.models import Dataset, DriftResult, AnalysisTask, EDAResult
 from app.services.drift_service import run_drift
+from app.services.dvc_service import BASE_DATA_DIR
 from app.services.ddoc_runner import run_ddoc, DdocError
 from app.services.task_queue import get_task_queue
 from app.services.progress_tracker import TimeEstimator
+from ddoc.core.drift_cache import drift_cache_key, get_drift_result_cache
 
 logger = logging.getLogger(__name__)
 
+# 지문(fingerprint) 계산 시 제외할 파생 디렉토리 (ZIP 압축 해제본)
+_FINGERPRINT_EXCLUDE = ("_extracted",)
+
+# 드리프트 결과 캐시 루트 (데이터 저장소 기준, 프로세스 cwd와 무관)
+# → <dvc_storage>/.ddoc/cache/drift
+DRIFT_CACHE_ROOT = os.path.dirname(os.path.abspath(BASE_DATA_DIR))
+
 
 def _use_ddoc_cli() -> bool:
     """Phase 3 — orchestrator pivot feature flag.
@@ -80,6 +89,64 @@ def _run_drift_via_cli(base: Dataset, target: Dataset) -> dict:
         )
     return out.json
 
+
+def _open_drift_cache(base_path: str, target_path: str):
+    """
+    ddoc 드리프트 결과 캐시와 이번 비교의 캐시 키를 반환합니다.
+    
+    키는 데이터셋 ID가 아니라 내용 지문(content fingerprint) + 분석 경로
+    (legacy / ddoc CLI) + detector + fusion + 분석기 버전으로 구성되므로,
+    이름이 바뀌었거나 다시 등록된 데이터셋도 같은 캐시를 사용합니다.
+    (ddoc ``analyze drift`` 와 같은 ``drift_cache_key`` 사용)
+    
+    지문 계산은 데이터셋 전체를 훑으므로 요청 스레드가 아니라 분석을
+    수행하는 쪽(동기 분석 또는 백그라운드 작업)에서 호출합니다.
+    
+    Returns:
+        tuple: (DriftResultCache, key) 또는 사용 불가 시 (None, None)
+    """
+    try:
+        cache = get_drift_result_cache(DRIFT_CACHE_ROOT)
+        base_fp = cache.fingerprint(base_path, exclude_suffixes=_FINGERPRINT_EXCLUDE)
+        target_fp = cache.fingerprint(target_path, exclude_suffixes=_FINGERPRINT_EXCLUDE)
+        if _use_ddoc_cli():
+            plugin, detector = "backend:ddoc-cli", os.getenv("DDOC_DRIFT_DETECTOR", "mmd")
+        else:
+            plugin, detector = "backend:legacy", "ensemble"
+        return cache, drift_cache_key(base_fp, target_fp, plugin=plugin, detector=detector, fusion="none")
+    except (OSError, ValueError) as e:
+        logger.warning("[drift] drift cache unavailable: %s", e)
+        return None, None
+
+
+def _save_drift_result(db: Session, base_id: str, target_id: str, result: dict) -> None:
+    """(base_id, target_id) 드리프트 결과를 upsert 합니다 (commit은 호출자)."""
+    existing = db.query(DriftResult).filter(
+        DriftResult.base_id == base_id,
+        DriftResult.target_id == target_id
+    ).first()
+
+    # overall 점수 추출 (legacy + ddoc CLI shape 모두 대응)
+    overall_score = _extract_overall_score(result)
+    
+    if existing:
+        # 업데이트
+        existing.summary = result
+        existing.feature_drift = result.get("drift") or result.get("advanced_drift")
+        existing.overall = overall_score
+    else:
+        # 새로 생성
+        drift_result = DriftResult(
+            id=str(uuid.uuid4()),
+            base_id=base_id,
+            target_id=target_id,
+            summary=result,
+            feature_drift=result.get("drift") or result.get("advanced_drift"),
+            overall=overall_score,
+        )
+        db.add(drift_result)
+
+
 router = APIRouter(prefix="/drift", tags=["drift"])
 
 
@@ -173,15 +240,25 @@ def _get_or_create_drift_result(
     Returns:
         tuple: (분석 결과 dict, 캐시 여부 bool)
     """
-    # 1) 드리프트 결과 캐시 조회 (force가 아닐 때만)
+    # 1) 드리프트 결과 캐시 조회 (force가 아닐 때만 — force면 지문도 계산하지 않음)
+    #    내용 기반 키 우선, 캐시 사용 불가 시 (base_id, target_id) 조회
+    drift_cache = cache_key = None
     if not force:
-        cached = db.query(DriftResult).filter(
-            DriftResult.base_id == base.id,
-            DriftResult.target_id == target.id
-        ).first()
-        
-        if cached and cached.summary:
-            return cached.summary, True
+        drift_cache, cache_key = _open_drift_cache(base.dvc_path, target.dvc_path)
+        if drift_cache is not None:
+            entry = drift_cache.get(cache_key)
+            if entry:
+                _save_drift_result(db, base.id, target.id, entry["result"])
+                db.commit()
+                return entry["result"], True
+        else:
+            cached = db.query(DriftResult).filter(
+                DriftResult.base_id == base.id,
+                DriftResult.target_id == target.id
+            ).first()
+            
+            if cached and cached.summary:
+                return cached.summary, True
     
     # 2) EDA 캐시 조회 (속성 분석, 임베딩)
     base_cache = _get_eda_cache(db, base.id)
@@ -209,33 +286,11 @@ def _get_or_create_drift_result(
             target_cache=target_cache,
         )
 
-    # 4) 결과 저장 (upsert)
-    existing = db.query(DriftResult).filter(
-        DriftResult.base_id == base.id,
-        DriftResult.target_id == target.id
-    ).first()
-
-    # overall 점수 추출 (legacy + ddoc CLI shape 모두 대응)
-    overall_score = _extract_overall_score(result)
-    
-    if existing:
-        # 업데이트
-        existing.summary = result
-        existing.feature_drift = result.get("drift") or result.get("advanced_drift")
-        existing.overall = overall_score
-    else:
-        # 새로 생성
-        drift_result = DriftResult(
-            id=str(uuid.uuid4()),
-            base_id=base.id,
-            target_id=target.id,
-            summary=result,
-            feature_drift=result.get("drift") or result.get("advanced_drift"),
-            overall=overall_score,
-        )
-        db.add(drift_result)
-    
+    # 4) 결과 저장 (upsert + 내용 기반 캐시)
+    _save_drift_result(db, base.id, target.id, result)
     db.commit()
+    if drift_cache is not None and result.get("type") != "unsupported":
+        drift_cache.put(cache_key, result, params={"base_id": base.id, "target_id": target.id})
     
     return result, False
 
@@ -322,8 +377,11 @@ def drift_async(req: DriftRequest, db: Session = Depends(get_db)):
     """
     드리프트 분석을 비동기로 실행합니다 (중복 실행 방지).
     
+    내용 기반 결과 캐시는 백그라운드 작업이 확인하므로, 캐시된 결과도
+    queued로 응답한 뒤 작업이 곧바로 완료됩니다.
+    
     Returns:
-        - status: queued | already_running | completed
+        - status: queued | already_running
         - task_id: 작업 ID (폴링/WebSocket 연결용)
     """
     # 1) 데이터셋 확인
@@ -344,19 +402,8 @@ def drift_async(req: DriftRequest, db: Session = Depends(get_db)):
             "message": "이미 드리프트 분석이 진행 중입니다."
         }
     
-    # 3) 캐시 확인 (force가 아닐 때만)
-    if not req.force:
-        cached = db.query(DriftResult).filter(
-            DriftResult.base_id == req.base_id,
-            DriftResult.target_id == req.target_id
-        ).first()
-        
-        if cached and cached.summary:
-            return {
-                "status": "completed",
-                "cached": True,
-                "message": "이미 분석 결과가 존재합니다."
-            }
+    # 3) 내용 기반 결과 캐시는 백그라운드 작업에서 확인합니다
+    #    (데이터셋 지문 계산이 요청을 막지 않도록)
     
     # 4) 새 작업 생성
     task_id = str(uuid.uuid4())
@@ -421,7 +468,7 @@ def drift_async(req: DriftRequest, db: Session = Depends(get_db)):
         req.target_id,
         base.dvc_path,
         target.dvc_path,
-        req.force or False
+        req.force or False,
     )
     
     return {
@@ -443,9 +490,14 @@ def _run_drift_task(
     target_id: str,
     base_path: str,
     target_path: str,
-    force: bool
+    force: bool,
 ):
-    """백그라운드에서 드리프트 분석 실행 (EDA 캐시 활용)"""
+    """
+    백그라운드에서 드리프트 분석 실행 (EDA 캐시 활용)
+    
+    force가 아니면 먼저 내용 지문으로 결과 캐시를 조회하고, 있으면 분석 없이
+    완료합니다. force면 지문 계산과 캐시 조회·저장을 모두 건너뜁니다.
+    """
     from app.services.progress_tracker import ProgressTracker
     
     db = SessionLocal()
@@ -474,6 +526,33 @@ def _run_drift_task(
                 db.rollback()
                 print(f"⚠️ update_progress DB 오류: {e}")
         
+        # 내용 기반 결과 캐시 조회 (force가 아닐 때만)
+        drift_cache = cache_key = None
+        if not force:
+            update_progress(0.12, "결과 캐시 확인 중...")
+            drift_cache, cache_key = _open_drift_cache(base_path, target_path)
+            if drift_cache is not None:
+                entry = drift_cache.get(cache_key)
+                cached_summary = entry["result"] if entry else None
+                if cached_summary:
+                    _save_drift_result(db, base_id, target_id, cached_summary)
+            else:
+                cached = db.query(DriftResult).filter(
+                    DriftResult.base_id == base_id,
+                    DriftResult.target_id == target_id
+                ).first()
+                cached_summary = cached.summary if cached else None
+            if cached_summary:
+                task = db.query(AnalysisTask).filter(AnalysisTask.id == task_id).first()
+                if task:
+                    task.status = "completed"
+                    task.completed_at = datetime.utcnow()
+                    task.progress = 1.0
+                    task.message = "완료 (캐시)"
+                db.commit()
+                print(f"✅ 드리프트 결과 캐시 사용: task_id={task_id}")
+                return
+        
         update_progress(0.15, "EDA 캐시 조회 중...")
         
         # EDA 캐시 조회
@@ -504,30 +583,9 @@ def _run_drift_task(
         update_progress(0.8, "결과 저장 중...")
         
         # 결과 저장
-        existing = db.query(DriftResult).filter(
-            DriftResult.base_id == base_id,
-            DriftResult.target_id == target_id
-        ).first()
-        
-        overall_score = None
-        if "advanced_drift" in result and result["advanced_drift"]:
-            ensemble = result["advanced_drift"].get("ensemble", {})
-            overall_score = ensemble.get("overall_score")
-        
-        if existing:
-            existing.summary = result
-            existing.feature_drift = result.get("drift") or result.get("advanced_drift")
-            existing.overall = overall_score
-        else:
-            drift_result = DriftResult(
-                id=str(uuid.uuid4()),
-                base_id=base_id,
-                target_id=target_id,
-                summary=result,
-                feature_drift=result.get("drift") or result.get("advanced_drift"),
-                overall=overall_score,
-            )
-            db.add(drift_result)
+        _save_drift_result(db, base_id, target_id, result)
+        if drift_cache is not None and result.get("type") != "unsupported":
+            drift_cache.put(cache_key, result, params={"base_id": base_id, "target_id": target_id})
         
         # 완료
         task = db.query(AnalysisTask).filter(AnalysisTask.id == task_id).first()
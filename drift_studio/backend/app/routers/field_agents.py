@@ -3,20 +3,32 @@
 Endpoints for field applications (e.g. keti-veritas) to:
 - Register themselves as field agents
 - Send periodic heartbeats
-- Submit drift reports from their embedded DIA systems
+- Submit drift reports from their embedded DIA systems (single or bulk)
 """
 
+import gzip
+import io
+import json
+import logging
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field, ValidationError
 from sqlalchemy.orm import Session
 
 from app.database import SessionLocal
+from app.models import FieldAgent
 from app.services import field_agent_service as svc
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/field-agents", tags=["field-agents"])
 
+# Upper bound on reports per bulk upload (decompressed)
+MAX_BULK_REPORTS = 5000
+MAX_BULK_BYTES = 64 * 1024 * 1024
+
 
 def get_db():
     db = SessionLocal()
@@ -49,6 +61,15 @@ class DriftReportRequest(BaseModel):
     report: dict = Field(..., description="Full DriftReport JSON payload")
 
 
+class BulkDriftReportItem(BaseModel):
+    """One report in a bulk upload; ``app_id`` may come from the envelope."""
+    app_id: Optional[str] = Field(None, description="Registered field agent app_id")
+    report: dict = Field(..., description="Full DriftReport JSON payload")
+    idempotency_key: Optional[str] = Field(
+        None, description="Retry-safe key (default: report_id/id in the payload, else payload hash)",
+    )
+
+
 class AgentResponse(BaseModel):
     id: str
     app_id: str
@@ -139,6 +160,38 @@ def submit_drift_report(req: DriftReportRequest, db: Session = Depends(get_db)):
     return resp
 
 
+@router.post("/drift-reports/bulk")
+async def submit_drift_reports_bulk(request: Request, db: Session = Depends(get_db)):
+    """Receive many drift reports in one request.
+
+    Accepted bodies (optionally ``Content-Encoding: gzip``):
+
+    - JSON array of ``{"app_id", "report", "idempotency_key"?}``
+    - JSON object ``{"app_id"?, "reports": [...]}`` — envelope ``app_id``
+      applies to items without one
+    - NDJSON (``Content-Type: application/x-ndjson``), one item per line
+
+    All accepted reports are inserted in one transaction. Reports whose
+    idempotency key was already stored are reported as ``duplicates`` and
+    not inserted again, so agents can safely retry a failed upload.
+    """
+    body = await request.body()
+    if request.headers.get("content-encoding", "").lower() == "gzip" or body[:2] == b"\x1f\x8b":
+        try:
+            with gzip.GzipFile(fileobj=io.BytesIO(body)) as f:
+                body = f.read(MAX_BULK_BYTES + 1)
+        except OSError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid gzip body: {e}")
+    if len(body) > MAX_BULK_BYTES:
+        raise HTTPException(status_code=413, detail=f"Bulk body exceeds {MAX_BULK_BYTES} bytes")
+
+    raw_items, default_app_id = _parse_bulk_body(body, request.headers.get("content-type", ""))
+    if len(raw_items) > MAX_BULK_REPORTS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_REPORTS} reports per request")
+
+    return await run_in_threadpool(_ingest_bulk, db, raw_items, default_app_id)
+
+
 @router.get("/agents", response_model=list[AgentResponse])
 def list_agents(db: Session = Depends(get_db)):
     """List all registered field agents."""
@@ -158,6 +211,16 @@ def list_reports(
     return [_report_to_response(r) for r in reports]
 
 
+@router.post("/reports/retention")
+def run_report_retention(
+    days: Optional[int] = Query(None, ge=1, description="Retention period (default DD_REPORT_RETENTION_DAYS)"),
+    db: Session = Depends(get_db),
+):
+    """Roll up and delete old drift reports now (normally run by the scheduler)."""
+    from app.services.report_retention import rollup_and_prune
+    return rollup_and_prune(db, days=days)
+
+
 @router.get("/reports/{report_id}")
 def get_report(report_id: str, db: Session = Depends(get_db)):
     """Get a single drift report with full payload."""
@@ -175,6 +238,75 @@ def get_report(report_id: str, db: Session = Depends(get_db)):
 # ── Helpers ─────────────────────────────────────────────────────────
 
 
+def _parse_bulk_body(body: bytes, content_type: str) -> tuple[list, Optional[str]]:
+    """Split a bulk body into raw items and the envelope ``app_id``."""
+    try:
+        if "ndjson" in content_type or "jsonlines" in content_type:
+            return [json.loads(line) for line in body.splitlines() if line.strip()], None
+        payload = json.loads(body or b"null")
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON body: {e}")
+    if isinstance(payload, list):
+        return payload, None
+    if isinstance(payload, dict) and isinstance(payload.get("reports"), list):
+        return payload["reports"], payload.get("app_id")
+    raise HTTPException(status_code=400, detail="Expected a JSON array, {'reports': [...]} or NDJSON")
+
+
+def _ingest_bulk(db: Session, raw_items: list, default_app_id: Optional[str]) -> dict:
+    rejected: list[dict] = []
+    parsed: list[tuple[int, BulkDriftReportItem]] = []
+    for index, raw in enumerate(raw_items):
+        if not isinstance(raw, dict):
+            rejected.append({"index": index, "error": "item must be an object"})
+            continue
+        try:
+            item = BulkDriftReportItem(**raw)
+        except ValidationError as e:
+            rejected.append({"index": index, "error": str(e)})
+            continue
+        item.app_id = item.app_id or default_app_id
+        if not item.app_id:
+            rejected.append({"index": index, "error": "missing app_id"})
+            continue
+        parsed.append((index, item))
+
+    # One agent lookup for the whole batch
+    agents = {
+        a.app_id: a
+        for a in db.query(FieldAgent).filter(FieldAgent.app_id.in_({item.app_id for _, item in parsed})).all()
+    } if parsed else {}
+    items = []
+    for index, item in parsed:
+        agent = agents.get(item.app_id)
+        if agent is None:
+            rejected.append({"index": index, "app_id": item.app_id, "error": "agent not registered"})
+            continue
+        items.append((agent.id, item.report, item.idempotency_key))
+
+    result = svc.receive_drift_reports(db, items)
+    rows = result["rows"]
+
+    # Stage 3.5: Autonomous loop — batch evaluation over the inserted reports
+    auto_result = None
+    from app.services.autonomous_loop import is_auto_trigger_enabled, on_drift_reports_received
+    if is_auto_trigger_enabled() and rows:
+        try:
+            auto_result = on_drift_reports_received(db, rows)
+        except Exception as e:
+            db.rollback()
+            logger.warning("[AutoLoop] Batch failed: %s", e)
+
+    return {
+        "received": len(raw_items),
+        "inserted": len(rows),
+        "duplicates": result["duplicates"],
+        "rejected": sorted(rejected, key=lambda r: r["index"]),
+        "report_ids": [row["id"] for row in rows],
+        **({"auto_loop": auto_result} if auto_result else {}),
+    }
+
+
 def _agent_to_response(agent) -> AgentResponse:
     return AgentResponse(
         id=agent.id,
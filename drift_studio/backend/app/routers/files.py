@@ -1,14 +1,73 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
-import os
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
+
+from app.services.file_server import (
+    FileInfo,
+    ServedFileResponse,
+    image_variant,
+    is_image,
+    not_modified,
+    parse_range,
+    resolve_served_path,
+    wants_gzip,
+)
 
 router = APIRouter(prefix="/files", tags=["files"])
 
-@router.get("/raw")
-def get_raw_file(path: str):
-    safe_path = os.path.normpath(path)
 
-    if not os.path.exists(safe_path):
+@router.api_route("/raw", methods=["GET", "HEAD"])
+async def get_raw_file(
+    request: Request,
+    path: str,
+    w: Optional[int] = Query(None, ge=16, le=4096, description="이미지 축소 변형 최대 너비 (px)"),
+):
+    """허용된 루트(데이터셋 저장소 / 워크스페이스) 아래 파일을 제공합니다.
+
+    Range(206), ETag / Last-Modified 검증(304), 텍스트 gzip,
+    이미지 축소 변형(``w``)을 지원합니다.
+    """
+    try:
+        source = resolve_served_path(path)
+    except PermissionError:
+        raise HTTPException(status_code=403, detail="Path outside allowed roots")
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="File not found")
 
-    return FileResponse(safe_path, filename=os.path.basename(safe_path))
\ No newline at end of file
+    headers = request.headers
+    vary: list[str] = []
+    if w and is_image(source):
+        try:
+            served, media_type = await run_in_threadpool(image_variant, source, w, headers.get("accept", ""))
+        except Exception as e:
+            raise HTTPException(status_code=422, detail=f"Cannot resize image: {e}")
+        info = FileInfo.of(served, media_type, tag=f"-w{w}")
+        vary.append("Accept")
+    else:
+        info = FileInfo.of(source)
+
+    if not_modified(info, headers):
+        return Response(status_code=304, headers={"etag": info.etag, "cache-control": "no-cache"})
+
+    byte_range = None
+    if_range = headers.get("if-range")
+    if if_range is None or if_range in (info.etag, info.last_modified):
+        try:
+            byte_range = parse_range(headers.get("range"), info.size)
+        except ValueError:
+            raise HTTPException(
+                status_code=416,
+                detail="Range not satisfiable",
+                headers={"content-range": f"bytes */{info.size}"},
+            )
+
+    return ServedFileResponse(
+        info,
+        byte_range=byte_range,
+        gzip=byte_range is None and wants_gzip(info, headers),
+        head=request.method == "HEAD",
+        filename=source.name,
+        vary=vary,
+    )
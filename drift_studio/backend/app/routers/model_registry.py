@@ -13,8 +13,8 @@ from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 from app.database import SessionLocal
-from app.models import FieldAgent, TrainingJob
-from app.services.model_deployment_service import ModelDeploymentService
+from app.models import FieldAgent, ModelDeployment, TrainingJob
+from app.services.model_deployment_service import ModelDeploymentService, RolloutPolicy
 
 router = APIRouter(prefix="/deployment", tags=["deployment"])
 
@@ -40,10 +40,17 @@ class DeployRequest(BaseModel):
     target_app_id: Optional[str] = Field(
         None, description="Deploy to specific agent (None = all eligible)"
     )
+    canary: Optional[int] = Field(None, ge=0, description="Agents deployed first; failure halts rollout")
+    wave_size: Optional[int] = Field(None, ge=0, description="Agents per wave after canary (0 = all)")
+    max_concurrency: Optional[int] = Field(None, ge=1, le=256)
+    timeout: Optional[float] = Field(None, gt=0, description="Seconds per attempt per agent")
+    retries: Optional[int] = Field(None, ge=0, le=10)
+    max_failure_ratio: Optional[float] = Field(None, ge=0, le=1)
 
 
 class DeployResult(BaseModel):
     artifact_id: Optional[str] = None
+    rollout_id: Optional[str] = None
     model_name: Optional[str] = None
     version: Optional[str] = None
     deployments: list[dict] = Field(default_factory=list)
@@ -95,10 +102,19 @@ def deploy_model(req: DeployRequest, db: Session = Depends(get_db)):
         artifact_meta=artifact_meta,
         training_job=job,
         target_app_id=req.target_app_id,
+        policy=RolloutPolicy.from_env(
+            canary=req.canary,
+            wave_size=req.wave_size,
+            max_concurrency=req.max_concurrency,
+            timeout=req.timeout,
+            retries=req.retries,
+            max_failure_ratio=req.max_failure_ratio,
+        ),
     )
 
     return DeployResult(
         artifact_id=artifact_id,
+        rollout_id=next((d["rollout_id"] for d in deployments if d.get("rollout_id")), None),
         model_name=artifact_meta.get("model_name"),
         version=artifact_meta.get("version"),
         deployments=deployments,
@@ -129,3 +145,70 @@ def get_artifact(artifact_id: str):
     if artifact_id not in _artifacts:
         raise HTTPException(status_code=404, detail="Artifact not found")
     return _artifacts[artifact_id]
+
+
+@router.get("/deployments")
+def list_deployments(
+    rollout_id: Optional[str] = Query(None),
+    training_job_id: Optional[str] = Query(None),
+    agent_id: Optional[str] = Query(None),
+    status: Optional[str] = Query(None, description="pending/deploying/deployed/rejected/error/skipped"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    """Per-agent deployment status (updated live while a rollout runs)."""
+    q = db.query(ModelDeployment)
+    if rollout_id:
+        q = q.filter(ModelDeployment.rollout_id == rollout_id)
+    if training_job_id:
+        q = q.filter(ModelDeployment.training_job_id == training_job_id)
+    if agent_id:
+        q = q.filter(ModelDeployment.agent_id == agent_id)
+    if status:
+        q = q.filter(ModelDeployment.status == status)
+    rows = q.order_by(ModelDeployment.created_at.desc(), ModelDeployment.wave).limit(limit).all()
+    return [_deployment_dict(d) for d in rows]
+
+
+@router.get("/rollouts/{rollout_id}")
+def get_rollout(rollout_id: str, db: Session = Depends(get_db)):
+    """Rollout summary: status counts plus per-agent rows ordered by wave."""
+    rows = (
+        db.query(ModelDeployment)
+        .filter(ModelDeployment.rollout_id == rollout_id)
+        .order_by(ModelDeployment.wave, ModelDeployment.agent_app_id)
+        .all()
+    )
+    if not rows:
+        raise HTTPException(status_code=404, detail="Rollout not found")
+    counts: dict[str, int] = {}
+    for d in rows:
+        counts[d.status] = counts.get(d.status, 0) + 1
+    return {
+        "rollout_id": rollout_id,
+        "training_job_id": rows[0].training_job_id,
+        "model_name": rows[0].model_name,
+        "version": rows[0].version,
+        "waves": max(d.wave or 0 for d in rows) + 1,
+        "counts": counts,
+        "deployments": [_deployment_dict(d) for d in rows],
+    }
+
+
+def _deployment_dict(d: ModelDeployment) -> dict:
+    return {
+        "id": d.id,
+        "rollout_id": d.rollout_id,
+        "training_job_id": d.training_job_id,
+        "agent_id": d.agent_id,
+        "agent_app_id": d.agent_app_id,
+        "model_name": d.model_name,
+        "version": d.version,
+        "wave": d.wave,
+        "status": d.status,
+        "attempts": d.attempts,
+        "status_code": d.status_code,
+        "detail": d.detail,
+        "started_at": d.started_at.isoformat() if d.started_at else None,
+        "completed_at": d.completed_at.isoformat() if d.completed_at else None,
+    }
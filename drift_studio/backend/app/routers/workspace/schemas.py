@@ -96,6 +96,7 @@ class SnapshotInfo(BaseModel):
 class SnapshotRestoreRequest(BaseModel):
     """Request to restore a snapshot"""
     force: bool = Field(False, description="Force restore even with uncommitted changes")
+    fast: bool = Field(False, description="Restore only changed data files from the local DVC cache")
 
 
 class LineageNode(BaseModel):
@@ -147,6 +147,7 @@ async def restore_snapshot(
         result = snapshot_service.restore_snapshot(
             version_or_alias=snapshot_id,
             force=request.force,
+            fast=request.fast,
         )
         
         if not result.get("success"):
@@ -7,7 +7,6 @@ from pathlib import Path
 from typing import List, Optional
 import os
 import shutil
-import json
 from datetime import datetime
 
 from .schemas import (
@@ -22,6 +21,7 @@ from .schemas import (
 # Import ddoc services (installed via wheel)
 from ddoc.core.workspace import WorkspaceService, get_workspace_service
 from ddoc.core.snapshot_service import SnapshotService, get_snapshot_service
+from ddoc.core.registry import get_registry
 
 router = APIRouter()
 
@@ -49,21 +49,16 @@ def get_workspace_path(workspace_id: str) -> Path:
 
 
 def load_workspace_metadata(workspace_id: str) -> Optional[dict]:
-    """Load workspace metadata from JSON file"""
+    """Load workspace metadata from JSON file (mtime-cached by the ddoc registry)"""
     metadata_file = get_workspace_path(workspace_id) / ".ddoc" / "workspace_meta.json"
-    if metadata_file.exists():
-        with open(metadata_file, 'r') as f:
-            return json.load(f)
-    return None
+    return get_registry().read_json(metadata_file, default=None, mutable=True)
 
 
 def save_workspace_metadata(workspace_id: str, metadata: dict):
     """Save workspace metadata to JSON file"""
     workspace_path = get_workspace_path(workspace_id)
     metadata_file = workspace_path / ".ddoc" / "workspace_meta.json"
-    metadata_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(metadata_file, 'w') as f:
-        json.dump(metadata, f, indent=2)
+    get_registry().write(metadata_file, metadata)
 
 
 @router.post("/create", response_model=WorkspaceInfo)
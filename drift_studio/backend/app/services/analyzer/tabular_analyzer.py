@@ -1,4 +1,6 @@
 import pandas as pd
+from ddoc.core.tabular_drift import tabular_drift
+
 from .base_analyzer import BaseAnalyzer
 
 class TabularAnalyzer(BaseAnalyzer):
@@ -19,28 +21,30 @@ class TabularAnalyzer(BaseAnalyzer):
 
     def drift(self, base_path: str, target_path: str) -> dict:
         """
-        매우 단순한 드리프트 계산 (컬럼별 평균 차이 비교)
-        향후 PSI, KS 등으로 변경 가능
+        컬럼별 sketch 기반 드리프트 (PSI / KS / Jensen-Shannon / null-rate)
+        두 CSV 를 chunk 단위로 한 번씩만 읽으므로 대용량 파일도 메모리 제한 내에서 처리
         """
+        report = tabular_drift(base_path, target_path)
+
         results = []
-        numeric_cols = df_base.select_dtypes("number").columns
-    
-        for col in numeric_cols:
-            b = df_base[col].mean()
-            t = df_target[col].mean()
-            diff = abs(b - t)
-    
+        for col, metrics in report["columns"].items():
             results.append({
                 "feature": col,
-                "mean_base": float(b),
-                "mean_target": float(t),
-                "drift_score": float(diff)
+                "kind": metrics.get("kind"),
+                "mean_base": metrics.get("base_mean"),
+                "mean_target": metrics.get("target_mean"),
+                "psi": metrics.get("psi"),
+                "ks": metrics.get("ks"),
+                "js": metrics.get("js"),
+                "null_rate_delta": metrics.get("null_rate_delta"),
+                "drift_score": metrics.get("psi"),
+                "status": metrics.get("status"),
             })
 
-        #overall = sum([r["drift_score"] for r in results]) / len(results)
-        overlall = '0'
-        
         return {
-            "overall": overall,
-            "method": "todo  drift",
-        }
\ No newline at end of file
+            "overall": report["summary"]["psi_mean"],
+            "status": report["summary"]["status"],
+            "method": "psi/ks/js (chunked sketches)",
+            "rows": report["rows"],
+            "features": results,
+        }
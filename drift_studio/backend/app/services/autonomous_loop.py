@@ -20,6 +20,7 @@ import logging
 import os
 import threading
 
+from sqlalchemy import bindparam
 from sqlalchemy.orm import Session
 
 from app.models import FieldDriftReport, TrainingJob
@@ -109,6 +110,70 @@ def on_drift_report_received(db: Session, report: FieldDriftReport) -> dict:
     }
 
 
+def on_drift_reports_received(db: Session, rows: list[dict]) -> dict:
+    """Batch counterpart of :func:`on_drift_report_received`.
+
+    ``rows`` are the report rows just inserted by
+    ``field_agent_service.receive_drift_reports``. Decisions are evaluated
+    in memory over the batch (``DriftDecisionEngine.evaluate_batch``),
+    statuses are written back with one executemany UPDATE, and at most one
+    training job is triggered per (agent, model) in the batch.
+
+    Returns a summary dict of what happened.
+    """
+    if not is_auto_trigger_enabled():
+        return {"auto_trigger": False, "action": "manual_review_required"}
+    if not rows:
+        return {"auto_trigger": True, "actions": {}, "training_jobs": []}
+
+    # Transient ORM objects: the engine and orchestrator only read fields
+    reports = [FieldDriftReport(**row) for row in rows]
+    decisions = _decision_engine.evaluate_batch(db, reports)
+
+    from app.models import TrainerAgent
+    trainers: dict[str, TrainerAgent | None] = {}
+    jobs: dict[tuple[str, str | None], str] = {}
+    updates: list[dict] = []
+    actions: dict[str, int] = {}
+
+    for report, decision in zip(reports, decisions):
+        status, action_taken = decision.action, decision.to_dict()
+        if decision.action == Action.RETRAIN:
+            key = (report.agent_id, report.model_name)
+            if decision.trainer_name not in trainers:
+                trainers[decision.trainer_name] = db.query(TrainerAgent).filter(
+                    TrainerAgent.name == decision.trainer_name
+                ).first() if decision.trainer_name else None
+            trainer = trainers[decision.trainer_name]
+            if trainer is None:
+                status = "alert"
+                logger.warning("[AutoLoop] No trainer for %s — alerting only", report.model_name)
+            else:
+                if key not in jobs:
+                    job = _orchestrator.trigger_training(db, trainer=trainer, drift_report=report)
+                    jobs[key] = job.id
+                    logger.info(
+                        "[AutoLoop] Training triggered: job=%s trainer=%s model=%s",
+                        job.id, trainer.name, report.model_name,
+                    )
+                status = "action_taken"
+                action_taken = {**action_taken, "training_job_id": jobs[key], "auto_triggered": True}
+        actions[status] = actions.get(status, 0) + 1
+        updates.append({"report_id": report.id, "new_status": status, "new_action": action_taken})
+
+    table = FieldDriftReport.__table__
+    db.execute(
+        table.update()
+        .where(table.c.id == bindparam("report_id"))
+        .values(status=bindparam("new_status"), action_taken=bindparam("new_action")),
+        updates,
+    )
+    db.commit()
+
+    logger.info("[AutoLoop] Batch of %d report(s): %s", len(reports), actions)
+    return {"auto_trigger": True, "actions": actions, "training_jobs": sorted(set(jobs.values()))}
+
+
 def on_training_completed(db: Session, job: TrainingJob) -> dict:
     """Called when a training job completes. Auto-deploys if enabled.
 
@@ -1,28 +1,175 @@
 # dataset_store.py
-import pandas as pd
+"""업로드된 테이블 데이터 저장소 (메모리 예산 + 디스크 spill).
+
+업로드 CSV 는 pyarrow 로 배치 단위 스트리밍 변환되어 parquet 파일로 저장되며,
+변환 중에 shape / dtype / null 개수 메타데이터를 함께 계산합니다.
+메모리에는 최근 사용한 DataFrame 만 LRU 로 유지하고
+(``DD_DATASET_STORE_MEMORY_MB``, 기본 512MB), 열 선택 / 행 구간 조회는
+필요한 row group 만 읽으므로 전체 파일을 메모리에 올리지 않습니다.
+"""
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
 from uuid import uuid4
 
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+STORE_DIR = Path(os.getenv("DD_DATASET_STORE_DIR", "dvc_storage/tables"))
+MEMORY_BUDGET_MB = int(os.getenv("DD_DATASET_STORE_MEMORY_MB", "512"))
+BLOCK_SIZE = 8 * 1024 * 1024  # CSV 스트리밍 배치 크기 (타입 추론도 첫 블록 기준)
+_CONVERSION_ERROR = re.compile(r"In CSV column #(\d+)")  # 변환 실패한 열 번호
+
+
 class DatasetStore:
-    def __init__(self):
-        self.data = {}
+    def __init__(self, root=STORE_DIR, memory_budget_mb=MEMORY_BUDGET_MB):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.memory_budget = memory_budget_mb * 1024 * 1024
         self.meta = {}
+        self._frames = OrderedDict()  # id → (DataFrame, bytes)
+        self._frames_bytes = 0
+        self._lock = threading.Lock()
+        self._load_meta()
+
+    # ── 저장 ─────────────────────────────────────────────
 
     def add_dataset(self, file):
+        """업로드 파일(CSV)을 parquet 로 스트리밍 변환하여 저장합니다."""
         ds_id = str(uuid4())
-        df = pd.read_csv(file.file)
+        path = self._path(ds_id)
+        stats = self._convert_csv(file.file, path)
 
-        self.data[ds_id] = df
-        self.meta[ds_id] = {
+        meta = {
             "id": ds_id,
             "name": file.filename,
-            "rows": len(df),
-            "cols": len(df.columns),
-            "columns": list(df.columns)
+            "rows": stats["rows"],
+            "cols": len(stats["columns"]),
+            "columns": stats["columns"],
+            "dtypes": stats["dtypes"],
+            "null_counts": stats["null_counts"],
+            "row_groups": stats["row_groups"],
+            "size_bytes": path.stat().st_size,
+            "created_at": datetime.utcnow().isoformat(),
         }
+        self._meta_path(ds_id).write_text(json.dumps(meta, ensure_ascii=False))
+        with self._lock:
+            self.meta[ds_id] = meta
         return ds_id
 
+    def _convert_csv(self, fileobj, path):
+        """CSV → parquet (배치마다 row group 1개). 타입 충돌 시 해당 열만 넓혀서 재시도합니다.
+
+        pyarrow 스트리밍 리더는 첫 블록으로 타입을 추론하므로, 이후 블록에서
+        충돌한 열만 정수 → float64 → 문자열 순으로 넓히고 나머지 열은 추론된
+        타입을 유지합니다. 오류에서 열을 알 수 없으면 그대로 예외를 전달합니다.
+        """
+        column_types = {}
+        schema = None
+        while True:
+            fileobj.seek(0)
+            try:
+                return self._stream_csv(fileobj, path, column_types)
+            except pa.ArrowInvalid as e:
+                match = _CONVERSION_ERROR.search(str(e))
+                if match is None:
+                    raise
+                if schema is None:
+                    fileobj.seek(0)
+                    schema = pacsv.open_csv(fileobj, read_options=pacsv.ReadOptions(block_size=BLOCK_SIZE)).schema
+                index = int(match.group(1))
+                if index >= len(schema):
+                    raise
+                field = schema.field(index)
+                current = column_types.get(field.name, field.type)
+                if pa.types.is_string(current) or pa.types.is_large_string(current):
+                    raise
+                column_types[field.name] = pa.float64() if pa.types.is_integer(current) else pa.string()
+
+    def _stream_csv(self, fileobj, path, column_types=None):
+        reader = pacsv.open_csv(
+            fileobj,
+            read_options=pacsv.ReadOptions(block_size=BLOCK_SIZE),
+            convert_options=pacsv.ConvertOptions(column_types=column_types or {}),
+        )
+        schema = reader.schema
+        rows, row_groups = 0, []
+        nulls = [0] * len(schema)
+        tmp = path.with_suffix(".parquet.tmp")
+        try:
+            with pq.ParquetWriter(tmp, schema, compression="zstd") as writer:
+                for batch in reader:
+                    if not batch.num_rows:
+                        continue
+                    writer.write_batch(batch)
+                    rows += batch.num_rows
+                    row_groups.append(batch.num_rows)
+                    for i, column in enumerate(batch.columns):
+                        nulls[i] += column.null_count
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+        dtypes = schema.empty_table().to_pandas().dtypes
+        return {
+            "rows": rows,
+            "columns": schema.names,
+            "dtypes": {name: str(dtypes[name]) for name in schema.names},
+            "null_counts": dict(zip(schema.names, nulls)),
+            "row_groups": row_groups,
+        }
+
+    # ── 조회 ─────────────────────────────────────────────
+
     def get(self, id):
-        return self.data.get(id)
+        """전체 DataFrame (LRU 캐시 경유). 큰 테이블은 ``read`` 사용을 권장합니다."""
+        if id not in self.meta:
+            return None
+        with self._lock:
+            cached = self._frames.get(id)
+            if cached is not None:
+                self._frames.move_to_end(id)
+                return cached[0]
+        df = pq.read_table(self._path(id)).to_pandas()
+        self._remember(id, df)
+        return df
+
+    def read(self, id, columns=None, start=0, stop=None):
+        """열 선택(``columns``) + 행 구간(``[start, stop)``) 조회.
+
+        메모리에 올라와 있으면 캐시에서 자르고, 아니면 겹치는 row group 만 읽습니다.
+        """
+        meta = self.meta.get(id)
+        if meta is None:
+            return None
+        stop = meta["rows"] if stop is None else min(stop, meta["rows"])
+        start = max(start, 0)
+        if start >= stop:
+            return pd.DataFrame(columns=list(columns or meta["columns"]))
+
+        with self._lock:
+            cached = self._frames.get(id)
+            if cached is not None:
+                self._frames.move_to_end(id)
+        if cached is not None:
+            df = cached[0].iloc[start:stop]
+            return (df[list(columns)] if columns else df).reset_index(drop=True)
+
+        groups, offset, first_offset = [], 0, None
+        for index, n in enumerate(meta["row_groups"]):
+            if offset + n > start and offset < stop:
+                groups.append(index)
+                first_offset = offset if first_offset is None else first_offset
+            offset += n
+        table = pq.ParquetFile(self._path(id)).read_row_groups(groups, columns=columns)
+        table = table.slice(start - first_offset, stop - start)
+        return table.to_pandas()
 
     def get_meta(self, id):
         return self.meta.get(id)
@@ -30,5 +177,51 @@ class DatasetStore:
     def list_datasets(self):
         return list(self.meta.values())
 
+    def delete(self, id):
+        with self._lock:
+            meta = self.meta.pop(id, None)
+            cached = self._frames.pop(id, None)
+            if cached is not None:
+                self._frames_bytes -= cached[1]
+        self._path(id).unlink(missing_ok=True)
+        self._meta_path(id).unlink(missing_ok=True)
+        return meta is not None
+
+    def memory_usage(self):
+        with self._lock:
+            return {"frames": len(self._frames), "bytes": self._frames_bytes, "budget": self.memory_budget}
+
+    # ── 내부 ─────────────────────────────────────────────
+
+    def _remember(self, id, df):
+        size = int(df.memory_usage(deep=True).sum())
+        if size > self.memory_budget:
+            return  # 예산보다 큰 프레임은 캐시하지 않음
+        with self._lock:
+            old = self._frames.pop(id, None)
+            if old is not None:
+                self._frames_bytes -= old[1]
+            self._frames[id] = (df, size)
+            self._frames_bytes += size
+            while self._frames_bytes > self.memory_budget:
+                _, (_, evicted) = self._frames.popitem(last=False)
+                self._frames_bytes -= evicted
+
+    def _load_meta(self):
+        for meta_path in self.root.glob("*.json"):
+            try:
+                meta = json.loads(meta_path.read_text())
+            except (OSError, ValueError):
+                continue
+            if self._path(meta["id"]).exists():
+                self.meta[meta["id"]] = meta
+
+    def _path(self, id):
+        return self.root / f"{id}.parquet"
+
+    def _meta_path(self, id):
+        return self.root / f"{id}.json"
+
+
 # ← 추가: 싱글턴 인스턴스
-store = DatasetStore()
\ No newline at end of file
+store = DatasetStore()
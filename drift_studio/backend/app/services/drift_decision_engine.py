@@ -16,9 +16,11 @@ from __future__ import annotations
 import logging
 from datetime import datetime, timedelta
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.models import FieldDriftReport, TrainerAgent
+from app.services.escalation_counter import get_escalation_counter
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +57,53 @@ class DriftDecisionEngine:
 
     def evaluate(self, db: Session, report: FieldDriftReport) -> DriftDecision:
         """Evaluate a single drift report and return the recommended action."""
+        return self._decide(
+            report,
+            should_escalate=lambda: self._should_escalate(db, report),
+            find_trainer=lambda model_name: self._find_trainer(db, model_name),
+        )
+
+    def evaluate_batch(self, db: Session, reports: list[FieldDriftReport]) -> list[DriftDecision]:
+        """Evaluate a batch of already-persisted reports in arrival order.
+
+        Equivalent to calling :meth:`evaluate` on each report right after it
+        was stored, but escalation counts come from one grouped ``COUNT``
+        over the reports *before* the batch plus an in-memory running count
+        over the batch, and trainers are looked up once per model name.
+        """
+        # Window counts include the (already stored) batch itself; start from
+        # the count before the batch and replay the batch in order.
+        batch_medium: dict[tuple[str, str | None], int] = {}
+        for r in reports:
+            if r.severity == "medium":
+                key = (r.agent_id, r.model_name)
+                batch_medium[key] = batch_medium.get(key, 0) + 1
+        counter = get_escalation_counter()
+        if counter.ready:
+            totals = {key: counter.count(*key, "medium") for key in batch_medium}
+        else:
+            totals = self._medium_counts(db, set(batch_medium))
+        counts = {key: max(total - batch_medium.get(key, 0), 0) for key, total in totals.items()}
+        trainers: dict[str, TrainerAgent | None] = {}
+
+        def find_trainer(model_name: str) -> TrainerAgent | None:
+            if model_name not in trainers:
+                trainers[model_name] = self._find_trainer(db, model_name)
+            return trainers[model_name]
+
+        decisions = []
+        for report in reports:
+            key = (report.agent_id, report.model_name)
+            if report.severity == "medium":
+                counts[key] = counts.get(key, 0) + 1
+            decisions.append(self._decide(
+                report,
+                should_escalate=lambda key=key: counts.get(key, 0) >= self.MEDIUM_ESCALATION_COUNT,
+                find_trainer=find_trainer,
+            ))
+        return decisions
+
+    def _decide(self, report: FieldDriftReport, *, should_escalate, find_trainer) -> DriftDecision:
         severity = report.severity or "low"
         model_name = report.model_name or "unknown"
 
@@ -65,7 +114,7 @@ class DriftDecisionEngine:
             )
 
         if severity == "high":
-            trainer = self._find_trainer(db, model_name)
+            trainer = find_trainer(model_name)
             if trainer:
                 return DriftDecision(
                     action=Action.RETRAIN,
@@ -78,8 +127,8 @@ class DriftDecisionEngine:
             )
 
         # severity == "medium"
-        if self._should_escalate(db, report):
-            trainer = self._find_trainer(db, model_name)
+        if should_escalate():
+            trainer = find_trainer(model_name)
             if trainer:
                 return DriftDecision(
                     action=Action.RETRAIN,
@@ -96,7 +145,14 @@ class DriftDecisionEngine:
         )
 
     def _should_escalate(self, db: Session, report: FieldDriftReport) -> bool:
-        """Check if recent medium-severity reports warrant escalation to RETRAIN."""
+        """Check if recent medium-severity reports warrant escalation to RETRAIN.
+
+        Answered from the in-memory sliding-window counter once it has been
+        warm-loaded; falls back to a windowed ``COUNT`` otherwise.
+        """
+        counter = get_escalation_counter()
+        if counter.ready:
+            return counter.count(report.agent_id, report.model_name, "medium") >= self.MEDIUM_ESCALATION_COUNT
         cutoff = datetime.utcnow() - timedelta(hours=self.MEDIUM_ESCALATION_WINDOW_HOURS)
         recent_count = (
             db.query(FieldDriftReport)
@@ -110,6 +166,27 @@ class DriftDecisionEngine:
         )
         return recent_count >= self.MEDIUM_ESCALATION_COUNT
 
+    def _medium_counts(
+        self,
+        db: Session,
+        keys: set[tuple[str, str | None]],
+    ) -> dict[tuple[str, str | None], int]:
+        """Medium-severity report counts in the escalation window per (agent, model)."""
+        if not keys:
+            return {}
+        cutoff = datetime.utcnow() - timedelta(hours=self.MEDIUM_ESCALATION_WINDOW_HOURS)
+        rows = (
+            db.query(FieldDriftReport.agent_id, FieldDriftReport.model_name, func.count(FieldDriftReport.id))
+            .filter(
+                FieldDriftReport.agent_id.in_({agent_id for agent_id, _ in keys}),
+                FieldDriftReport.severity == "medium",
+                FieldDriftReport.created_at >= cutoff,
+            )
+            .group_by(FieldDriftReport.agent_id, FieldDriftReport.model_name)
+            .all()
+        )
+        return {(agent_id, model_name): count for agent_id, model_name, count in rows if (agent_id, model_name) in keys}
+
     def _find_trainer(self, db: Session, model_name: str) -> TrainerAgent | None:
         """Find a suitable trainer for the given model.
 
@@ -20,6 +20,14 @@ import numpy as np
 from typing import Dict, Any, List, Optional, Tuple
 from scipy import stats
 
+from ddoc.core.tabular_drift import tabular_drift
+from ddoc.core.reference_profile import (
+    EmbeddingSketch,
+    ReferenceProfile,
+    compare_embeddings,
+    histogram as sketch_histogram,
+)
+from ddoc.core.sketches import NumericSketch, compare_numeric
 from app.services.zip_resolver import analyze_zip_dataset, analyze_roboflow
 from app.utils.json_sanitize import clean_json_value
 from app.services.eda_service import run_image_analysis, collect_image_files
@@ -133,29 +141,28 @@ def compute_zip_drift(base_info, target_info):
 # ============================================================
 
 def compute_csv_drift(base_path, target_path):
-    print('base_path = ', base_path)
-    print('target_path = ', target_path)
-    df1 = pd.read_csv(base_path)
-    df2 = pd.read_csv(target_path)
-    print(df1)
-    print(df2)
+    """
+    CSV 컬럼별 드리프트 (수치형 컬럼만, 기존 응답 형태 유지)
 
-    # 수치형 컬럼만 비교
-    numeric_cols = [c for c in df1.columns if pd.api.types.is_numeric_dtype(df1[c])]
+    두 파일을 chunk 단위로 한 번만 읽어 컬럼별 sketch 를 만들고
+    PSI / KS / Jensen-Shannon / null-rate 드리프트를 계산합니다.
+    범주형 컬럼까지 포함한 전체 결과는 ``compute_csv_drift_report`` 참고.
+    """
+    report = compute_csv_drift_report(base_path, target_path)
+    return {
+        col: metrics for col, metrics in report["columns"].items()
+        if metrics.get("kind") == "numeric"
+    }
 
-    drift = {}
 
-    for col in numeric_cols:
-        mean1 = df1[col].mean()
-        mean2 = df2[col].mean()
-        drift[col] = {
-            "base_mean": None if pd.isna(mean1) else round(float(mean1), 4),
-            "target_mean": None if pd.isna(mean2) else round(float(mean2), 4),
-            "delta": None if pd.isna(mean1) or pd.isna(mean2) else round(float(mean2 - mean1), 4),
-        }
-    print('drift = ', drift)
+def compute_csv_drift_report(base_path, target_path) -> Dict[str, Any]:
+    """
+    대용량 CSV 쌍을 위한 chunked drift (``ddoc.core.tabular_drift``)
 
-    return drift
+    Returns:
+        {"rows": {...}, "columns": {col: metrics}, "summary": {...}}
+    """
+    return tabular_drift(base_path, target_path)
 
 
 # ============================================================
@@ -220,8 +227,16 @@ def run_drift(
     # CSV vs CSV
     # -------------------
     if base_path.endswith(".csv") and target_path.endswith(".csv"):
-        result = compute_csv_drift(base_path, target_path)
-        return clean_json_value({"type": "csv_csv", "drift": result})
+        report = compute_csv_drift_report(base_path, target_path)
+        columns = report["columns"]
+        return clean_json_value({
+            "type": "csv_csv",
+            # 수치형 컬럼 (base_mean / target_mean / delta + PSI / KS / JS)
+            "drift": {c: m for c, m in columns.items() if m.get("kind") == "numeric"},
+            "categorical": {c: m for c, m in columns.items() if m.get("kind") != "numeric"},
+            "rows": report["rows"],
+            "summary": report["summary"],
+        })
 
     # -------------------
     # 다른 조합은 미지원 (향후 추가 가능)
@@ -252,6 +267,10 @@ def compute_advanced_image_drift(
     - 임베딩 드리프트: MMD, Mean Shift, Wasserstein, PSI
     - 앙상블 점수 및 상태 판정
     
+    기준 데이터셋 캐시에 참조 프로파일(reference_profile / embedding_profile)이
+    있으면 기준 측 속성·임베딩 원본을 읽지 않고 프로파일과 비교합니다.
+    이 경우 MMD는 계산되지 않습니다 (원본 샘플 필요).
+    
     Args:
         base_dir: 기준 데이터셋 디렉토리
         target_dir: 비교 대상 데이터셋 디렉토리
@@ -286,13 +305,23 @@ def compute_advanced_image_drift(
     if target_embs_cached:
         print("   ✅ Target 임베딩 데이터: 캐시 사용")
     
+    base_profile = load_cached_reference_profile(base_cache)
+    base_attr_profile = base_profile is not None and bool(base_profile.features)
+    base_emb_profile = base_profile is not None and base_profile.embedding is not None
+    if base_attr_profile:
+        print("   ✅ Base 속성 참조 프로파일 사용")
+    if base_emb_profile:
+        print("   ✅ Base 임베딩 참조 프로파일 사용")
+    
     # ============================================================
     # 1. 속성 데이터 준비 (캐시 또는 새로 분석)
     # ============================================================
     base_attrs = {}
     target_attrs = {}
     
-    if base_attrs_cached:
+    if base_attr_profile:
+        pass  # 참조 프로파일로 비교 (원본 속성 불필요)
+    elif base_attrs_cached:
         # 캐시에서 속성 데이터 로드
         base_attrs = base_cache["image_analysis"].get("attributes", {})
     else:
@@ -320,24 +349,31 @@ def compute_advanced_image_drift(
             if attrs:
                 target_attrs[rel_path] = attrs
     
-    if not base_attrs or not target_attrs:
+    if not (base_attrs or base_attr_profile) or not target_attrs:
         print("   ⚠️ 속성 분석 결과가 없습니다.")
         return None
     
     # 2. 속성 드리프트 (KL Divergence)
-    attribute_drift = compute_attribute_drift(base_attrs, target_attrs)
+    if base_attr_profile:
+        attribute_drift = compute_profile_attribute_drift(base_profile, target_attrs)
+        base_count = base_profile.count
+    else:
+        attribute_drift = compute_attribute_drift(base_attrs, target_attrs)
+        base_count = len(base_attrs)
     
     # ============================================================
     # 3. 임베딩 데이터 준비 (캐시 또는 새로 추출)
     # ============================================================
     embedding_drift = None
     
-    if len(base_attrs) >= 5 and len(target_attrs) >= 5:
+    if base_count >= 5 and len(target_attrs) >= 5:
         base_embs = []
         target_embs = []
         
         # Base 임베딩
-        if base_embs_cached:
+        if base_emb_profile:
+            pass  # 참조 프로파일로 비교 (원본 임베딩 불필요)
+        elif base_embs_cached:
             base_embs = base_cache["clustering"]["embeddings"]
             print(f"   📦 Base 임베딩 캐시 로드: {len(base_embs)}개")
         else:
@@ -362,7 +398,12 @@ def compute_advanced_image_drift(
                 if emb and 'embedding' in emb:
                     target_embs.append(emb['embedding'])
         
-        if len(base_embs) >= 5 and len(target_embs) >= 5:
+        if base_emb_profile and base_profile.embedding.count >= 5 and len(target_embs) >= 5:
+            embedding_drift = compute_profile_embedding_drift(
+                base_profile.embedding,
+                np.array(target_embs)
+            )
+        elif len(base_embs) >= 5 and len(target_embs) >= 5:
             embedding_drift = compute_embedding_drift(
                 np.array(base_embs), 
                 np.array(target_embs)
@@ -373,7 +414,7 @@ def compute_advanced_image_drift(
     
     result = {
         "file_counts": {
-            "base": len(base_attrs),
+            "base": base_count,
             "target": len(target_attrs),
         },
         "attribute_drift": attribute_drift,
@@ -384,6 +425,7 @@ def compute_advanced_image_drift(
             "target_attributes": bool(target_attrs_cached),
             "base_embeddings": bool(base_embs_cached),
             "target_embeddings": bool(target_embs_cached),
+            "base_reference_profile": bool(base_attr_profile or base_emb_profile),
         }
     }
     
@@ -450,6 +492,80 @@ def compute_attribute_drift(base_attrs: Dict, target_attrs: Dict) -> Dict[str, A
     return drift
 
 
+# 속성 필드 (결과 키 → 속성 캐시 키)
+_PROFILE_ATTRIBUTE_FIELDS = (("size", "size"), ("noise", "noise_level"), ("sharpness", "sharpness"))
+
+
+def load_cached_reference_profile(cache: Optional[Dict[str, Any]]) -> Optional[ReferenceProfile]:
+    """
+    EDA 캐시에서 참조 프로파일을 복원합니다.
+    
+    속성 프로파일은 image_analysis.reference_profile, 임베딩 프로파일은
+    clustering.embedding_profile 에 저장되어 있습니다.
+    """
+    if not cache:
+        return None
+    attr_data = (cache.get("image_analysis") or {}).get("reference_profile")
+    emb_data = (cache.get("clustering") or {}).get("embedding_profile")
+    try:
+        profile = ReferenceProfile.from_dict(attr_data) if attr_data else None
+        if emb_data:
+            emb_profile = ReferenceProfile.from_dict(emb_data)
+            if profile is None:
+                profile = emb_profile
+            else:
+                profile.embedding = emb_profile.embedding
+    except (ValueError, KeyError, TypeError) as e:
+        print(f"   ⚠️ 참조 프로파일 로드 실패: {e}")
+        return None
+    return profile
+
+
+def compute_profile_attribute_drift(base_profile: ReferenceProfile, target_attrs: Dict) -> Dict[str, Any]:
+    """
+    기준 참조 프로파일과 비교 대상 속성 간 드리프트를 계산합니다.
+    
+    compute_attribute_drift 와 같은 형태를 반환하며, KL Divergence는
+    기준 분위수 구간에서 계산됩니다 (PSI / KS / JS 추가).
+    """
+    drift = {}
+    distributions = {}
+    for key, field in _PROFILE_ATTRIBUTE_FIELDS:
+        base_sketch = base_profile.features.get(field)
+        target_values = [v[field] for v in target_attrs.values() if field in v]
+        if not isinstance(base_sketch, NumericSketch) or not base_sketch.count or not target_values:
+            distributions[key] = {}
+            continue
+        target_sketch = NumericSketch().update(target_values)
+        metrics = compare_numeric(base_sketch, target_sketch)
+        drift[key] = {
+            'kl_divergence': metrics['kl'],
+            'base_mean': metrics['base_mean'],
+            'target_mean': metrics['target_mean'],
+            'base_std': metrics['base_std'],
+            'target_std': metrics['target_std'],
+            'psi': metrics['psi'],
+            'ks': metrics['ks'],
+            'js': metrics['js'],
+        }
+        distributions[key] = create_profile_histogram(base_sketch, target_values, 20)
+    
+    # 히스토그램 데이터 (시각화용)
+    drift['distributions'] = distributions
+    return drift
+
+
+def compute_profile_embedding_drift(base_sketch: EmbeddingSketch, target_embs: np.ndarray) -> Dict[str, Any]:
+    """
+    기준 임베딩 프로파일과 비교 대상 임베딩 간 드리프트를 계산합니다.
+    
+    메트릭: Mean Shift, Cosine Distance, Wasserstein, PSI (랜덤 투영 기준)
+    """
+    target_sketch = EmbeddingSketch(n_projections=base_sketch.n_projections, seed=base_sketch.seed)
+    target_sketch.update(target_embs)
+    return compare_embeddings(base_sketch, target_sketch)
+
+
 def compute_embedding_drift(base_embs: np.ndarray, target_embs: np.ndarray) -> Dict[str, Any]:
     """
     임베딩 공간에서의 드리프트를 계산합니다.
@@ -668,6 +784,33 @@ def calculate_psi(baseline: np.ndarray, current: np.ndarray, bins: int = 10) ->
         return 0.0
 
 
+def create_profile_histogram(
+    base_sketch: NumericSketch,
+    target_data: List[float],
+    bins: int = 20
+) -> Dict[str, Any]:
+    """참조 프로파일(스케치)과 비교 대상 값의 비교용 히스토그램을 생성합니다."""
+    if not base_sketch.count or not target_data:
+        return {}
+    
+    try:
+        min_val = min(base_sketch.min, min(target_data))
+        max_val = max(base_sketch.max, max(target_data))
+        
+        target_hist, edges = np.histogram(target_data, bins=bins, range=(min_val, max_val))
+        base_hist = sketch_histogram(base_sketch, edges)
+        
+        bin_centers = [(edges[i] + edges[i+1]) / 2 for i in range(len(target_hist))]
+        
+        return {
+            "bins": [round(b, 4) for b in bin_centers],
+            "base": [int(round(c)) for c in base_hist],
+            "target": target_hist.tolist(),
+        }
+    except Exception:
+        return {}
+
+
 def create_comparison_histogram(
     base_data: List[float], 
     target_data: List[float], 
@@ -17,6 +17,7 @@ import numpy as np
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
+from ddoc.core.reference_profile import build_profile
 from app.utils.json_sanitize import clean_json_value
 from app.services.zip_resolver import (
     analyze_zip_dataset,
@@ -230,6 +231,8 @@ def run_image_attributes(directory: str) -> Optional[Dict[str, Any]]:
             "summary": summary_stats,
             "attributes": attr_results,
             "distributions": calculate_distributions(attr_results),
+            # 드리프트 분석 시 기준(base) 측 재계산 없이 재사용하는 참조 프로파일
+            "reference_profile": build_profile("image", attributes=attr_results).to_dict(),
         }
         
         print(f"✅ 이미지 속성 분석 완료: {len(attr_results)}개 파일")
@@ -307,6 +310,8 @@ def run_image_attributes_with_progress(
             "summary": summary_stats,
             "attributes": attr_results,
             "distributions": calculate_distributions(attr_results),
+            # 드리프트 분석 시 기준(base) 측 재계산 없이 재사용하는 참조 프로파일
+            "reference_profile": build_profile("image", attributes=attr_results).to_dict(),
         }
         
         if progress_callback:
@@ -387,6 +392,9 @@ def run_image_clustering(directory: str, save_embeddings: bool = True) -> Option
             # 리스트를 numpy array로 변환 후 다시 리스트로 (JSON 직렬화 가능하게)
             result["embeddings"] = [emb.tolist() if hasattr(emb, 'tolist') else emb for emb in embeddings_list]
         
+        # 임베딩 참조 프로파일 (평균/분산 + 랜덤 투영 스케치)
+        result["embedding_profile"] = build_profile("image", embeddings=embeddings_list).to_dict()
+        
         print(f"✅ 이미지 클러스터링 완료: {len(embeddings_list)}개 파일, {result['n_clusters']}개 클러스터")
         return result
         
@@ -482,6 +490,9 @@ def run_image_clustering_with_progress(
         if save_embeddings:
             result["embeddings"] = [emb.tolist() if hasattr(emb, 'tolist') else emb for emb in embeddings_list]
         
+        # 임베딩 참조 프로파일 (평균/분산 + 랜덤 투영 스케치)
+        result["embedding_profile"] = build_profile("image", embeddings=embeddings_list).to_dict()
+        
         if progress_callback:
             progress_callback(1.0, "완료")
         
@@ -0,0 +1,131 @@
+"""Sliding-window counters for drift escalation.
+
+``DriftDecisionEngine`` escalates repeated medium-severity reports
+(N reports for the same agent + model within a window). Instead of a
+``COUNT(*)`` over ``field_drift_reports`` per report, this keeps one
+timestamp ring buffer (``deque``) per (agent, model, severity):
+
+- ``record`` appends the report timestamp — O(1)
+- ``count`` drops expired timestamps from the left and returns the
+  length — amortized O(1), every timestamp is expired at most once
+
+The counter is warm-loaded from the DB on startup (``warm_load``) and fed
+by ``field_agent_service`` whenever a report is stored. It is
+per-process state; until ``warm_load`` has run, the engine falls back to
+the DB count.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.models import FieldDriftReport
+
+logger = logging.getLogger(__name__)
+
+Key = tuple[str, "str | None", str]
+
+
+class SlidingWindowCounter:
+    """Per-key event counts over a trailing time window."""
+
+    def __init__(self, window: timedelta, severities: tuple[str, ...] = ("medium",)):
+        self.window = window
+        self.severities = severities
+        self._buffers: dict[Key, deque[datetime]] = {}
+        self._lock = threading.Lock()
+        self.ready = False
+
+    def tracks(self, severity: str | None) -> bool:
+        return severity in self.severities
+
+    def record(self, agent_id: str, model_name: str | None, severity: str | None, at: datetime | None = None) -> None:
+        """Count one report (ignored for untracked severities)."""
+        if not self.tracks(severity):
+            return
+        at = at or datetime.utcnow()
+        key = (agent_id, model_name, severity)
+        with self._lock:
+            buffer = self._buffers.setdefault(key, deque())
+            if buffer and at < buffer[-1]:
+                # Out-of-order timestamp (e.g. clock skew) — keep the buffer sorted
+                items = sorted([*buffer, at])
+                buffer.clear()
+                buffer.extend(items)
+            else:
+                buffer.append(at)
+
+    def count(self, agent_id: str, model_name: str | None, severity: str, now: datetime | None = None) -> int:
+        """Reports for the key within the window ending at ``now``."""
+        cutoff = (now or datetime.utcnow()) - self.window
+        key = (agent_id, model_name, severity)
+        with self._lock:
+            buffer = self._buffers.get(key)
+            if not buffer:
+                return 0
+            while buffer and buffer[0] < cutoff:
+                buffer.popleft()
+            if not buffer:
+                del self._buffers[key]
+                return 0
+            return len(buffer)
+
+    def prune(self, now: datetime | None = None) -> int:
+        """Drop expired timestamps of every key; returns the number of keys left."""
+        cutoff = (now or datetime.utcnow()) - self.window
+        with self._lock:
+            for key in list(self._buffers):
+                buffer = self._buffers[key]
+                while buffer and buffer[0] < cutoff:
+                    buffer.popleft()
+                if not buffer:
+                    del self._buffers[key]
+            return len(self._buffers)
+
+    def warm_load(self, db: Session) -> int:
+        """Rebuild the buffers from reports inside the window; returns the row count."""
+        cutoff = datetime.utcnow() - self.window
+        rows = (
+            db.query(
+                FieldDriftReport.agent_id,
+                FieldDriftReport.model_name,
+                FieldDriftReport.severity,
+                FieldDriftReport.created_at,
+            )
+            .filter(
+                FieldDriftReport.severity.in_(self.severities),
+                FieldDriftReport.created_at >= cutoff,
+            )
+            .order_by(FieldDriftReport.created_at)
+            .all()
+        )
+        buffers: dict[Key, deque[datetime]] = {}
+        for agent_id, model_name, severity, created_at in rows:
+            buffers.setdefault((agent_id, model_name, severity), deque()).append(created_at)
+        with self._lock:
+            self._buffers = buffers
+            self.ready = True
+        logger.info("[Escalation] Warm-loaded %d report(s) into %d window(s)", len(rows), len(buffers))
+        return len(rows)
+
+
+_counter: SlidingWindowCounter | None = None
+_counter_lock = threading.Lock()
+
+
+def get_escalation_counter() -> SlidingWindowCounter:
+    """Process-wide counter sized by ``DriftDecisionEngine``'s escalation window."""
+    global _counter
+    if _counter is None:
+        with _counter_lock:
+            if _counter is None:
+                from app.services.drift_decision_engine import DriftDecisionEngine
+                _counter = SlidingWindowCounter(
+                    timedelta(hours=DriftDecisionEngine.MEDIUM_ESCALATION_WINDOW_HOURS)
+                )
+    return _counter
@@ -5,12 +5,20 @@ remote field applications (e.g. keti-veritas).
 """
 
 import hashlib
+import json
 import uuid
 from datetime import datetime
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.models import FieldAgent, FieldDriftReport
+from app.services.escalation_counter import get_escalation_counter
+
+# Namespace for report IDs derived from idempotency keys (uuid5)
+REPORT_ID_NAMESPACE = uuid.UUID("5b0f6f0e-6b4a-4f4e-9a51-2d1f3c7e8a90")
+# SQLite bound-parameter limit is 999; stay well below for IN (...) lookups
+_IN_CHUNK = 500
 
 
 def hash_api_key(raw_key: str) -> str:
@@ -82,6 +90,16 @@ def heartbeat(db: Session, app_id: str) -> FieldAgent | None:
     return agent
 
 
+def _report_fields(report_json: dict) -> dict:
+    """Indexed columns extracted from a DriftReport payload."""
+    drift = report_json.get("drift", {})
+    return {
+        "severity": drift.get("severity", "low"),
+        "model_name": drift.get("model_name"),
+        "drift_overall": drift.get("scores", {}).get("overall"),
+    }
+
+
 def receive_drift_report(
     db: Session,
     *,
@@ -89,26 +107,102 @@ def receive_drift_report(
     report_json: dict,
 ) -> FieldDriftReport:
     """Persist a drift report from a field agent."""
-    drift = report_json.get("drift", {})
-    severity = drift.get("severity", "low")
-    model_name = drift.get("model_name")
-    overall = drift.get("scores", {}).get("overall")
-
     report = FieldDriftReport(
         id=str(uuid.uuid4()),
         agent_id=agent_id,
         report_json=report_json,
-        severity=severity,
-        model_name=model_name,
-        drift_overall=overall,
         status="received",
+        **_report_fields(report_json),
     )
     db.add(report)
     db.commit()
     db.refresh(report)
+    get_escalation_counter().record(report.agent_id, report.model_name, report.severity, report.created_at)
     return report
 
 
+def report_id_for(agent_id: str, report_json: dict, idempotency_key: str | None = None) -> str:
+    """Deterministic report ID so retried uploads map to the same row.
+
+    The key is, in order: the explicit ``idempotency_key``, the payload's own
+    ``report_id`` / ``id``, or a hash of the canonical payload.
+    """
+    key = idempotency_key or report_json.get("report_id") or report_json.get("id")
+    if not key:
+        canonical = json.dumps(report_json, sort_keys=True, separators=(",", ":"), default=str)
+        key = hashlib.sha256(canonical.encode()).hexdigest()
+    return str(uuid.uuid5(REPORT_ID_NAMESPACE, f"{agent_id}:{key}"))
+
+
+def existing_report_ids(db: Session, report_ids: list[str]) -> set[str]:
+    """Subset of ``report_ids`` already stored (chunked ``IN`` lookups)."""
+    found: set[str] = set()
+    for start in range(0, len(report_ids), _IN_CHUNK):
+        chunk = report_ids[start:start + _IN_CHUNK]
+        found.update(
+            rid for (rid,) in db.query(FieldDriftReport.id).filter(FieldDriftReport.id.in_(chunk))
+        )
+    return found
+
+
+def receive_drift_reports(
+    db: Session,
+    items: list[tuple[str, dict, str | None]],
+) -> dict:
+    """Persist a batch of drift reports in one transaction.
+
+    Args:
+        items: ``(agent_id, report_json, idempotency_key)`` tuples in arrival order
+
+    Returns:
+        ``{"rows": [...inserted row dicts...], "duplicates": [report ids]}``.
+        Reports whose ID already exists (or repeats within the batch) are
+        skipped, so a retried upload never creates duplicates.
+    """
+    rows: list[dict] = []
+    duplicates: list[str] = []
+    seen: set[str] = set()
+    now = datetime.utcnow()
+    for agent_id, report_json, idempotency_key in items:
+        report_id = report_id_for(agent_id, report_json, idempotency_key)
+        if report_id in seen:
+            duplicates.append(report_id)
+            continue
+        seen.add(report_id)
+        rows.append({
+            "id": report_id,
+            "agent_id": agent_id,
+            "report_json": report_json,
+            "status": "received",
+            "action_taken": None,
+            "created_at": now,
+            **_report_fields(report_json),
+        })
+
+    # A concurrent retry of the same upload can win the race between the
+    # existence check and the INSERT; re-check once on a key conflict.
+    for attempt in range(2):
+        stored = existing_report_ids(db, [r["id"] for r in rows])
+        if stored:
+            duplicates.extend(r["id"] for r in rows if r["id"] in stored)
+            rows = [r for r in rows if r["id"] not in stored]
+        if not rows:
+            break
+        try:
+            # Single executemany INSERT + one commit for the whole batch
+            db.execute(FieldDriftReport.__table__.insert(), rows)
+            db.commit()
+            counter = get_escalation_counter()
+            for row in rows:
+                counter.record(row["agent_id"], row["model_name"], row["severity"], row["created_at"])
+            break
+        except IntegrityError:
+            db.rollback()
+            if attempt:
+                raise
+    return {"rows": rows, "duplicates": duplicates}
+
+
 def list_agents(db: Session) -> list[FieldAgent]:
     return db.query(FieldAgent).order_by(FieldAgent.created_at.desc()).all()
 
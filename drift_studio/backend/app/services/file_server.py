@@ -0,0 +1,280 @@
+"""File serving for ``GET /files/raw`` — confined paths, validation, ranges.
+
+- Paths are resolved (symlinks included) and must lie under an allowed
+  root: the dataset store, ``WORKSPACES_ROOT`` and any extra roots in
+  ``DD_FILES_ROOTS`` (``os.pathsep`` separated).
+- Strong ``ETag`` (mtime + size) and ``Last-Modified``; ``If-None-Match`` /
+  ``If-Modified-Since`` answer ``304`` without touching the file body.
+- Single byte ranges (``206`` / ``416``, ``If-Range`` honoured) so media
+  seeking only fetches what the player asks for.
+- The body is sent with the ASGI zero-copy extension (``sendfile``) when
+  the server offers it, otherwise streamed with ``os.pread`` in a thread.
+- Images can be served as cached downscaled variants (``max_width``),
+  and text-like files are gzip-compressed when the client accepts it.
+"""
+
+from __future__ import annotations
+
+import email.utils
+import hashlib
+import mimetypes
+import os
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+from urllib.parse import quote
+
+import anyio
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from app.services.dvc_service import BASE_DATA_DIR
+
+CHUNK_SIZE = 256 * 1024
+
+# Downscaled variants snap to these widths so the cache stays bounded
+VARIANT_WIDTHS = (64, 128, 256, 512, 1024, 2048)
+VARIANT_CACHE_DIR = Path(os.getenv("DD_FILE_VARIANT_CACHE", ".cache/file_variants"))
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp", ".bmp", ".tif", ".tiff", ".gif"}
+
+# Compressed on the fly when the client accepts gzip (media is already compressed)
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/xml", "application/javascript")
+MAX_GZIP_BYTES = 64 * 1024 * 1024
+
+
+def allowed_roots() -> list[Path]:
+    roots = [BASE_DATA_DIR, os.getenv("WORKSPACES_ROOT", "/workspaces")]
+    roots += [r for r in os.getenv("DD_FILES_ROOTS", "").split(os.pathsep) if r]
+    return [Path(os.path.realpath(r)) for r in roots]
+
+
+def resolve_served_path(path: str) -> Path:
+    """Resolve ``path`` and make sure it is a regular file under an allowed root.
+
+    Raises:
+        PermissionError: Path escapes every allowed root.
+        FileNotFoundError: Path does not exist or is not a regular file.
+    """
+    if not path or "\x00" in path:
+        raise FileNotFoundError(path)
+    real = Path(os.path.realpath(path))
+    if not any(real == root or root in real.parents for root in allowed_roots()):
+        raise PermissionError(path)
+    if not real.is_file():
+        raise FileNotFoundError(path)
+    return real
+
+
+@dataclass
+class FileInfo:
+    path: Path
+    size: int
+    mtime: float
+    etag: str
+    media_type: str
+
+    @classmethod
+    def of(cls, path: Path, media_type: str | None = None, tag: str = "") -> "FileInfo":
+        st = path.stat()
+        etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}{tag}"'
+        media_type = media_type or mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        return cls(path, st.st_size, st.st_mtime, etag, media_type)
+
+    @property
+    def last_modified(self) -> str:
+        return email.utils.formatdate(self.mtime, usegmt=True)
+
+
+def gzip_etag(etag: str) -> str:
+    return etag[:-1] + '-gz"'
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    tags = {t.strip().removeprefix("W/") for t in header.split(",")}
+    return etag in tags or gzip_etag(etag) in tags
+
+
+def not_modified(info: FileInfo, headers) -> bool:
+    """Evaluate ``If-None-Match`` (preferred) or ``If-Modified-Since``."""
+    inm = headers.get("if-none-match")
+    if inm is not None:
+        return _etag_matches(inm, info.etag)
+    ims = headers.get("if-modified-since")
+    if ims:
+        try:
+            since = email.utils.parsedate_to_datetime(ims).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(info.mtime) <= since
+    return False
+
+
+def parse_range(header: str | None, size: int) -> Optional[tuple[int, int]]:
+    """Parse a single ``bytes=`` range into an inclusive ``(start, end)``.
+
+    Returns ``None`` for absent, malformed or multi-range headers (the
+    full body is sent then).
+
+    Raises:
+        ValueError: The range is not satisfiable (``416``).
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start_s, sep, end_s = header[6:].strip().partition("-")
+    if not sep:
+        return None
+    if not start_s:
+        if not end_s.isdigit():
+            return None
+        length = int(end_s)
+        if length == 0 or size == 0:
+            raise ValueError(f"range {header} not satisfiable for {size} bytes")
+        return max(size - length, 0), size - 1
+    if not start_s.isdigit() or (end_s and not end_s.isdigit()):
+        return None
+    start = int(start_s)
+    if end_s and int(end_s) < start:
+        return None
+    if start >= size:
+        raise ValueError(f"range {header} not satisfiable for {size} bytes")
+    end = int(end_s) if end_s else size - 1
+    return start, min(end, size - 1)
+
+
+def wants_gzip(info: FileInfo, headers) -> bool:
+    return (
+        info.media_type.startswith(COMPRESSIBLE_TYPES)
+        and info.size <= MAX_GZIP_BYTES
+        and "gzip" in headers.get("accept-encoding", "")
+        and "range" not in headers
+    )
+
+
+def image_variant(source: Path, max_width: int, accept: str = "") -> tuple[Path, str]:
+    """Downscaled copy of ``source`` (cached on disk); returns ``(path, media_type)``.
+
+    The width snaps up to the next ``VARIANT_WIDTHS`` step. WebP is used
+    when the client accepts it, otherwise JPEG (PNG for images with alpha).
+    """
+    from PIL import Image
+
+    width = next((w for w in VARIANT_WIDTHS if w >= max_width), VARIANT_WIDTHS[-1])
+    st = source.stat()
+    with Image.open(source) as img:
+        if img.width <= width:
+            return source, mimetypes.guess_type(source.name)[0] or "application/octet-stream"
+        has_alpha = img.mode in ("RGBA", "LA", "P")
+        fmt = "WEBP" if "image/webp" in accept else ("PNG" if has_alpha else "JPEG")
+        key = hashlib.sha1(f"{source}|{st.st_mtime_ns}|{st.st_size}|{width}|{fmt}".encode()).hexdigest()
+        target = VARIANT_CACHE_DIR / key[:2] / f"{key}.{fmt.lower()}"
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            img.draft("RGB", (width, width * img.height // img.width))
+            img.thumbnail((width, img.height))
+            if fmt == "JPEG" and img.mode != "RGB":
+                img = img.convert("RGB")
+            tmp = target.with_suffix(f".{os.getpid()}.tmp")
+            img.save(tmp, format=fmt, quality=85)
+            os.replace(tmp, target)
+    return target, f"image/{fmt.lower()}"
+
+
+def is_image(path: Path) -> bool:
+    return path.suffix.lower() in IMAGE_SUFFIXES
+
+
+class ServedFileResponse(Response):
+    """``FileResponse`` replacement with range, validation and zero-copy send."""
+
+    def __init__(
+        self,
+        info: FileInfo,
+        *,
+        byte_range: Optional[tuple[int, int]] = None,
+        gzip: bool = False,
+        head: bool = False,
+        filename: str | None = None,
+        vary: Iterable[str] = (),
+    ):
+        self.info = info
+        self.byte_range = byte_range
+        self.gzip = gzip
+        self.head = head
+        self.background = None
+        self.status_code = 206 if byte_range else 200
+        self.media_type = info.media_type
+
+        headers = {
+            "accept-ranges": "bytes",
+            "etag": info.etag,
+            "last-modified": info.last_modified,
+            "cache-control": "no-cache",
+        }
+        if filename:
+            headers["content-disposition"] = f"inline; filename*=utf-8''{quote(filename)}"
+        vary = list(vary) + (["Accept-Encoding"] if info.media_type.startswith(COMPRESSIBLE_TYPES) else [])
+        if vary:
+            headers["vary"] = ", ".join(vary)
+        if gzip:
+            # No content-length: the compressed size is unknown until the
+            # body is streamed, so the response goes out chunked
+            headers["content-encoding"] = "gzip"
+            headers["etag"] = gzip_etag(info.etag)
+        elif byte_range:
+            start, end = byte_range
+            headers["content-range"] = f"bytes {start}-{end}/{info.size}"
+            headers["content-length"] = str(end - start + 1)
+        else:
+            headers["content-length"] = str(info.size)
+        self.init_headers(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if self.head:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        start, end = self.byte_range or (0, self.info.size - 1)
+        count = max(end - start + 1, 0)
+        extensions = scope.get("extensions") or {}
+        with open(self.info.path, "rb") as f:
+            fd = f.fileno()
+            if self.gzip:
+                await self._send_gzip(fd, send)
+            elif "http.response.zerocopysend" in extensions and count:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": fd, "offset": start, "count": count, "more_body": False,
+                })
+            else:
+                await self._send_chunks(fd, start, count, send)
+
+    async def _send_chunks(self, fd: int, offset: int, count: int, send: Send) -> None:
+        if not count:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        while count > 0:
+            chunk = await anyio.to_thread.run_sync(os.pread, fd, min(CHUNK_SIZE, count), offset)
+            if not chunk:  # file shrank underneath us
+                break
+            offset += len(chunk)
+            count -= len(chunk)
+            await send({"type": "http.response.body", "body": chunk, "more_body": count > 0})
+        if count > 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def _send_gzip(self, fd: int, send: Send) -> None:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        offset = 0
+        while True:
+            chunk = await anyio.to_thread.run_sync(os.pread, fd, CHUNK_SIZE, offset)
+            if not chunk:
+                break
+            offset += len(chunk)
+            out = compressor.compress(chunk)
+            if out:
+                await send({"type": "http.response.body", "body": out, "more_body": True})
+        await send({"type": "http.response.body", "body": compressor.flush(), "more_body": False})
@@ -5,21 +5,32 @@ After a training job completes and passes the quality gate, this service:
 2. Verifies integrity (SHA-256)
 3. Stores it in dd's local artifact store
 4. Pushes the model to the target field agent (keti-veritas)
+
+Fan-out to many agents runs concurrently on one pooled ``httpx.AsyncClient``
+(bounded by ``RolloutPolicy.max_concurrency``) with per-agent timeouts and
+retries, optionally as a canary + waves rollout. Per-agent progress is
+written to ``model_deployments`` in batches (every
+``STATUS_FLUSH_INTERVAL`` seconds and at the end) on a worker thread, so
+database commits never block the event loop.
 """
 
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
 import hashlib
 import logging
 import os
+import random
 import uuid
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
 import httpx
 from sqlalchemy.orm import Session
 
-from app.models import FieldAgent, TrainingJob
+from app.models import FieldAgent, ModelDeployment, TrainingJob
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +38,65 @@ logger = logging.getLogger(__name__)
 ARTIFACTS_DIR = Path(os.getenv("DD_ARTIFACTS_DIR", "/app/model_artifacts"))
 
 
+# Agent responses worth retrying (everything else non-200 is a rejection)
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+# Seconds between batched ``model_deployments`` status commits during a rollout
+STATUS_FLUSH_INTERVAL = float(os.getenv("DD_DEPLOY_STATUS_FLUSH", "0.5"))
+
+
+@dataclass
+class RolloutPolicy:
+    """How a model is fanned out to field agents.
+
+    Attributes:
+        max_concurrency: Agents deployed to at once (also the connection pool size).
+        timeout: Seconds per attempt per agent.
+        retries: Extra attempts after a network error / timeout / retryable status.
+        backoff: Base delay in seconds; attempt ``n`` waits ``backoff * 2**n`` (+ jitter).
+        canary: Agents deployed first; any canary failure halts the rollout.
+        wave_size: Agents per wave after the canary (0 = all remaining at once).
+        max_failure_ratio: Halt before the next wave when a wave's failure ratio exceeds this.
+    """
+
+    max_concurrency: int = 16
+    timeout: float = 30.0
+    retries: int = 2
+    backoff: float = 0.5
+    canary: int = 0
+    wave_size: int = 0
+    max_failure_ratio: float = 1.0
+
+    @classmethod
+    def from_env(cls, **overrides) -> "RolloutPolicy":
+        """Defaults from ``DD_DEPLOY_*`` env vars; ``None`` overrides are ignored."""
+        policy = cls(
+            max_concurrency=int(os.getenv("DD_DEPLOY_CONCURRENCY", "16")),
+            timeout=float(os.getenv("DD_DEPLOY_TIMEOUT", "30")),
+            retries=int(os.getenv("DD_DEPLOY_RETRIES", "2")),
+            backoff=float(os.getenv("DD_DEPLOY_BACKOFF", "0.5")),
+            canary=int(os.getenv("DD_DEPLOY_CANARY", "0")),
+            wave_size=int(os.getenv("DD_DEPLOY_WAVE_SIZE", "0")),
+            max_failure_ratio=float(os.getenv("DD_DEPLOY_MAX_FAILURE_RATIO", "1.0")),
+        )
+        for key, value in overrides.items():
+            if value is not None:
+                setattr(policy, key, value)
+        return policy
+
+    def waves(self, agents: list[FieldAgent]) -> list[list[FieldAgent]]:
+        """Split agents into canary + waves (order preserved)."""
+        waves = []
+        rest = list(agents)
+        if self.canary > 0:
+            waves.append(rest[: self.canary])
+            rest = rest[self.canary:]
+        size = self.wave_size if self.wave_size > 0 else len(rest)
+        for i in range(0, len(rest), max(size, 1)):
+            waves.append(rest[i:i + size])
+        return waves
+
+
 class ModelDeploymentService:
     """Manages model artifact storage and deployment to field agents."""
 
@@ -90,20 +160,8 @@ class ModelDeploymentService:
         if not agent.api_base_url:
             return {"status": "error", "detail": "Agent has no api_base_url"}
 
-        deploy_url = f"{agent.api_base_url.rstrip('/')}/api/v1/models/deploy"
-
-        payload = {
-            "model": artifact_meta,
-            "source": {
-                "dd_instance": "drift-studio",
-                "training_job_id": training_job.id,
-                "drift_report_id": training_job.drift_report_id,
-            },
-            "deployment": {
-                "strategy": "blue_green",
-                "rollback_version": _get_current_version(artifact_meta.get("model_name")),
-            },
-        }
+        deploy_url = _deploy_url(agent)
+        payload = _deploy_payload(artifact_meta, training_job)
 
         try:
             with httpx.Client(timeout=30) as client:
@@ -151,11 +209,13 @@ class ModelDeploymentService:
         artifact_meta: dict,
         training_job: TrainingJob,
         target_app_id: str | None = None,
+        policy: RolloutPolicy | None = None,
     ) -> list[dict]:
         """Deploy model to one or all field agents.
 
         If target_app_id is specified, deploy only to that agent.
-        Otherwise, deploy to all active agents that support 'model_receive'.
+        Otherwise, deploy to all active agents that support 'model_receive'
+        (concurrently, see ``RolloutPolicy``).
         """
         if target_app_id:
             agent = (
@@ -165,21 +225,278 @@ class ModelDeploymentService:
             )
             if not agent:
                 return [{"status": "error", "detail": f"Agent not found: {target_app_id}"}]
-            return [self.deploy_to_field_agent(
-                db, agent=agent, artifact_meta=artifact_meta, training_job=training_job,
-            )]
+            return self.rollout(
+                db, agents=[agent], artifact_meta=artifact_meta, training_job=training_job, policy=policy,
+            )
 
         # Deploy to all active agents with model_receive capability
-        agents = db.query(FieldAgent).filter(FieldAgent.status == "active").all()
-        results = []
-        for agent in agents:
-            caps = agent.capabilities or []
-            if "model_receive" in caps:
-                result = self.deploy_to_field_agent(
-                    db, agent=agent, artifact_meta=artifact_meta, training_job=training_job,
+        agents = (
+            db.query(FieldAgent)
+            .filter(FieldAgent.status == "active")
+            .order_by(FieldAgent.app_id)
+            .all()
+        )
+        agents = [a for a in agents if "model_receive" in (a.capabilities or [])]
+        return self.rollout(
+            db, agents=agents, artifact_meta=artifact_meta, training_job=training_job, policy=policy,
+        )
+
+    def rollout(
+        self,
+        db: Session,
+        *,
+        agents: list[FieldAgent],
+        artifact_meta: dict,
+        training_job: TrainingJob,
+        policy: RolloutPolicy | None = None,
+    ) -> list[dict]:
+        """Deploy to ``agents`` concurrently according to ``policy``.
+
+        Blocks until the rollout finishes. Safe to call from sync endpoints
+        and from inside a running event loop (runs on a helper thread then).
+
+        Returns:
+            One result dict per agent (same shape as ``deploy_to_field_agent``
+            plus ``rollout_id``, ``deployment_id``, ``wave`` and ``attempts``).
+        """
+        if not agents:
+            return []
+        policy = policy or RolloutPolicy.from_env()
+        coro = _Rollout(db, policy, artifact_meta, training_job).run(agents)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, coro).result()
+
+
+@dataclass(frozen=True)
+class _Target:
+    """Agent fields a rollout needs, read once so no ORM state is touched off-thread."""
+
+    id: str
+    app_id: str
+    api_base_url: str | None
+
+
+class _Rollout:
+    """One fan-out run: shared client, semaphore and DB status rows.
+
+    Status changes are queued in ``_pending`` on the event loop and written
+    by ``_flusher`` on a worker thread. After ``_create_rows`` the ORM objects
+    (and the session) are only touched by that thread, one flush at a time.
+    """
+
+    def __init__(self, db: Session, policy: RolloutPolicy, artifact_meta: dict, training_job: TrainingJob):
+        self.db = db
+        self.policy = policy
+        self.artifact_meta = artifact_meta
+        self.training_job = training_job
+        self.rollout_id = str(uuid.uuid4())
+        self.payload = _deploy_payload(artifact_meta, training_job)
+        self._rows: dict[str, ModelDeployment] = {}
+        self._pending: dict[str, dict] = {}
+
+    async def run(self, agents: list[FieldAgent]) -> list[dict]:
+        agents = [_Target(a.id, a.app_id, a.api_base_url) for a in agents]
+        waves = self.policy.waves(agents)
+        slots = self._create_rows(waves)
+        results: dict[str, dict] = {}
+        limits = httpx.Limits(
+            max_connections=self.policy.max_concurrency,
+            max_keepalive_connections=self.policy.max_concurrency,
+        )
+        semaphore = asyncio.Semaphore(self.policy.max_concurrency)
+        halted: str | None = None
+        done = asyncio.Event()
+        flusher = asyncio.create_task(self._flusher(done))
+
+        try:
+            async with httpx.AsyncClient(limits=limits, timeout=self.policy.timeout) as client:
+                for index, wave in enumerate(waves):
+                    if halted:
+                        for agent in wave:
+                            results[agent.id] = self._finish(
+                                slots[agent.id], agent, {"status": "skipped", "detail": halted}, attempts=0,
+                            )
+                        continue
+                    outcomes = await asyncio.gather(*(
+                        self._deploy_one(client, semaphore, agent, slots[agent.id]) for agent in wave
+                    ))
+                    failed = 0
+                    for agent, outcome in zip(wave, outcomes):
+                        results[agent.id] = outcome
+                        failed += outcome["status"] != "deployed"
+                    is_canary = self.policy.canary > 0 and index == 0
+                    if is_canary and failed:
+                        halted = f"rollout halted: {failed} canary deployment(s) failed"
+                    elif wave and failed / len(wave) > self.policy.max_failure_ratio:
+                        halted = f"rollout halted: wave {index} failure ratio {failed}/{len(wave)}"
+                    if halted:
+                        logger.warning("[Deploy] %s (rollout=%s)", halted, self.rollout_id)
+        finally:
+            done.set()
+            await flusher
+
+        deployed = sum(r["status"] == "deployed" for r in results.values())
+        logger.info(
+            "[Deploy] Rollout %s: %s v%s → %d/%d agent(s) deployed",
+            self.rollout_id, self.artifact_meta.get("model_name"), self.artifact_meta.get("version"),
+            deployed, len(agents),
+        )
+        return [results[a.id] for a in agents]
+
+    def _create_rows(self, waves: list[list[_Target]]) -> dict[str, dict]:
+        """Insert one pending row per agent; returns ``{agent_id: {deployment_id, wave}}``."""
+        slots = {}
+        for index, wave in enumerate(waves):
+            for agent in wave:
+                row = ModelDeployment(
+                    id=str(uuid.uuid4()),
+                    rollout_id=self.rollout_id,
+                    training_job_id=self.training_job.id,
+                    agent_id=agent.id,
+                    agent_app_id=agent.app_id,
+                    model_name=self.artifact_meta.get("model_name"),
+                    version=self.artifact_meta.get("version"),
+                    wave=index,
+                    status="pending",
+                    attempts=0,
                 )
-                results.append(result)
-        return results
+                self._rows[agent.id] = row
+                slots[agent.id] = {"agent_id": agent.id, "deployment_id": row.id, "wave": index}
+        self.db.add_all(self._rows.values())
+        self.db.commit()
+        return slots
+
+    def _update(self, slot: dict, **fields) -> None:
+        """Queue a status change for the next batched commit."""
+        self._pending.setdefault(slot["agent_id"], {}).update(fields)
+
+    async def _flusher(self, done: asyncio.Event) -> None:
+        """Commit queued status changes every ``STATUS_FLUSH_INTERVAL`` and once more at the end."""
+        finished = False
+        while not finished:
+            try:
+                await asyncio.wait_for(done.wait(), timeout=STATUS_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            # Nothing is queued once ``done`` is set, so this pass is the last
+            finished = done.is_set()
+            if self._pending:
+                batch, self._pending = self._pending, {}
+                await asyncio.to_thread(self._write, batch)
+
+    def _write(self, batch: dict[str, dict]) -> None:
+        for agent_id, fields in batch.items():
+            row = self._rows[agent_id]
+            for key, value in fields.items():
+                setattr(row, key, value)
+        try:
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.warning("[Deploy] Status update failed for %d deployment(s): %s", len(batch), e)
+
+    def _finish(self, slot: dict, agent: _Target, outcome: dict, attempts: int) -> dict:
+        self._update(
+            slot,
+            status=outcome["status"],
+            status_code=outcome.get("status_code"),
+            detail=(outcome.get("detail") or "")[:500] or None,
+            response_json=outcome.get("response"),
+            completed_at=datetime.utcnow(),
+        )
+        return {
+            **outcome,
+            "agent_id": agent.id,
+            "agent_app_id": agent.app_id,
+            "rollout_id": self.rollout_id,
+            "deployment_id": slot["deployment_id"],
+            "wave": slot["wave"],
+            "attempts": attempts,
+        }
+
+    async def _deploy_one(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        agent: _Target,
+        slot: dict,
+    ) -> dict:
+        if not agent.api_base_url:
+            return self._finish(slot, agent, {"status": "error", "detail": "Agent has no api_base_url"}, attempts=0)
+
+        attempts = 0
+        async with semaphore:
+            self._update(slot, status="deploying", started_at=datetime.utcnow())
+            outcome: dict = {}
+            for attempt in range(self.policy.retries + 1):
+                if attempt:
+                    delay = self.policy.backoff * 2 ** (attempt - 1)
+                    await asyncio.sleep(delay + random.uniform(0, delay / 2))
+                attempts = attempt + 1
+                self._update(slot, attempts=attempts)
+                outcome = await self._attempt(client, agent)
+                if not outcome.pop("retryable", False):
+                    break
+
+        if outcome["status"] == "deployed":
+            logger.info(
+                "[Deploy] Model pushed to %s: %s v%s",
+                agent.app_id, self.artifact_meta.get("model_name"), self.artifact_meta.get("version"),
+            )
+        else:
+            logger.warning(
+                "[Deploy] Deployment to %s %s after %d attempt(s): %s",
+                agent.app_id, outcome["status"], attempts, (outcome.get("detail") or "")[:200],
+            )
+        return self._finish(slot, agent, outcome, attempts)
+
+    async def _attempt(self, client: httpx.AsyncClient, agent: _Target) -> dict:
+        try:
+            resp = await asyncio.wait_for(
+                client.post(_deploy_url(agent), json=self.payload, headers=_agent_auth_headers(agent)),
+                timeout=self.policy.timeout,
+            )
+        except (asyncio.TimeoutError, httpx.TimeoutException):
+            return {"status": "error", "detail": f"timed out after {self.policy.timeout}s", "retryable": True}
+        except httpx.HTTPError as e:
+            return {"status": "error", "detail": str(e) or type(e).__name__, "retryable": True}
+
+        if resp.status_code == 200:
+            try:
+                body = resp.json()
+            except ValueError:
+                body = {"raw": resp.text[:500]}
+            return {"status": "deployed", "response": body}
+        return {
+            "status": "rejected",
+            "status_code": resp.status_code,
+            "detail": resp.text[:500],
+            "retryable": resp.status_code in RETRYABLE_STATUS,
+        }
+
+
+def _deploy_url(agent: FieldAgent) -> str:
+    return f"{agent.api_base_url.rstrip('/')}/api/v1/models/deploy"
+
+
+def _deploy_payload(artifact_meta: dict, training_job: TrainingJob) -> dict:
+    """ModelPackage request body sent to a field agent's deploy endpoint."""
+    return {
+        "model": artifact_meta,
+        "source": {
+            "dd_instance": "drift-studio",
+            "training_job_id": training_job.id,
+            "drift_report_id": training_job.drift_report_id,
+        },
+        "deployment": {
+            "strategy": "blue_green",
+            "rollback_version": _get_current_version(artifact_meta.get("model_name")),
+        },
+    }
 
 
 def _agent_auth_headers(agent: FieldAgent) -> dict:
@@ -0,0 +1,165 @@
+"""Retention / rollup job for field drift reports.
+
+Keeps ``field_drift_reports`` bounded: reports older than the retention
+period are folded into daily ``field_drift_report_rollups`` rows
+(count, overall score sum / max per agent + model + severity + day) and
+then deleted. Reports referenced by a ``TrainingJob`` are kept so the
+training audit trail stays intact. Retention is never shorter than the
+escalation window, so escalation counts are unaffected.
+
+Each chunk is rolled up and deleted in one transaction, so an
+interrupted run never double-counts.
+
+Environment:
+- ``DD_REPORT_RETENTION_DAYS`` (default 30)
+- ``DD_REPORT_RETENTION_INTERVAL_HOURS`` (default 6; ``0`` disables the
+  background scheduler)
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.models import FieldDriftReport, FieldDriftReportRollup, TrainingJob
+from app.services.drift_decision_engine import DriftDecisionEngine
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 500
+
+
+def retention_days() -> int:
+    return int(os.getenv("DD_REPORT_RETENTION_DAYS", "30"))
+
+
+def _rollup_id(agent_id: str, model_name: str | None, severity: str | None, day: str) -> str:
+    return f"{agent_id}|{model_name or ''}|{severity or ''}|{day}"
+
+
+def rollup_and_prune(db: Session, days: int | None = None, chunk_size: int = CHUNK_SIZE) -> dict:
+    """Roll up and delete reports older than ``days``.
+
+    Returns:
+        ``{"cutoff", "deleted", "rollups"}``
+    """
+    days = retention_days() if days is None else days
+    window = timedelta(hours=DriftDecisionEngine.MEDIUM_ESCALATION_WINDOW_HOURS)
+    cutoff = datetime.utcnow() - max(timedelta(days=days), window)
+    referenced = (
+        db.query(TrainingJob.drift_report_id)
+        .filter(TrainingJob.drift_report_id.isnot(None))
+    )
+
+    deleted = 0
+    touched: set[str] = set()
+    while True:
+        rows = (
+            db.query(
+                FieldDriftReport.id,
+                FieldDriftReport.agent_id,
+                FieldDriftReport.model_name,
+                FieldDriftReport.severity,
+                FieldDriftReport.drift_overall,
+                FieldDriftReport.created_at,
+            )
+            .filter(
+                FieldDriftReport.created_at < cutoff,
+                FieldDriftReport.id.notin_(referenced),
+            )
+            .order_by(FieldDriftReport.created_at)
+            .limit(chunk_size)
+            .all()
+        )
+        if not rows:
+            break
+
+        groups: dict[str, dict] = {}
+        for _, agent_id, model_name, severity, overall, created_at in rows:
+            day = created_at.strftime("%Y-%m-%d") if created_at else "unknown"
+            rid = _rollup_id(agent_id, model_name, severity, day)
+            g = groups.setdefault(rid, {
+                "agent_id": agent_id, "model_name": model_name, "severity": severity, "day": day,
+                "count": 0, "sum": 0.0, "n": 0, "max": None,
+            })
+            g["count"] += 1
+            if overall is not None and math.isfinite(overall):
+                g["sum"] += overall
+                g["n"] += 1
+                g["max"] = overall if g["max"] is None else max(g["max"], overall)
+
+        existing = {
+            r.id: r for r in db.query(FieldDriftReportRollup).filter(FieldDriftReportRollup.id.in_(list(groups)))
+        }
+        for rid, g in groups.items():
+            rollup = existing.get(rid)
+            if rollup is None:
+                rollup = FieldDriftReportRollup(
+                    id=rid, agent_id=g["agent_id"], model_name=g["model_name"], severity=g["severity"],
+                    day=g["day"], report_count=0, overall_sum=0.0, overall_count=0, overall_max=None,
+                )
+                db.add(rollup)
+            rollup.report_count += g["count"]
+            rollup.overall_sum += g["sum"]
+            rollup.overall_count += g["n"]
+            if g["max"] is not None:
+                rollup.overall_max = g["max"] if rollup.overall_max is None else max(rollup.overall_max, g["max"])
+
+        db.query(FieldDriftReport).filter(
+            FieldDriftReport.id.in_([r[0] for r in rows])
+        ).delete(synchronize_session=False)
+        db.commit()
+        deleted += len(rows)
+        touched.update(groups)
+        if len(rows) < chunk_size:
+            break
+
+    if deleted:
+        logger.info("[Retention] Rolled up %d report(s) older than %s into %d rollup(s)", deleted, cutoff, len(touched))
+    return {"cutoff": cutoff.isoformat(), "deleted": deleted, "rollups": len(touched)}
+
+
+class RetentionScheduler:
+    """Daemon thread running ``rollup_and_prune`` every ``interval_hours``."""
+
+    def __init__(self, session_factory, interval_hours: float):
+        self.session_factory = session_factory
+        self.interval = interval_hours * 3600
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            db = self.session_factory()
+            try:
+                rollup_and_prune(db)
+                from app.services.escalation_counter import get_escalation_counter
+                get_escalation_counter().prune()
+            except Exception as e:
+                db.rollback()
+                logger.warning("[Retention] Run failed: %s", e)
+            finally:
+                db.close()
+            self._stop.wait(self.interval)
+
+    def start(self) -> "RetentionScheduler":
+        if self.interval > 0 and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="report-retention", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+def start_retention_scheduler(session_factory) -> RetentionScheduler | None:
+    """Start the background job unless ``DD_REPORT_RETENTION_INTERVAL_HOURS`` is 0."""
+    interval = float(os.getenv("DD_REPORT_RETENTION_INTERVAL_HOURS", "6"))
+    if interval <= 0:
+        return None
+    return RetentionScheduler(session_factory, interval).start()
@@ -0,0 +1,43 @@
+"""Pytest setup for the drift_studio backend tests.
+
+Run from ``drift_studio/backend`` (``python -m pytest tests``). The
+backend is not an installed package, so make ``app`` importable from
+any working directory.
+"""
+import sys as _sys
+from pathlib import Path as _Path
+
+import pytest
+
+_sys.path.insert(0, str(_Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def db_factory():
+    """Factory of sessions, each on its own in-memory SQLite database"""
+    sqlalchemy = pytest.importorskip("sqlalchemy")
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from app.database import Base
+
+    opened = []
+
+    def make():
+        engine = sqlalchemy.create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool,
+        )
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        opened.append((engine, session))
+        return session
+
+    yield make
+    for engine, session in opened:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def db(db_factory):
+    return db_factory()
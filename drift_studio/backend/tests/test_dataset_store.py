@@ -0,0 +1,25 @@
+"""
+Tests for CSV → parquet conversion (app/services/dataset_store.py)
+"""
+import io
+
+import pyarrow.parquet as pq
+
+from app.services import dataset_store
+from app.services.dataset_store import DatasetStore
+
+
+def test_type_conflict_widens_only_that_column(tmp_path, monkeypatch):
+    # Small blocks, so the bad cells land after the block types are inferred from
+    monkeypatch.setattr(dataset_store, "BLOCK_SIZE", 4096)
+    rows = ["id,score,count,name"] + [f"{i},{i * 0.5},{i},n{i}" for i in range(2000)]
+    rows += ["2000,oops,2.5,n2000"]
+    store = DatasetStore(root=tmp_path)
+    path = tmp_path / "t.parquet"
+
+    stats = store._convert_csv(io.BytesIO("\n".join(rows).encode()), path)
+
+    types = {field.name: str(field.type) for field in pq.read_schema(path)}
+    assert types == {"id": "int64", "score": "string", "count": "double", "name": "string"}
+    assert stats["rows"] == 2001
+    assert pq.read_table(path).column("score")[-1].as_py() == "oops"
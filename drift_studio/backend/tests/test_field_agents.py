@@ -0,0 +1,140 @@
+"""
+Tests for bulk drift report intake (app/routers/field_agents.py,
+app/services/field_agent_service.py) and batch decisions
+(app/services/drift_decision_engine.py)
+"""
+import json
+import uuid
+from datetime import timedelta
+
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("fastapi")
+pytest.importorskip("sqlalchemy")
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.models import FieldDriftReport, TrainerAgent  # noqa: E402
+from app.routers import field_agents  # noqa: E402
+from app.services import escalation_counter  # noqa: E402
+from app.services import field_agent_service as svc  # noqa: E402
+from app.services.drift_decision_engine import DriftDecisionEngine  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def counter(monkeypatch):
+    """Fresh process-wide escalation counter per test"""
+    fresh = escalation_counter.SlidingWindowCounter(
+        timedelta(hours=DriftDecisionEngine.MEDIUM_ESCALATION_WINDOW_HOURS)
+    )
+    monkeypatch.setattr(escalation_counter, "_counter", fresh)
+    return fresh
+
+
+@pytest.fixture
+def client(db, monkeypatch):
+    monkeypatch.delenv("DD_AUTO_TRIGGER", raising=False)
+    app = FastAPI()
+    app.include_router(field_agents.router)
+    app.dependency_overrides[field_agents.get_db] = lambda: db
+    return TestClient(app)
+
+
+def _report(report_id, severity="medium", model="alpr-v1", overall=0.4):
+    return {
+        "report_id": report_id,
+        "drift": {"severity": severity, "model_name": model, "scores": {"overall": overall}},
+    }
+
+
+def test_bulk_reupload_inserts_nothing_new(db, client):
+    agent = svc.register_agent(db, app_id="field-01")
+    batch = {
+        "app_id": "field-01",
+        "reports": [
+            {"report": _report("r1")},
+            {"report": _report("r2", severity="high")},
+            {"report": _report("r3"), "idempotency_key": "retry-3"},
+        ],
+    }
+
+    first = client.post("/field-agents/drift-reports/bulk", json=batch).json()
+    assert first["inserted"] == 3 and first["duplicates"] == []
+    expected = {
+        str(uuid.uuid5(svc.REPORT_ID_NAMESPACE, f"{agent.id}:{key}")) for key in ("r1", "r2", "retry-3")
+    }
+    assert set(first["report_ids"]) == expected
+
+    again = client.post("/field-agents/drift-reports/bulk", json=batch).json()
+    assert again["inserted"] == 0
+    assert sorted(again["duplicates"]) == sorted(expected)
+    assert db.query(FieldDriftReport).count() == 3
+
+
+def test_duplicates_within_a_batch_collapse(db, client):
+    svc.register_agent(db, app_id="field-01")
+    report = _report("same")
+    body = "\n".join([
+        '{"app_id": "field-01", "report": %s}' % json.dumps(report),
+        '{"app_id": "field-01", "report": %s}' % json.dumps(report),
+        '{"app_id": "field-01", "report": %s}' % json.dumps(_report(None, overall=0.9)),
+        '{"app_id": "field-01", "report": %s}' % json.dumps(_report(None, overall=0.9)),
+        '{"app_id": "unknown", "report": %s}' % json.dumps(report),
+    ])
+
+    result = client.post(
+        "/field-agents/drift-reports/bulk", content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    ).json()
+    # Same report_id, and identical payloads without one (payload hash)
+    assert result["inserted"] == 2
+    assert len(result["duplicates"]) == 2
+    assert [r["index"] for r in result["rejected"]] == [4]
+    assert db.query(FieldDriftReport).count() == 2
+
+
+SEQUENCE = [
+    ("medium", "alpr-v1"), ("low", "alpr-v1"), ("medium", "alpr-v1"), ("high", "yolo-v8"),
+    ("medium", "yolo-v8"), ("medium", "alpr-v1"), ("medium", "alpr-v1"), ("medium", "yolo-v8"),
+    ("medium", "other"), ("medium", "yolo-v8"), ("high", "other"),
+]
+
+
+@pytest.mark.parametrize("warm", [False, True], ids=["db_count", "counter"])
+def test_evaluate_batch_matches_per_report_evaluate(db_factory, counter, warm):
+    def setup():
+        session = db_factory()
+        session.add(TrainerAgent(id="t1", name="alpr-trainer", trainer_type="alpr",
+                                 api_base_url="http://trainer", status="active"))
+        session.commit()
+        agent = svc.register_agent(session, app_id="field-01")
+        return session, agent
+
+    def items(agent):
+        return [
+            (agent.id, _report(f"r{i}", severity=severity, model=model), None)
+            for i, (severity, model) in enumerate(SEQUENCE)
+        ]
+
+    engine = DriftDecisionEngine()
+    counter.ready = warm
+
+    # Per report: store one, evaluate it, store the next, ...
+    session, agent = setup()
+    single = []
+    for item in items(agent):
+        row = svc.receive_drift_reports(session, [item])["rows"][0]
+        report = session.get(FieldDriftReport, row["id"])
+        single.append(engine.evaluate(session, report).to_dict())
+
+    # Batch: store everything, then evaluate in arrival order
+    counter._buffers.clear()
+    session, agent = setup()
+    rows = svc.receive_drift_reports(session, items(agent))["rows"]
+    reports = [session.get(FieldDriftReport, row["id"]) for row in rows]
+    batch = [decision.to_dict() for decision in engine.evaluate_batch(session, reports)]
+
+    assert batch == single
+    assert {d["action"] for d in batch} == {"observe", "alert", "retrain"}
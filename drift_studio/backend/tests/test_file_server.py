@@ -0,0 +1,113 @@
+"""
+Tests for ``GET /files/raw`` (app/routers/files.py, app/services/file_server.py)
+"""
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("fastapi")
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.routers import files  # noqa: E402
+from app.services.file_server import CHUNK_SIZE  # noqa: E402
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setenv("DD_FILES_ROOTS", str(tmp_path))
+    app = FastAPI()
+    app.include_router(files.router)
+    return TestClient(app)
+
+
+@pytest.fixture
+def text_file(tmp_path):
+    path = tmp_path / "log.txt"
+    # Several read chunks, so the gzip body is streamed in pieces
+    path.write_bytes(b"".join(b"line %d: drift ok\n" % i for i in range(3 * CHUNK_SIZE // 16)))
+    return path
+
+
+def test_gzip_body_is_chunked_and_decodes_to_the_file(client, text_file):
+    resp = client.get("/files/raw", params={"path": str(text_file)}, headers={"Accept-Encoding": "gzip"})
+
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "content-length" not in resp.headers
+    assert resp.content == text_file.read_bytes()
+
+    head = client.head("/files/raw", params={"path": str(text_file)}, headers={"Accept-Encoding": "gzip"})
+    assert head.headers["content-encoding"] == "gzip"
+    assert "content-length" not in head.headers
+
+
+def test_identity_and_range_report_exact_lengths(client, text_file):
+    data = text_file.read_bytes()
+    plain = client.get("/files/raw", params={"path": str(text_file)}, headers={"Accept-Encoding": "identity"})
+    assert plain.headers["content-length"] == str(len(data))
+    assert plain.content == data
+
+    part = client.get("/files/raw", params={"path": str(text_file)}, headers={"Range": "bytes=10-19"})
+    assert part.status_code == 206
+    assert part.headers["content-length"] == "10"
+    assert part.content == data[10:20]
+
+
+@pytest.fixture
+def confined(tmp_path, monkeypatch):
+    """Client serving only ``tmp_path/served``, with a secret file next to it"""
+    root = tmp_path / "served"
+    root.mkdir()
+    (tmp_path / "secret.txt").write_text("outside")
+    monkeypatch.setenv("DD_FILES_ROOTS", str(root))
+    app = FastAPI()
+    app.include_router(files.router)
+    return TestClient(app), root
+
+
+def test_paths_outside_the_roots_are_forbidden(confined, tmp_path):
+    client, root = confined
+    (root / "inside.txt").write_text("inside")
+    (root / "link.txt").symlink_to(tmp_path / "secret.txt")
+    (root / "dir").symlink_to(tmp_path)
+
+    assert client.get("/files/raw", params={"path": str(root / "inside.txt")}).text == "inside"
+    for path in (
+        root / ".." / "secret.txt",
+        root / "link.txt",
+        root / "dir" / "secret.txt",
+    ):
+        assert client.get("/files/raw", params={"path": str(path)}).status_code == 403
+    assert client.get("/files/raw", params={"path": str(root / "missing.txt")}).status_code == 404
+
+
+def test_if_none_match_returns_not_modified(client, text_file):
+    first = client.get("/files/raw", params={"path": str(text_file)}, headers={"Accept-Encoding": "identity"})
+    etag = first.headers["etag"]
+
+    again = client.get("/files/raw", params={"path": str(text_file)}, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+
+    other = client.get("/files/raw", params={"path": str(text_file)},
+                       headers={"If-None-Match": '"stale"', "Accept-Encoding": "identity"})
+    assert other.status_code == 200
+
+
+def test_if_range_with_a_stale_etag_returns_the_full_body(client, text_file):
+    data = text_file.read_bytes()
+    etag = client.head("/files/raw", params={"path": str(text_file)},
+                       headers={"Accept-Encoding": "identity"}).headers["etag"]
+
+    fresh = client.get("/files/raw", params={"path": str(text_file)},
+                       headers={"Range": "bytes=0-9", "If-Range": etag})
+    assert fresh.status_code == 206
+    assert fresh.content == data[:10]
+
+    stale = client.get("/files/raw", params={"path": str(text_file)},
+                       headers={"Range": "bytes=0-9", "If-Range": '"stale"', "Accept-Encoding": "identity"})
+    assert stale.status_code == 200
+    assert "content-range" not in stale.headers
+    assert stale.content == data
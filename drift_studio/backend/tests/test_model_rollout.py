@@ -0,0 +1,131 @@
+"""
+Tests for concurrent model rollouts (app/services/model_deployment_service.py)
+
+Field agents are local stub HTTP servers; deployment rows go to an
+in-memory SQLite database.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("sqlalchemy")
+
+from app.models import FieldAgent, ModelDeployment, TrainingJob  # noqa: E402
+from app.services import model_deployment_service as mds  # noqa: E402
+
+
+class _StubAgent:
+    """Field agent answering ``/api/v1/models/deploy`` from a list of status codes
+
+    The last status repeats once the list is exhausted.
+    """
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.calls = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                status = stub.statuses[min(stub.calls, len(stub.statuses) - 1)]
+                stub.calls += 1
+                body = json.dumps({"ok": status == 200}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def agents(db, monkeypatch, tmp_path):
+    """Factory: ``agents([200], [503, 200], ...)`` → FieldAgent rows backed by stubs"""
+    monkeypatch.setattr(mds, "STATUS_FLUSH_INTERVAL", 0.01)
+    monkeypatch.setattr(mds, "ARTIFACTS_DIR", tmp_path / "artifacts")
+    stubs = []
+
+    def make(*behaviours):
+        rows = []
+        for index, statuses in enumerate(behaviours):
+            stub = _StubAgent(statuses)
+            stubs.append(stub)
+            rows.append(FieldAgent(
+                id=f"agent-{index}", app_id=f"field-{index:02d}", api_base_url=stub.url,
+                status="active", capabilities=["model_receive"],
+            ))
+        db.add_all(rows)
+        db.commit()
+        return rows, stubs
+
+    yield make
+    for stub in stubs:
+        stub.close()
+
+
+def _rollout(db, agents, **policy):
+    service = mds.ModelDeploymentService()
+    job = TrainingJob(id="job-1", trainer_id="trainer", command_json={})
+    policy = mds.RolloutPolicy(timeout=5.0, backoff=0.0, **policy)
+    results = service.rollout(
+        db, agents=agents, artifact_meta={"model_name": "m", "version": "1.0.0"},
+        training_job=job, policy=policy,
+    )
+    rows = {row.agent_id: row for row in db.query(ModelDeployment).all()}
+    return results, rows
+
+
+def test_canary_then_waves_all_deploy(db, agents):
+    fleet, stubs = agents(*([200],) * 5)
+    results, rows = _rollout(db, fleet, canary=1, wave_size=2, retries=0)
+
+    assert [r["status"] for r in results] == ["deployed"] * 5
+    assert [r["wave"] for r in results] == [0, 1, 1, 2, 2]
+    assert {row.status for row in rows.values()} == {"deployed"}
+    assert all(row.attempts == 1 and row.completed_at for row in rows.values())
+    assert [stub.calls for stub in stubs] == [1] * 5
+
+
+def test_retryable_status_is_retried(db, agents):
+    fleet, stubs = agents([503, 200], [400])
+    results, rows = _rollout(db, fleet, retries=2)
+
+    assert results[0]["status"] == "deployed" and results[0]["attempts"] == 2
+    assert rows["agent-0"].attempts == 2 and rows["agent-0"].status == "deployed"
+    # 400 is not retryable
+    assert results[1]["status"] == "rejected" and results[1]["status_code"] == 400
+    assert stubs[1].calls == 1 and rows["agent-1"].attempts == 1
+
+
+def test_failed_canary_halts_rollout(db, agents):
+    fleet, stubs = agents([500], [200], [200])
+    results, rows = _rollout(db, fleet, canary=1, retries=1)
+
+    assert results[0]["status"] == "rejected" and stubs[0].calls == 2
+    assert [r["status"] for r in results[1:]] == ["skipped", "skipped"]
+    assert [stub.calls for stub in stubs[1:]] == [0, 0]
+    assert rows["agent-1"].status == "skipped"
+    assert "canary" in rows["agent-2"].detail
+
+
+def test_wave_failure_ratio_halts_next_wave(db, agents):
+    fleet, stubs = agents([200], [404], [200], [200])
+    results, rows = _rollout(db, fleet, wave_size=2, max_failure_ratio=0.4, retries=0)
+
+    assert [r["status"] for r in results] == ["deployed", "rejected", "skipped", "skipped"]
+    assert stubs[2].calls == stubs[3].calls == 0
+    assert rows["agent-3"].status == "skipped" and "wave 0" in rows["agent-3"].detail
@@ -0,0 +1,123 @@
+"""
+Tests for the escalation window counter (app/services/escalation_counter.py)
+and the report retention rollup (app/services/report_retention.py)
+"""
+import math
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from app.models import FieldDriftReport, FieldDriftReportRollup, TrainingJob  # noqa: E402
+from app.services import escalation_counter  # noqa: E402
+from app.services.drift_decision_engine import DriftDecisionEngine  # noqa: E402
+from app.services.escalation_counter import SlidingWindowCounter  # noqa: E402
+from app.services.report_retention import rollup_and_prune  # noqa: E402
+
+T0 = datetime(2026, 1, 1, 12, 0)
+
+
+def test_counter_expires_timestamps_at_the_window_edge():
+    counter = SlidingWindowCounter(timedelta(hours=1))
+    for minutes in (0, 30, 59):
+        counter.record("a", "m", "medium", T0 + timedelta(minutes=minutes))
+    counter.record("a", "m", "low", T0)  # untracked severity
+
+    # The window is inclusive of its start
+    assert counter.count("a", "m", "medium", now=T0 + timedelta(hours=1)) == 3
+    assert counter.count("a", "m", "medium", now=T0 + timedelta(hours=1, microseconds=1)) == 2
+    assert counter.count("a", "m", "low", now=T0) == 0
+    assert counter.count("a", "m", "medium", now=T0 + timedelta(hours=1, minutes=59)) == 1
+    # Emptied buffers are evicted
+    assert counter.prune(now=T0 + timedelta(hours=2)) == 0
+    assert counter.count("a", "m", "medium", now=T0) == 0
+
+
+def test_counter_keeps_out_of_order_timestamps_sorted():
+    counter = SlidingWindowCounter(timedelta(hours=1))
+    for minutes in (50, 10, 40):
+        counter.record("a", "m", "medium", T0 + timedelta(minutes=minutes))
+    assert counter.count("a", "m", "medium", now=T0 + timedelta(minutes=71)) == 2
+    assert counter.count("a", "m", "medium", now=T0 + timedelta(minutes=100)) == 2
+    assert counter.count("a", "m", "medium", now=T0 + timedelta(minutes=101)) == 1
+
+
+@pytest.mark.parametrize("oldest_hours, escalates", [(47, True), (49, False)])
+def test_escalation_at_the_threshold_boundary(monkeypatch, oldest_hours, escalates):
+    engine = DriftDecisionEngine()
+    counter = SlidingWindowCounter(timedelta(hours=engine.MEDIUM_ESCALATION_WINDOW_HOURS))
+    counter.ready = True
+    monkeypatch.setattr(escalation_counter, "_counter", counter)
+    now = datetime.utcnow()
+    # Exactly MEDIUM_ESCALATION_COUNT reports, the oldest inside / just outside the window
+    ages = [oldest_hours] + [1] * (engine.MEDIUM_ESCALATION_COUNT - 1)
+    for hours in ages:
+        counter.record("a", "m", "medium", now - timedelta(hours=hours))
+
+    report = FieldDriftReport(agent_id="a", model_name="m", severity="medium")
+    assert engine._should_escalate(None, report) is escalates
+
+
+def test_rollup_matches_replaced_rows_and_keeps_recent_reports(db):
+    now = datetime.utcnow()
+    old_day = now - timedelta(days=40)
+    older_day = now - timedelta(days=41)
+    specs = [
+        ("a", "m", "medium", 0.2, old_day),
+        ("a", "m", "medium", 0.6, old_day + timedelta(minutes=5)),
+        ("a", "m", "medium", None, old_day + timedelta(minutes=6)),
+        ("a", "m", "medium", float("nan"), old_day + timedelta(minutes=7)),
+        ("a", "m", "high", 0.9, old_day),
+        ("b", None, "low", 0.1, older_day),
+        ("a", "m", "medium", 0.3, older_day),
+        ("a", "m", "medium", 0.5, now - timedelta(days=29)),  # inside retention
+        ("a", "m", "medium", 0.7, now - timedelta(hours=1)),  # inside retention
+        ("a", "m", "high", 0.8, old_day),                     # referenced by a training job
+    ]
+    reports = [
+        FieldDriftReport(id=f"r{i}", agent_id=agent, model_name=model, severity=severity,
+                         drift_overall=overall, created_at=created, report_json={})
+        for i, (agent, model, severity, overall, created) in enumerate(specs)
+    ]
+    db.add_all(reports)
+    db.add(TrainingJob(id="job", trainer_id="t", drift_report_id="r9", command_json={}))
+    db.commit()
+
+    expected = {}
+    for agent, model, severity, overall, created in specs[:7]:
+        key = f"{agent}|{model or ''}|{severity}|{created.strftime('%Y-%m-%d')}"
+        group = expected.setdefault(key, {"count": 0, "values": []})
+        group["count"] += 1
+        if overall is not None and math.isfinite(overall):
+            group["values"].append(overall)
+
+    # Small chunks, so groups accumulate across transactions
+    result = rollup_and_prune(db, days=30, chunk_size=2)
+    assert result["deleted"] == 7
+    assert sorted(r.id for r in db.query(FieldDriftReport)) == ["r7", "r8", "r9"]
+
+    rollups = {r.id: r for r in db.query(FieldDriftReportRollup)}
+    assert set(rollups) == set(expected)
+    assert sum(r.report_count for r in rollups.values()) == result["deleted"]
+    for key, group in expected.items():
+        rollup = rollups[key]
+        assert rollup.report_count == group["count"]
+        assert rollup.overall_count == len(group["values"])
+        assert rollup.overall_sum == pytest.approx(sum(group["values"]))
+        assert rollup.overall_max == (max(group["values"]) if group["values"] else None)
+
+    # A second run finds nothing left to fold in
+    assert rollup_and_prune(db, days=30)["deleted"] == 0
+    assert {r.id: r.report_count for r in db.query(FieldDriftReportRollup)} == {
+        key: group["count"] for key, group in expected.items()
+    }
+
+
+def test_retention_never_shorter_than_the_escalation_window(db):
+    window = timedelta(hours=DriftDecisionEngine.MEDIUM_ESCALATION_WINDOW_HOURS)
+    db.add(FieldDriftReport(id="recent", agent_id="a", model_name="m", severity="medium",
+                            created_at=datetime.utcnow() - window + timedelta(hours=1), report_json={}))
+    db.commit()
+    assert rollup_and_prune(db, days=1)["deleted"] == 0
+    assert db.query(FieldDriftReport).count() == 1
@@ -32,7 +32,7 @@ dataset_app.add_typer(tag_app, name="tag")
 from .init import init
 from .add import add
 from .snapshot import snapshot_app
-from .analyze import analyze_eda_command, analyze_drift_command
+from .analyze import analyze_eda_command, analyze_drift_command, analyze_drift_matrix_command
 from .ingest import ingest_command
 from .plugin import plugin_list_command, plugin_info_command, plugin_install_command, plugin_detectors_command
 from .vis import vis
@@ -56,6 +56,7 @@ def register(app: typer.Typer) -> None:
     # ========================================================================
     analyze_app.command("eda")(analyze_eda_command)
     analyze_app.command("drift")(analyze_drift_command)
+    analyze_app.command("drift-matrix")(analyze_drift_matrix_command)
     app.add_typer(analyze_app, name="analyze")
 
     # ========================================================================
@@ -1,6 +1,7 @@
 """Data analysis commands"""
 from .eda import analyze_eda_command
 from .drift import analyze_drift_command
+from .drift_matrix import analyze_drift_matrix_command
 
-__all__ = ['analyze_eda_command', 'analyze_drift_command']
+__all__ = ['analyze_eda_command', 'analyze_drift_command', 'analyze_drift_matrix_command']
 
@@ -14,16 +14,25 @@ Two input modes (Phase 3 — orchestrator pivot):
 When ``--json`` is set the merged plugin result is printed to stdout as
 a single JSON object (no rich formatting). Errors also use stdout JSON
 in this mode for machine-parsable diagnostics.
+
+Results are memoized in ``.ddoc/cache/drift`` keyed by both sides' data
+hashes (DVC hash in snapshot mode, content fingerprint in path mode),
+the drift plugin set, detector, fusion settings and analyzer version
+(see ``ddoc.core.drift_cache``). ``--no-cache`` bypasses the lookup.
 """
+import importlib.metadata
 import json
+import os
 import sys
+import types
 import typer
 from rich import print as rprint
-from typing import Optional
+from typing import List, Optional, Tuple
 
-from ..utils import get_pmgr, _pretty
+from ..utils import emit_progress, get_pmgr, _pretty
 from ddoc.core.snapshot_service import get_snapshot_service
 from ddoc.core.cache_service import get_cache_service
+from ddoc.core.drift_cache import DriftResultCache, drift_cache_key, get_drift_result_cache
 
 
 def _emit(res: dict, json_out: bool) -> None:
@@ -131,35 +140,6 @@ class _SilencePluginIO:
             sys.stdout = self._saved_stdout
 
 
-def emit_progress(
-    progress: float,
-    stage: str,
-    message: str = "",
-    *,
-    enabled: bool = False,
-) -> None:
-    """Emit one NDJSON progress line on stderr (Phase 6 — orchestrator).
-
-    Schema (per `_specs/ddoc_orchestrator_pattern.md`):
-        {"progress": 0.0..1.0, "stage": "<short id>", "message": "..."}
-
-    Stderr is the channel because stdout is reserved for the final
-    ``--json`` envelope. ``enabled=False`` makes this a no-op so callers
-    can sprinkle invocations unconditionally.
-    """
-    if not enabled:
-        return
-    try:
-        line = json.dumps(
-            {"progress": float(progress), "stage": stage, "message": message},
-            ensure_ascii=False,
-        )
-    except (TypeError, ValueError):
-        return
-    sys.stderr.write(line + "\n")
-    sys.stderr.flush()
-
-
 def _validate_detector_against_registry(detector: str, json_out: bool) -> None:
     """Round-13 (Gap 5) — sanity-check ``--detector`` against the
     detector preset registry (``ddoc_supported_detectors`` hook) before
@@ -199,6 +179,135 @@ def _validate_detector_against_registry(detector: str, json_out: bool) -> None:
     raise typer.Exit(code=2)
 
 
+def _drift_plugin_signature() -> str:
+    """``name==version`` of every plugin implementing ``drift_detect``,
+    sorted and comma-joined — part of the drift cache key so installing,
+    removing or upgrading a plugin invalidates cached results."""
+    pm = get_pmgr().pm
+    try:
+        impls = pm.hook.drift_detect.get_hookimpls()
+    except Exception:
+        return ""
+    try:
+        dists = importlib.metadata.packages_distributions()
+    except Exception:
+        dists = {}
+    parts = []
+    for impl in impls:
+        plugin = impl.plugin
+        name = pm.get_name(plugin) or type(plugin).__name__
+        module = plugin.__name__ if isinstance(plugin, types.ModuleType) else type(plugin).__module__
+        version = None
+        for dist in dists.get((module or "").split(".")[0], []):
+            try:
+                version = importlib.metadata.version(dist)
+                break
+            except importlib.metadata.PackageNotFoundError:
+                continue
+        parts.append(f"{name}=={version or 'unknown'}")
+    return ",".join(sorted(parts))
+
+
+def _open_drift_cache(
+    ref: str,
+    cur: str,
+    *,
+    path_mode: bool,
+    detector: str,
+    fusion: str,
+    fusion_weights: dict,
+    with_embeddings: bool,
+    significance: Optional[dict] = None,
+    window: Optional[dict] = None,
+    output_path: Optional[str] = None,
+) -> Tuple[Optional[DriftResultCache], Optional[str]]:
+    """Open the drift result cache and compute this run's key.
+
+    ``ref`` / ``cur`` are data hashes in snapshot mode and data paths in
+    path mode (fingerprinted here). ``output_path`` is where plugins write
+    their side outputs (metrics, plots) and is part of the key, so a hit
+    never points at another run's outputs. Returns ``(None, None)`` when
+    the cache can't be used — caching is best-effort and never blocks drift.
+    """
+    try:
+        cache = get_drift_result_cache()
+        if path_mode:
+            ref, cur = cache.fingerprint(ref), cache.fingerprint(cur)
+        if not ref or not cur:
+            return None, None
+        key = drift_cache_key(
+            ref, cur,
+            plugin=_drift_plugin_signature(),
+            detector=detector,
+            fusion=fusion,
+            options={
+                "fusion_weights": fusion_weights,
+                "with_embeddings": with_embeddings,
+                "significance": significance,
+                "window": window,
+                "output_path": os.path.abspath(output_path) if output_path else None,
+            },
+        )
+        return cache, key
+    except (OSError, ValueError):
+        return None, None
+
+
+def _side_outputs(output_path: Optional[str]) -> List[str]:
+    """Files the plugins wrote under ``output_path``, relative and sorted."""
+    if not output_path or not os.path.isdir(output_path):
+        return []
+    return sorted(
+        os.path.relpath(os.path.join(dirpath, name), output_path)
+        for dirpath, _, filenames in os.walk(output_path)
+        for name in filenames
+    )
+
+
+def _emit_cached(
+    cache: Optional[DriftResultCache],
+    key: Optional[str],
+    json_out: bool,
+    ndjson_progress: bool,
+    output_path: Optional[str] = None,
+) -> bool:
+    """Emit a memoized result if there is one; returns True on a hit.
+
+    A hit skips the plugins, so it only counts when every side output
+    recorded with the entry is still under ``output_path``; otherwise the
+    drift is recomputed (and the outputs rewritten).
+    """
+    if cache is None:
+        return False
+    entry = cache.get(key)
+    if entry is None:
+        return False
+    outputs = (entry.get("params") or {}).get("outputs") or []
+    if output_path and not all(os.path.isfile(os.path.join(output_path, rel)) for rel in outputs):
+        return False
+    res = entry["result"]
+    if isinstance(res, dict):
+        res["drift_cache"] = {"hit": True, "key": key, "created_at": entry.get("created_at")}
+    if not json_out:
+        rprint(f"[green]♻️  Cached drift result ({key[:12]}, {entry.get('created_at')}) — use --no-cache to recompute[/green]")
+    _emit(res, json_out=json_out)
+    emit_progress(1.0, "complete", "cached result", enabled=ndjson_progress)
+    return True
+
+
+def _cacheable(res: dict) -> bool:
+    """Only completed drift results are memoized (no errors / baselines)."""
+    if not isinstance(res, dict) or res.get("status") in ("error", "BASELINE_CREATED"):
+        return False
+    modalities = res.get("modalities")
+    if isinstance(modalities, dict):
+        return all(
+            not isinstance(r, dict) or r.get("status") not in ("error", "BASELINE_CREATED")
+            for r in modalities.values()
+        )
+    return True
+
+
 def _parse_fusion_weights(spec: Optional[str]) -> dict:
     """Parse a weights spec string ``"image=0.6,text=0.4"`` into a dict.
 
@@ -364,7 +473,7 @@ def analyze_drift_command(
             "historical behaviour (vision: ensemble, text: cosine, "
             "audio: wasserstein, timeseries: attributes). Explicit values: "
             "vision supports {ensemble,mmd,mean_shift,wasserstein,psi,cosine}; "
-            "text {cosine}; audio {wasserstein}; timeseries {attributes}. "
+            "text {cosine}; audio {wasserstein}; timeseries {attributes,windowed}. "
             "Unsupported values produce an unsupported_detector error envelope."
         ),
     ),
@@ -400,6 +509,29 @@ def analyze_drift_command(
         None, "--fusion-weights",
         help="Per-modality weights for --fusion weighted, e.g. 'image=0.6,text=0.4'. Missing modalities default to 0; total is normalized internally.",
     ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache",
+        help="Recompute even if a drift result for the same data hashes, plugins, detector and fusion settings is cached.",
+    ),
+    significance: bool = typer.Option(
+        False, "--significance",
+        help="Add permutation-test p-values (embedding MMD, per-attribute PSI) to plugins that support it. Scores and status are unchanged.",
+    ),
+    permutations: int = typer.Option(
+        1000, "--permutations",
+        help="Maximum permutations per test for --significance (stops early once p is clearly above/below --alpha).",
+    ),
+    alpha: float = typer.Option(
+        0.05, "--alpha", help="Significance level for --significance.",
+    ),
+    window: Optional[str] = typer.Option(
+        None, "--window",
+        help="Time-series windowed drift: window length as a pandas offset (e.g. '1h', '1D'). Each window of the current series is scored against the whole reference; only windows newer than the last run are re-evaluated.",
+    ),
+    window_step: Optional[str] = typer.Option(
+        None, "--window-step",
+        help="Slide step for --window (must divide the window length). Omit for tumbling windows.",
+    ),
 ):
     """Detect drift between two snapshots or two data paths.
 
@@ -411,6 +543,9 @@ def analyze_drift_command(
         ddoc analyze drift baseline v05
         ddoc analyze drift v01 v02 --json
         ddoc analyze drift --data-path-ref /data/a --data-path-cur /data/b --json
+        ddoc analyze drift v01 v02 --no-cache
+        ddoc analyze drift v01 v02 --significance --permutations 500
+        ddoc analyze drift v01 v02 --detector windowed --window 1D --window-step 1h
     """
     # ── Mode resolution ──
     path_mode = bool(data_path_ref or data_path_cur)
@@ -433,6 +568,9 @@ def analyze_drift_command(
     # per-plugin runtime checks in Round-11/12: catches typos before the
     # fork and gives a single consolidated error envelope.
     _validate_detector_against_registry(detector, json_out=json_out)
+    weights = _parse_fusion_weights(fusion_weights)
+    significance_cfg = {"permutations": permutations, "alpha": alpha, "seed": 0} if significance else None
+    window_cfg = {"size": window, "step": window_step} if window else None
 
     # Path mode: skip snapshot resolution entirely.
     if path_mode:
@@ -441,6 +579,15 @@ def analyze_drift_command(
             rprint(f"[cyan]🔍 Drift Analysis (path mode)[/cyan]")
             rprint(f"   Ref:  {data_path_ref}")
             rprint(f"   Cur:  {data_path_cur}\n")
+        output_path = f"analysis/drift_path_{detector}"
+        drift_cache, cache_key = (None, None) if no_cache else _open_drift_cache(
+            data_path_ref, data_path_cur, path_mode=True, detector=detector,
+            fusion=fusion, fusion_weights=weights, with_embeddings=with_embeddings,
+            significance=significance_cfg, window=window_cfg,
+            output_path=output_path,
+        )
+        if _emit_cached(drift_cache, cache_key, json_out, ndjson_progress, output_path):
+            return None
         cfg = {
             # No cache — caller is the orchestrator, expected to manage caching outside.
             "baseline_cache": None,
@@ -451,6 +598,8 @@ def analyze_drift_command(
             # inline in path mode (otherwise drift falls back to
             # attribute-only). Only the text/vision plugins honour it.
             "with_embeddings": with_embeddings,
+            "significance": significance_cfg,
+            "window": window_cfg,
         }
         emit_progress(0.2, "plugin_call", "invoking drift_detect hook",
                       enabled=ndjson_progress)
@@ -465,19 +614,21 @@ def analyze_drift_command(
                     data_hash_cur="",
                     detector=detector,
                     cfg=cfg,
-                    output_path=f"analysis/drift_path_{detector}",
+                    output_path=output_path,
                 )
         except Exception as e:
             _emit_error(f"plugin invocation failed: {e}", code="plugin_error", json_out=json_out)
             raise typer.Exit(code=1)
         emit_progress(0.9, "merge", "merging plugin results",
                       enabled=ndjson_progress)
-        result = _finish_drift(
+        _finish_drift(
             hook_results, json_out=json_out,
-            fusion=fusion, fusion_weights=_parse_fusion_weights(fusion_weights),
+            fusion=fusion, fusion_weights=weights,
+            drift_cache=drift_cache, cache_key=cache_key,
+            output_path=output_path,
         )
         emit_progress(1.0, "complete", "done", enabled=ndjson_progress)
-        return result
+        return None
 
     # ── Snapshot mode (legacy interactive path) ──
     snapshot_service = get_snapshot_service()
@@ -503,6 +654,16 @@ def analyze_drift_command(
         _emit_error(f"Failed to load snapshot {current_id}", code="snapshot_load_failed", json_out=json_out)
         raise typer.Exit(code=1)
 
+    output_path = f"analysis/drift_{baseline_id}_{current_id}"
+    drift_cache, cache_key = (None, None) if no_cache else _open_drift_cache(
+        snap_baseline.data.dvc_hash, snap_current.data.dvc_hash, path_mode=False,
+        detector=detector, fusion=fusion, fusion_weights=weights,
+        with_embeddings=with_embeddings, significance=significance_cfg,
+        window=window_cfg, output_path=output_path,
+    )
+    if _emit_cached(drift_cache, cache_key, json_out, ndjson_progress, output_path):
+        return None
+
     # Cache lookup must accept modality-suffixed cache types
     # (``attributes_timeseries`` / ``attributes_image`` / …) — plugins
     # write those, not the bare ``attributes`` key, so the legacy single-
@@ -534,6 +695,13 @@ def analyze_drift_command(
         )
         raise typer.Exit(code=1)
 
+    # Windowed drift reads the raw series, so each snapshot's data is read
+    # from its own DVC manifest rather than the shared workspace ``data/``.
+    data_path_ref, data_path_cur = snap_baseline.data.path, snap_current.data.path
+    if (detector or "").lower() == "windowed" or window_cfg:
+        data_path_ref = _snapshot_data_path(snapshot_service, snap_baseline, json_out)
+        data_path_cur = _snapshot_data_path(snapshot_service, snap_current, json_out)
+
     cfg = {
         "baseline_cache": cache_baseline_attr,
         "current_cache": cache_current_attr,
@@ -544,10 +712,10 @@ def analyze_drift_command(
             snapshot_id=current_id, data_hash=snap_current.data.dvc_hash,
         ),
         "with_embeddings": with_embeddings,
+        "significance": significance_cfg,
+        "window": window_cfg,
     }
 
-    output_path = f"analysis/drift_{baseline_id}_{current_id}"
-
     if not json_out:
         rprint(f"[cyan]🔍 Drift Analysis[/cyan]")
         rprint(f"   Baseline: {baseline_id} ({snap_baseline.data.dvc_hash[:7]})")
@@ -560,8 +728,8 @@ def analyze_drift_command(
             hook_results = get_pmgr().hook.drift_detect(
                 snapshot_id_ref=baseline_id,
                 snapshot_id_cur=current_id,
-                data_path_ref=snap_baseline.data.path,
-                data_path_cur=snap_current.data.path,
+                data_path_ref=data_path_ref,
+                data_path_cur=data_path_cur,
                 data_hash_ref=snap_baseline.data.dvc_hash,
                 data_hash_cur=snap_current.data.dvc_hash,
                 detector=detector,
@@ -574,12 +742,40 @@ def analyze_drift_command(
 
     emit_progress(0.9, "merge", "merging plugin results",
                   enabled=ndjson_progress)
-    result = _finish_drift(
+    _finish_drift(
         hook_results, json_out=json_out,
-        fusion=fusion, fusion_weights=_parse_fusion_weights(fusion_weights),
+        fusion=fusion, fusion_weights=weights,
+        drift_cache=drift_cache, cache_key=cache_key,
+        output_path=output_path,
     )
     emit_progress(1.0, "complete", "done", enabled=ndjson_progress)
-    return result
+    return None
+
+
+def _snapshot_data_path(snapshot_service, snapshot, json_out: bool) -> str:
+    """Directory holding ``snapshot``'s own data, built from the local DVC cache.
+
+    ``snapshot.data.path`` is the workspace ``data/`` for every snapshot,
+    so code that reads raw files must not use it for non-checked-out
+    snapshots.
+    """
+    from ddoc.core.restore_service import get_restore_service
+
+    try:
+        view = get_restore_service(str(snapshot_service.project_root)).snapshot_view(snapshot.data.dvc_hash)
+    except OSError as e:
+        _emit_error(
+            f"Could not read data of {snapshot.snapshot_id} from the DVC cache: {e}",
+            code="snapshot_data_unavailable", json_out=json_out,
+        )
+        raise typer.Exit(code=1)
+    if view is None:
+        _emit_error(
+            f"Data of {snapshot.snapshot_id} is not in the local DVC cache — run 'dvc pull' first",
+            code="snapshot_data_unavailable", json_out=json_out,
+        )
+        raise typer.Exit(code=1)
+    return str(view)
 
 
 def _finish_drift(
@@ -588,8 +784,16 @@ def _finish_drift(
     json_out: bool,
     fusion: str = "none",
     fusion_weights: Optional[dict] = None,
+    drift_cache: Optional[DriftResultCache] = None,
+    cache_key: Optional[str] = None,
+    output_path: Optional[str] = None,
 ) -> None:
-    """Shared post-hook handling (used by both modes)."""
+    """Shared post-hook handling (used by both modes).
+
+    Completed results are stored in ``drift_cache`` under ``cache_key``
+    before being emitted, together with the side outputs the plugins
+    wrote under ``output_path``.
+    """
     if not hook_results:
         _emit_error(
             "No plugin available for drift detection. Install via: pip install ddoc-full",
@@ -609,4 +813,10 @@ def _finish_drift(
         valid, hook_name="drift_detect",
         fusion=fusion, fusion_weights=fusion_weights,
     )
+    if drift_cache is not None and _cacheable(res):
+        drift_cache.put(cache_key, res, params={
+            "fusion": fusion, "fusion_weights": fusion_weights,
+            "outputs": _side_outputs(output_path),
+        })
+        res["drift_cache"] = {"hit": False, "key": cache_key}
     _emit(res, json_out=json_out)
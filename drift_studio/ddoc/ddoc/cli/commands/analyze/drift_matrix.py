@@ -0,0 +1,158 @@
+"""Pairwise drift matrix command.
+
+``ddoc analyze drift-matrix v01 v02 v03 ...`` compares every pair of
+snapshots in one process (see ``ddoc.core.drift_matrix``): each
+snapshot's attribute / embedding caches are loaded exactly once, kernel
+statistics are shared across pairs, and the pairs run in parallel.
+Without positional arguments every snapshot is included, oldest first.
+
+Like ``ddoc analyze drift`` it needs the EDA caches (``ddoc analyze eda
+<snapshot>``) and supports ``--json`` / ``--ndjson-progress`` for the
+backend orchestrator.
+"""
+import json
+from pathlib import Path
+from typing import List, Optional
+
+import typer
+from rich import print as rprint
+from rich.console import Console
+from rich.table import Table
+
+from ddoc.core.snapshot_service import get_snapshot_service
+from ddoc.core.cache_service import get_cache_service
+from ddoc.core.drift_matrix import (
+    DEFAULT_MAX_SAMPLES,
+    PAIR_METRICS,
+    drift_matrix,
+    load_snapshot_sides,
+)
+from ..utils import emit_progress
+from .drift import _emit, _emit_error
+
+
+def _render_matrix(res: dict) -> None:
+    """Rich table of the score matrix plus the most-drifted pairs"""
+    console = Console()
+    ids = res["snapshots"]
+    table = Table(title=f"Drift matrix ({res['metric']})")
+    table.add_column("")
+    for sid in ids:
+        table.add_column(sid, justify="right")
+    for sid, row in zip(ids, res["matrix"]):
+        table.add_row(sid, *("-" if v is None else f"{v:.4f}" for v in row))
+    console.print(table)
+
+    if res["top_pairs"]:
+        top = Table(title="Most drifted pairs")
+        top.add_column("Ref")
+        top.add_column("Cur")
+        top.add_column("Score", justify="right")
+        top.add_column("Status")
+        for pair in res["top_pairs"]:
+            status = ", ".join(f"{m}: {s}" for m, s in pair["status"].items())
+            top.add_row(pair["ref"], pair["cur"], f"{pair['score']:.4f}", status)
+        console.print(top)
+
+
+def analyze_drift_matrix_command(
+    snapshots: Optional[List[str]] = typer.Argument(
+        None, help="Snapshot IDs or aliases (default: all snapshots, oldest first)"
+    ),
+    metric: str = typer.Option(
+        "auto", "--metric",
+        help=f"Pair score used for the matrix and ranking: {', '.join(PAIR_METRICS)}. "
+             "``auto`` uses embedding MMD when every modality has cached embeddings and attribute "
+             "PSI otherwise (one metric per matrix); a pair's score is its most drifted modality.",
+    ),
+    top: int = typer.Option(10, "--top", help="Number of most-drifted pairs to report"),
+    max_samples: int = typer.Option(
+        DEFAULT_MAX_SAMPLES, "--max-samples",
+        help="Embedding rows per snapshot used for MMD (deterministic subsample)",
+    ),
+    workers: Optional[int] = typer.Option(
+        None, "--workers", help="Threads for loading and pair comparisons (default: CPU count)",
+    ),
+    output: Optional[str] = typer.Option(
+        None, "--output", "-o", help="Also write the JSON result to this file",
+    ),
+    json_out: bool = typer.Option(
+        False, "--json",
+        help="Emit machine-readable JSON envelope to stdout (no rich formatting).",
+    ),
+    ndjson_progress: bool = typer.Option(
+        False, "--ndjson-progress",
+        help="Emit NDJSON progress lines on stderr (orchestrator streaming).",
+    ),
+):
+    """Compare every pair of snapshots and rank the most drifted pairs.
+
+    Examples:
+        ddoc analyze drift-matrix
+        ddoc analyze drift-matrix v01 v02 v03 v04 --top 5
+        ddoc analyze drift-matrix --metric psi_max --json -o drift_matrix.json
+    """
+    if metric not in PAIR_METRICS:
+        raise typer.BadParameter(f"--metric expects one of {PAIR_METRICS}, got {metric!r}")
+
+    snapshot_service = get_snapshot_service()
+    cache_service = get_cache_service()
+
+    if not snapshots:
+        listed = snapshot_service.list_snapshots()
+        if not listed.get("success"):
+            _emit_error(listed.get("error", "failed to list snapshots"), code="snapshot_list_failed", json_out=json_out)
+            raise typer.Exit(code=1)
+        snapshots = [s["snapshot_id"] for s in reversed(listed["snapshots"])]
+
+    resolved = []
+    for name in snapshots:
+        snapshot_id = snapshot_service._resolve_version(name)
+        snapshot = snapshot_service._load_snapshot(snapshot_id) if snapshot_id else None
+        if not snapshot:
+            _emit_error(f"Snapshot '{name}' not found", code="snapshot_not_found", json_out=json_out)
+            raise typer.Exit(code=1)
+        if snapshot_id not in (sid for sid, _ in resolved):
+            resolved.append((snapshot_id, snapshot.data.dvc_hash))
+    if len(resolved) < 2:
+        _emit_error("drift-matrix needs at least two distinct snapshots", code="too_few_snapshots", json_out=json_out)
+        raise typer.Exit(code=2)
+
+    emit_progress(0.05, "load", f"loading caches for {len(resolved)} snapshots", enabled=ndjson_progress)
+    sides = load_snapshot_sides(cache_service, resolved, max_samples=max_samples, max_workers=workers)
+    missing = [s.snapshot_id for s in sides if not s.profiles]
+    if missing:
+        _emit_error(
+            f"No analysis cache for {', '.join(missing)} — run 'ddoc analyze eda <snapshot>' first",
+            code="cache_missing", json_out=json_out,
+        )
+        raise typer.Exit(code=1)
+
+    if not json_out:
+        rprint(f"[cyan]🔍 Drift Matrix[/cyan] — {len(sides)} snapshots, "
+               f"{len(sides) * (len(sides) - 1) // 2} pairs\n")
+
+    def _progress(done: int, total: int) -> None:
+        emit_progress(0.2 + 0.75 * done / total, "pairs", f"{done}/{total} pairs", enabled=ndjson_progress)
+
+    emit_progress(0.2, "pairs", "comparing pairs", enabled=ndjson_progress)
+    try:
+        res = drift_matrix(sides, metric=metric, top=top, max_workers=workers, progress=_progress)
+    except ValueError as e:
+        _emit_error(f"drift matrix failed: {e}", code="drift_matrix_failed", json_out=json_out)
+        raise typer.Exit(code=1)
+    res["status"] = "success"
+
+    if output:
+        out_path = Path(output)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(json.dumps(res, ensure_ascii=False, indent=2, default=str))
+
+    if json_out:
+        _emit(res, json_out=True)
+    else:
+        _render_matrix(res)
+        if output:
+            rprint(f"[green]💾 Saved to {output}[/green]")
+    emit_progress(1.0, "complete", "done", enabled=ndjson_progress)
+    return None
@@ -19,10 +19,10 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from ..utils import get_pmgr, _pretty
+from ..utils import emit_progress, get_pmgr, _pretty
 from ddoc.core.snapshot_service import get_snapshot_service
 from ddoc.core.cache_service import get_cache_service
-from .drift import _emit, _emit_error, _merge_plugin_results, emit_progress, _SilencePluginIO
+from .drift import _emit, _emit_error, _merge_plugin_results, _SilencePluginIO
 
 
 def analyze_eda_command(
@@ -1,7 +1,7 @@
 """``ddoc fetch`` — materialize a remote data source into a local dir.
 
 Round 13 — first concrete user of the ``data_source_read`` hookspec.
-Built-in fallback handles ``file://`` (and bare paths) by copying or
+Built-in fallback handles ``file://`` (and bare paths) by syncing or
 sym-linking the source dir; plugins can register additional schemes
 (``s3://``, ``gs://``, ``http(s)://``, ``kafka://``) via the same
 hook so an operator can run::
@@ -10,11 +10,16 @@ hook so an operator can run::
     ddoc analyze drift --data-path-ref /tmp/ref --data-path-cur ...
 
 without ddoc itself needing to know about S3.
+
+The built-in copy path goes through :mod:`ddoc.core.sync_service`:
+repeat fetches only transfer files whose size / mtime (optionally md5)
+changed, same-filesystem sources are reflinked when the filesystem
+supports it (hard links only with ``--link hardlink``), copies run in
+parallel and interrupted copies resume.
 """
 from __future__ import annotations
 
 import json
-import shutil
 import sys
 from pathlib import Path
 from typing import Any, Dict, Optional
@@ -23,15 +28,29 @@ from urllib.parse import urlparse
 import typer
 from rich import print as rprint
 
+from ddoc.core.sync_service import LINK_MODES, ProgressCallback, get_sync_service
+
+from .utils import emit_progress
 from .utils import get_pmgr
 
 
-def _builtin_file_read(source_uri: str, dest_dir: str, config: Dict[str, Any]) -> Dict[str, Any]:
+def _builtin_file_read(
+    source_uri: str,
+    dest_dir: str,
+    config: Dict[str, Any],
+    progress: Optional[ProgressCallback] = None,
+) -> Dict[str, Any]:
     """Built-in adapter for ``file://`` URIs and bare paths.
 
-    Copies the source into ``<dest_dir>/<basename>`` (or creates a
+    Syncs the source into ``<dest_dir>/<basename>`` (or creates a
     symlink when ``config.symlink == True``). Returns the same envelope
     shape plugins should produce.
+
+    Recognised ``config`` keys for the sync path: ``link``
+    (auto / reflink / hardlink / copy), ``checksum`` (confirm size-equal
+    files by md5), ``workers`` and ``delete`` (drop files that vanished
+    from the source, default True). ``bytes_transferred`` counts bytes
+    actually copied, so a no-op re-fetch reports 0.
     """
     parsed = urlparse(source_uri)
     if parsed.scheme in ("", "file"):
@@ -50,6 +69,7 @@ def _builtin_file_read(source_uri: str, dest_dir: str, config: Dict[str, Any]) -
     use_symlink = bool(config.get("symlink", False))
     bytes_transferred = 0
     files_count = 0
+    sync_stats: Dict[str, Any] = {}
 
     if use_symlink:
         if target.exists() or target.is_symlink():
@@ -61,18 +81,17 @@ def _builtin_file_read(source_uri: str, dest_dir: str, config: Dict[str, Any]) -
                 files_count += 1
                 bytes_transferred += p.stat().st_size
     else:
-        if src.is_dir():
-            if target.exists():
-                shutil.rmtree(target)
-            shutil.copytree(src, target)
-            for p in target.rglob("*"):
-                if p.is_file():
-                    files_count += 1
-                    bytes_transferred += p.stat().st_size
-        else:
-            shutil.copy2(src, target)
-            files_count = 1
-            bytes_transferred = target.stat().st_size
+        stats = get_sync_service(config.get("workers")).sync(
+            src,
+            target,
+            link=str(config.get("link") or "auto"),
+            checksum=bool(config.get("checksum", False)),
+            delete=bool(config.get("delete", True)),
+            progress=progress,
+        )
+        files_count = stats["files_count"]
+        bytes_transferred = stats["bytes_transferred"]
+        sync_stats = stats
 
     return {
         "status": "success",
@@ -82,6 +101,7 @@ def _builtin_file_read(source_uri: str, dest_dir: str, config: Dict[str, Any]) -
         "bytes_transferred": bytes_transferred,
         "files_count": files_count,
         "adapter": "builtin",
+        **{k: v for k, v in sync_stats.items() if k not in ("files_count", "bytes_transferred")},
     }
 
 
@@ -97,6 +117,23 @@ def fetch_command(
         False, "--symlink",
         help="For file:// sources, create a symlink instead of copying (faster, but no isolation).",
     ),
+    link: str = typer.Option(
+        "auto", "--link",
+        help="For file:// sources on the same filesystem: auto (reflink, then copy), "
+             "reflink, hardlink (opt-in; shares inodes with the source), or copy.",
+    ),
+    checksum: bool = typer.Option(
+        False, "--checksum",
+        help="Compare md5 of same-size files whose mtime differs instead of recopying them.",
+    ),
+    workers: Optional[int] = typer.Option(
+        None, "--workers", "-j", min=1,
+        help="Parallel file transfers for file:// sources.",
+    ),
+    ndjson_progress: bool = typer.Option(
+        False, "--ndjson-progress",
+        help="Emit NDJSON progress lines on stderr (orchestrator streaming).",
+    ),
     config: Optional[str] = typer.Option(
         None, "--config",
         help="Adapter-specific JSON config (e.g. '{\"region\":\"us-east-1\"}' for s3 plugins).",
@@ -114,7 +151,12 @@ def fetch_command(
         ddoc fetch file:///mnt/share/audit --dest /tmp/audit --symlink
         ddoc fetch s3://my-bucket/datasets/ref --dest /tmp/ref --config '{"region":"us-west-2"}'
     """
-    cfg: Dict[str, Any] = {"symlink": symlink}
+    if link not in LINK_MODES:
+        rprint(f"[red]❌ --link must be one of {', '.join(sorted(LINK_MODES))}[/red]")
+        raise typer.Exit(code=2)
+    cfg: Dict[str, Any] = {"symlink": symlink, "link": link, "checksum": checksum}
+    if workers:
+        cfg["workers"] = workers
     if config:
         try:
             cfg.update(json.loads(config))
@@ -122,6 +164,13 @@ def fetch_command(
             rprint(f"[red]❌ --config must be valid JSON: {e}[/red]")
             raise typer.Exit(code=2)
 
+    emit_progress(0.0, "start", f"fetch {source_uri}", enabled=ndjson_progress)
+
+    def _on_progress(done_bytes: int, total_bytes: int, done_files: int, total_files: int) -> None:
+        fraction = done_bytes / total_bytes if total_bytes else 1.0
+        emit_progress(fraction, "transfer", f"{done_files}/{total_files} files",
+                      enabled=ndjson_progress)
+
     # 1. Try plugins first (firstresult=True; first claim wins).
     pm = get_pmgr().pm
     try:
@@ -138,7 +187,10 @@ def fetch_command(
     else:
         # 2. Built-in fallback (file:// only).
         try:
-            result = _builtin_file_read(source_uri, str(dest), cfg)
+            result = _builtin_file_read(
+                source_uri, str(dest), cfg,
+                progress=_on_progress if ndjson_progress else None,
+            )
         except typer.BadParameter as e:
             err = {
                 "status": "error",
@@ -162,9 +214,13 @@ def fetch_command(
                 rprint(f"[red]❌ {err['message']}[/red]")
             raise typer.Exit(code=1)
 
+    emit_progress(1.0, "complete", "done", enabled=ndjson_progress)
     if json_out:
         sys.stdout.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
     else:
         rprint(f"[green]✅ {result.get('scheme')} → {result.get('local_path')}[/green]")
         rprint(f"   files: {result.get('files_count')}  bytes: {result.get('bytes_transferred')}  "
                f"adapter: {result.get('adapter', 'plugin')}")
+        if "files_unchanged" in result:
+            rprint(f"   unchanged: {result['files_unchanged']}  linked: {result['files_linked']}  "
+                   f"copied: {result['files_copied']}  deleted: {result['files_deleted']}")
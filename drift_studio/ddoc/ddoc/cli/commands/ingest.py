@@ -76,6 +76,25 @@ def ingest_command(
         "--parquet",
         help="Write parquet alongside CSV (requires pyarrow).",
     ),
+    partition_by: Optional[str] = typer.Option(
+        None,
+        "--partition-by",
+        help="Write a partitioned parquet dataset by 'date' or 'source' "
+             "(implies --parquet).",
+    ),
+    workers: Optional[int] = typer.Option(
+        None,
+        "--workers",
+        "-j",
+        min=1,
+        help="Parser processes for large drops (default: min(8, CPU count)).",
+    ),
+    reingest: bool = typer.Option(
+        False,
+        "--reingest",
+        help="Ingest envelopes again even if their content hash is already "
+             "recorded in the inbox's _ingested.jsonl.",
+    ),
     dvc_pull: bool = typer.Option(
         False,
         "--dvc-pull",
@@ -101,10 +120,14 @@ def ingest_command(
         ddoc ingest --from-dir /tmp/keti_export
         ddoc ingest -f /mnt/nas/site_a/audit -s site_a -w ~/ddoc-ws
         ddoc ingest -f export/ --json   # for scripts
+        ddoc ingest -f /mnt/nas/site_a/audit --partition-by date -j 8
     """
     if mode not in {"move", "delete"}:
         rprint(f"[red]error:[/red] --mode must be 'move' or 'delete', got {mode!r}")
         raise typer.Exit(code=2)
+    if partition_by is not None and partition_by not in {"date", "source"}:
+        rprint(f"[red]error:[/red] --partition-by must be 'date' or 'source', got {partition_by!r}")
+        raise typer.Exit(code=2)
 
     # Phase 4 — opportunistic DVC pull. If `dvc` is on PATH and the cwd
     # has a `.dvc/` directory, pull the target dir; otherwise warn and
@@ -135,6 +158,9 @@ def ingest_command(
             inbox_root=inbox,
             mode=mode,
             use_parquet=parquet,
+            partition_by=partition_by,
+            workers=workers,
+            incremental=not reingest,
         )
     except (FileNotFoundError, ValueError) as e:
         if json_out:
@@ -155,10 +181,13 @@ def ingest_command(
     table.add_row("files seen", str(outcome.files_seen))
     table.add_row("files processed", str(outcome.files_processed))
     table.add_row("files skipped", str(len(outcome.files_skipped)))
+    table.add_row("already ingested", str(outcome.files_duplicate))
     table.add_row("decision rows", str(outcome.decision_rows))
     table.add_row("drift reports", str(outcome.drift_reports))
     if outcome.decisions_path:
         table.add_row("decisions csv", outcome.decisions_path)
+    if outcome.parquet_paths:
+        table.add_row("parquet files", str(len(outcome.parquet_paths)))
     if outcome.manifest_path:
         table.add_row("manifest", outcome.manifest_path)
     console.print(table)
@@ -22,6 +22,8 @@ from typing import Any, Dict, Optional
 import typer
 from rich import print as rprint
 
+from ddoc.core.report_stream import DEFAULT_PAGE_SIZE, StreamedHtmlWriter
+
 from .utils import get_pmgr
 
 
@@ -101,6 +103,9 @@ def _builtin_render(
             return "warning"
         return "critical"
 
+    if fmt == "html" and cfg.get("stream"):
+        return _builtin_render_stream(env, drift_result, eda_result, out_path, cfg, _status_class)
+
     if drift_result is not None:
         tpl = env.get_template("drift_report.html")
         html = tpl.render(
@@ -108,6 +113,7 @@ def _builtin_render(
             title=cfg.get("title"),
             status_class=_status_class(drift_result.get("overall_score")),
             raw_json=json.dumps(drift_result, indent=2, ensure_ascii=False, default=str),
+            tables={},
         )
     else:
         tpl = env.get_template("eda_report.html")
@@ -115,6 +121,7 @@ def _builtin_render(
             eda=eda_result or {},
             title=cfg.get("title"),
             raw_json=json.dumps(eda_result or {}, indent=2, ensure_ascii=False, default=str),
+            tables={},
         )
 
     if fmt == "html":
@@ -141,6 +148,50 @@ def _builtin_render(
     raise typer.BadParameter(f"built-in fallback supports html|pdf|md; got {fmt!r}")
 
 
+def _builtin_render_stream(env, drift_result, eda_result, out_path: Path, cfg, status_class) -> Dict[str, Any]:
+    """Streamed HTML: the template is written chunk by chunk, large tables
+    are paged into ``<stem>_files/`` and the raw envelope is linked as a
+    side-car JSON file instead of being inlined."""
+    from markupsafe import Markup
+
+    page_size = cfg.get("page_size") or DEFAULT_PAGE_SIZE
+    payload = drift_result if drift_result is not None else (eda_result or {})
+    with StreamedHtmlWriter(out_path, page_size=page_size) as writer:
+        raw_path = writer.asset_path("envelope.json")
+        with open(raw_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False, default=str)
+
+        tables: Dict[str, Any] = {}
+        if drift_result is not None:
+            if drift_result.get("attribute_drifts"):
+                tables["attribute_drifts"] = Markup(writer.table_html(
+                    "attribute_drifts", ["attribute", "drift"],
+                    ((k, f"{v:.4f}") for k, v in drift_result["attribute_drifts"].items()),
+                ))
+            context = {
+                "drift": drift_result,
+                "status_class": status_class(drift_result.get("overall_score")),
+            }
+            tpl = env.get_template("drift_report.html")
+        else:
+            summary = (eda_result or {}).get("summary") or {}
+            tables["summary"] = Markup(writer.table_html("summary", [], summary.items()))
+            context = {"eda": eda_result or {}}
+            tpl = env.get_template("eda_report.html")
+
+        for chunk in tpl.stream(title=cfg.get("title"), raw_json=None, raw_json_href=writer.href(raw_path),
+                                tables=tables, **context):
+            writer.write(chunk)
+
+    return {
+        "status": "success",
+        "format": "html",
+        "renderer": "builtin",
+        "streamed": True,
+        **writer.summary(),
+    }
+
+
 def _render_markdown(drift, eda, cfg) -> str:
     title = cfg.get("title") or ("Drift Report" if drift else "EDA Report")
     lines = [f"# {title}", ""]
@@ -193,6 +244,15 @@ def render_report(
         False, "--json",
         help="Emit machine-readable JSON envelope to stdout instead of pretty progress.",
     ),
+    stream: bool = typer.Option(
+        False, "--stream",
+        help="HTML only: write the report incrementally, page large tables into <out>_files/ "
+             "and link the raw envelope instead of inlining it.",
+    ),
+    page_size: int = typer.Option(
+        DEFAULT_PAGE_SIZE, "--page-size",
+        help="Rows per table page with --stream (the first page is inline).",
+    ),
 ):
     """Render a drift / EDA envelope to an HTML, PDF, or Markdown report.
 
@@ -200,6 +260,7 @@ def render_report(
         ddoc report render --input drift.json --out report.html
         ddoc report render -i drift.json -o report.pdf --title "Q4 release drift"
         ddoc report render -i eda.json -o eda.md
+        ddoc report render -i drift.json -o report.html --stream --page-size 200
     """
     fmt = (format or output.suffix.lstrip(".")).lower()
     if fmt not in ("html", "pdf", "md"):
@@ -215,8 +276,14 @@ def render_report(
         rprint(f"[red]❌ Failed to parse {input}: {e}[/red]")
         raise typer.Exit(code=2)
 
+    if stream and fmt != "html":
+        rprint(f"[red]❌ --stream only supports html output, not {fmt!r}.[/red]")
+        raise typer.Exit(code=2)
+
     drift_result, eda_result = _classify_envelope(payload)
     cfg = {"title": title}
+    if stream:
+        cfg.update(stream=True, page_size=page_size)
 
     # Try plugin hookimpls first; fall back to built-in if all return None.
     pm = get_pmgr().pm
@@ -142,6 +142,10 @@ def inspect_snapshot(
 def checkout_snapshot(
     version: str = typer.Argument(..., help="Snapshot ID or alias"),
     force: bool = typer.Option(False, "-f", "--force", help="Force checkout even with uncommitted changes"),
+    fast: bool = typer.Option(
+        False, "--fast",
+        help="Restore only the data files that differ from the current snapshot, linking them from the local DVC cache (falls back to dvc checkout when objects are missing).",
+    ),
 ):
     """Restore (checkout) a snapshot"""
     from ddoc.core.snapshot_service import get_snapshot_service
@@ -149,7 +153,7 @@ def checkout_snapshot(
     snapshot_service = get_snapshot_service()
     
     print(f"[cyan]🔄 Restoring snapshot: {version}[/cyan]\n")
-    result = snapshot_service.restore_snapshot(version, force=force)
+    result = snapshot_service.restore_snapshot(version, force=force, fast=fast)
     
     if not result["success"]:
         print(f"[red]❌ Snapshot restore failed: {result['error']}[/red]")
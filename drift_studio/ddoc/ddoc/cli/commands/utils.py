@@ -1,5 +1,6 @@
 """Common utility functions for CLI commands"""
 import json
+import sys
 from typing import Optional, Any, Tuple
 from pathlib import Path
 
@@ -128,3 +129,31 @@ def _resolve_dataset_reference(dataset_ref: str) -> Tuple[str, Optional[str]]:
         return parts[0], parts[1]
     return dataset_ref, None
 
+
+def emit_progress(
+    progress: float,
+    stage: str,
+    message: str = "",
+    *,
+    enabled: bool = False,
+) -> None:
+    """Emit one NDJSON progress line on stderr (Phase 6 — orchestrator).
+
+    Schema (per `_specs/ddoc_orchestrator_pattern.md`):
+        {"progress": 0.0..1.0, "stage": "<short id>", "message": "..."}
+
+    Stderr is the channel because stdout is reserved for the final
+    ``--json`` envelope. ``enabled=False`` makes this a no-op so callers
+    can sprinkle invocations unconditionally.
+    """
+    if not enabled:
+        return
+    try:
+        line = json.dumps(
+            {"progress": float(progress), "stage": stage, "message": message},
+            ensure_ascii=False,
+        )
+    except (TypeError, ValueError):
+        return
+    sys.stderr.write(line + "\n")
+    sys.stderr.flush()
@@ -0,0 +1,269 @@
+"""
+Archive extraction engine for ddoc add
+
+Extracts ZIP members in parallel (every worker thread owns its own
+``ZipFile`` handle, so reads and inflation are independent) and streams
+tar archives member by member. Both paths:
+
+- flatten on the fly: a single top-level folder named like the archive
+  is stripped from member paths instead of moving the tree afterwards;
+- drop macOS metadata (``__MACOSX/``) without writing it;
+- hash every file while it is written, so ``dvc add`` and the restore
+  stat cache can reuse the digests instead of re-reading the data;
+- reject members that would land outside the extraction directory.
+"""
+import hashlib
+import os
+import shutil
+import tarfile
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Dict, Any, Optional, List, Tuple
+
+CHUNK_SIZE = 1024 * 1024
+SKIP_PREFIXES = ("__MACOSX/",)
+
+
+class UnsafeArchiveError(ValueError):
+    """Raised when an archive member would escape the extraction directory"""
+
+
+def archive_stem(archive_path: Path) -> str:
+    """Extraction folder name for an archive (``foo.tar.gz`` → ``foo``)"""
+    name = archive_path.name
+    for suffix in (".tar.gz", ".tar.bz2", ".tar.xz", ".tgz"):
+        if name.endswith(suffix):
+            return name[: -len(suffix)]
+    return archive_path.stem
+
+
+def _normalize_member(name: str) -> Optional[str]:
+    """Normalize a member name to a relative POSIX path (None = skip)"""
+    name = name.replace("\\", "/")
+    if any(name.startswith(prefix) for prefix in SKIP_PREFIXES):
+        return None
+    parts = [p for p in PurePosixPath(name).parts if p not in ("", ".")]
+    if not parts:
+        return None
+    if name.startswith("/") or parts[0].endswith(":") or ".." in parts:
+        raise UnsafeArchiveError(f"Unsafe path in archive: {name}")
+    return "/".join(parts)
+
+
+def _flatten_prefix(names: List[str], expected_name: str) -> Optional[str]:
+    """
+    Prefix to strip when every non-hidden top-level entry is a single folder
+    named ``expected_name`` (mirrors FileService._flatten_single_folder)
+    """
+    top_level = {n.split("/", 1)[0] for n in names}
+    visible = [t for t in top_level if not t.startswith(".")]
+    if visible == [expected_name] and any(n.startswith(expected_name + "/") for n in names):
+        return expected_name + "/"
+    return None
+
+
+class ArchiveService:
+    """Service for parallel, hashing archive extraction"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 2)
+
+    def _safe_target(self, root: Path, rel: str) -> Path:
+        target = (root / rel).resolve()
+        if target != root and root not in target.parents:
+            raise UnsafeArchiveError(f"Unsafe path in archive: {rel}")
+        return target
+
+    @staticmethod
+    def _copy_and_hash(src, dst: Path) -> Tuple[str, int]:
+        digest = hashlib.md5()
+        size = 0
+        with open(dst, "wb") as out:
+            while True:
+                chunk = src.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+        return digest.hexdigest(), size
+
+    # ------------------------------------------------------------------
+    # ZIP
+    # ------------------------------------------------------------------
+
+    def extract_zip(self, zip_path: Path, extract_dir: Path, expected_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Extract a ZIP archive with one independent reader per worker thread
+
+        Args:
+            zip_path: Archive to extract
+            extract_dir: Destination directory (created if missing)
+            expected_name: Folder name to flatten (defaults to the archive stem)
+
+        Returns:
+            ``{"extract_dir", "hashes": {relpath: {"md5", "size"}}, "files"}``
+        """
+        expected_name = expected_name or archive_stem(zip_path)
+        extract_dir.mkdir(parents=True, exist_ok=True)
+        root = extract_dir.resolve()
+
+        with zipfile.ZipFile(zip_path, "r") as zf:
+            members = []
+            for info in zf.infolist():
+                rel = _normalize_member(info.filename)
+                if rel is not None:
+                    members.append((info, rel, info.is_dir()))
+
+        prefix = _flatten_prefix([rel for _, rel, _ in members], expected_name)
+        files: List[Tuple[zipfile.ZipInfo, str]] = []
+        for info, rel, is_dir in members:
+            if prefix:
+                if rel + "/" == prefix:
+                    continue
+                if rel.startswith(prefix):
+                    rel = rel[len(prefix):]
+            target = self._safe_target(root, rel)
+            if is_dir:
+                target.mkdir(parents=True, exist_ok=True)
+            else:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                files.append((info, rel))
+
+        local = threading.local()
+        handles: List[zipfile.ZipFile] = []
+        handles_lock = threading.Lock()
+
+        def _extract(item: Tuple[zipfile.ZipInfo, str]) -> Tuple[str, str, int]:
+            info, rel = item
+            zf = getattr(local, "zf", None)
+            if zf is None:
+                zf = local.zf = zipfile.ZipFile(zip_path, "r")
+                with handles_lock:
+                    handles.append(zf)
+            with zf.open(info, "r") as src:
+                md5, size = self._copy_and_hash(src, root / rel)
+            return rel, md5, size
+
+        # Largest members first so one big file doesn't finish the run alone
+        files.sort(key=lambda item: item[0].file_size, reverse=True)
+        hashes: Dict[str, Dict[str, Any]] = {}
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for rel, md5, size in executor.map(_extract, files):
+                    hashes[rel] = {"md5": md5, "size": size}
+        finally:
+            for zf in handles:
+                zf.close()
+
+        return {"extract_dir": extract_dir, "hashes": hashes, "files": len(hashes)}
+
+    # ------------------------------------------------------------------
+    # TAR
+    # ------------------------------------------------------------------
+
+    def extract_tar(self, tar_path: Path, extract_dir: Path, expected_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Extract a tar / tar.gz archive in one streaming pass
+
+        Compressed tar streams can't be read at random offsets, so members
+        are processed sequentially. The flatten decision is taken from the
+        first visible member and applied while writing; if a second
+        top-level entry shows up later, the few entries already written are
+        moved back under ``expected_name/``.
+
+        Returns:
+            Same shape as :meth:`extract_zip`
+        """
+        expected_name = expected_name or archive_stem(tar_path)
+        extract_dir.mkdir(parents=True, exist_ok=True)
+        root = extract_dir.resolve()
+
+        hashes: Dict[str, Dict[str, Any]] = {}
+        flatten: Optional[bool] = None
+        stripped_tops = set()
+
+        def _map(rel: str) -> str:
+            if flatten and rel.startswith(expected_name + "/"):
+                return rel[len(expected_name) + 1:]
+            return rel
+
+        with tarfile.open(tar_path, "r|*") as tar:
+            for member in tar:
+                rel = _normalize_member(member.name)
+                if rel is None:
+                    continue
+                top, _, rest = rel.partition("/")
+                if not top.startswith("."):
+                    if flatten is None:
+                        flatten = top == expected_name and (bool(rest) or member.isdir())
+                    elif flatten and top != expected_name:
+                        self._unflatten(root, expected_name, stripped_tops, hashes)
+                        flatten = False
+                if flatten and top == expected_name:
+                    if not rest:
+                        continue
+                    stripped_tops.add(rest.split("/", 1)[0])
+                rel = _map(rel)
+
+                target = self._safe_target(root, rel)
+                if member.isdir():
+                    target.mkdir(parents=True, exist_ok=True)
+                elif member.isfile():
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    md5, size = self._copy_and_hash(tar.extractfile(member), target)
+                    hashes[rel] = {"md5": md5, "size": size}
+                elif member.issym():
+                    resolved = (target.parent / member.linkname).resolve()
+                    if resolved != root and root not in resolved.parents:
+                        raise UnsafeArchiveError(f"Unsafe link in archive: {member.name}")
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    os.symlink(member.linkname, target)
+                elif member.islnk():
+                    link_rel = _normalize_member(member.linkname)
+                    source = self._safe_target(root, _map(link_rel)) if link_rel else None
+                    if source is None or not source.is_file():
+                        raise UnsafeArchiveError(f"Unsafe link in archive: {member.name}")
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copyfile(source, target)
+                    # Only regular-file members carry a digest; a hardlink to a
+                    # symlink member is copied but left for DVC to hash
+                    if _map(link_rel) in hashes:
+                        hashes[rel] = dict(hashes[_map(link_rel)])
+                # Devices, FIFOs etc. are never extracted
+
+        return {"extract_dir": extract_dir, "hashes": hashes, "files": len(hashes)}
+
+    def _unflatten(
+        self,
+        root: Path,
+        expected_name: str,
+        stripped_tops: set,
+        hashes: Dict[str, Dict[str, Any]]
+    ) -> None:
+        """Undo on-the-fly flattening once the archive turns out to have several roots"""
+        nested = root / expected_name
+        nested.mkdir(parents=True, exist_ok=True)
+        for name in stripped_tops:
+            source = root / name
+            if source.exists() or source.is_symlink():
+                source.rename(nested / name)
+        for rel in list(hashes):
+            if rel.split("/", 1)[0] in stripped_tops:
+                hashes[f"{expected_name}/{rel}"] = hashes.pop(rel)
+        stripped_tops.clear()
+
+    def extract(self, archive_path: Path, target_dir: Path) -> Dict[str, Any]:
+        """Extract ``archive_path`` into ``target_dir/<archive stem>``"""
+        name = archive_stem(archive_path)
+        extract_dir = target_dir / name
+        if zipfile.is_zipfile(archive_path):
+            return self.extract_zip(archive_path, extract_dir, name)
+        return self.extract_tar(archive_path, extract_dir, name)
+
+
+def get_archive_service(max_workers: Optional[int] = None) -> ArchiveService:
+    """Factory function to get archive service instance"""
+    return ArchiveService(max_workers)
@@ -150,7 +150,8 @@ class CacheService:
         Args:
             snapshot_id: Snapshot ID
             data_hash: Data hash from DVC
-            cache_type: Type of cache ("summary", "embedding", "attributes", "file_metadata")
+            cache_type: Type of cache ("summary", "embedding", "attributes", "file_metadata",
+                or a namespaced "attributes_*" / "embedding_*" / "profile_*" type)
             data: Cache data to save
             metadata: Optional metadata
             
@@ -162,9 +163,9 @@ class CacheService:
             data_dir.mkdir(parents=True, exist_ok=True)
             
             # Save based on cache type (support namespaced types like attributes_image, embedding_text, etc.)
-            # JSON types: summary, attributes*, file_metadata
+            # JSON types: summary, attributes*, profile*, file_metadata
             # PKL types: embedding*, xai*
-            if cache_type in ["summary", "file_metadata"] or cache_type.startswith("attributes_"):
+            if cache_type in ["summary", "file_metadata"] or cache_type.startswith(("attributes_", "profile_")):
                 cache_file = data_dir / f"{cache_type}.json"
                 with open(cache_file, 'w') as f:
                     json.dump(data, f, indent=2, default=str)
@@ -245,9 +246,9 @@ class CacheService:
         data_dir = self.get_data_hash_dir(data_hash)
         
         # Load based on cache type (support namespaced types)
-        # JSON types: summary, attributes*, file_metadata
+        # JSON types: summary, attributes*, profile*, file_metadata
         # PKL types: embedding*, xai*
-        if cache_type in ["summary", "file_metadata"] or cache_type.startswith("attributes_"):
+        if cache_type in ["summary", "file_metadata"] or cache_type.startswith(("attributes_", "profile_")):
             cache_file = data_dir / f"{cache_type}.json"
             if not cache_file.exists():
                 return None
@@ -319,6 +320,57 @@ class CacheService:
                     continue
         return out
 
+    def save_reference_profile(
+        self,
+        snapshot_id: str,
+        data_hash: str,
+        profile: Any,
+    ) -> Dict[str, Any]:
+        """
+        Save a reference profile as ``profile_<modality>.json``
+
+        Args:
+            snapshot_id: Snapshot ID
+            data_hash: Data hash the profile describes
+            profile: ``ReferenceProfile`` (see ``ddoc.core.reference_profile``)
+
+        Returns:
+            Result dictionary
+        """
+        profile.data_hash = data_hash
+        return self.save_analysis_cache(
+            snapshot_id=snapshot_id,
+            data_hash=data_hash,
+            cache_type=f"profile_{profile.modality}",
+            data=profile.to_dict(),
+        )
+
+    def load_reference_profile(
+        self,
+        modality: str,
+        snapshot_id: Optional[str] = None,
+        data_hash: Optional[str] = None,
+    ) -> Optional[Any]:
+        """
+        Load the reference profile saved for a modality
+
+        Returns:
+            ``ReferenceProfile`` or None when no (readable) profile exists
+        """
+        from .reference_profile import ReferenceProfile
+
+        data = self.load_analysis_cache(
+            snapshot_id=snapshot_id,
+            data_hash=data_hash,
+            cache_type=f"profile_{modality}",
+        )
+        if not data:
+            return None
+        try:
+            return ReferenceProfile.from_dict(data)
+        except (ValueError, KeyError, TypeError):
+            return None
+
     def _save_snapshot_mapping(self, snapshot_id: str, data_hash: str):
         """Save snapshot to data hash mapping (SQLite only)"""
         conn = sqlite3.connect(self.index_db)
@@ -387,7 +439,7 @@ class CacheService:
                         cache_types.append("summary")
                     elif name == "file_metadata.json":
                         cache_types.append("file_metadata")
-                    elif name.startswith("attributes") and name.endswith(".json"):
+                    elif name.startswith(("attributes", "profile_")) and name.endswith(".json"):
                         # Extract cache type: attributes_image.json -> attributes_image
                         cache_type = name[:-5]  # Remove .json
                         if cache_type not in cache_types:
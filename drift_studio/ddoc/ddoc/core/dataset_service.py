@@ -2,7 +2,6 @@
 Dataset Service for ddoc
 """
 import json
-import yaml
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, List, Optional
@@ -12,6 +11,7 @@ from ..ops.core_ops import CoreOpsPlugin
 from .version_service import get_version_service
 from .metadata_service import get_metadata_service
 from .staging_service import get_staging_service
+from .registry import get_registry
 
 
 class DatasetService:
@@ -25,6 +25,7 @@ class DatasetService:
         self.version_service = get_version_service(project_root)
         self.metadata_service = get_metadata_service(project_root)
         self.staging_service = get_staging_service(project_root)
+        self.registry = get_registry()
     
     def stage_dataset(
         self, 
@@ -250,24 +251,16 @@ class DatasetService:
         """Update params.yaml with dataset configuration"""
         try:
             params_file = self.project_root / "params.yaml"
-            if params_file.exists():
-                with open(params_file, 'r') as f:
-                    params = yaml.safe_load(f) or {}
-            else:
-                params = {}
-            
-            # Add dataset configuration
-            if 'datasets' not in params:
-                params['datasets'] = {}
-            
-            params['datasets'][name] = {
-                'path': f"data/{name}",
-                'config': config,
-                'created_at': datetime.now().isoformat()
-            }
-            
-            with open(params_file, 'w') as f:
-                yaml.dump(params, f, default_flow_style=False)
+            with self.registry.transaction(params_file, default={}) as params:
+                # Add dataset configuration
+                if 'datasets' not in params:
+                    params['datasets'] = {}
+                
+                params['datasets'][name] = {
+                    'path': f"data/{name}",
+                    'config': config,
+                    'created_at': datetime.now().isoformat()
+                }
             
             # Stage params.yaml
             # Git operations (optional - only if Git repository exists)
@@ -302,7 +295,7 @@ class DatasetService:
                     'path': str(dataset_path),  # Actual dataset path
                     'dvc_file': str(dvc_file_path),  # DVC file path
                     'registered_at': mapping_info.get('registered_at', ''),
-                    'formats': self._get_dataset_formats(dataset_path)
+                    'formats': self._get_dataset_formats(dataset_path, dvc_file_path)
                 })
         
         # Sort by registration time (newest first)
@@ -323,27 +316,25 @@ class DatasetService:
             if dvc_file.is_file() and str(dvc_file) not in mapped_dvc_files:
                 try:
                     # Get dataset info from DVC file
-                    with open(dvc_file, 'r') as f:
-                        import yaml
-                        dvc_data = yaml.safe_load(f)
-                        if 'outs' in dvc_data and dvc_data['outs']:
-                            dataset_path = Path(dvc_data['outs'][0]['path'])
-                            if not dataset_path.is_absolute():
-                                dataset_path = dvc_file.parent / dataset_path
+                    dvc_data = self.registry.read_yaml(dvc_file, default={})
+                    if 'outs' in dvc_data and dvc_data['outs']:
+                        dataset_path = Path(dvc_data['outs'][0]['path'])
+                        if not dataset_path.is_absolute():
+                            dataset_path = dvc_file.parent / dataset_path
+                        
+                        if dataset_path.exists():
+                            # Use DVC file name as dataset name for migration
+                            dataset_name = dvc_file.stem
                             
-                            if dataset_path.exists():
-                                # Use DVC file name as dataset name for migration
-                                dataset_name = dvc_file.stem
-                                
-                                # Store the mapping
-                                self.metadata_service.store_dataset_mapping(
-                                    dataset_name, 
-                                    str(dvc_file), 
-                                    str(dataset_path)
-                                )
-                                
-                                print(f"  ✅ Migrated: {dataset_name} -> {dataset_path}")
-                                migrated_count += 1
+                            # Store the mapping
+                            self.metadata_service.store_dataset_mapping(
+                                dataset_name, 
+                                str(dvc_file), 
+                                str(dataset_path)
+                            )
+                            
+                            print(f"  ✅ Migrated: {dataset_name} -> {dataset_path}")
+                            migrated_count += 1
                 except Exception as e:
                     print(f"  ⚠️ Failed to migrate {dvc_file}: {e}")
         
@@ -352,15 +343,27 @@ class DatasetService:
         else:
             print("[green]✅ No datasets needed migration[/green]")
     
-    def _get_dataset_formats(self, dataset_path: Path) -> List[str]:
-        """Get file formats in dataset"""
-        formats = set()
-        for file_path in dataset_path.rglob('*'):
-            if file_path.is_file():
-                suffix = file_path.suffix.lower()
-                if suffix:
-                    formats.add(suffix)
-        return list(formats)
+    def _get_dataset_formats(self, dataset_path: Path, dvc_file_path: Optional[Path] = None) -> List[str]:
+        """Get file formats in dataset
+        
+        The directory walk is memoized in the shared registry and only
+        repeated when the dataset's .dvc file or top-level directory changes,
+        so listing N datasets no longer walks N trees on every call.
+        """
+        def _scan() -> List[str]:
+            formats = set()
+            for file_path in dataset_path.rglob('*'):
+                if file_path.is_file():
+                    suffix = file_path.suffix.lower()
+                    if suffix:
+                        formats.add(suffix)
+            return list(formats)
+        
+        key = (
+            self.registry.signature(dvc_file_path) if dvc_file_path else None,
+            self.registry.signature(dataset_path),
+        )
+        return self.registry.derived("dataset_formats", str(dataset_path.resolve()), key, _scan)
     
     def commit_staged_datasets(
         self,
@@ -0,0 +1,277 @@
+"""
+Drift result cache
+
+Memoizes drift results under a key derived only from *what* was compared
+and *how*:
+
+    (ref data hash, cur data hash, plugin set, detector, fusion mode,
+     analyzer version)
+
+Snapshot mode uses the DVC data hashes; path mode (and the backend) use
+``DriftResultCache.fingerprint``, a content hash of the dataset that ignores where
+it lives and what it is called — so a renamed or re-registered dataset
+with the same bytes still hits the cache.
+
+Entries live under ``.ddoc/cache/drift/<kk>/<key>.json``. The analyzer
+version is part of every key and is also recorded in
+``.ddoc/cache/drift/VERSION``; when it changes (ddoc upgrade or a bump of
+``DRIFT_ANALYZER_VERSION``) the stale entries are dropped on first use.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, Iterable, List, Tuple
+
+from ddoc import __version__
+
+# Bump when a change in drift computation makes stored results stale
+DRIFT_ANALYZER_VERSION = "1"
+ANALYZER_VERSION = f"{DRIFT_ANALYZER_VERSION}+ddoc{__version__}"
+
+_HASH_CHUNK = 1 << 20
+
+
+def drift_cache_key(
+    ref_hash: str,
+    cur_hash: str,
+    plugin: str,
+    detector: str = "default",
+    fusion: str = "none",
+    analyzer_version: str = ANALYZER_VERSION,
+    options: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Stable cache key for one drift comparison
+
+    Args:
+        ref_hash: Reference data hash (DVC hash or ``DriftResultCache.fingerprint``)
+        cur_hash: Current data hash
+        plugin: Signature of the analyzer(s) that produce the result
+            (e.g. ``"ddoc_vision==0.3.1,ddoc_text==0.2.0"``)
+        detector: Detector strategy
+        fusion: Multi-modality fusion mode
+        analyzer_version: Version tag; bumping it invalidates every key
+        options: Any other setting that changes the result
+            (fusion weights, ``with_embeddings``, ...)
+
+    Returns:
+        Hex sha256 key
+    """
+    payload = {
+        "ref": ref_hash,
+        "cur": cur_hash,
+        "plugin": plugin,
+        "detector": (detector or "default").lower(),
+        "fusion": (fusion or "none").lower(),
+        "analyzer_version": analyzer_version,
+        "options": options or {},
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _walk_files(root: Path, exclude_suffixes: Tuple[str, ...]) -> List[Tuple[str, Path]]:
+    """``(relative posix path, path)`` for every file under ``root``, sorted"""
+    if root.is_file():
+        return [("", root)]
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [
+            d for d in dirnames
+            if not d.startswith(".") and not (exclude_suffixes and d.endswith(exclude_suffixes))
+        ]
+        for name in filenames:
+            if name.startswith("."):
+                continue
+            path = Path(dirpath) / name
+            files.append((path.relative_to(root).as_posix(), path))
+    files.sort()
+    return files
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DriftResultCache:
+    """File-backed drift result store keyed by ``drift_cache_key``"""
+
+    def __init__(self, project_root: Optional[str] = None, analyzer_version: str = ANALYZER_VERSION):
+        self.project_root = Path(project_root) if project_root else Path.cwd()
+        self.root = self.project_root / ".ddoc" / "cache" / "drift"
+        self.fingerprint_dir = self.root / "fingerprints"
+        self.analyzer_version = analyzer_version
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._check_version()
+
+    # ------------------------------------------------------------------
+    # Versioning
+    # ------------------------------------------------------------------
+
+    def _check_version(self) -> None:
+        """Drop every stored result when the analyzer version changed"""
+        marker = self.root / "VERSION"
+        try:
+            stored = marker.read_text().strip()
+        except OSError:
+            stored = None
+        if stored == self.analyzer_version:
+            return
+        if stored is not None:
+            self.clear()
+        self._atomic_write(marker, self.analyzer_version)
+
+    def clear(self) -> int:
+        """Remove all stored results (fingerprints are kept); returns the count"""
+        removed = 0
+        for shard in self.root.iterdir():
+            if shard.is_dir() and len(shard.name) == 2:
+                removed += sum(1 for _ in shard.glob("*.json"))
+                shutil.rmtree(shard, ignore_errors=True)
+        return removed
+
+    # ------------------------------------------------------------------
+    # Results
+    # ------------------------------------------------------------------
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def _atomic_write(self, path: Path, text: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Stored entry for ``key``
+
+        Returns:
+            ``{"key", "analyzer_version", "created_at", "params", "result"}``
+            or None (missing, unreadable or from another analyzer version)
+        """
+        try:
+            with open(self._entry_path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if entry.get("analyzer_version") != self.analyzer_version:
+            return None
+        return entry
+
+    def put(self, key: str, result: Dict[str, Any], params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Store a drift result
+
+        Returns:
+            Result dictionary (``success`` / ``error``)
+        """
+        entry = {
+            "key": key,
+            "analyzer_version": self.analyzer_version,
+            "created_at": datetime.now().isoformat(),
+            "params": params or {},
+            "result": result,
+        }
+        try:
+            self._atomic_write(self._entry_path(key), json.dumps(entry, ensure_ascii=False, default=str))
+        except (OSError, TypeError, ValueError) as e:
+            return {"success": False, "error": f"Failed to store drift result: {e}"}
+        return {"success": True, "key": key}
+
+    def invalidate(self, key: str) -> bool:
+        try:
+            self._entry_path(key).unlink()
+            return True
+        except OSError:
+            return False
+
+    # ------------------------------------------------------------------
+    # Content fingerprints (path mode / backend)
+    # ------------------------------------------------------------------
+
+    def fingerprint(
+        self,
+        path: str,
+        exclude_suffixes: Iterable[str] = (),
+        max_workers: Optional[int] = None,
+    ) -> str:
+        """
+        Content hash of a file or directory tree
+
+        The hash covers relative paths and file bytes only, so the same
+        data under another name or location gets the same fingerprint.
+        The result is memoized against a stat signature (relative path,
+        size, mtime of every file); an unchanged tree is only stat'ed.
+
+        Args:
+            path: File or directory
+            exclude_suffixes: Directory name suffixes to skip (derived
+                data such as ``_extracted`` archive mirrors)
+            max_workers: Threads for hashing files
+
+        Returns:
+            Hex sha256 fingerprint
+        """
+        root = Path(path).resolve()
+        if not root.exists():
+            raise FileNotFoundError(f"Path not found: {path}")
+        exclude = tuple(exclude_suffixes)
+        files = _walk_files(root, exclude)
+
+        stat_sig = hashlib.sha256(str(root).encode("utf-8"))
+        for rel, file_path in files:
+            st = file_path.stat()
+            stat_sig.update(f"{rel}\0{st.st_size}\0{st.st_mtime_ns}\n".encode("utf-8"))
+        stat_sig = stat_sig.hexdigest()
+
+        memo = self.fingerprint_dir / f"{hashlib.sha256(str(root).encode('utf-8')).hexdigest()[:32]}.json"
+        try:
+            with open(memo, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("stat_sig") == stat_sig and cached.get("exclude") == list(exclude):
+                return cached["fingerprint"]
+        except (OSError, json.JSONDecodeError, KeyError):
+            pass
+
+        workers = max_workers or min(8, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            digests = list(pool.map(_file_digest, [p for _, p in files]))
+        content = hashlib.sha256()
+        for (rel, _), digest in zip(files, digests):
+            content.update(f"{rel}\0{digest}\n".encode("utf-8"))
+        fingerprint = content.hexdigest()
+
+        try:
+            self._atomic_write(memo, json.dumps({
+                "path": str(root),
+                "exclude": list(exclude),
+                "stat_sig": stat_sig,
+                "fingerprint": fingerprint,
+            }))
+        except OSError:
+            pass
+        return fingerprint
+
+
+def get_drift_result_cache(project_root: Optional[str] = None) -> DriftResultCache:
+    """Factory function to get drift result cache instance"""
+    return DriftResultCache(project_root)
@@ -0,0 +1,318 @@
+"""
+Pairwise drift matrix across many snapshots
+
+``ddoc analyze drift`` compares one pair at a time, so N snapshots cost
+N·(N−1)/2 runs that each reload both caches and rebuild every kernel.
+This module does the per-snapshot work once and only the genuinely
+pairwise work per pair:
+
+- **Once per snapshot** (``load_snapshot_side``): the ``attributes_*``
+  and ``embedding_*`` caches the ``drift_detect`` hooks read, turned into
+  a ``ReferenceProfile`` per modality (or the stored ``profile_*`` from
+  EDA) plus a fixed-size embedding sample.
+- **Once per modality** (``GramCache``): a shared standardization and
+  RBF bandwidth over all snapshots, so every pair is scored in the same
+  feature space, and each snapshot's self-similarity block
+  ``mean K(X, X)``.
+- **Per pair**: sketch comparison (PSI / KS / JS per attribute, embedding
+  projection PSI) and only the cross block ``mean K(X, Y)`` for MMD.
+
+Pairs run in a thread pool (the heavy parts are numpy / BLAS calls that
+release the GIL).
+"""
+import math
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from itertools import combinations
+from typing import Dict, Any, Optional, List, Callable, Tuple
+
+import numpy as np
+
+from ddoc.core.reference_profile import ReferenceProfile, build_profile, compare_reference
+
+DEFAULT_MAX_SAMPLES = 1000
+SAMPLE_SEED = 0
+
+# ``metric="auto"`` resolves to one metric per matrix: embedding MMD when
+# every compared modality has it, attribute PSI otherwise (never a mix,
+# since MMD and PSI are on different scales)
+PAIR_METRICS = ("auto", "mmd", "psi_mean", "psi_max", "mean_shift")
+
+
+@dataclass
+class SnapshotSide:
+    """Everything a snapshot contributes to the matrix, loaded once"""
+
+    snapshot_id: str
+    data_hash: Optional[str]
+    profiles: Dict[str, ReferenceProfile] = field(default_factory=dict)
+    samples: Dict[str, np.ndarray] = field(default_factory=dict)
+
+
+def _modality(cache_type: str, prefix: str) -> str:
+    """``attributes_image`` → ``image``; the bare legacy type → ``generic``"""
+    return cache_type[len(prefix) + 1:] if cache_type.startswith(prefix + "_") else "generic"
+
+
+def _embedding_matrix(cache: Any) -> Optional[np.ndarray]:
+    """``(n, dim)`` float array from an ``embedding_*`` cache, items sorted by key"""
+    if isinstance(cache, dict):
+        vectors = [cache[k]["embedding"] for k in sorted(cache)
+                   if isinstance(cache[k], dict) and cache[k].get("embedding") is not None]
+    else:
+        vectors = cache
+    if vectors is None or not len(vectors):
+        return None
+    matrix = np.asarray(vectors, dtype=np.float64)
+    if matrix.ndim != 2:
+        return None
+    return matrix
+
+
+def _subsample(matrix: np.ndarray, max_samples: int, seed: int = SAMPLE_SEED) -> np.ndarray:
+    """Deterministic row subsample (same rows for the same data on every run)"""
+    if max_samples <= 0 or matrix.shape[0] <= max_samples:
+        return matrix
+    rng = np.random.default_rng(seed)
+    idx = np.sort(rng.choice(matrix.shape[0], size=max_samples, replace=False))
+    return matrix[idx]
+
+
+def load_snapshot_side(
+    cache_service,
+    snapshot_id: str,
+    data_hash: Optional[str],
+    max_samples: int = DEFAULT_MAX_SAMPLES,
+) -> SnapshotSide:
+    """
+    Load one snapshot's attribute and embedding caches
+
+    Args:
+        cache_service: ``CacheService``
+        snapshot_id: Snapshot ID
+        data_hash: DVC data hash of the snapshot
+        max_samples: Embedding rows kept for kernel statistics
+
+    Returns:
+        ``SnapshotSide`` (empty when the snapshot has no analysis cache)
+    """
+    side = SnapshotSide(snapshot_id=snapshot_id, data_hash=data_hash)
+    attributes = cache_service.find_attribute_caches(snapshot_id=snapshot_id, data_hash=data_hash)
+
+    embeddings: Dict[str, np.ndarray] = {}
+    data_hash = data_hash or cache_service._get_data_hash_by_snapshot(snapshot_id)
+    if data_hash:
+        for path in sorted(cache_service.get_data_hash_dir(data_hash).glob("embedding*.pkl")):
+            matrix = _embedding_matrix(cache_service.load_analysis_cache(data_hash=data_hash, cache_type=path.stem))
+            if matrix is not None:
+                embeddings[_modality(path.stem, "embedding")] = matrix
+
+    for modality in sorted(set(_modality(t, "attributes") for t in attributes) | set(embeddings)):
+        profile = None
+        if modality != "generic":
+            profile = cache_service.load_reference_profile(modality, snapshot_id=snapshot_id, data_hash=data_hash)
+        if profile is None:
+            attrs = attributes.get(f"attributes_{modality}") or (attributes.get("attributes") if modality == "generic" else None)
+            profile = build_profile(modality, attributes=attrs, embeddings=embeddings.get(modality), data_hash=data_hash)
+        side.profiles[modality] = profile
+        if modality in embeddings:
+            side.samples[modality] = _subsample(embeddings[modality], max_samples)
+    return side
+
+
+def load_snapshot_sides(
+    cache_service,
+    snapshots: List[Tuple[str, Optional[str]]],
+    max_samples: int = DEFAULT_MAX_SAMPLES,
+    max_workers: Optional[int] = None,
+) -> List[SnapshotSide]:
+    """``load_snapshot_side`` for ``[(snapshot_id, data_hash), ...]`` in parallel, order preserved"""
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(
+            lambda item: load_snapshot_side(cache_service, item[0], item[1], max_samples), snapshots
+        ))
+
+
+def median_gamma(pooled: np.ndarray, seed: int = SAMPLE_SEED, max_rows: int = 500) -> float:
+    """RBF bandwidth ``1 / median squared distance`` over a subsample of ``pooled``"""
+    rows = _subsample(pooled, max_rows, seed)
+    sq = np.einsum("ij,ij->i", rows, rows)
+    dist = sq[:, None] + sq[None, :] - 2.0 * rows @ rows.T
+    upper = dist[np.triu_indices(rows.shape[0], k=1)]
+    median = float(np.median(upper[upper > 0])) if np.any(upper > 0) else 1.0
+    return 1.0 / median
+
+
+class GramCache:
+    """
+    RBF-kernel MMD with per-snapshot Gram blocks computed once
+
+    All samples of a modality share one standardization (pooled mean /
+    std) and one bandwidth (median pairwise distance of a pooled
+    subsample), so ``MMD²(i, j) = s_i + s_j − 2·c_ij`` where the self terms
+    ``s_i`` (unbiased, diagonal excluded) are computed once per snapshot
+    and only the cross term ``c_ij`` per pair.
+    """
+
+    def __init__(self, samples: Dict[str, np.ndarray], seed: int = SAMPLE_SEED):
+        pooled = np.vstack(list(samples.values()))
+        self.mean = pooled.mean(axis=0)
+        self.std = pooled.std(axis=0) + 1e-8
+        self.z = {sid: (x - self.mean) / self.std for sid, x in samples.items()}
+        self.sqnorms = {sid: np.einsum("ij,ij->i", z, z) for sid, z in self.z.items()}
+        self.gamma = median_gamma(np.vstack(list(self.z.values())), seed)
+        self.self_terms: Dict[str, float] = {}
+
+    def _block_mean(self, a: str, b: str, exclude_diagonal: bool = False) -> float:
+        dist = self.sqnorms[a][:, None] + self.sqnorms[b][None, :] - 2.0 * self.z[a] @ self.z[b].T
+        kernel = np.exp(-self.gamma * np.maximum(dist, 0.0))
+        if not exclude_diagonal:
+            return float(kernel.mean())
+        n = kernel.shape[0]
+        if n < 2:
+            return 1.0
+        return float((kernel.sum() - np.trace(kernel)) / (n * (n - 1)))
+
+    def prepare(self, max_workers: Optional[int] = None) -> "GramCache":
+        """Compute every snapshot's self term (in parallel)"""
+        ids = list(self.z)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            terms = pool.map(lambda sid: self._block_mean(sid, sid, exclude_diagonal=True), ids)
+        self.self_terms = dict(zip(ids, terms))
+        return self
+
+    def mmd(self, a: str, b: str) -> float:
+        for sid in (a, b):
+            if sid not in self.self_terms:
+                self.self_terms[sid] = self._block_mean(sid, sid, exclude_diagonal=True)
+        value = self.self_terms[a] + self.self_terms[b] - 2.0 * self._block_mean(a, b)
+        return float(math.sqrt(max(value, 0.0)))
+
+
+def _resolve_metric(results: List[Dict[str, Any]], metric: str) -> str:
+    """Concrete metric for ``results`` (``auto`` → ``mmd`` only if every result has it)"""
+    if metric != "auto":
+        return metric
+    return "mmd" if results and all("mmd" in r for r in results) else "psi_mean"
+
+
+def _pair_score(modalities: Dict[str, Dict[str, Any]], metric: str) -> Optional[float]:
+    """Ranking score of one pair: the worst modality under a concrete ``metric``"""
+    scores = [result[metric] for result in modalities.values() if result.get(metric) is not None]
+    return max(scores) if scores else None
+
+
+def _compare_pair(
+    ref: SnapshotSide,
+    cur: SnapshotSide,
+    grams: Dict[str, GramCache],
+) -> Dict[str, Any]:
+    modalities: Dict[str, Dict[str, Any]] = {}
+    for modality in sorted(set(ref.profiles) & set(cur.profiles)):
+        report = compare_reference(ref.profiles[modality], cur.profiles[modality])
+        summary = report["summary"]
+        result: Dict[str, Any] = {
+            "status": summary["status"],
+            "psi_mean": summary["psi_mean"],
+            "psi_max": summary["psi_max"],
+            "drifted_columns": summary["drifted_columns"],
+        }
+        if report["embedding"]:
+            result["mean_shift"] = report["embedding"]["mean_shift"]
+            result["embedding_psi"] = report["embedding"]["psi"]
+        gram = grams.get(modality)
+        if gram is not None and ref.snapshot_id in gram.z and cur.snapshot_id in gram.z:
+            result["mmd"] = round(gram.mmd(ref.snapshot_id, cur.snapshot_id), 6)
+        modalities[modality] = result
+    return {
+        "ref": ref.snapshot_id,
+        "cur": cur.snapshot_id,
+        "score": None,
+        "modalities": modalities,
+    }
+
+
+def drift_matrix(
+    sides: List[SnapshotSide],
+    metric: str = "auto",
+    top: int = 10,
+    max_workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, Any]:
+    """
+    All-pairs drift between loaded snapshots
+
+    Args:
+        sides: Snapshots in display order (oldest first); ``ref`` of a pair
+            is always the earlier one
+        metric: Ranking metric, one of ``PAIR_METRICS``; ``auto`` is resolved
+            once for the whole matrix (and once per modality matrix), so
+            every score in a matrix is on the same scale
+        top: Number of most-drifted pairs to report
+        max_workers: Threads for pair comparisons
+        progress: Optional ``callback(done, total)``
+
+    Returns:
+        ``{"snapshots", "metric", "matrix", "modality_metrics",
+        "modality_matrices", "pairs", "top_pairs", "kernel"}``; ``metric`` /
+        ``modality_metrics`` are the resolved metrics, ``matrix`` is
+        symmetric N×N with ``None`` where a pair shares no modality
+    """
+    if metric not in PAIR_METRICS:
+        raise ValueError(f"metric must be one of {PAIR_METRICS}, got {metric!r}")
+
+    ids = [s.snapshot_id for s in sides]
+    grams: Dict[str, GramCache] = {}
+    for modality in sorted({m for s in sides for m in s.samples}):
+        samples = {s.snapshot_id: s.samples[modality] for s in sides if modality in s.samples}
+        if len(samples) >= 2:
+            grams[modality] = GramCache(samples).prepare(max_workers)
+
+    index_pairs: List[Tuple[int, int]] = list(combinations(range(len(sides)), 2))
+    results: List[Optional[Dict[str, Any]]] = [None] * len(index_pairs)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(_compare_pair, sides[i], sides[j], grams): n
+            for n, (i, j) in enumerate(index_pairs)
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            results[futures[future]] = future.result()
+            if progress:
+                progress(done, len(index_pairs))
+
+    by_modality: Dict[str, List[Dict[str, Any]]] = {}
+    for pair in results:
+        for modality, result in pair["modalities"].items():
+            by_modality.setdefault(modality, []).append(result)
+    resolved = _resolve_metric([r for rs in by_modality.values() for r in rs], metric)
+    modality_metrics = {m: _resolve_metric(rs, metric) for m, rs in sorted(by_modality.items())}
+
+    n = len(sides)
+    matrix: List[List[Optional[float]]] = [[0.0 if i == j else None for j in range(n)] for i in range(n)]
+    modality_matrices: Dict[str, List[List[Optional[float]]]] = {}
+    for (i, j), pair in zip(index_pairs, results):
+        pair["score"] = _pair_score(pair["modalities"], resolved)
+        matrix[i][j] = matrix[j][i] = pair["score"]
+        for modality, result in pair["modalities"].items():
+            grid = modality_matrices.setdefault(
+                modality, [[0.0 if a == b else None for b in range(n)] for a in range(n)]
+            )
+            value = _pair_score({modality: result}, modality_metrics[modality])
+            grid[i][j] = grid[j][i] = value
+
+    ranked = sorted((p for p in results if p["score"] is not None), key=lambda p: p["score"], reverse=True)
+    return {
+        "snapshots": ids,
+        "metric": resolved,
+        "matrix": matrix,
+        "modality_metrics": modality_metrics,
+        "modality_matrices": modality_matrices,
+        "pairs": results,
+        "top_pairs": [
+            {"ref": p["ref"], "cur": p["cur"], "score": p["score"],
+             "status": {m: r["status"] for m, r in p["modalities"].items()}}
+            for p in ranked[:max(top, 0)]
+        ],
+        "kernel": {m: {"gamma": round(g.gamma, 8), "samples": {k: int(v.shape[0]) for k, v in g.z.items()}}
+                   for m, g in grams.items()},
+    }
@@ -2,13 +2,13 @@
 File management service for ddoc (add command implementation)
 """
 import shutil
-import zipfile
-import tarfile
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 import subprocess
 from rich import print
 
+from .archive_service import get_archive_service
+
 
 class FileService:
     """Service for managing file operations (add command)"""
@@ -18,6 +18,8 @@ class FileService:
         self.data_dir = self.project_root / "data"
         self.code_dir = self.project_root / "code"
         self.notebooks_dir = self.project_root / "notebooks"
+        # data/-relative path -> md5 for files hashed during extraction
+        self._extracted_hashes: Dict[str, str] = {}
     
     def add_data(self, source: str, auto_dvc: bool = True, auto_git: bool = True) -> Dict[str, Any]:
         """
@@ -222,67 +224,20 @@ class FileService:
         Handles nested single-folder archives by flattening them:
         - If archive contains only one folder with same name, move contents up one level
         - Example: yolo_reference.zip containing yolo_reference/ → data/yolo_reference/
-        """
-        # Create extraction directory based on zip name
-        extract_dir = target_dir / zip_path.stem
-        extract_dir.mkdir(parents=True, exist_ok=True)
-        
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_dir)
-        
-        # Remove macOS metadata folder if present
-        macosx_dir = extract_dir / "__MACOSX"
-        if macosx_dir.exists():
-            shutil.rmtree(macosx_dir)
-        
-        # Check for nested single folder with same name
-        self._flatten_single_folder(extract_dir, zip_path.stem)
         
-        return extract_dir
-    
-    def _flatten_single_folder(self, extract_dir: Path, expected_name: str) -> None:
-        """
-        Flatten single nested folder if it matches the expected name.
-        
-        Example:
-            Before: data/yolo_reference/yolo_reference/train/
-            After:  data/yolo_reference/train/
-        
-        Args:
-            extract_dir: Directory where archive was extracted
-            expected_name: Expected folder name (usually same as archive stem)
+        Members are extracted in parallel by ArchiveService, which rewrites
+        member paths to flatten on the fly and hashes files as it writes them.
         """
-        # Get list of items in extract directory (excluding hidden files)
-        items = [item for item in extract_dir.iterdir() if not item.name.startswith('.')]
-        
-        # Check if there's exactly one item and it's a directory with matching name
-        if len(items) == 1 and items[0].is_dir() and items[0].name == expected_name:
-            nested_folder = items[0]
-            
-            # Move all contents from nested folder to parent
-            # Use a temporary directory to avoid conflicts
-            temp_dir = extract_dir.parent / f"_temp_{expected_name}"
-            nested_folder.rename(temp_dir)
-            
-            # Move all items from temp to extract_dir
-            for item in temp_dir.iterdir():
-                dest = extract_dir / item.name
-                # If dest exists, remove it first (shouldn't happen in normal cases)
-                if dest.exists():
-                    if dest.is_dir():
-                        shutil.rmtree(dest)
-                    else:
-                        dest.unlink()
-                item.rename(dest)
-            
-            # Remove the now-empty temp directory
-            temp_dir.rmdir()
+        result = get_archive_service().extract_zip(zip_path, target_dir / zip_path.stem, zip_path.stem)
+        self._remember_hashes(result)
+        return result["extract_dir"]
     
     def _extract_tar(self, tar_path: Path, target_dir: Path) -> Path:
         """
         Extract tar/tar.gz file to target directory.
         
-        Handles nested single-folder archives by flattening them.
+        Handles nested single-folder archives by flattening them. The archive
+        is streamed once; files are hashed while they are written.
         """
         # Create extraction directory based on tar name
         if tar_path.name.endswith('.tar.gz'):
@@ -292,24 +247,54 @@ class FileService:
         else:
             extract_name = tar_path.stem
         
-        extract_dir = target_dir / extract_name
-        extract_dir.mkdir(parents=True, exist_ok=True)
-        
-        with tarfile.open(tar_path, 'r:*') as tar_ref:
-            tar_ref.extractall(extract_dir)
+        result = get_archive_service().extract_tar(tar_path, target_dir / extract_name, extract_name)
+        self._remember_hashes(result)
+        return result["extract_dir"]
+    
+    def _remember_hashes(self, extract_result: Dict[str, Any]) -> None:
+        """Keep extraction-time digests (keyed relative to data/) for reuse"""
+        try:
+            prefix = Path(extract_result["extract_dir"]).resolve().relative_to(self.data_dir.resolve())
+        except ValueError:
+            return
+        for rel, info in extract_result["hashes"].items():
+            if info.get("md5"):
+                self._extracted_hashes[(prefix / rel).as_posix()] = info["md5"]
+    
+    def _seed_hash_caches(self) -> None:
+        """
+        Hand extraction-time digests to DVC's state DB and to the restore
+        stat cache so ``dvc add`` and ``snapshot checkout --fast`` skip
+        re-hashing freshly extracted files. Best-effort: any failure just
+        means DVC hashes the files itself.
+        """
+        if not self._extracted_hashes:
+            return
         
-        # Remove macOS metadata folder if present
-        macosx_dir = extract_dir / "__MACOSX"
-        if macosx_dir.exists():
-            shutil.rmtree(macosx_dir)
+        from .restore_service import get_restore_service
+        try:
+            get_restore_service(str(self.project_root)).record_hashes(self._extracted_hashes)
+        except Exception:
+            pass
         
-        # Check for nested single folder with same name
-        self._flatten_single_folder(extract_dir, extract_name)
+        try:
+            from dvc.repo import Repo
+            from dvc_data.hashfile.hash_info import HashInfo
+            
+            with Repo(str(self.project_root)) as repo:
+                items = [
+                    (str((self.data_dir / rel).resolve()), HashInfo("md5", md5), None)
+                    for rel, md5 in self._extracted_hashes.items()
+                ]
+                repo.state.save_many(items, repo.fs)
+        except Exception:
+            pass
         
-        return extract_dir
+        self._extracted_hashes = {}
     
     def _dvc_add_data(self) -> Dict[str, Any]:
         """Run dvc add on data/ directory"""
+        self._seed_hash_caches()
         try:
             result = subprocess.run(
                 ["dvc", "add", "data/"],
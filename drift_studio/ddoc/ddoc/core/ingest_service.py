@@ -15,23 +15,36 @@ Layout written to disk (per ingest run, idempotent):
     ├── decisions/
     │   └── decisions_<UTC ts>.csv          # one row per DecisionRecord
     │   └── decisions_<UTC ts>.parquet      # if pyarrow available + parquet flag
+    │   └── parquet/<key>=<value>/          # partitioned dataset (partition_by)
+    │       └── part-<UTC ts>.parquet
     ├── drift_reports/
     │   └── drift_<UTC ts>.json             # one envelope's drift_report payload
     ├── _manifest.jsonl                     # one line per ingest run
+    ├── _ingested.jsonl                     # one line per consumed envelope (sha256)
     └── .processed/
         └── <original_filename>             # source files that were consumed
 
 Source files are either moved into ``.processed/`` (default) or deleted
 when ``mode="delete"``. Re-ingesting a directory is a no-op for files
-already in ``.processed/``.
+already in ``.processed/``, and envelopes whose content hash is already
+listed in ``_ingested.jsonl`` are consumed without producing rows again.
+
+Large drops (field sites push tens of thousands of envelopes a day) are
+parsed by a process pool in bounded batches; rows are streamed to the
+CSV and to parquet row groups as each batch completes, so memory stays
+flat regardless of the number of envelopes.
 """
 
 from __future__ import annotations
 
 import csv
+import hashlib
 import json
+import os
+import re
 import shutil
 import uuid
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone
 from pathlib import Path
@@ -40,10 +53,24 @@ from typing import Any, Iterable, Optional
 from ddoc.core.io import write_json
 from ddoc.core.logging import get_logger
 
+try:  # optional fast parser — same semantics as json.loads for our payloads
+    import orjson as _orjson  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - exercised only without orjson
+    _orjson = None
+
 logger = get_logger(__name__)
 
 SUPPORTED_PROTOCOLS = frozenset({"1.1"})
 DEFAULT_INBOX_REL = ".ddoc/inbox"
+INGESTED_INDEX_NAME = "_ingested.jsonl"
+PARTITION_KEYS = frozenset({"date", "source"})
+
+# Process pool is only worth its start-up cost for larger drops.
+PARALLEL_MIN_FILES = 32
+# Envelopes submitted to the pool per batch — bounds in-flight parsed rows.
+BATCH_FILES = 512
+# Rows buffered per parquet partition before a row group is flushed.
+PARQUET_ROW_GROUP = 50_000
 
 
 # ── Schema mirrors (frozen — keep in sync with keti_veritas envelope) ─
@@ -106,10 +133,12 @@ class IngestOutcome:
     files_seen: int = 0
     files_processed: int = 0
     files_skipped: list[dict[str, Any]] = field(default_factory=list)
+    files_duplicate: int = 0
     decision_rows: int = 0
     drift_reports: int = 0
     decisions_path: Optional[str] = None
     drift_paths: list[str] = field(default_factory=list)
+    parquet_paths: list[str] = field(default_factory=list)
     manifest_path: Optional[str] = None
 
     def to_dict(self) -> dict[str, Any]:
@@ -190,89 +219,305 @@ def _parse_envelope(payload: dict[str, Any]) -> tuple[IngestEnvelopeSource, list
 # ── Writers ────────────────────────────────────────────────────────────
 
 
-def _write_decisions_csv(
-    rows: list[IngestDecisionRecord],
-    *,
-    out_path: Path,
-    site_id: str,
-    ingested_at: str,
-    source_file: str,
-) -> None:
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    with out_path.open("w", encoding="utf-8", newline="") as fh:
-        writer = csv.DictWriter(fh, fieldnames=DECISION_CSV_COLUMNS)
-        writer.writeheader()
-        for r in rows:
-            writer.writerow({
-                "id": r.id,
-                "created_at": r.created_at,
-                "decision_type": r.decision_type,
-                "decision": r.decision,
-                "model_name": r.model_name or "",
-                "model_version": r.model_version or "",
-                "threshold_applied": (
-                    "" if r.threshold_applied is None
-                    else f"{r.threshold_applied:.6g}"
-                ),
-                "scores_json": json.dumps(r.scores, ensure_ascii=False) if r.scores else "",
-                "inputs_ref_json": json.dumps(r.inputs_ref, ensure_ascii=False) if r.inputs_ref else "",
-                "result_summary": r.result_summary or "",
-                "trace_json": json.dumps(r.trace, ensure_ascii=False) if r.trace else "",
-                "site_id": site_id,
-                "ingested_at": ingested_at,
-                "source_file": source_file,
-            })
+def _append_manifest(manifest_path: Path, line: dict[str, Any]) -> None:
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    with manifest_path.open("a", encoding="utf-8") as fh:
+        fh.write(json.dumps(line, ensure_ascii=False) + "\n")
 
 
-def _write_decisions_parquet(
-    rows: list[IngestDecisionRecord],
-    *,
-    out_path: Path,
-    site_id: str,
-    ingested_at: str,
-    source_file: str,
-) -> None:
-    """Optional parquet writer — only used when ``pyarrow`` is importable.
-
-    Caller is expected to gate on availability; this function will raise
-    ``ImportError`` if pyarrow is missing.
+def _load_ingested_hashes(index_path: Path) -> frozenset[str]:
+    """Content hashes of every envelope already consumed into this inbox."""
+    if not index_path.exists():
+        return frozenset()
+    hashes: set[str] = set()
+    with index_path.open("r", encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                hashes.add(json.loads(line)["sha256"])
+            except (ValueError, KeyError, TypeError):
+                continue  # torn / foreign line — ignore
+    return frozenset(hashes)
+
+
+# ── Parallel loading ───────────────────────────────────────────────────
+
+
+def _loads(raw: bytes) -> Any:
+    """Parse JSON bytes, preferring orjson when installed."""
+    if _orjson is not None:
+        return _orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _opt_str(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _encode_nested(value: Any) -> Optional[str]:
+    return json.dumps(value, ensure_ascii=False) if value else None
+
+
+def _decision_row(r: IngestDecisionRecord) -> tuple:
+    """Typed row for the first 11 ``DECISION_CSV_COLUMNS`` (nested → JSON)."""
+    return (
+        r.id,
+        r.created_at,
+        r.decision_type,
+        r.decision,
+        _opt_str(r.model_name),
+        _opt_str(r.model_version),
+        r.threshold_applied,
+        _encode_nested(r.scores),
+        _encode_nested(r.inputs_ref),
+        _opt_str(r.result_summary),
+        _encode_nested(r.trace),
+    )
+
+
+@dataclass
+class _LoadedEnvelope:
+    """One envelope file after read + hash + parse (picklable)."""
+
+    path: str
+    sha256: str
+    app_id: Optional[str] = None
+    rows: list[tuple] = field(default_factory=list)
+    drift: Optional[dict[str, Any]] = None
+    error: Optional[str] = None
+    duplicate: bool = False
+
+
+# Hashes already ingested into the target inbox; set once per pool worker.
+_known_hashes: frozenset[str] = frozenset()
+
+
+def _init_loader(known: frozenset[str]) -> None:
+    global _known_hashes
+    _known_hashes = known
+
+
+def _load_envelope(path: str, known: Optional[frozenset[str]] = None) -> _LoadedEnvelope:
+    """Read, hash and parse one envelope file.
+
+    Runs inside pool workers, so JSON decoding, validation and the JSON
+    encoding of nested columns all happen off the main process. Files
+    whose hash is in ``known`` are not parsed at all.
     """
-    import pyarrow as pa  # type: ignore[import-untyped]
-    import pyarrow.parquet as pq  # type: ignore[import-untyped]
-
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    table = pa.table({
-        "id": [r.id for r in rows],
-        "created_at": [r.created_at for r in rows],
-        "decision_type": [r.decision_type for r in rows],
-        "decision": [r.decision for r in rows],
-        "model_name": [r.model_name for r in rows],
-        "model_version": [r.model_version for r in rows],
-        "threshold_applied": [r.threshold_applied for r in rows],
-        "scores_json": [
-            json.dumps(r.scores, ensure_ascii=False) if r.scores else None
-            for r in rows
-        ],
-        "inputs_ref_json": [
-            json.dumps(r.inputs_ref, ensure_ascii=False) if r.inputs_ref else None
-            for r in rows
-        ],
-        "result_summary": [r.result_summary for r in rows],
-        "trace_json": [
-            json.dumps(r.trace, ensure_ascii=False) if r.trace else None
-            for r in rows
-        ],
-        "site_id": [site_id] * len(rows),
-        "ingested_at": [ingested_at] * len(rows),
-        "source_file": [source_file] * len(rows),
-    })
-    pq.write_table(table, str(out_path))
+    known = _known_hashes if known is None else known
+    try:
+        raw = Path(path).read_bytes()
+    except OSError as e:
+        return _LoadedEnvelope(path=path, sha256="", error=str(e))
+    sha = hashlib.sha256(raw).hexdigest()
+    if sha in known:
+        return _LoadedEnvelope(path=path, sha256=sha, duplicate=True)
+    try:
+        payload = _loads(raw)
+        if not isinstance(payload, dict):
+            raise EnvelopeError("envelope must be a JSON object")
+        src, decisions, drift = _parse_envelope(payload)
+    except (ValueError, EnvelopeError) as e:
+        return _LoadedEnvelope(path=path, sha256=sha, error=str(e))
+    return _LoadedEnvelope(
+        path=path,
+        sha256=sha,
+        app_id=src.app_id,
+        rows=[_decision_row(r) for r in decisions],
+        drift=drift,
+    )
 
 
-def _append_manifest(manifest_path: Path, line: dict[str, Any]) -> None:
-    manifest_path.parent.mkdir(parents=True, exist_ok=True)
-    with manifest_path.open("a", encoding="utf-8") as fh:
-        fh.write(json.dumps(line, ensure_ascii=False) + "\n")
+def _iter_loaded(
+    paths: list[Path], known: frozenset[str], workers: int,
+) -> Iterable[_LoadedEnvelope]:
+    """Yield loaded envelopes in input order.
+
+    Small drops are loaded in-process. Larger ones go through a process
+    pool in batches of ``BATCH_FILES``; the next batch is submitted before
+    the current one is consumed, so parsing overlaps with writing while
+    at most two batches of parsed rows are held in memory.
+    """
+    names = [str(p) for p in paths]
+    if workers <= 1 or len(names) < PARALLEL_MIN_FILES:
+        for name in names:
+            yield _load_envelope(name, known)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_loader, initargs=(known,),
+    ) as pool:
+        pending = None
+        for start in range(0, len(names), BATCH_FILES):
+            batch = names[start:start + BATCH_FILES]
+            chunksize = max(1, len(batch) // (workers * 4))
+            submitted = pool.map(_load_envelope, batch, chunksize=chunksize)
+            if pending is not None:
+                yield from pending
+            pending = submitted
+        if pending is not None:
+            yield from pending
+
+
+# ── Streaming sinks ────────────────────────────────────────────────────
+
+
+def _partition_value(partition_by: str, row: tuple, app_id: Optional[str]) -> str:
+    if partition_by == "date":
+        created = row[1] or row[12]  # created_at, else ingested_at
+        day = created[:10]
+        return day if re.fullmatch(r"\d{4}-\d{2}-\d{2}", day) else "unknown"
+    value = re.sub(r"[^A-Za-z0-9._-]", "_", app_id or "")
+    return value or "unknown"
+
+
+class _ParquetSink:
+    """Row-group streaming parquet writer, optionally hive-partitioned.
+
+    Without ``partition_by`` a single ``decisions_<ts>.parquet`` is
+    written; with it, one ``parquet/<key>=<value>/part-<ts>.parquet`` file
+    per partition value. Rows are buffered per partition and flushed as
+    row groups, so memory is bounded by ``PARQUET_ROW_GROUP``.
+    """
+
+    def __init__(self, decisions_dir: Path, ts: str, partition_by: Optional[str]):
+        import pyarrow as pa  # type: ignore[import-untyped]
+        import pyarrow.parquet as pq  # type: ignore[import-untyped]
+
+        self._pa = pa
+        self._pq = pq
+        self._decisions_dir = decisions_dir
+        self._ts = ts
+        self._partition_by = partition_by
+        self._schema = pa.schema([
+            (name, pa.float64() if name == "threshold_applied" else pa.string())
+            for name in DECISION_CSV_COLUMNS
+        ])
+        self._buffers: dict[str, list[tuple]] = {}
+        self._buffered = 0
+        self._writers: dict[str, Any] = {}
+        self.paths: list[str] = []
+
+    def add(self, row: tuple, app_id: Optional[str]) -> None:
+        key = (
+            _partition_value(self._partition_by, row, app_id)
+            if self._partition_by else ""
+        )
+        buf = self._buffers.setdefault(key, [])
+        buf.append(row)
+        self._buffered += 1
+        if len(buf) >= PARQUET_ROW_GROUP:
+            self._flush(key)
+        elif self._buffered >= 4 * PARQUET_ROW_GROUP:
+            for k in list(self._buffers):
+                self._flush(k)
+
+    def _path_for(self, key: str) -> Path:
+        if not self._partition_by:
+            return self._decisions_dir / f"decisions_{self._ts}.parquet"
+        part_dir = self._decisions_dir / "parquet" / f"{self._partition_by}={key}"
+        return part_dir / f"part-{self._ts}.parquet"
+
+    def _flush(self, key: str) -> None:
+        rows = self._buffers.pop(key, [])
+        if not rows:
+            return
+        self._buffered -= len(rows)
+        pa = self._pa
+        columns = list(zip(*rows))
+        table = pa.Table.from_arrays(
+            [pa.array(col, type=f.type) for col, f in zip(columns, self._schema)],
+            schema=self._schema,
+        )
+        writer = self._writers.get(key)
+        if writer is None:
+            out_path = self._path_for(key)
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            writer = self._pq.ParquetWriter(str(out_path), self._schema)
+            self._writers[key] = writer
+            self.paths.append(str(out_path))
+        writer.write_table(table)
+
+    def close(self) -> list[str]:
+        try:
+            for key in list(self._buffers):
+                self._flush(key)
+        finally:
+            for writer in self._writers.values():
+                writer.close()
+        return self.paths
+
+
+class _DecisionSink:
+    """Shared CSV (+ optional parquet) output for one ingest run.
+
+    Files are opened on the first row, so a run without decisions leaves
+    no empty CSV behind.
+    """
+
+    def __init__(
+        self,
+        decisions_dir: Path,
+        ts: str,
+        *,
+        site_id: str,
+        ingested_at: str,
+        parquet: bool,
+        partition_by: Optional[str],
+    ):
+        self.decisions_dir = decisions_dir
+        self.csv_path = decisions_dir / f"decisions_{ts}.csv"
+        self.site_id = site_id
+        self.ingested_at = ingested_at
+        self.rows = 0
+        self._ts = ts
+        self._parquet = parquet
+        self._partition_by = partition_by
+        self._csv_handle = None
+        self._csv_writer = None
+        self._parquet_sink: Optional[_ParquetSink] = None
+
+    def _open(self) -> None:
+        self.decisions_dir.mkdir(parents=True, exist_ok=True)
+        self._csv_handle = self.csv_path.open("w", encoding="utf-8", newline="")
+        self._csv_writer = csv.writer(self._csv_handle)
+        self._csv_writer.writerow(DECISION_CSV_COLUMNS)
+        if self._parquet:
+            try:
+                self._parquet_sink = _ParquetSink(
+                    self.decisions_dir, self._ts, self._partition_by,
+                )
+            except ImportError:
+                logger.warning(
+                    "[ingest] parquet output requested but pyarrow unavailable — skipping parquet"
+                )
+
+    def write(self, rows: list[tuple], *, source_file: str, app_id: Optional[str]) -> None:
+        if not rows:
+            return
+        if self._csv_writer is None:
+            self._open()
+        tail = (self.site_id, self.ingested_at, source_file)
+        for row in rows:
+            full = row + tail
+            self._csv_writer.writerow([
+                "" if v is None
+                else (f"{v:.6g}" if i == 6 else v)
+                for i, v in enumerate(full)
+            ])
+            if self._parquet_sink is not None:
+                self._parquet_sink.add(full, app_id)
+        self.rows += len(rows)
+
+    def close(self) -> tuple[Optional[str], list[str]]:
+        """Close outputs; returns (csv path or None, parquet paths)."""
+        parquet_paths: list[str] = []
+        try:
+            if self._parquet_sink is not None:
+                parquet_paths = self._parquet_sink.close()
+        finally:
+            if self._csv_handle is not None:
+                self._csv_handle.close()
+        return (str(self.csv_path) if self.rows else None), parquet_paths
 
 
 # ── Public entry ───────────────────────────────────────────────────────
@@ -287,6 +532,19 @@ def _is_envelope_filename(p: Path) -> bool:
     return p.is_file() and p.suffix.lower() == ".json" and not p.name.startswith(".")
 
 
+def _consume(src_path: Path, mode: str, processed_dir: Path) -> None:
+    """Move a source file into ``.processed/`` or delete it."""
+    if mode == "move":
+        processed_dir.mkdir(parents=True, exist_ok=True)
+        target = processed_dir / src_path.name
+        # Idempotency: if same name already exists in processed, append a counter.
+        if target.exists():
+            target = processed_dir / f"{src_path.stem}.{uuid.uuid4().hex[:8]}{src_path.suffix}"
+        shutil.move(str(src_path), str(target))
+    else:  # delete
+        src_path.unlink(missing_ok=True)
+
+
 def ingest_directory(
     *,
     from_dir: Path,
@@ -295,6 +553,9 @@ def ingest_directory(
     inbox_root: Optional[Path] = None,
     mode: str = "move",
     use_parquet: bool = False,
+    partition_by: Optional[str] = None,
+    workers: Optional[int] = None,
+    incremental: bool = True,
 ) -> IngestOutcome:
     """Scan ``from_dir`` for envelope JSON files, ingest each.
 
@@ -313,18 +574,33 @@ def ingest_directory(
         mode: ``"move"`` (default) places consumed files under
             ``.processed/``; ``"delete"`` removes them.
         use_parquet: write parquet alongside CSV (requires pyarrow).
+        partition_by: ``"date"`` (decision ``created_at`` day) or
+            ``"source"`` (envelope ``source.app_id``) — write a
+            hive-partitioned parquet dataset under ``decisions/parquet/``.
+            Implies ``use_parquet``.
+        workers: parser processes. Defaults to ``min(8, cpu_count)``;
+            ``1`` parses in-process. Drops smaller than
+            ``PARALLEL_MIN_FILES`` are always parsed in-process.
+        incremental: skip envelopes whose content hash is already listed
+            in the inbox's ``_ingested.jsonl`` (they are still consumed).
 
     Returns:
         ``IngestOutcome`` with counts + paths. Idempotent: files already
-        in ``.processed/`` are not re-scanned.
+        in ``.processed/`` are not re-scanned, and with ``incremental``
+        re-dropped envelopes produce no new rows.
     """
     if mode not in {"move", "delete"}:
         raise ValueError(f"mode must be 'move' or 'delete', got {mode!r}")
+    if partition_by is not None and partition_by not in PARTITION_KEYS:
+        raise ValueError(
+            f"partition_by must be one of {sorted(PARTITION_KEYS)}, got {partition_by!r}"
+        )
 
     from_dir = Path(from_dir).resolve()
     if not from_dir.is_dir():
         raise FileNotFoundError(f"from_dir does not exist: {from_dir}")
     workspace_root = Path(workspace_root).resolve()
+    workers = workers or min(8, os.cpu_count() or 1)
 
     candidates = sorted(p for p in from_dir.iterdir() if _is_envelope_filename(p))
     files_seen = len(candidates)
@@ -336,142 +612,120 @@ def ingest_directory(
         return IngestOutcome(site_id=site, inbox_dir=str(inbox_dir),
                              files_seen=0, files_processed=0)
 
-    # First pass — read first valid envelope to resolve site_id when caller didn't pass one.
+    # Resolve site_id when the caller didn't pass one: load envelopes
+    # in-process until the first valid one. These are reused below.
     resolved_site = site_id
-    parsed: list[tuple[Path, IngestEnvelopeSource, list[IngestDecisionRecord], Optional[dict[str, Any]]]] = []
-    skipped: list[dict[str, Any]] = []
-    for p in candidates:
-        try:
-            payload = json.loads(p.read_text(encoding="utf-8"))
-            src, decisions, drift = _parse_envelope(payload)
-        except (json.JSONDecodeError, EnvelopeError) as e:
-            skipped.append({"file": p.name, "reason": str(e)})
-            continue
-        if resolved_site is None:
-            resolved_site = src.app_id
-        parsed.append((p, src, decisions, drift))
-
-    if not parsed:
+    head: list[_LoadedEnvelope] = []
+    rest = candidates
+    if resolved_site is None:
+        rest = []
+        for i, p in enumerate(candidates):
+            item = _load_envelope(str(p), frozenset())
+            head.append(item)
+            if item.error is None:
+                resolved_site = item.app_id
+                rest = candidates[i + 1:]
+                break
+
+    if resolved_site is None:
         return IngestOutcome(
-            site_id=resolved_site or "default",
-            inbox_dir=str((inbox_root or (workspace_root / DEFAULT_INBOX_REL))
-                          / (resolved_site or "default")),
-            files_seen=files_seen, files_processed=0, files_skipped=skipped,
+            site_id="default",
+            inbox_dir=str((inbox_root or (workspace_root / DEFAULT_INBOX_REL)) / "default"),
+            files_seen=files_seen, files_processed=0,
+            files_skipped=[
+                {"file": Path(item.path).name, "reason": item.error} for item in head
+            ],
         )
 
-    site = resolved_site or "default"
+    site = resolved_site
     inbox_dir = (inbox_root or (workspace_root / DEFAULT_INBOX_REL)) / site
     decisions_dir = inbox_dir / "decisions"
     drift_dir = inbox_dir / "drift_reports"
     processed_dir = inbox_dir / ".processed"
     manifest_path = inbox_dir / "_manifest.jsonl"
+    index_path = inbox_dir / INGESTED_INDEX_NAME
 
-    # Aggregate all decisions across this run into one CSV file (idempotency:
-    # filename keyed on UTC timestamp, source-file column tracks origin).
-    all_decisions: list[IngestDecisionRecord] = []
-    drift_paths: list[str] = []
-    drift_count = 0
-    files_processed = 0
+    known = _load_ingested_hashes(index_path) if incremental else frozenset()
+    seen: set[str] = set()
 
     ingested_at = datetime.now(timezone.utc).isoformat()
     ts = _utc_ts()
-    decisions_csv = decisions_dir / f"decisions_{ts}.csv"
-    decisions_parquet = decisions_dir / f"decisions_{ts}.parquet"
+    sink = _DecisionSink(
+        decisions_dir, ts,
+        site_id=site, ingested_at=ingested_at,
+        parquet=use_parquet or partition_by is not None,
+        partition_by=partition_by,
+    )
 
-    # Use one CSV writer shared across all envelopes in this pass — keep
-    # source_file column populated per-row for provenance.
-    decisions_dir.mkdir(parents=True, exist_ok=True)
-    csv_handle = decisions_csv.open("w", encoding="utf-8", newline="")
-    writer = csv.DictWriter(csv_handle, fieldnames=DECISION_CSV_COLUMNS)
-    writer.writeheader()
+    skipped: list[dict[str, Any]] = []
+    drift_paths: list[str] = []
+    duplicates = 0
+    files_processed = 0
+    index_handle = None
 
-    try:
-        for src_path, src, decisions, drift in parsed:
-            for r in decisions:
-                writer.writerow({
-                    "id": r.id,
-                    "created_at": r.created_at,
-                    "decision_type": r.decision_type,
-                    "decision": r.decision,
-                    "model_name": r.model_name or "",
-                    "model_version": r.model_version or "",
-                    "threshold_applied": (
-                        "" if r.threshold_applied is None
-                        else f"{r.threshold_applied:.6g}"
-                    ),
-                    "scores_json": json.dumps(r.scores, ensure_ascii=False) if r.scores else "",
-                    "inputs_ref_json": json.dumps(r.inputs_ref, ensure_ascii=False) if r.inputs_ref else "",
-                    "result_summary": r.result_summary or "",
-                    "trace_json": json.dumps(r.trace, ensure_ascii=False) if r.trace else "",
-                    "site_id": site,
-                    "ingested_at": ingested_at,
-                    "source_file": src_path.name,
-                })
-                all_decisions.append(r)
+    def _loaded() -> Iterable[_LoadedEnvelope]:
+        yield from head
+        yield from _iter_loaded(rest, known, workers)
 
-            if drift is not None:
+    try:
+        for item in _loaded():
+            src_path = Path(item.path)
+            if item.error is not None:
+                skipped.append({"file": src_path.name, "reason": item.error})
+                continue
+            if incremental and (item.duplicate or item.sha256 in known or item.sha256 in seen):
+                _consume(src_path, mode, processed_dir)
+                duplicates += 1
+                continue
+            seen.add(item.sha256)
+
+            sink.write(item.rows, source_file=src_path.name, app_id=item.app_id)
+
+            if item.drift is not None:
                 drift_dir.mkdir(parents=True, exist_ok=True)
                 drift_out = drift_dir / f"drift_{ts}_{src_path.stem}.json"
                 write_json(str(drift_out), {
                     "site_id": site,
                     "source_file": src_path.name,
                     "ingested_at": ingested_at,
-                    "report": drift,
+                    "report": item.drift,
                 })
                 drift_paths.append(str(drift_out))
-                drift_count += 1
-
-            # Mark consumed
-            if mode == "move":
-                processed_dir.mkdir(parents=True, exist_ok=True)
-                target = processed_dir / src_path.name
-                # Idempotency: if same name already exists in processed, append a counter.
-                if target.exists():
-                    target = processed_dir / f"{src_path.stem}.{uuid.uuid4().hex[:8]}{src_path.suffix}"
-                shutil.move(str(src_path), str(target))
-            else:  # delete
-                src_path.unlink(missing_ok=True)
 
+            _consume(src_path, mode, processed_dir)
+
+            if index_handle is None:
+                index_path.parent.mkdir(parents=True, exist_ok=True)
+                index_handle = index_path.open("a", encoding="utf-8")
+            index_handle.write(json.dumps({
+                "sha256": item.sha256,
+                "source_file": src_path.name,
+                "ingested_at": ingested_at,
+            }, ensure_ascii=False) + "\n")
             files_processed += 1
     finally:
-        csv_handle.close()
-
-    # If no decision rows landed in this pass, drop the empty CSV.
-    if not all_decisions:
-        try:
-            decisions_csv.unlink()
-        except FileNotFoundError:
-            pass
-        decisions_csv_path: Optional[str] = None
-    else:
-        decisions_csv_path = str(decisions_csv)
-
-    # Optional parquet output
-    if use_parquet and all_decisions:
-        try:
-            _write_decisions_parquet(
-                all_decisions, out_path=decisions_parquet,
-                site_id=site, ingested_at=ingested_at,
-                source_file="<aggregated>",
-            )
-        except ImportError:
-            logger.warning(
-                "[ingest] use_parquet=True but pyarrow unavailable — skipping parquet"
-            )
-
-    # Manifest line
-    manifest_line = {
-        "ingested_at": ingested_at,
-        "site_id": site,
-        "files_seen": files_seen,
-        "files_processed": files_processed,
-        "files_skipped": len(skipped),
-        "decision_rows": len(all_decisions),
-        "drift_reports": drift_count,
-        "decisions_csv": decisions_csv_path,
-        "drift_paths": drift_paths,
-    }
-    _append_manifest(manifest_path, manifest_line)
+        if index_handle is not None:
+            index_handle.close()
+        decisions_csv_path, parquet_paths = sink.close()
+
+    manifest_written: Optional[str] = None
+    if files_processed or duplicates:
+        manifest_line = {
+            "ingested_at": ingested_at,
+            "site_id": site,
+            "files_seen": files_seen,
+            "files_processed": files_processed,
+            "files_skipped": len(skipped),
+            "files_duplicate": duplicates,
+            "decision_rows": sink.rows,
+            "drift_reports": len(drift_paths),
+            "decisions_csv": decisions_csv_path,
+            "parquet_paths": parquet_paths,
+            "partition_by": partition_by,
+            "drift_paths": drift_paths,
+        }
+        _append_manifest(manifest_path, manifest_line)
+        manifest_written = str(manifest_path)
 
     return IngestOutcome(
         site_id=site,
@@ -479,9 +733,11 @@ def ingest_directory(
         files_seen=files_seen,
         files_processed=files_processed,
         files_skipped=skipped,
-        decision_rows=len(all_decisions),
-        drift_reports=drift_count,
+        files_duplicate=duplicates,
+        decision_rows=sink.rows,
+        drift_reports=len(drift_paths),
         decisions_path=decisions_csv_path,
         drift_paths=drift_paths,
-        manifest_path=str(manifest_path),
+        parquet_paths=parquet_paths,
+        manifest_path=manifest_written,
     )
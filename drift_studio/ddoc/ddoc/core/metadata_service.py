@@ -9,6 +9,8 @@ from dataclasses import dataclass
 import networkx as nx
 from rich import print
 
+from .registry import get_registry
+
 
 @dataclass
 class LineageNode:
@@ -43,9 +45,10 @@ class MetadataService:
         self.dataset_mapping_file = self.metadata_dir / "dataset_mappings.json"
         self.graph = nx.DiGraph()
         
-        # Cache for metadata files (mtime-based invalidation)
-        self._dataset_mappings_cache = None
-        self._dataset_mappings_mtime = None
+        # Dataset mappings are served by the shared registry (mtime-validated)
+        self.registry = get_registry()
+        
+        # Cache for lineage file (mtime-based invalidation)
         self._lineage_cache = None
         self._lineage_mtime = None
         
@@ -65,50 +68,35 @@ class MetadataService:
             }
             self._save_lineage(lineage)
     
-    def _init_dataset_mappings(self):
+    def _empty_dataset_mappings(self) -> Dict[str, Any]:
+        return {
+            'datasets': {},
+            'created_at': datetime.now().isoformat()
+        }
+    
+    def _init_dataset_mappings(self) -> Dict[str, Any]:
         """Initialize dataset mappings file if it doesn't exist"""
+        mappings = self._empty_dataset_mappings()
         if not self.dataset_mapping_file.exists():
-            mappings = {
-                'datasets': {},
-                'created_at': datetime.now().isoformat()
-            }
             self._save_dataset_mappings(mappings)
+        return mappings
     
-    def _load_dataset_mappings(self) -> Dict[str, Any]:
-        """Load dataset mappings with mtime-based caching"""
+    def _load_dataset_mappings(self, mutable: bool = False) -> Dict[str, Any]:
+        """Load dataset mappings through the shared registry (read-only unless ``mutable``)"""
         if self.dataset_mapping_file.exists():
-            try:
-                current_mtime = self.dataset_mapping_file.stat().st_mtime
-                
-                # Use cache if available and file hasn't changed
-                if (self._dataset_mappings_cache is not None and 
-                    self._dataset_mappings_mtime == current_mtime):
-                    return self._dataset_mappings_cache
-                
-                # Load from file
-                with open(self.dataset_mapping_file, 'r') as f:
-                    mappings = json.load(f)
-                
-                # Update cache
-                self._dataset_mappings_cache = mappings
-                self._dataset_mappings_mtime = current_mtime
+            mappings = self.registry.read_json(self.dataset_mapping_file, mutable=mutable)
+            if isinstance(mappings, dict) and 'datasets' in mappings:
                 return mappings
-            except (json.JSONDecodeError, KeyError):
-                print("Warning: Could not load dataset mappings, starting fresh")
-                return self._init_dataset_mappings()
+            print("Warning: Could not load dataset mappings, starting fresh")
+            return self._empty_dataset_mappings()
         return self._init_dataset_mappings()
     
     def _save_dataset_mappings(self, mappings: Dict[str, Any] = None):
-        """Save dataset mappings and invalidate cache"""
+        """Save dataset mappings (atomic write-through to the registry)"""
         if mappings is None:
             mappings = self._load_dataset_mappings()
         
-        with open(self.dataset_mapping_file, 'w') as f:
-            json.dump(mappings, f, indent=2)
-        
-        # Invalidate cache
-        self._dataset_mappings_cache = None
-        self._dataset_mappings_mtime = None
+        self.registry.write(self.dataset_mapping_file, mappings)
     
     def _normalize_path(self, path: str) -> str:
         """
@@ -236,14 +224,15 @@ class MetadataService:
         rel_dataset_path = self._to_relative_path(dataset_path)
         rel_dvc_file_path = self._to_relative_path(dvc_file_path)
         
-        mappings = self._load_dataset_mappings()
-        mappings['datasets'][name] = {
-            'dvc_file': rel_dvc_file_path,
-            'dataset_path': rel_dataset_path,
-            'registered_at': datetime.now().isoformat()
-        }
-        mappings['last_updated'] = datetime.now().isoformat()
-        self._save_dataset_mappings(mappings)
+        with self.registry.lock(self.dataset_mapping_file):
+            mappings = self._load_dataset_mappings(mutable=True)
+            mappings['datasets'][name] = {
+                'dvc_file': rel_dvc_file_path,
+                'dataset_path': rel_dataset_path,
+                'registered_at': datetime.now().isoformat()
+            }
+            mappings['last_updated'] = datetime.now().isoformat()
+            self._save_dataset_mappings(mappings)
     
     def get_dataset_mapping(self, name: str) -> Optional[Dict[str, Any]]:
         """Get dataset mapping by name"""
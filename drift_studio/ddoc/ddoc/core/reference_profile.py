@@ -0,0 +1,370 @@
+"""
+Reference profiles: reusable baseline summaries for drift detection
+
+A reference profile is a compact, versioned, mergeable summary of one
+dataset, produced once during ``eda_run`` and stored through
+``CacheService`` (``profile_<modality>.json``). Drift against a fixed
+baseline then only needs a pass over the *current* data: the reference
+side is read back from the profile instead of being recomputed from raw
+attribute dicts, embeddings or files on every check.
+
+A profile holds:
+
+- ``features``: one sketch per scalar attribute / column
+  (``NumericSketch`` for numbers, ``CategoricalSketch`` for strings and
+  booleans — see ``ddoc.core.sketches``)
+- ``embedding``: an ``EmbeddingSketch`` with the running mean / variance
+  of the embedding vectors and a ``NumericSketch`` per fixed random
+  projection. Projections are regenerated from ``(seed, dim)`` so two
+  profiles built with the same settings are directly comparable.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Any, Optional, Mapping, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from ddoc.core.sketches import (
+    CategoricalSketch,
+    NumericSketch,
+    Sketch,
+    compare_numeric,
+    sketch_from_dict,
+)
+from ddoc.core.tabular_drift import TableProfile, compare_profiles
+
+PROFILE_VERSION = 1
+DEFAULT_PROJECTIONS = 16
+PROJECTION_SEED = 0
+
+# Per-file bookkeeping fields that are not part of the data distribution
+EXCLUDED_ATTRIBUTES = frozenset({"file_mtime", "file_size", "file_path", "file_name", "file_hash"})
+
+
+@lru_cache(maxsize=8)
+def _projection_matrix(dim: int, n_projections: int, seed: int) -> np.ndarray:
+    """``(dim, n_projections)`` matrix; column 0 is the plain mean over dimensions"""
+    rng = np.random.default_rng(seed)
+    matrix = np.empty((dim, n_projections), dtype=np.float64)
+    matrix[:, 0] = 1.0 / dim
+    if n_projections > 1:
+        matrix[:, 1:] = rng.standard_normal((dim, n_projections - 1)) / np.sqrt(dim)
+    matrix.setflags(write=False)
+    return matrix
+
+
+class EmbeddingSketch:
+    """Mergeable summary of a set of embedding vectors"""
+
+    kind = "embedding"
+
+    def __init__(self, n_projections: int = DEFAULT_PROJECTIONS, seed: int = PROJECTION_SEED):
+        self.n_projections = n_projections
+        self.seed = seed
+        self.dim: Optional[int] = None
+        self.count = 0
+        self.mean: Optional[np.ndarray] = None
+        self.m2: Optional[np.ndarray] = None
+        self.projections: List[NumericSketch] = [NumericSketch() for _ in range(n_projections)]
+
+    def update(self, embeddings: Any) -> "EmbeddingSketch":
+        """Add a batch of vectors (``(n, dim)`` array or list of vectors)"""
+        x = np.asarray(embeddings, dtype=np.float64)
+        if x.size == 0:
+            return self
+        x = x.reshape(len(x), -1)
+        if self.dim is None:
+            self.dim = x.shape[1]
+            self.mean = np.zeros(self.dim)
+            self.m2 = np.zeros(self.dim)
+        elif x.shape[1] != self.dim:
+            raise ValueError(f"embedding dim {x.shape[1]} does not match profile dim {self.dim}")
+
+        batch_mean = x.mean(axis=0)
+        self._merge_moments(len(x), batch_mean, ((x - batch_mean) ** 2).sum(axis=0))
+        projected = x @ _projection_matrix(self.dim, self.n_projections, self.seed)
+        for sketch, column in zip(self.projections, projected.T):
+            sketch.update(column)
+        return self
+
+    def _merge_moments(self, count: int, mean: np.ndarray, m2: np.ndarray) -> None:
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean = self.mean + delta * count / total
+        self.m2 = self.m2 + m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    def merge(self, other: "EmbeddingSketch") -> "EmbeddingSketch":
+        if not other.count:
+            return self
+        if (other.n_projections, other.seed) != (self.n_projections, self.seed):
+            raise ValueError("cannot merge embedding sketches with different projections")
+        if self.dim is None:
+            self.dim = other.dim
+            self.mean = np.zeros(self.dim)
+            self.m2 = np.zeros(self.dim)
+        elif other.dim != self.dim:
+            raise ValueError("cannot merge embedding sketches with different dims")
+        self._merge_moments(other.count, other.mean, other.m2)
+        for mine, theirs in zip(self.projections, other.projections):
+            mine.merge(theirs)
+        return self
+
+    @property
+    def variance(self) -> Optional[np.ndarray]:
+        return self.m2 / self.count if self.count else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "n_projections": self.n_projections,
+            "seed": self.seed,
+            "dim": self.dim,
+            "count": self.count,
+            "mean": self.mean.tolist() if self.mean is not None else None,
+            "m2": self.m2.tolist() if self.m2 is not None else None,
+            "projections": [p.to_dict() for p in self.projections],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EmbeddingSketch":
+        sketch = cls(int(data.get("n_projections", DEFAULT_PROJECTIONS)), int(data.get("seed", PROJECTION_SEED)))
+        sketch.dim = data.get("dim")
+        sketch.count = int(data.get("count", 0))
+        if data.get("mean") is not None:
+            sketch.mean = np.asarray(data["mean"], dtype=np.float64)
+            sketch.m2 = np.asarray(data["m2"], dtype=np.float64)
+        sketch.projections = [NumericSketch.from_dict(p) for p in data.get("projections", [])]
+        return sketch
+
+
+@dataclass
+class ReferenceProfile:
+    """Feature sketches (+ optional embedding summary) for one dataset"""
+
+    modality: str
+    count: int = 0
+    features: Dict[str, Sketch] = field(default_factory=dict)
+    embedding: Optional[EmbeddingSketch] = None
+    data_hash: Optional[str] = None
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    def update_attributes(
+        self,
+        attributes: Mapping[str, Mapping[str, Any]],
+        exclude: Iterable[str] = EXCLUDED_ATTRIBUTES,
+    ) -> "ReferenceProfile":
+        """
+        Add per-item attribute dicts (``{item: {attr: value}}``)
+
+        Numbers feed a numeric sketch, strings / booleans a categorical
+        one; nested values (lists, dicts) are skipped. The kind of an
+        attribute is fixed by the first batch it appears in; later
+        non-numeric values of a numeric attribute count as nulls.
+        """
+        exclude = set(exclude)
+        columns: Dict[str, List[Any]] = {}
+        for attrs in attributes.values():
+            if not isinstance(attrs, Mapping):
+                continue
+            for name, value in attrs.items():
+                if name in exclude or isinstance(value, (list, tuple, dict)):
+                    continue
+                columns.setdefault(name, []).append(value)
+
+        for name, values in columns.items():
+            sketch = self.features.get(name)
+            if sketch is None:
+                numeric = all(
+                    isinstance(v, (int, float, np.number)) and not isinstance(v, (bool, np.bool_))
+                    for v in values if v is not None
+                )
+                sketch = self.features[name] = NumericSketch() if numeric else CategoricalSketch()
+            if isinstance(sketch, NumericSketch):
+                sketch.update(pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype=np.float64))
+            else:
+                sketch.update([None if v is None else str(v) for v in values])
+        self.count += len(attributes)
+        return self
+
+    def update_embeddings(self, embeddings: Any, n_projections: int = DEFAULT_PROJECTIONS) -> "ReferenceProfile":
+        """Add a batch of embedding vectors"""
+        if self.embedding is None:
+            self.embedding = EmbeddingSketch(n_projections=n_projections)
+        self.embedding.update(embeddings)
+        return self
+
+    def merge(self, other: "ReferenceProfile") -> "ReferenceProfile":
+        if other.modality != self.modality:
+            raise ValueError(f"cannot merge {other.modality} profile into {self.modality} profile")
+        self.count += other.count
+        for name, sketch in other.features.items():
+            if name in self.features:
+                self.features[name].merge(sketch)
+            else:
+                self.features[name] = sketch
+        if other.embedding is not None:
+            if self.embedding is None:
+                self.embedding = EmbeddingSketch(other.embedding.n_projections, other.embedding.seed)
+            self.embedding.merge(other.embedding)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": PROFILE_VERSION,
+            "modality": self.modality,
+            "count": self.count,
+            "data_hash": self.data_hash,
+            "created_at": self.created_at,
+            "features": {name: sketch.to_dict() for name, sketch in self.features.items()},
+            "embedding": self.embedding.to_dict() if self.embedding is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ReferenceProfile":
+        version = data.get("version", PROFILE_VERSION)
+        if version > PROFILE_VERSION:
+            raise ValueError(f"profile version {version} is newer than supported {PROFILE_VERSION}")
+        embedding = data.get("embedding")
+        return cls(
+            modality=data.get("modality", "unknown"),
+            count=int(data.get("count", 0)),
+            features={name: sketch_from_dict(s) for name, s in data.get("features", {}).items()},
+            embedding=EmbeddingSketch.from_dict(embedding) if embedding else None,
+            data_hash=data.get("data_hash"),
+            created_at=data.get("created_at") or datetime.now().isoformat(),
+        )
+
+
+def build_profile(
+    modality: str,
+    attributes: Optional[Mapping[str, Mapping[str, Any]]] = None,
+    embeddings: Any = None,
+    data_hash: Optional[str] = None,
+) -> ReferenceProfile:
+    """
+    Build a profile from an attribute cache and/or embedding vectors
+
+    Args:
+        modality: Profile modality ("image", "timeseries", ...)
+        attributes: ``{item: {attr: value}}`` as stored in ``attributes_*`` caches
+        embeddings: ``(n, dim)`` array, list of vectors, or an
+            ``embedding_*`` cache (``{item: {"embedding": [...]}}``)
+        data_hash: Data hash the profile describes
+
+    Returns:
+        ``ReferenceProfile``
+    """
+    profile = ReferenceProfile(modality=modality, data_hash=data_hash)
+    if attributes:
+        profile.update_attributes(attributes)
+    if embeddings is not None:
+        if isinstance(embeddings, Mapping):
+            embeddings = [v["embedding"] for v in embeddings.values()
+                          if isinstance(v, Mapping) and v.get("embedding") is not None]
+        if len(embeddings):
+            profile.update_embeddings(embeddings)
+    return profile
+
+
+def load_profile(data: Any) -> Optional[ReferenceProfile]:
+    """``ReferenceProfile`` from a profile or its ``to_dict`` form (``None`` passes through)"""
+    if data is None or isinstance(data, ReferenceProfile):
+        return data
+    return ReferenceProfile.from_dict(data)
+
+
+# ----------------------------------------------------------------------
+# Comparison
+# ----------------------------------------------------------------------
+
+
+def _wasserstein(ref: NumericSketch, cur: NumericSketch) -> float:
+    """1-D Wasserstein distance between two sketches (∫|F_ref − F_cur|)"""
+    ref_values, ref_counts = ref.buckets()
+    cur_values, cur_counts = cur.buckets()
+    grid = np.union1d(ref_values, cur_values)
+    if grid.size < 2:
+        return 0.0
+    ref_cdf = np.zeros(grid.size)
+    cur_cdf = np.zeros(grid.size)
+    ref_cdf[np.searchsorted(grid, ref_values)] = ref_counts / ref_counts.sum()
+    cur_cdf[np.searchsorted(grid, cur_values)] = cur_counts / cur_counts.sum()
+    diff = np.abs(np.cumsum(ref_cdf) - np.cumsum(cur_cdf))[:-1]
+    return float(np.sum(diff * np.diff(grid)))
+
+
+def compare_embeddings(ref: EmbeddingSketch, cur: EmbeddingSketch, psi_bins: int = 10) -> Dict[str, Any]:
+    """
+    Embedding drift between two sketches
+
+    ``mean_shift`` / ``cosine_distance`` follow the definitions used by the
+    raw-embedding drift paths; ``psi`` / ``ks`` are taken over the random
+    projections and ``wasserstein`` over the mean-of-dimensions projection.
+    """
+    if not ref.count or not cur.count:
+        return {}
+    if ref.dim != cur.dim or (ref.n_projections, ref.seed) != (cur.n_projections, cur.seed):
+        raise ValueError("embedding sketches were built with different dims or projections")
+
+    shift = ref.mean - cur.mean
+    ref_norm = np.linalg.norm(ref.mean)
+    cur_norm = np.linalg.norm(cur.mean)
+    cosine = 0.0
+    if ref_norm > 0 and cur_norm > 0:
+        cosine = max(0.0, 1.0 - float(np.dot(ref.mean, cur.mean) / (ref_norm * cur_norm)))
+
+    projected = [compare_numeric(r, c, psi_bins=psi_bins) for r, c in zip(ref.projections, cur.projections)]
+    psis = [m["psi"] for m in projected if m["psi"] is not None]
+    kss = [m["ks"] for m in projected if m["ks"] is not None]
+    return {
+        "count_base": ref.count,
+        "count_target": cur.count,
+        "mean_shift": round(float(np.linalg.norm(shift) / np.sqrt(ref.dim)), 4),
+        "cosine_distance": round(cosine, 4),
+        "wasserstein": round(_wasserstein(ref.projections[0], cur.projections[0]), 4),
+        "psi": round(float(np.mean(psis)), 4) if psis else 0.0,
+        "psi_max": round(float(np.max(psis)), 4) if psis else 0.0,
+        "ks_max": round(float(np.max(kss)), 4) if kss else 0.0,
+        "projections": len(projected),
+    }
+
+
+def compare_reference(
+    ref: ReferenceProfile,
+    cur: ReferenceProfile,
+    psi_bins: int = 10,
+) -> Dict[str, Any]:
+    """
+    Drift report between a reference profile and a current profile
+
+    Returns:
+        ``{"count": {...}, "features": {name: metrics}, "summary": {...},
+        "embedding": {...} | None}``; feature metrics and summary have the
+        same shape as the tabular drift report
+    """
+    report = compare_profiles(
+        TableProfile(rows=ref.count, columns=ref.features),
+        TableProfile(rows=cur.count, columns=cur.features),
+        psi_bins=psi_bins,
+    )
+    embedding = None
+    if ref.embedding is not None and cur.embedding is not None:
+        embedding = compare_embeddings(ref.embedding, cur.embedding, psi_bins=psi_bins) or None
+    return {
+        "count": report["rows"],
+        "features": report["columns"],
+        "summary": report["summary"],
+        "embedding": embedding,
+    }
+
+
+def histogram(sketch: NumericSketch, edges: np.ndarray) -> np.ndarray:
+    """Counts of a sketch's buckets over fixed ``edges`` (e.g. for comparison plots)"""
+    values, counts = sketch.buckets()
+    # Bucket representatives may sit up to ``relative_accuracy`` past min / max
+    values = np.clip(values, edges[0], edges[-1])
+    hist, _ = np.histogram(values, bins=edges, weights=counts)
+    return hist
@@ -0,0 +1,235 @@
+"""
+Shared metadata registry for ddoc
+
+``VersionService``, ``DatasetService``, ``StagingService`` and
+``MetadataService`` all keep their state in small YAML/JSON files
+(``params.yaml``, ``dataset_versions.json``, ``staging.json``,
+``dataset_mappings.json``, ``*.dvc``). This registry is the single place
+those files are read and written:
+
+- reads are cached in-process and validated by ``(mtime_ns, size, inode)``,
+  so a file is parsed once until it changes on disk;
+- writes go through a temp file plus ``os.replace`` (readers never see a
+  half-written file) and update the cache in place;
+- read-modify-write cycles run under an exclusive ``<file>.lock`` so
+  concurrent ddoc processes (CLI + backend) don't lose updates.
+
+Objects returned by ``read_json`` / ``read_yaml`` are shared with the
+cache and must be treated as read-only; use ``transaction`` (or
+``mutable=True``) to modify.
+"""
+import copy
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Optional, Callable, Iterator, Tuple, Union
+
+import yaml
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
+
+PathLike = Union[str, Path]
+YAML_SUFFIXES = {".yaml", ".yml", ".dvc"}
+
+
+def _signature(path: Path) -> Optional[Tuple[int, int, int]]:
+    """Change-detection signature of a file, or None if it doesn't exist"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class MetadataRegistry:
+    """Process-wide, mtime-validated cache of ddoc metadata files"""
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Tuple[int, int, int], Any]] = {}
+        self._derived: Dict[Tuple[str, str], Tuple[Any, Any]] = {}
+        self._lock = threading.RLock()
+        self._file_locks: Dict[str, threading.RLock] = {}
+
+    # ------------------------------------------------------------------
+    # Parsing helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _is_yaml(path: Path) -> bool:
+        return path.suffix.lower() in YAML_SUFFIXES
+
+    def _parse(self, path: Path) -> Any:
+        with open(path, "r", encoding="utf-8") as f:
+            if self._is_yaml(path):
+                return yaml.load(f, Loader=_YamlLoader)
+            return json.load(f)
+
+    def _dump(self, path: Path, data: Any, f) -> None:
+        if self._is_yaml(path):
+            yaml.dump(data, f, Dumper=_YamlDumper, default_flow_style=False, allow_unicode=True)
+        else:
+            json.dump(data, f, indent=2)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def read(self, path: PathLike, default: Any = None, mutable: bool = False) -> Any:
+        """
+        Read a JSON or YAML file (format chosen by suffix)
+
+        Args:
+            path: File to read
+            default: Returned when the file is missing, empty or unparsable
+            mutable: Return a private deep copy instead of the shared object
+
+        Returns:
+            Parsed content
+        """
+        path = Path(path)
+        key = str(path.resolve())
+        signature = _signature(path)
+        if signature is None:
+            return copy.deepcopy(default) if mutable else default
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                data = entry[1]
+            else:
+                try:
+                    data = self._parse(path)
+                except (OSError, ValueError, yaml.YAMLError):
+                    return copy.deepcopy(default) if mutable else default
+                self._entries[key] = (signature, data)
+
+        if data is None:
+            data = default
+        return copy.deepcopy(data) if mutable else data
+
+    def read_json(self, path: PathLike, default: Any = None, mutable: bool = False) -> Any:
+        """Read a JSON file through the cache"""
+        return self.read(path, default=default, mutable=mutable)
+
+    def read_yaml(self, path: PathLike, default: Any = None, mutable: bool = False) -> Any:
+        """Read a YAML file through the cache"""
+        return self.read(path, default=default, mutable=mutable)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def write(self, path: PathLike, data: Any) -> None:
+        """Atomically write ``data`` (temp file + rename) and refresh the cache"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                self._dump(path, data, f)
+            os.replace(tmp_name, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+
+        signature = _signature(path)
+        with self._lock:
+            if signature is not None:
+                self._entries[str(path.resolve())] = (signature, copy.deepcopy(data))
+
+    @contextmanager
+    def lock(self, path: PathLike) -> Iterator[None]:
+        """Exclusive lock for ``path`` across threads and processes"""
+        path = Path(path)
+        key = str(path.resolve())
+        with self._lock:
+            thread_lock = self._file_locks.setdefault(key, threading.RLock())
+
+        with thread_lock:
+            if fcntl is None:
+                yield
+                return
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(f"{path}.lock", "a") as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    @contextmanager
+    def transaction(self, path: PathLike, default: Any = None) -> Iterator[Any]:
+        """
+        Locked read-modify-write of a metadata file
+
+        Yields a private copy of the current content; it is written back
+        when the block exits without an exception.
+        """
+        with self.lock(path):
+            data = self.read(path, default=default, mutable=True)
+            yield data
+            self.write(path, data)
+
+    # ------------------------------------------------------------------
+    # Derived values
+    # ------------------------------------------------------------------
+
+    def derived(self, name: str, ident: str, key: Any, compute: Callable[[], Any]) -> Any:
+        """
+        Memoize a value computed from files on disk
+
+        Args:
+            name: Namespace for the value (e.g. ``"dataset_formats"``)
+            ident: Which entry within the namespace (e.g. a dataset path)
+            key: Validity key, typically built from ``signature()`` of the
+                files the value depends on; the value is recomputed when it changes
+            compute: Zero-argument function producing the value
+        """
+        with self._lock:
+            entry = self._derived.get((name, ident))
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        value = compute()
+        with self._lock:
+            self._derived[(name, ident)] = (key, value)
+        return value
+
+    def signature(self, path: PathLike) -> Optional[Tuple[int, int, int]]:
+        """Public access to a file's change-detection signature"""
+        return _signature(Path(path))
+
+    def invalidate(self, path: Optional[PathLike] = None) -> None:
+        """Drop one cached file (or everything when ``path`` is None)"""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._derived.clear()
+            else:
+                self._entries.pop(str(Path(path).resolve()), None)
+
+
+# Global registry instance (one per process)
+_registry = None
+
+
+def get_registry() -> MetadataRegistry:
+    """Get global metadata registry instance"""
+    global _registry
+    if _registry is None:
+        _registry = MetadataRegistry()
+    return _registry
@@ -0,0 +1,181 @@
+"""
+Streamed, paginated HTML report output
+
+Large reports are written to disk fragment by fragment instead of being
+built as one string:
+
+- ``StreamedHtmlWriter`` appends HTML fragments to the output file as
+  they are produced
+- ``table()`` consumes rows lazily, keeps only one page in memory and
+  writes every page after the first to ``<stem>_files/<name>-<n>.html``.
+  Those pages are embedded as lazily loaded iframes inside collapsed
+  ``<details>`` blocks, so the browser only fetches a page when it is
+  opened (works over ``file://``)
+- ``asset()`` writes binary payloads (figures, raw JSON) next to the
+  report and returns a relative link instead of inlining them
+- ``reservoir_sample`` keeps a uniform, seeded sample of at most ``k``
+  items from an iterable of unknown length, for plots with a point budget
+"""
+from __future__ import annotations
+
+import html
+import os
+import random
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 500
+DEFAULT_POINT_BUDGET = 20_000
+
+_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>
+  body {{ font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif; margin: 0; color: #222; }}
+  table {{ border-collapse: collapse; width: 100%; }}
+  th, td {{ border: 1px solid #ddd; padding: 0.4em 0.7em; text-align: left; }}
+  th {{ background: #f5f5f5; }}
+</style></head>
+<body>{table}</body></html>
+"""
+
+
+def reservoir_sample(items: Iterable[T], k: int, seed: int = 0) -> List[T]:
+    """Uniform sample of at most ``k`` items in one pass (Algorithm R)"""
+    rng = random.Random(seed)
+    sample: List[T] = []
+    for i, item in enumerate(items):
+        if i < k:
+            sample.append(item)
+        else:
+            j = rng.randint(0, i)
+            if j < k:
+                sample[j] = item
+    return sample
+
+
+def _cell(value: Any) -> str:
+    return html.escape(str(value))
+
+
+def _table_html(header: Sequence[str], rows: Sequence[Sequence[Any]]) -> str:
+    parts = ["<table>"]
+    if header:
+        parts.append("<thead><tr>" + "".join(f"<th>{_cell(h)}</th>" for h in header) + "</tr></thead>")
+    parts.append("<tbody>")
+    for row in rows:
+        parts.append("<tr>" + "".join(f"<td>{_cell(v)}</td>" for v in row) + "</tr>")
+    parts.append("</tbody></table>")
+    return "".join(parts)
+
+
+class StreamedHtmlWriter:
+    """Write an HTML report incrementally, with paged tables and side-car assets"""
+
+    def __init__(self, output_path, page_size: int = DEFAULT_PAGE_SIZE):
+        """
+        Args:
+            output_path: Report file; pages and assets go to ``<stem>_files/``
+            page_size: Table rows per page (first page inline)
+        """
+        self.output_path = Path(output_path)
+        self.page_size = max(1, int(page_size))
+        self.assets_dir = self.output_path.parent / f"{self.output_path.stem}_files"
+        self.pages_written = 0
+        self.assets_written = 0
+        self._fp = None
+        self._tmp: Optional[Path] = None
+
+    def __enter__(self) -> "StreamedHtmlWriter":
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp = self.output_path.with_name(f".{self.output_path.name}.{os.getpid()}.tmp")
+        self._fp = open(self._tmp, "w", encoding="utf-8")
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._fp.close()
+        if exc_type is None:
+            os.replace(self._tmp, self.output_path)
+        else:
+            self._tmp.unlink(missing_ok=True)
+
+    def write(self, fragment: str) -> None:
+        """Append an HTML fragment"""
+        self._fp.write(fragment)
+
+    def _relative(self, path: Path) -> str:
+        return f"{self.assets_dir.name}/{path.name}"
+
+    def asset_path(self, name: str) -> Path:
+        """Path of a side-car file to write into (link it with ``href()``)"""
+        self.assets_dir.mkdir(parents=True, exist_ok=True)
+        self.assets_written += 1
+        return self.assets_dir / name
+
+    def href(self, path: Path) -> str:
+        """Link to a side-car file, relative to the report"""
+        return self._relative(path)
+
+    def asset(self, name: str, data: bytes) -> str:
+        """Write a side-car file and return its link relative to the report"""
+        path = self.asset_path(name)
+        path.write_bytes(data)
+        return self._relative(path)
+
+    def _paged_table(self, name: str, header: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+        """Inline fragments of a paged table; pages after the first go to files"""
+        page: List[Sequence[Any]] = []
+        page_no = 0
+
+        def _flush() -> str:
+            nonlocal page_no
+            start = page_no * self.page_size
+            page_no += 1
+            if page_no == 1:
+                return _table_html(header, page)
+            self.assets_dir.mkdir(parents=True, exist_ok=True)
+            path = self.assets_dir / f"{name}-{page_no}.html"
+            label = f"Rows {start + 1}–{start + len(page)}"
+            path.write_text(_PAGE_TEMPLATE.format(title=_cell(f"{name}: {label}"), table=_table_html(header, page)),
+                            encoding="utf-8")
+            self.pages_written += 1
+            return (
+                f'<details><summary>{label}</summary>'
+                f'<iframe loading="lazy" src="{self._relative(path)}" '
+                f'style="width: 100%; height: 24em; border: 0;"></iframe></details>\n'
+            )
+
+        for row in rows:
+            page.append(row)
+            if len(page) == self.page_size:
+                yield _flush()
+                page.clear()
+        if page or page_no == 0:
+            yield _flush()
+
+    def table(self, name: str, header: Sequence[str], rows: Iterable[Sequence[Any]]) -> None:
+        """
+        Write a table, paging it beyond ``page_size`` rows
+
+        Args:
+            name: Page file prefix (unique within the report)
+            header: Column names
+            rows: Row iterable, consumed lazily (one page in memory)
+        """
+        for fragment in self._paged_table(name, header, rows):
+            self.write(fragment)
+
+    def table_html(self, name: str, header: Sequence[str], rows: Iterable[Sequence[Any]]) -> str:
+        """Like ``table()`` but return the inline part (first page + page links)"""
+        return "".join(self._paged_table(name, header, rows))
+
+    def summary(self) -> Dict[str, Any]:
+        """Output stats for result envelopes"""
+        return {
+            "output_path": str(self.output_path),
+            "size_bytes": self.output_path.stat().st_size if self.output_path.exists() else 0,
+            "pages": self.pages_written,
+            "assets": self.assets_written,
+            "assets_dir": str(self.assets_dir) if (self.pages_written or self.assets_written) else None,
+        }
@@ -0,0 +1,499 @@
+"""
+Fast, stat-cached data restore for ddoc snapshots
+
+``dvc checkout`` relinks the whole ``data/`` output and the snapshot
+service then walks the tree repeatedly to drop empty directories. This
+module restores ``data/`` by diffing the DVC directory manifests
+(``<md5>.dir`` files in the local DVC cache) of the current and target
+snapshots and materializing only the files that differ.
+
+Workspace files are verified through a stat cache
+(``.ddoc/cache/restore_state.json``) that maps each relpath to the
+``(size, mtime_ns, inode)`` it had when its md5 was last known, so
+unchanged files cost one ``stat`` instead of a re-hash.
+"""
+import configparser
+import hashlib
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple
+
+# Files that commonly keep otherwise-empty directories alive (macOS/Windows).
+JUNK_NAMES = {".DS_Store", "Thumbs.db", "desktop.ini"}
+
+# DVC's own default when ``cache.type`` is not configured.
+DEFAULT_LINK_TYPES = ["reflink", "copy"]
+
+# Snapshot views are read-only, so cheap links into the cache are fine.
+VIEW_LINK_TYPES = ["symlink", "copy"]
+
+# Linux ioctl number for FICLONE (copy-on-write clone of a whole file).
+_FICLONE = 0x40049409
+
+
+def reflink_file(src: Path, dst: Path) -> None:
+    """Copy-on-write clone ``src`` to a new file ``dst`` (raises OSError if unsupported)"""
+    import fcntl  # POSIX only; ImportError lets callers fall through to the next link type
+
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        except OSError:
+            fdst.close()
+            dst.unlink()
+            raise
+
+
+def diff_manifests(current: Dict[str, str], target: Dict[str, str]) -> Dict[str, List[str]]:
+    """
+    File-level diff between two ``relpath -> md5`` manifests
+
+    Returns:
+        Dictionary with sorted ``added``, ``modified`` and ``removed`` relpaths
+    """
+    added = sorted(rel for rel in target if rel not in current)
+    removed = sorted(rel for rel in current if rel not in target)
+    modified = sorted(
+        rel for rel, md5 in target.items()
+        if rel in current and current[rel] != md5
+    )
+    return {"added": added, "modified": modified, "removed": removed}
+
+
+def file_md5(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """MD5 of a file's contents (same digest DVC 3 stores in manifests)"""
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class RestoreService:
+    """Service for restoring data/ from the local DVC cache by manifest diff"""
+
+    def __init__(self, project_root: Optional[str] = None, max_workers: Optional[int] = None):
+        self.project_root = Path(project_root) if project_root else Path.cwd()
+        self.data_dir = self.project_root / "data"
+        self.dvc_dir = self.project_root / ".dvc"
+        self.state_file = self.project_root / ".ddoc" / "cache" / "restore_state.json"
+        self.views_dir = self.project_root / ".ddoc" / "cache" / "snapshot_data"
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+
+    # ------------------------------------------------------------------
+    # DVC cache access
+    # ------------------------------------------------------------------
+
+    def _read_dvc_config(self) -> configparser.ConfigParser:
+        """Read .dvc/config and .dvc/config.local (local overrides)"""
+        parser = configparser.ConfigParser()
+        for name in ("config", "config.local"):
+            config_file = self.dvc_dir / name
+            if config_file.exists():
+                try:
+                    parser.read(config_file)
+                except configparser.Error:
+                    pass
+        return parser
+
+    def get_cache_root(self) -> Path:
+        """Resolve the DVC cache directory (honours ``cache.dir``)"""
+        parser = self._read_dvc_config()
+        if parser.has_option("cache", "dir"):
+            cache_dir = Path(parser.get("cache", "dir"))
+            if not cache_dir.is_absolute():
+                cache_dir = (self.dvc_dir / cache_dir).resolve()
+            return cache_dir
+        return self.dvc_dir / "cache"
+
+    def get_link_types(self) -> List[str]:
+        """Link types to try, in order, following DVC's ``cache.type``"""
+        parser = self._read_dvc_config()
+        if parser.has_option("cache", "type"):
+            types = [t.strip() for t in parser.get("cache", "type").split(",") if t.strip()]
+            if types:
+                return types
+        return list(DEFAULT_LINK_TYPES)
+
+    def cache_path(self, md5: str) -> Optional[Path]:
+        """Locate an object in the DVC cache (DVC 3 layout first, then DVC 2)"""
+        cache_root = self.get_cache_root()
+        for base in (cache_root / "files" / "md5", cache_root):
+            candidate = base / md5[:2] / md5[2:]
+            if candidate.exists():
+                return candidate
+        return None
+
+    def load_manifest(self, dvc_hash: Optional[str]) -> Optional[Dict[str, str]]:
+        """
+        Load a ``relpath -> md5`` manifest for a data.dvc directory hash
+
+        Args:
+            dvc_hash: ``md5`` value from data.dvc (``<md5>.dir``)
+
+        Returns:
+            Manifest dictionary, or None when the ``.dir`` object is not
+            in the local cache (caller should fall back to ``dvc checkout``)
+        """
+        if not dvc_hash or not dvc_hash.endswith(".dir"):
+            return None
+        dir_file = self.cache_path(dvc_hash)
+        if dir_file is None:
+            return None
+        try:
+            with open(dir_file, "r") as f:
+                entries = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return None
+        return {entry["relpath"]: entry["md5"] for entry in entries}
+
+    # ------------------------------------------------------------------
+    # Stat cache
+    # ------------------------------------------------------------------
+
+    def _load_state(self) -> Dict[str, list]:
+        if not self.state_file.exists():
+            return {}
+        try:
+            with open(self.state_file, "r") as f:
+                return json.load(f).get("files", {})
+        except (json.JSONDecodeError, IOError, AttributeError):
+            return {}
+
+    def _save_state(self, files: Dict[str, list]) -> None:
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_suffix(".json.tmp")
+        with open(tmp_file, "w") as f:
+            json.dump({"files": files}, f)
+        os.replace(tmp_file, self.state_file)
+
+    def record_hashes(self, hashes: Dict[str, str]) -> int:
+        """
+        Seed the stat cache with digests computed elsewhere (e.g. during
+        archive extraction) so the next restore doesn't re-hash those files
+
+        Args:
+            hashes: ``data/``-relative path -> md5
+
+        Returns:
+            Number of entries recorded
+        """
+        state = self._load_state()
+        recorded = 0
+        for rel, md5 in hashes.items():
+            try:
+                st = (self.data_dir / rel).stat()
+            except OSError:
+                continue
+            state[rel] = self._stat_key(st) + [md5]
+            recorded += 1
+        if recorded:
+            self._save_state(state)
+        return recorded
+
+    @staticmethod
+    def _stat_key(st: os.stat_result) -> list:
+        return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+    def _workspace_md5(self, rel: str, state: Dict[str, list]) -> Tuple[str, Optional[str], Optional[list]]:
+        """
+        md5 of a workspace file, trusting the stat cache when it still matches
+
+        Returns:
+            ``(relpath, md5 or None if missing, fresh stat-cache entry)``
+        """
+        path = self.data_dir / rel
+        try:
+            st = path.stat()
+        except OSError:
+            return rel, None, None
+        key = self._stat_key(st)
+        cached = state.get(rel)
+        if cached and cached[:3] == key:
+            return rel, cached[3], cached
+        md5 = file_md5(path)
+        return rel, md5, key + [md5]
+
+    # ------------------------------------------------------------------
+    # Materialization
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _reflink(src: Path, dst: Path) -> None:
+        reflink_file(src, dst)
+
+    def _link(self, src: Path, dst: Path, link_types: List[str]) -> str:
+        """Materialize ``src`` at ``dst`` using the first link type that works"""
+        last_error: Optional[Exception] = None
+        for link_type in link_types:
+            try:
+                if link_type == "reflink":
+                    self._reflink(src, dst)
+                elif link_type == "hardlink":
+                    os.link(src, dst)
+                elif link_type == "symlink":
+                    os.symlink(src, dst)
+                elif link_type == "copy":
+                    shutil.copyfile(src, dst)
+                else:
+                    continue
+                return link_type
+            except (OSError, ImportError) as e:
+                last_error = e
+        raise OSError(f"Could not link {dst}: {last_error}")
+
+    def _materialize(self, rel: str, md5: str, link_types: List[str]) -> Tuple[str, Optional[str], Optional[list]]:
+        """Place one cache object into data/; returns ``(relpath, error, state entry)``"""
+        src = self.cache_path(md5)
+        if src is None:
+            return rel, f"{md5} not in local DVC cache", None
+        dst = self.data_dir / rel
+        try:
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            if dst.is_symlink() or dst.exists():
+                dst.unlink()
+            self._link(src, dst, link_types)
+            st = dst.stat()
+        except OSError as e:
+            return rel, str(e), None
+        return rel, None, self._stat_key(st) + [md5]
+
+    def _remove_empty_dirs(self, candidates: List[Path]) -> int:
+        """
+        Remove empty directories in a single bottom-up pass
+
+        Only ancestors of removed files can have become empty, so the
+        candidates are visited deepest-first and each rmdir is attempted
+        exactly once.
+        """
+        dirs = set()
+        for path in candidates:
+            parent = path.parent
+            while parent != self.data_dir and self.data_dir in parent.parents:
+                dirs.add(parent)
+                parent = parent.parent
+
+        removed = 0
+        for directory in sorted(dirs, key=lambda p: len(p.parts), reverse=True):
+            try:
+                for child in directory.iterdir():
+                    if child.is_file() and (child.name in JUNK_NAMES or child.name.startswith("._")):
+                        child.unlink(missing_ok=True)
+                directory.rmdir()
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def plan(
+        self,
+        target_hash: str,
+        current_hash: Optional[str] = None,
+        force: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Work out what a restore would do, without touching the workspace
+
+        Run this before switching git revisions so a refusal (local edits,
+        objects missing from the cache) leaves HEAD and data.dvc alone.
+
+        Args:
+            target_hash: data.dvc md5 of the snapshot being restored
+            current_hash: data.dvc md5 before checkout (enables removals)
+            force: Overwrite workspace files that match neither manifest
+
+        Returns:
+            Result dictionary; on success ``plan`` holds the input for
+            ``apply()``. ``fallback`` is True when the fast path cannot run
+            and ``dvc checkout`` should be used instead.
+        """
+        target = self.load_manifest(target_hash)
+        if target is None:
+            return {
+                "success": False,
+                "fallback": True,
+                "error": f"Manifest {target_hash} not in local DVC cache"
+            }
+        current = self.load_manifest(current_hash) or {}
+
+        state = self._load_state()
+        candidates = set(target) | set(current)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            observed = list(executor.map(lambda rel: self._workspace_md5(rel, state), candidates))
+
+        new_state: Dict[str, list] = {}
+        to_materialize: List[str] = []
+        to_remove: List[str] = []
+        dirty: List[str] = []
+        for rel, actual, entry in observed:
+            desired = target.get(rel)
+            expected = current.get(rel)
+            if actual is not None and actual == desired:
+                new_state[rel] = entry
+                continue
+            if actual is not None and actual != expected and not force:
+                dirty.append(rel)
+                continue
+            if desired is None:
+                if actual is not None:
+                    to_remove.append(rel)
+            else:
+                to_materialize.append(rel)
+
+        if dirty:
+            return {
+                "success": False,
+                "fallback": False,
+                "error": (
+                    f"{len(dirty)} file(s) in data/ have uncommitted changes "
+                    f"(e.g. {sorted(dirty)[0]}). Use --force to overwrite."
+                )
+            }
+
+        missing = [rel for rel in to_materialize if self.cache_path(target[rel]) is None]
+        if missing:
+            return {
+                "success": False,
+                "fallback": True,
+                "error": f"{len(missing)} object(s) not in local DVC cache (e.g. {sorted(missing)[0]})"
+            }
+
+        return {
+            "success": True,
+            "plan": {
+                "target": target,
+                "diff": diff_manifests(current, target),
+                "materialize": to_materialize,
+                "remove": to_remove,
+                "state": new_state,
+            }
+        }
+
+    def apply(self, plan: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Carry out a plan from ``plan()``
+
+        Returns:
+            Result dictionary (``fallback`` is True when some objects could
+            not be linked and ``dvc checkout`` should finish the job)
+        """
+        target = plan["target"]
+        to_materialize = plan["materialize"]
+        to_remove = plan["remove"]
+        new_state = dict(plan["state"])
+
+        for rel in to_remove:
+            try:
+                (self.data_dir / rel).unlink()
+            except OSError:
+                pass
+
+        link_types = self.get_link_types()
+        errors: Dict[str, str] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = executor.map(
+                lambda rel: self._materialize(rel, target[rel], link_types),
+                to_materialize
+            )
+            for rel, error, entry in results:
+                if error:
+                    errors[rel] = error
+                else:
+                    new_state[rel] = entry
+
+        removed_dirs = self._remove_empty_dirs([self.data_dir / rel for rel in to_remove])
+        self._save_state(new_state)
+
+        if errors:
+            return {
+                "success": False,
+                "fallback": True,
+                "error": f"{len(errors)} file(s) could not be restored from the local cache",
+                "errors": errors
+            }
+
+        return {
+            "success": True,
+            "diff": {key: len(value) for key, value in plan["diff"].items()},
+            "materialized": len(to_materialize),
+            "removed_files": len(to_remove),
+            "removed_dirs": removed_dirs,
+            "unchanged": len(target) - len(to_materialize)
+        }
+
+    def restore(
+        self,
+        target_hash: str,
+        current_hash: Optional[str] = None,
+        force: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Bring data/ to the state recorded by ``target_hash`` (``plan`` + ``apply``)
+
+        Args:
+            target_hash: data.dvc md5 of the snapshot being restored
+            current_hash: data.dvc md5 before checkout (enables removals)
+            force: Overwrite workspace files that match neither manifest
+
+        Returns:
+            Result dictionary. ``fallback`` is True when the fast path cannot
+            run (manifest or objects missing locally) and ``dvc checkout``
+            should be used instead.
+        """
+        planned = self.plan(target_hash, current_hash=current_hash, force=force)
+        if not planned["success"]:
+            return planned
+        return self.apply(planned["plan"])
+
+    def snapshot_view(self, dvc_hash: Optional[str]) -> Optional[Path]:
+        """
+        Read-only copy of a snapshot's ``data/`` built from the local DVC cache
+
+        Lets commands read an older snapshot without checking it out. Views
+        are content-addressed (``.ddoc/cache/snapshot_data/<md5>``) and are
+        built once, into a temp directory that is renamed into place.
+
+        Args:
+            dvc_hash: data.dvc md5 of the snapshot (``<md5>.dir``)
+
+        Returns:
+            View directory, or None when the manifest or any object is not
+            in the local cache
+        """
+        target = self.load_manifest(dvc_hash)
+        if target is None:
+            return None
+        view = self.views_dir / dvc_hash[:-len(".dir")]
+        if view.is_dir():
+            return view
+        if any(self.cache_path(md5) is None for md5 in target.values()):
+            return None
+
+        self.views_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.views_dir / f".{view.name}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        try:
+            for rel, md5 in target.items():
+                dst = tmp / rel
+                dst.parent.mkdir(parents=True, exist_ok=True)
+                self._link(self.cache_path(md5), dst, VIEW_LINK_TYPES)
+            try:
+                os.replace(tmp, view)
+            except OSError:
+                if not view.is_dir():  # not a concurrent build of the same view
+                    raise
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        return view
+
+
+def get_restore_service(project_root: Optional[str] = None) -> RestoreService:
+    """Factory function to get restore service instance"""
+    return RestoreService(project_root)
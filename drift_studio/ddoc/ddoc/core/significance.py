@@ -0,0 +1,376 @@
+"""
+Permutation-test significance for drift statistics
+
+Drift scores (MMD, PSI, KL, KS, Wasserstein) are magnitudes; whether a
+value is large *for this sample size* depends on the data. This module
+turns them into permutation-test p-values:
+
+    p = (1 + #{permuted statistic >= observed}) / (1 + #permutations)
+
+The expensive part is shared across permutations: MMD uses one kernel
+matrix over the pooled sample, the univariate statistics one sort order
+(KS / Wasserstein) or one bin assignment (PSI / KL). A batch of
+permutations is a ``(batch, n)`` membership matrix, so each batch is a
+single matrix product instead of a Python loop.
+
+Batches are seeded from ``np.random.SeedSequence(seed).spawn`` by batch
+index, evaluated in worker processes for large samples, and consumed in
+order; the test stops early once a confidence interval for p lies
+entirely on one side of ``alpha``. Results are therefore identical for
+any number of workers. ``attribute_significance`` runs all of its tests
+on one shared process pool.
+"""
+import math
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Any, Optional, Tuple, Mapping
+
+import numpy as np
+
+from ddoc.core.drift_matrix import median_gamma
+
+DEFAULT_PERMUTATIONS = 1000
+DEFAULT_ALPHA = 0.05
+DEFAULT_BATCH = 100
+# Values kept per side by the univariate tests (a batch holds
+# ``batch × 2·max_samples`` membership weights)
+DEFAULT_UNIVARIATE_SAMPLES = 5000
+# z for the early-stopping interval (99%)
+STOP_Z = 2.576
+# Pooled sample size from which batches go to worker processes; below it
+# process start-up and kernel transfer cost more than the permutations
+PARALLEL_MIN_SIZE = 400
+UNIVARIATE_STATISTICS = ("ks", "wasserstein", "psi", "kl")
+
+# Per-process test state, set once per worker by ``_init_worker``
+_STATE: Dict[str, Any] = {}
+
+
+# ----------------------------------------------------------------------
+# Statistics over a batch of membership masks
+# ----------------------------------------------------------------------
+
+
+def _mmd2(state: Dict[str, Any], masks: np.ndarray) -> np.ndarray:
+    """Unbiased MMD² for every row of ``masks`` (1 = reference sample)"""
+    kernel, diag, total, m, n = state["kernel"], state["diag"], state["total"], state["m"], state["n"]
+    projected = masks @ kernel
+    sxx = np.einsum("ij,ij->i", projected, masks)
+    sxy = projected.sum(axis=1) - sxx
+    syy = total - sxx - 2.0 * sxy
+    tx = masks @ diag
+    ty = diag.sum() - tx
+    return (sxx - tx) / (m * (m - 1)) + (syy - ty) / (n * (n - 1)) - 2.0 * sxy / (m * n)
+
+
+def _ecdf_gap(state: Dict[str, Any], masks: np.ndarray) -> np.ndarray:
+    ordered = masks[:, state["order"]]
+    return np.abs(np.cumsum(ordered, axis=1) / state["m"] - np.cumsum(1.0 - ordered, axis=1) / state["n"])
+
+
+def _ks(state: Dict[str, Any], masks: np.ndarray) -> np.ndarray:
+    # Evaluate only at the last element of each run of tied values
+    return _ecdf_gap(state, masks)[:, state["ends"]].max(axis=1)
+
+
+def _wasserstein(state: Dict[str, Any], masks: np.ndarray) -> np.ndarray:
+    return _ecdf_gap(state, masks)[:, :-1] @ state["gaps"]
+
+
+def _proportions(state: Dict[str, Any], masks: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Smoothed bin proportions of both samples (``(hist + 1) / (n + bins)``, as in the drift helpers)"""
+    assignment, bins = state["assignment"], state["bin_totals"].size
+    # One-hot bin matrix, built per batch so the state stays small to ship
+    onehot = np.zeros((assignment.size, bins))
+    onehot[np.arange(assignment.size), assignment] = 1.0
+    ref = masks @ onehot
+    cur = state["bin_totals"] - ref
+    return (ref + 1.0) / (state["m"] + bins), (cur + 1.0) / (state["n"] + bins)
+
+
+def _psi(state: Dict[str, Any], masks: np.ndarray) -> np.ndarray:
+    ref, cur = _proportions(state, masks)
+    return np.abs(np.sum((cur - ref) * np.log(cur / ref), axis=1))
+
+
+def _kl(state: Dict[str, Any], masks: np.ndarray) -> np.ndarray:
+    ref, cur = _proportions(state, masks)
+    return np.sum(ref * np.log(ref / cur), axis=1)
+
+
+_STATISTICS = {"mmd": _mmd2, "ks": _ks, "wasserstein": _wasserstein, "psi": _psi, "kl": _kl}
+
+
+# ----------------------------------------------------------------------
+# Permutation engine
+# ----------------------------------------------------------------------
+
+
+def _masks(rng: np.random.Generator, size: int, m: int, n_total: int) -> np.ndarray:
+    """``size`` random membership rows with exactly ``m`` ones"""
+    masks = np.zeros((size, n_total))
+    for row in masks:
+        # Index draw per permutation: no (size, n_total) index matrix
+        row[rng.choice(n_total, m, replace=False, shuffle=False)] = 1.0
+    return masks
+
+
+def _batch(state: Dict[str, Any], seed: np.random.SeedSequence, size: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return _STATISTICS[state["kind"]](state, _masks(rng, size, state["m"], state["m"] + state["n"]))
+
+
+def _init_worker(state: Dict[str, Any]) -> None:
+    global _STATE
+    _STATE = state
+
+
+def _worker_batch(seed: np.random.SeedSequence, size: int) -> np.ndarray:
+    return _batch(_STATE, seed, size)
+
+
+def _submit(pool: Executor, state: Optional[Dict[str, Any]], seed: np.random.SeedSequence, size: int):
+    """Submit one batch (``state`` None → state installed by ``_init_worker``)"""
+    if state is None:
+        return pool.submit(_worker_batch, seed, size)
+    return pool.submit(_batch, state, seed, size)
+
+
+def _decided(exceedances: int, done: int, alpha: float) -> bool:
+    """Wilson interval for the exceedance rate lies entirely above or below ``alpha``"""
+    p = exceedances / done
+    denom = 1.0 + STOP_Z ** 2 / done
+    centre = (p + STOP_Z ** 2 / (2 * done)) / denom
+    half = STOP_Z * math.sqrt(p * (1 - p) / done + STOP_Z ** 2 / (4 * done ** 2)) / denom
+    return centre + half < alpha or centre - half > alpha
+
+
+def _run(
+    state: Dict[str, Any],
+    observed: float,
+    n_permutations: int,
+    alpha: float,
+    seed: int,
+    batch_size: int,
+    max_workers: Optional[int],
+    early_stop: bool,
+    pool: Optional[Executor] = None,
+) -> Dict[str, Any]:
+    sizes = [min(batch_size, n_permutations - start) for start in range(0, n_permutations, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+    parallel = workers > 1 and len(sizes) > 1 and state["m"] + state["n"] >= PARALLEL_MIN_SIZE
+
+    exceedances = done = 0
+    stopped = False
+    # Relative tolerance so ties with the observed value count as exceedances
+    threshold = observed - 1e-12 * max(1.0, abs(observed))
+
+    def consume(values: np.ndarray) -> bool:
+        nonlocal exceedances, done
+        exceedances += int(np.count_nonzero(values >= threshold))
+        done += len(values)
+        return early_stop and done < n_permutations and _decided(exceedances, done, alpha)
+
+    def run_on(executor: Executor, shipped: Optional[Dict[str, Any]]) -> bool:
+        # Keep at most ``workers`` batches in flight; results are consumed in batch order
+        pending = [_submit(executor, shipped, seeds[i], sizes[i]) for i in range(min(workers, len(sizes)))]
+        next_index = len(pending)
+        while pending:
+            values = pending.pop(0).result()
+            if consume(values):
+                for future in pending:
+                    future.cancel()
+                return True
+            if next_index < len(sizes):
+                pending.append(_submit(executor, shipped, seeds[next_index], sizes[next_index]))
+                next_index += 1
+        return False
+
+    if parallel and pool is not None:
+        # Shared pool: the (small) state travels with each batch
+        stopped = run_on(pool, state)
+    elif parallel:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(state,)) as own_pool:
+            stopped = run_on(own_pool, None)
+    else:
+        for batch_seed, size in zip(seeds, sizes):
+            if consume(_batch(state, batch_seed, size)):
+                stopped = True
+                break
+
+    p_value = (exceedances + 1) / (done + 1)
+    return {
+        "p_value": round(p_value, 6),
+        "significant": p_value < alpha,
+        "alpha": alpha,
+        "permutations": done,
+        "exceedances": exceedances,
+        "early_stopped": stopped,
+    }
+
+
+def _observed(state: Dict[str, Any]) -> float:
+    mask = np.zeros((1, state["m"] + state["n"]))
+    mask[0, :state["m"]] = 1.0
+    return float(_STATISTICS[state["kind"]](state, mask)[0])
+
+
+# ----------------------------------------------------------------------
+# Public tests
+# ----------------------------------------------------------------------
+
+
+def mmd_permutation_test(
+    X: Any,
+    Y: Any,
+    n_permutations: int = DEFAULT_PERMUTATIONS,
+    alpha: float = DEFAULT_ALPHA,
+    gamma: Optional[float] = None,
+    max_samples: int = 1000,
+    seed: int = 0,
+    batch_size: int = DEFAULT_BATCH,
+    max_workers: Optional[int] = None,
+    early_stop: bool = True,
+) -> Dict[str, Any]:
+    """
+    Permutation test for RBF-kernel MMD between two embedding sets
+
+    Args:
+        X: Reference embeddings ``(m, dim)``
+        Y: Current embeddings ``(n, dim)``
+        n_permutations: Maximum number of permutations
+        alpha: Significance level (also the early-stopping target)
+        gamma: RBF bandwidth on the pooled-standardized data (default:
+            median heuristic)
+        max_samples: Rows kept per side (first rows, as the drift helpers do)
+        seed: Base seed for the permutation stream
+        batch_size: Permutations per vectorized batch
+        max_workers: Worker processes (default: CPU count; 1 = in-process)
+        early_stop: Stop once the p-value is clearly above or below ``alpha``
+
+    Returns:
+        ``{"statistic": "mmd", "observed": MMD, "p_value", "significant",
+        "alpha", "permutations", "exceedances", "early_stopped", "gamma"}``
+    """
+    X = np.asarray(X, dtype=np.float64)[:max_samples]
+    Y = np.asarray(Y, dtype=np.float64)[:max_samples]
+    m, n = X.shape[0], Y.shape[0]
+    if m < 2 or n < 2:
+        raise ValueError("MMD permutation test needs at least two samples per side")
+
+    pooled = np.vstack([X, Y])
+    pooled = (pooled - pooled.mean(axis=0)) / (pooled.std(axis=0) + 1e-8)
+    gamma = gamma if gamma is not None else median_gamma(pooled, seed)
+    sq = np.einsum("ij,ij->i", pooled, pooled)
+    kernel = np.exp(-gamma * np.maximum(sq[:, None] + sq[None, :] - 2.0 * pooled @ pooled.T, 0.0))
+    state = {
+        "kind": "mmd", "m": m, "n": n,
+        "kernel": kernel, "diag": np.diagonal(kernel).copy(), "total": float(kernel.sum()),
+    }
+    observed = _observed(state)
+    result = _run(state, observed, n_permutations, alpha, seed, batch_size, max_workers, early_stop)
+    return {"statistic": "mmd", "observed": round(math.sqrt(max(observed, 0.0)), 6),
+            **result, "gamma": round(gamma, 8)}
+
+
+def univariate_permutation_test(
+    reference: Any,
+    current: Any,
+    statistic: str = "ks",
+    n_permutations: int = DEFAULT_PERMUTATIONS,
+    alpha: float = DEFAULT_ALPHA,
+    bins: int = 10,
+    max_samples: int = DEFAULT_UNIVARIATE_SAMPLES,
+    seed: int = 0,
+    batch_size: int = DEFAULT_BATCH,
+    max_workers: Optional[int] = None,
+    early_stop: bool = True,
+    pool: Optional[Executor] = None,
+) -> Dict[str, Any]:
+    """
+    Permutation test for a univariate drift statistic
+
+    Args:
+        reference: Reference values
+        current: Current values
+        statistic: One of ``UNIVARIATE_STATISTICS``. PSI / KL use ``bins``
+            pooled-quantile bins fixed across permutations, so ``observed``
+            can differ slightly from a PSI computed on min/max bins
+        max_samples: Finite values kept per side (first values, as
+            :func:`mmd_permutation_test` does)
+        n_permutations, alpha, seed, batch_size, max_workers, early_stop:
+            See :func:`mmd_permutation_test`
+        pool: Process pool to run batches on instead of starting one
+            (``max_workers`` still bounds the batches in flight)
+
+    Returns:
+        ``{"statistic", "observed", "p_value", "significant", "alpha",
+        "permutations", "exceedances", "early_stopped"}``
+    """
+    if statistic not in UNIVARIATE_STATISTICS:
+        raise ValueError(f"statistic must be one of {UNIVARIATE_STATISTICS}, got {statistic!r}")
+    x = np.asarray(reference, dtype=np.float64).ravel()
+    y = np.asarray(current, dtype=np.float64).ravel()
+    x, y = x[np.isfinite(x)][:max_samples], y[np.isfinite(y)][:max_samples]
+    m, n = x.size, y.size
+    if m < 2 or n < 2:
+        raise ValueError("permutation test needs at least two finite values per side")
+
+    pooled = np.concatenate([x, y])
+    state: Dict[str, Any] = {"kind": statistic, "m": m, "n": n}
+    if statistic in ("ks", "wasserstein"):
+        order = np.argsort(pooled, kind="stable")
+        ordered = pooled[order]
+        state["order"] = order
+        state["gaps"] = np.diff(ordered)
+        state["ends"] = np.append(np.flatnonzero(state["gaps"] > 0), ordered.size - 1)
+    else:
+        edges = np.unique(np.quantile(pooled, np.linspace(0, 1, bins + 1)[1:-1]))
+        assignment = np.searchsorted(edges, pooled, side="right")
+        state["assignment"] = assignment
+        state["bin_totals"] = np.bincount(assignment, minlength=edges.size + 1).astype(np.float64)
+    observed = _observed(state)
+    result = _run(state, observed, n_permutations, alpha, seed, batch_size, max_workers, early_stop, pool)
+    return {"statistic": statistic, "observed": round(observed, 6), **result}
+
+
+def attribute_significance(
+    attributes: Mapping[str, Tuple[Any, Any]],
+    statistic: str = "psi",
+    **kwargs,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    ``univariate_permutation_test`` for several attributes
+
+    Args:
+        attributes: ``{name: (reference values, current values)}``
+        statistic: Univariate statistic
+        **kwargs: Passed to :func:`univariate_permutation_test`
+
+    Returns:
+        ``{name: result}``; attributes that cannot be tested get ``{"error": ...}``
+
+    All tests share one process pool, started only when at least one
+    attribute is large enough to be tested in parallel.
+    """
+    max_workers = kwargs.get("max_workers")
+    workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+    max_samples = kwargs.get("max_samples", DEFAULT_UNIVARIATE_SAMPLES)
+    sizes = [min(np.size(ref), max_samples) + min(np.size(cur), max_samples) for ref, cur in attributes.values()]
+    pool = None
+    if workers > 1 and kwargs.get("pool") is None and any(size >= PARALLEL_MIN_SIZE for size in sizes):
+        pool = ProcessPoolExecutor(max_workers=workers)
+        kwargs["pool"] = pool
+
+    out: Dict[str, Dict[str, Any]] = {}
+    try:
+        for name, (ref, cur) in attributes.items():
+            try:
+                out[name] = univariate_permutation_test(ref, cur, statistic=statistic, **kwargs)
+            except ValueError as e:
+                out[name] = {"statistic": statistic, "error": str(e)}
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return out
@@ -0,0 +1,432 @@
+"""
+Mergeable distribution sketches for drift detection
+
+Drift between two large datasets can be measured from compact per-column
+summaries instead of the raw values. Both sketch types here are built
+in one pass over chunks, can be merged (chunk by chunk, file by file,
+worker by worker) and serialize to plain JSON:
+
+- ``NumericSketch``: log-bucketed histogram with bounded relative error
+  (DDSketch-style; every value lands in a bucket whose width is
+  ``relative_accuracy`` of its magnitude) plus null count, min/max and
+  mean/variance accumulators. Two sketches with the same accuracy share
+  bucket boundaries, so they can be compared bucket by bucket.
+- ``CategoricalSketch``: frequency table capped at ``max_categories``;
+  categories beyond the cap are folded into ``__other__``.
+
+``compare_numeric`` / ``compare_categorical`` turn a reference and a
+current sketch into PSI, KL, Kolmogorov–Smirnov, Jensen–Shannon and
+null-rate drift.
+"""
+import math
+from typing import Dict, Any, Optional, Tuple, Iterable, Union
+
+import numpy as np
+import pandas as pd
+
+SKETCH_VERSION = 1
+DEFAULT_RELATIVE_ACCURACY = 0.01
+MIN_INDEXABLE = 1e-12
+MAX_CATEGORIES = 10_000
+OTHER_CATEGORY = "__other__"
+
+# PSI rule of thumb: < 0.1 stable, 0.1–0.25 moderate shift, > 0.25 major shift
+PSI_WARNING = 0.1
+PSI_CRITICAL = 0.25
+NULL_RATE_WARNING = 0.1
+
+_EPS = 1e-4
+
+
+class NumericSketch:
+    """Mergeable relative-error histogram plus moments for one numeric column"""
+
+    kind = "numeric"
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero = 0
+        self.count = 0
+        self.nulls = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _add_keys(store: Dict[int, int], keys: np.ndarray) -> None:
+        if keys.size:
+            uniq, counts = np.unique(keys, return_counts=True)
+            for key, cnt in zip(uniq.tolist(), counts.tolist()):
+                store[key] = store.get(key, 0) + cnt
+
+    def _merge_moments(self, count: int, mean: float, m2: float) -> None:
+        """Chan et al. parallel update of count / mean / M2"""
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    def update(self, values: Union[np.ndarray, pd.Series, Iterable[float]]) -> "NumericSketch":
+        """Add a batch of values; NaN / ±inf count as nulls"""
+        arr = np.asarray(values, dtype=np.float64)
+        finite = np.isfinite(arr)
+        self.nulls += int(arr.size - finite.sum())
+        x = arr[finite]
+        if not x.size:
+            return self
+
+        batch_mean = float(x.mean())
+        self._merge_moments(int(x.size), batch_mean, float(((x - batch_mean) ** 2).sum()))
+        self.min = min(self.min, float(x.min()))
+        self.max = max(self.max, float(x.max()))
+
+        magnitude = np.abs(x)
+        is_zero = magnitude < MIN_INDEXABLE
+        self.zero += int(is_zero.sum())
+        nonzero = x[~is_zero]
+        keys = np.ceil(np.log(np.abs(nonzero)) / self._log_gamma).astype(np.int64)
+        self._add_keys(self.positive, keys[nonzero > 0])
+        self._add_keys(self.negative, keys[nonzero < 0])
+        return self
+
+    def merge(self, other: "NumericSketch") -> "NumericSketch":
+        """Fold ``other`` into this sketch (accuracies must match)"""
+        if not math.isclose(other.relative_accuracy, self.relative_accuracy):
+            raise ValueError("cannot merge sketches with different relative_accuracy")
+        for store, other_store in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, cnt in other_store.items():
+                store[key] = store.get(key, 0) + cnt
+        self.zero += other.zero
+        self.nulls += other.nulls
+        self._merge_moments(other.count, other.mean, other.m2)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @property
+    def std(self) -> Optional[float]:
+        return math.sqrt(self.m2 / self.count) if self.count else None
+
+    @property
+    def null_rate(self) -> float:
+        total = self.count + self.nulls
+        return self.nulls / total if total else 0.0
+
+    def _bucket_value(self, key: int) -> float:
+        return 2.0 * self.gamma ** key / (self.gamma + 1.0)
+
+    def buckets(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Bucket representative values (ascending) and their counts"""
+        neg_keys = sorted(self.negative, reverse=True)
+        pos_keys = sorted(self.positive)
+        values = (
+            [-self._bucket_value(k) for k in neg_keys]
+            + ([0.0] if self.zero else [])
+            + [self._bucket_value(k) for k in pos_keys]
+        )
+        counts = (
+            [self.negative[k] for k in neg_keys]
+            + ([self.zero] if self.zero else [])
+            + [self.positive[k] for k in pos_keys]
+        )
+        return np.asarray(values, dtype=np.float64), np.asarray(counts, dtype=np.float64)
+
+    def quantiles(self, qs: Iterable[float]) -> np.ndarray:
+        """Approximate quantiles (within ``relative_accuracy``)"""
+        values, counts = self.buckets()
+        qs = np.asarray(list(qs), dtype=np.float64)
+        if not values.size:
+            return np.full(qs.shape, np.nan)
+        cumulative = np.cumsum(counts)
+        ranks = qs * (cumulative[-1] - 1)
+        idx = np.searchsorted(cumulative, ranks, side="right")
+        return values[np.minimum(idx, values.size - 1)]
+
+    # ------------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "version": SKETCH_VERSION,
+            "relative_accuracy": self.relative_accuracy,
+            "positive": {str(k): v for k, v in self.positive.items()},
+            "negative": {str(k): v for k, v in self.negative.items()},
+            "zero": self.zero,
+            "count": self.count,
+            "nulls": self.nulls,
+            "mean": self.mean,
+            "m2": self.m2,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "NumericSketch":
+        sketch = cls(data.get("relative_accuracy", DEFAULT_RELATIVE_ACCURACY))
+        sketch.positive = {int(k): int(v) for k, v in data.get("positive", {}).items()}
+        sketch.negative = {int(k): int(v) for k, v in data.get("negative", {}).items()}
+        sketch.zero = int(data.get("zero", 0))
+        sketch.count = int(data.get("count", 0))
+        sketch.nulls = int(data.get("nulls", 0))
+        sketch.mean = float(data.get("mean", 0.0))
+        sketch.m2 = float(data.get("m2", 0.0))
+        sketch.min = math.inf if data.get("min") is None else float(data["min"])
+        sketch.max = -math.inf if data.get("max") is None else float(data["max"])
+        return sketch
+
+
+class CategoricalSketch:
+    """Bounded, mergeable frequency table for one categorical column"""
+
+    kind = "categorical"
+
+    def __init__(self, max_categories: int = MAX_CATEGORIES):
+        self.max_categories = max_categories
+        self.counts: Dict[str, int] = {}
+        self.count = 0
+        self.nulls = 0
+
+    def _add(self, key: str, cnt: int) -> None:
+        if key not in self.counts and len(self.counts) >= self.max_categories:
+            key = OTHER_CATEGORY
+        self.counts[key] = self.counts.get(key, 0) + cnt
+
+    def update(self, values: Union[pd.Series, Iterable[Any]]) -> "CategoricalSketch":
+        """Add a batch of values; NaN / None count as nulls"""
+        series = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+        nulls = int(series.isna().sum())
+        self.nulls += nulls
+        self.count += int(series.size - nulls)
+        for key, cnt in series.value_counts(dropna=True).items():
+            self._add(str(key), int(cnt))
+        return self
+
+    def merge(self, other: "CategoricalSketch") -> "CategoricalSketch":
+        for key, cnt in other.counts.items():
+            self._add(key, cnt)
+        self.count += other.count
+        self.nulls += other.nulls
+        return self
+
+    @property
+    def null_rate(self) -> float:
+        total = self.count + self.nulls
+        return self.nulls / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "version": SKETCH_VERSION,
+            "max_categories": self.max_categories,
+            "counts": dict(self.counts),
+            "count": self.count,
+            "nulls": self.nulls,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CategoricalSketch":
+        sketch = cls(int(data.get("max_categories", MAX_CATEGORIES)))
+        sketch.counts = {str(k): int(v) for k, v in data.get("counts", {}).items()}
+        sketch.count = int(data.get("count", 0))
+        sketch.nulls = int(data.get("nulls", 0))
+        return sketch
+
+
+Sketch = Union[NumericSketch, CategoricalSketch]
+
+
+def sketch_from_dict(data: Dict[str, Any]) -> Sketch:
+    """Rebuild a sketch serialized with ``to_dict``"""
+    version = data.get("version", SKETCH_VERSION)
+    if version > SKETCH_VERSION:
+        raise ValueError(f"sketch version {version} is newer than supported {SKETCH_VERSION}")
+    if data.get("kind") == "numeric":
+        return NumericSketch.from_dict(data)
+    if data.get("kind") == "categorical":
+        return CategoricalSketch.from_dict(data)
+    raise ValueError(f"unknown sketch kind: {data.get('kind')!r}")
+
+
+# ----------------------------------------------------------------------
+# Drift metrics
+# ----------------------------------------------------------------------
+
+
+def _psi(ref: np.ndarray, cur: np.ndarray) -> float:
+    ref = np.clip(ref, _EPS, None)
+    cur = np.clip(cur, _EPS, None)
+    return float(np.sum((cur - ref) * np.log(cur / ref)))
+
+
+def _kl_divergence(ref: np.ndarray, cur: np.ndarray) -> float:
+    """KL(ref || cur) with the same floor as PSI"""
+    ref = np.clip(ref, _EPS, None)
+    cur = np.clip(cur, _EPS, None)
+    return float(np.sum(ref * np.log(ref / cur)))
+
+
+def _js_distance(p: np.ndarray, q: np.ndarray) -> float:
+    """Jensen–Shannon distance (base 2, in [0, 1])"""
+    m = 0.5 * (p + q)
+
+    def _kl(a: np.ndarray, b: np.ndarray) -> float:
+        mask = a > 0
+        return float(np.sum(a[mask] * np.log2(a[mask] / b[mask])))
+
+    divergence = 0.5 * _kl(p, m) + 0.5 * _kl(q, m)
+    return math.sqrt(max(divergence, 0.0))
+
+
+def _ks_pvalue(statistic: float, n_ref: int, n_cur: int) -> float:
+    """Asymptotic two-sample Kolmogorov–Smirnov p-value"""
+    if statistic <= 0:
+        return 1.0
+    n_eff = n_ref * n_cur / (n_ref + n_cur)
+    lam = (math.sqrt(n_eff) + 0.12 + 0.11 / math.sqrt(n_eff)) * statistic
+    total = 0.0
+    for k in range(1, 101):
+        term = 2 * (-1) ** (k - 1) * math.exp(-2 * k * k * lam * lam)
+        total += term
+        if abs(term) < 1e-10:
+            break
+    return float(min(max(total, 0.0), 1.0))
+
+
+def drift_status(psi: Optional[float], null_rate_delta: float = 0.0) -> str:
+    """NORMAL / WARNING / CRITICAL from PSI, bumped to WARNING by a large null-rate change"""
+    if psi is not None and psi >= PSI_CRITICAL:
+        return "CRITICAL"
+    if (psi is not None and psi >= PSI_WARNING) or abs(null_rate_delta) >= NULL_RATE_WARNING:
+        return "WARNING"
+    return "NORMAL"
+
+
+def _null_metrics(ref: Sketch, cur: Sketch) -> Dict[str, float]:
+    return {
+        "null_rate_base": round(ref.null_rate, 4),
+        "null_rate_target": round(cur.null_rate, 4),
+        "null_rate_delta": round(cur.null_rate - ref.null_rate, 4),
+    }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(float(value), 4)
+
+
+def compare_numeric(ref: NumericSketch, cur: NumericSketch, psi_bins: int = 10) -> Dict[str, Any]:
+    """
+    Drift metrics between two numeric sketches
+
+    PSI and KL use ``psi_bins`` reference-quantile bins; KS and Jensen–Shannon
+    use the shared sketch buckets directly.
+    """
+    result: Dict[str, Any] = {
+        "kind": "numeric",
+        "count_base": ref.count,
+        "count_target": cur.count,
+        "base_mean": _round(ref.mean) if ref.count else None,
+        "target_mean": _round(cur.mean) if cur.count else None,
+        "base_std": _round(ref.std),
+        "target_std": _round(cur.std),
+        "delta": _round(cur.mean - ref.mean) if ref.count and cur.count else None,
+        **_null_metrics(ref, cur),
+        "psi": None,
+        "kl": None,
+        "ks": None,
+        "ks_pvalue": None,
+        "js": None,
+    }
+    if not ref.count or not cur.count:
+        result["status"] = drift_status(None, result["null_rate_delta"])
+        return result
+
+    ref_values, ref_counts = ref.buckets()
+    cur_values, cur_counts = cur.buckets()
+    grid = np.union1d(ref_values, cur_values)
+    ref_p = np.zeros(grid.size)
+    cur_p = np.zeros(grid.size)
+    ref_p[np.searchsorted(grid, ref_values)] = ref_counts / ref_counts.sum()
+    cur_p[np.searchsorted(grid, cur_values)] = cur_counts / cur_counts.sum()
+
+    ks = float(np.max(np.abs(np.cumsum(ref_p) - np.cumsum(cur_p))))
+
+    edges = np.unique(ref.quantiles(np.linspace(0, 1, psi_bins + 1)[1:-1]))
+    bin_idx = np.searchsorted(edges, grid, side="left")
+    ref_bins = np.bincount(bin_idx, weights=ref_p, minlength=edges.size + 1)
+    cur_bins = np.bincount(bin_idx, weights=cur_p, minlength=edges.size + 1)
+
+    result.update({
+        "psi": round(_psi(ref_bins, cur_bins), 4),
+        "kl": round(_kl_divergence(ref_bins, cur_bins), 4),
+        "ks": round(ks, 4),
+        "ks_pvalue": round(_ks_pvalue(ks, ref.count, cur.count), 6),
+        "js": round(_js_distance(ref_p, cur_p), 4),
+    })
+    result["status"] = drift_status(result["psi"], result["null_rate_delta"])
+    return result
+
+
+def compare_categorical(ref: CategoricalSketch, cur: CategoricalSketch, top_new: int = 10) -> Dict[str, Any]:
+    """Drift metrics between two categorical sketches (PSI / JS over the category union)"""
+    result: Dict[str, Any] = {
+        "kind": "categorical",
+        "count_base": ref.count,
+        "count_target": cur.count,
+        "categories_base": len(ref.counts),
+        "categories_target": len(cur.counts),
+        **_null_metrics(ref, cur),
+        "psi": None,
+        "kl": None,
+        "ks": None,
+        "js": None,
+        "new_categories": [],
+    }
+    if not ref.count or not cur.count:
+        result["status"] = drift_status(None, result["null_rate_delta"])
+        return result
+
+    keys = sorted(set(ref.counts) | set(cur.counts))
+    ref_p = np.array([ref.counts.get(k, 0) for k in keys], dtype=np.float64)
+    cur_p = np.array([cur.counts.get(k, 0) for k in keys], dtype=np.float64)
+    ref_p /= ref_p.sum()
+    cur_p /= cur_p.sum()
+
+    new = sorted((k for k in cur.counts if k not in ref.counts), key=lambda k: -cur.counts[k])
+    result.update({
+        "psi": round(_psi(ref_p, cur_p), 4),
+        "kl": round(_kl_divergence(ref_p, cur_p), 4),
+        "js": round(_js_distance(ref_p, cur_p), 4),
+        "new_categories": new[:top_new],
+        "new_categories_count": len(new),
+    })
+    result["status"] = drift_status(result["psi"], result["null_rate_delta"])
+    return result
+
+
+def compare_sketches(ref: Sketch, cur: Sketch, psi_bins: int = 10) -> Dict[str, Any]:
+    """Dispatch to ``compare_numeric`` / ``compare_categorical``"""
+    if isinstance(ref, NumericSketch) and isinstance(cur, NumericSketch):
+        return compare_numeric(ref, cur, psi_bins=psi_bins)
+    if isinstance(ref, CategoricalSketch) and isinstance(cur, CategoricalSketch):
+        return compare_categorical(ref, cur)
+    raise ValueError(f"cannot compare {ref.kind} sketch with {cur.kind} sketch")
@@ -207,7 +207,8 @@ class SnapshotService:
     def restore_snapshot(
         self,
         version_or_alias: str,
-        force: bool = False
+        force: bool = False,
+        fast: bool = False
     ) -> Dict[str, Any]:
         """
         Restore a snapshot (ddoc checkout)
@@ -215,6 +216,8 @@ class SnapshotService:
         Args:
             version_or_alias: Snapshot ID or alias
             force: Force checkout even with uncommitted changes
+            fast: Restore data/ by manifest diff from the local DVC cache,
+                touching only changed files (falls back to dvc checkout)
             
         Returns:
             Result dictionary
@@ -263,6 +266,18 @@ class SnapshotService:
                             "error": "You have uncommitted changes. Commit them or use --force to checkout anyway."
                         }
             
+            # Plan the fast restore before git checkout replaces data.dvc, so
+            # a refusal (local edits) leaves HEAD and data/ untouched
+            fast_plan = None
+            if fast:
+                fast_plan = self._plan_fast_restore(snapshot.data.dvc_hash, self._get_dvc_data_hash(), force)
+                if not fast_plan["success"] and not fast_plan.get("fallback"):
+                    return {
+                        "success": False,
+                        "error": f"Fast restore failed: {fast_plan.get('error')}",
+                        "git_restored": False
+                    }
+            
             # Checkout git revision
             git_result = self.git_service.checkout(snapshot.code.git_rev, force=force)
             if not git_result["success"]:
@@ -271,20 +286,26 @@ class SnapshotService:
                     "error": f"Git checkout failed: {git_result.get('error')}"
                 }
             
-            # Checkout DVC data
-            dvc_result = self._dvc_checkout(force=force)
-            if not dvc_result["success"]:
-                return {
-                    "success": False,
-                    "error": f"DVC checkout failed: {dvc_result.get('error')}",
-                    "git_restored": True
-                }
+            fast_result = None
+            if fast_plan is not None and fast_plan["success"]:
+                fast_result = self._apply_fast_restore(fast_plan["plan"])
+            
+            if fast_result is None or not fast_result["success"]:
+                # Checkout DVC data
+                dvc_result = self._dvc_checkout(force=force)
+                if not dvc_result["success"]:
+                    return {
+                        "success": False,
+                        "error": f"DVC checkout failed: {dvc_result.get('error')}",
+                        "git_restored": True
+                    }
             
             # Clean up empty directories in data/ after DVC checkout
             # DVC only tracks files, so empty directories remain after checkout
-            print("[cyan]🧹 Cleaning up empty directories...[/cyan]")
+            # (the fast path already pruned the directories it emptied)
             data_dir = self.project_root / "data"
-            if data_dir.exists():
+            if data_dir.exists() and not (fast_result and fast_result["success"]):
+                print("[cyan]🧹 Cleaning up empty directories...[/cyan]")
                 # Iterate multiple times to handle nested empty directories
                 # After removing child directories, parent may become empty
                 total_removed = 0
@@ -315,7 +336,8 @@ class SnapshotService:
                 "git_commit": snapshot.code.git_rev[:7],
                 "data_hash": snapshot.data.dvc_hash[:7],
                 "description": snapshot.description,
-                "restored_at": datetime.now().isoformat()
+                "restored_at": datetime.now().isoformat(),
+                "fast": bool(fast_result and fast_result["success"])
             }
             
         except Exception as e:
@@ -690,6 +712,45 @@ class SnapshotService:
                 "error": "DVC not found"
             }
     
+    def _plan_fast_restore(
+        self,
+        target_hash: str,
+        current_hash: Optional[str],
+        force: bool = False
+    ) -> Dict[str, Any]:
+        """Plan the manifest-diff restore of data/ (no workspace changes)"""
+        from .restore_service import get_restore_service
+        
+        print("[cyan]⚡ Restoring data by manifest diff...[/cyan]")
+        try:
+            result = get_restore_service(str(self.project_root)).plan(
+                target_hash, current_hash=current_hash, force=force
+            )
+        except Exception as e:
+            result = {"success": False, "fallback": True, "error": str(e)}
+        
+        if not result["success"] and result.get("fallback"):
+            print(f"[yellow]   ⚠️  {result.get('error')} — falling back to dvc checkout[/yellow]")
+        return result
+    
+    def _apply_fast_restore(self, plan: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply a planned restore through RestoreService (parallel links)"""
+        from .restore_service import get_restore_service
+        
+        try:
+            result = get_restore_service(str(self.project_root)).apply(plan)
+        except Exception as e:
+            result = {"success": False, "fallback": True, "error": str(e)}
+        
+        if result["success"]:
+            print(
+                f"[green]   ✅ {result['materialized']} restored, "
+                f"{result['removed_files']} removed, {result['unchanged']} unchanged[/green]"
+            )
+        else:
+            print(f"[yellow]   ⚠️  {result.get('error')} — falling back to dvc checkout[/yellow]")
+        return result
+    
     def _cleanup_empty_directories(self, path: Path) -> int:
         """
         Recursively remove empty directories in data/ directory.
@@ -1,12 +1,13 @@
 """
 Staging Service for ddoc - Git-like staging area for dataset changes
 """
-import json
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 from rich import print
 
+from .registry import get_registry
+
 
 class StagingService:
     """
@@ -19,6 +20,7 @@ class StagingService:
         self.metadata_dir.mkdir(exist_ok=True)
         
         self.staging_file = self.metadata_dir / "staging.json"
+        self.registry = get_registry()
         self._init_staging()
     
     def _empty_staging(self) -> Dict[str, Any]:
@@ -42,22 +44,24 @@ class StagingService:
             self._save_staging(staging)
         return staging
 
-    def _load_staging(self) -> Dict[str, Any]:
-        """Load staging data — always returns a usable dict."""
+    def _load_staging(self, mutable: bool = False) -> Dict[str, Any]:
+        """Load staging data — always returns a usable dict.
+
+        Served from the shared registry; pass ``mutable=True`` when the
+        result is going to be modified and saved.
+        """
         if self.staging_file.exists():
-            try:
-                with open(self.staging_file, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, KeyError, OSError):
+            staging = self.registry.read_json(self.staging_file, mutable=mutable)
+            if not isinstance(staging, dict) or 'staged_datasets' not in staging:
                 print("[yellow]Warning: Could not load staging data, starting fresh[/yellow]")
                 return self._empty_staging()
+            return staging
         return self._init_staging()
     
     def _save_staging(self, staging_data: Dict[str, Any]):
         """Save staging data"""
         staging_data['last_updated'] = datetime.now().isoformat()
-        with open(self.staging_file, 'w') as f:
-            json.dump(staging_data, f, indent=2)
+        self.registry.write(self.staging_file, staging_data)
     
     def stage_dataset(
         self,
@@ -85,19 +89,20 @@ class StagingService:
             Result dictionary with success status
         """
         try:
-            staging = self._load_staging()
-            
-            staging['staged_datasets'][name] = {
-                'operation': operation,
-                'path': path,
-                'formats': formats or [],
-                'config': config,
-                'current_hash': current_hash,
-                'staged_at': datetime.now().isoformat(),
-                'metadata': metadata or {}
-            }
-            
-            self._save_staging(staging)
+            with self.registry.lock(self.staging_file):
+                staging = self._load_staging(mutable=True)
+                
+                staging['staged_datasets'][name] = {
+                    'operation': operation,
+                    'path': path,
+                    'formats': formats or [],
+                    'config': config,
+                    'current_hash': current_hash,
+                    'staged_at': datetime.now().isoformat(),
+                    'metadata': metadata or {}
+                }
+                
+                self._save_staging(staging)
             
             return {
                 'success': True,
@@ -122,16 +127,17 @@ class StagingService:
             Result dictionary with success status
         """
         try:
-            staging = self._load_staging()
-            
-            if name not in staging['staged_datasets']:
-                return {
-                    'success': False,
-                    'error': f"Dataset {name} is not staged"
-                }
-            
-            del staging['staged_datasets'][name]
-            self._save_staging(staging)
+            with self.registry.lock(self.staging_file):
+                staging = self._load_staging(mutable=True)
+                
+                if name not in staging['staged_datasets']:
+                    return {
+                        'success': False,
+                        'error': f"Dataset {name} is not staged"
+                    }
+                
+                del staging['staged_datasets'][name]
+                self._save_staging(staging)
             
             return {
                 'success': True,
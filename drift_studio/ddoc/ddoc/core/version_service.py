@@ -1,13 +1,13 @@
 """
 Version Service for ddoc - Git-free dataset version management
 """
-import json
-import yaml
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 from rich import print
 
+from .registry import get_registry
+
 
 class VersionService:
     """
@@ -21,6 +21,7 @@ class VersionService:
         
         self.dataset_versions_file = self.metadata_dir / "dataset_versions.json"
         self.experiment_versions_file = self.metadata_dir / "experiment_versions.json"
+        self.registry = get_registry()
         
         self.config = self._load_config()
         self._init_version_files()
@@ -30,8 +31,7 @@ class VersionService:
         params_file = self.project_root / "params.yaml"
         if params_file.exists():
             try:
-                with open(params_file, 'r') as f:
-                    params = yaml.safe_load(f) or {}
+                params = self.registry.read_yaml(params_file, default={})
                 return params.get('version_control', {
                     'policy': 'strict',
                     'auto_version_prefix': 'auto_',
@@ -49,12 +49,10 @@ class VersionService:
     def _init_version_files(self):
         """Initialize version files if they don't exist"""
         if not self.dataset_versions_file.exists():
-            with open(self.dataset_versions_file, 'w') as f:
-                json.dump({}, f, indent=2)
+            self.registry.write(self.dataset_versions_file, {})
         
         if not self.experiment_versions_file.exists():
-            with open(self.experiment_versions_file, 'w') as f:
-                json.dump({}, f, indent=2)
+            self.registry.write(self.experiment_versions_file, {})
     
     def get_dvc_hash(self, dataset_path: str) -> Optional[str]:
         """Extract MD5 hash from DVC file"""
@@ -65,8 +63,7 @@ class VersionService:
             if not dvc_file.exists():
                 return None
             
-            with open(dvc_file, 'r') as f:
-                dvc_data = yaml.safe_load(f)
+            dvc_data = self.registry.read_yaml(dvc_file, default={})
             
             # Extract MD5 hash from DVC file
             if 'outs' in dvc_data and dvc_data['outs']:
@@ -80,7 +77,15 @@ class VersionService:
     def create_dataset_version(self, name: str, version: str, message: str = "") -> Dict[str, Any]:
         """Create a new dataset version"""
         try:
-            versions_data = self._load_dataset_versions()
+            with self.registry.lock(self.dataset_versions_file):
+                return self._create_dataset_version_locked(name, version, message)
+        except Exception as e:
+            return {"error": f"Failed to create version: {e}"}
+    
+    def _create_dataset_version_locked(self, name: str, version: str, message: str) -> Dict[str, Any]:
+        """create_dataset_version body; caller holds the dataset_versions lock"""
+        try:
+            versions_data = self._load_dataset_versions(mutable=True)
             
             # Get dataset path from params.yaml
             dataset_path = self._get_dataset_path(name)
@@ -303,7 +308,12 @@ class VersionService:
 
     def set_dataset_version_alias(self, name: str, version: str, alias: Optional[str]) -> Dict[str, Any]:
         """Set or remove alias for a specific dataset version"""
-        versions_data = self._load_dataset_versions()
+        with self.registry.lock(self.dataset_versions_file):
+            return self._set_dataset_version_alias_locked(name, version, alias)
+
+    def _set_dataset_version_alias_locked(self, name: str, version: str, alias: Optional[str]) -> Dict[str, Any]:
+        """set_dataset_version_alias body; caller holds the dataset_versions lock"""
+        versions_data = self._load_dataset_versions(mutable=True)
 
         if name not in versions_data or version not in versions_data[name]["versions"]:
             return {"success": False, "error": f"Version {version} not found for dataset {name}"}
@@ -347,8 +357,7 @@ class VersionService:
         dataset_entry = versions_data.get(name)
         if not dataset_entry:
             return None
-        dataset_entry.setdefault("aliases", {})
-        return dataset_entry["aliases"].get(alias)
+        return dataset_entry.get("aliases", {}).get(alias)
 
     def _remove_alias_mapping(self, dataset_entry: Dict[str, Any], version: str) -> None:
         """Remove alias mapping associated with a version"""
@@ -357,42 +366,36 @@ class VersionService:
         for alias in to_remove:
             aliases.pop(alias, None)
 
-    def _load_dataset_versions(self) -> Dict[str, Any]:
-        with open(self.dataset_versions_file, 'r') as f:
-            return json.load(f)
+    def _load_dataset_versions(self, mutable: bool = False) -> Dict[str, Any]:
+        """Load dataset versions from the shared registry (read-only unless ``mutable``)"""
+        return self.registry.read_json(self.dataset_versions_file, default={}, mutable=mutable)
 
     def _save_dataset_versions(self, data: Dict[str, Any]) -> None:
-        with open(self.dataset_versions_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        self.registry.write(self.dataset_versions_file, data)
     
     def create_experiment_version(self, dataset_name: str, dataset_version: str, exp_name: str) -> str:
         """Create experiment version for specific dataset version"""
         try:
-            with open(self.experiment_versions_file, 'r') as f:
-                exp_versions = json.load(f)
-            
-            dataset_key = f"{dataset_name}@{dataset_version}"
-            
-            if dataset_key not in exp_versions:
-                exp_versions[dataset_key] = {
-                    "experiments": {},
-                    "counter": 0
+            with self.registry.transaction(self.experiment_versions_file, default={}) as exp_versions:
+                dataset_key = f"{dataset_name}@{dataset_version}"
+                
+                if dataset_key not in exp_versions:
+                    exp_versions[dataset_key] = {
+                        "experiments": {},
+                        "counter": 0
+                    }
+                
+                exp_versions[dataset_key]["counter"] += 1
+                exp_counter = exp_versions[dataset_key]["counter"]
+                
+                exp_version = f"exp_{exp_counter}"
+                
+                exp_versions[dataset_key]["experiments"][exp_version] = {
+                    "exp_name": exp_name,
+                    "timestamp": datetime.now().isoformat(),
+                    "metadata": {}
                 }
             
-            exp_versions[dataset_key]["counter"] += 1
-            exp_counter = exp_versions[dataset_key]["counter"]
-            
-            exp_version = f"exp_{exp_counter}"
-            
-            exp_versions[dataset_key]["experiments"][exp_version] = {
-                "exp_name": exp_name,
-                "timestamp": datetime.now().isoformat(),
-                "metadata": {}
-            }
-            
-            with open(self.experiment_versions_file, 'w') as f:
-                json.dump(exp_versions, f, indent=2)
-            
             return exp_version
             
         except Exception as e:
@@ -414,8 +417,7 @@ class VersionService:
             if not params_file.exists():
                 return None
             
-            with open(params_file, 'r') as f:
-                params = yaml.safe_load(f) or {}
+            params = self.registry.read_yaml(params_file, default={})
             
             datasets = params.get('datasets', [])
             for dataset in datasets:
@@ -484,8 +486,7 @@ class VersionService:
                 raise Exception(f"DVC file not found: {dvc_file}")
             
             # DVC 파일 읽기
-            with open(dvc_file, 'r') as f:
-                dvc_data = yaml.safe_load(f)
+            dvc_data = self.registry.read_yaml(dvc_file, default={}, mutable=True)
             
             # 해시 업데이트
             if 'outs' in dvc_data and dvc_data['outs']:
@@ -493,8 +494,7 @@ class VersionService:
                 dvc_data['outs'][0]['md5'] = target_hash
                 
                 # DVC 파일 저장
-                with open(dvc_file, 'w') as f:
-                    yaml.safe_dump(dvc_data, f, default_flow_style=False)
+                self.registry.write(dvc_file, dvc_data)
                 
                 print(f"✅ Updated DVC file hash: {old_hash[:8]}... → {target_hash[:8]}...")
                 return True
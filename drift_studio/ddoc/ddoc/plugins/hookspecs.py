@@ -157,6 +157,13 @@ def data_source_read(
     ``firstresult=True`` so the first plugin claiming the scheme wins;
     plugins return ``None`` for schemes they don't handle.
 
+    Plugins that mirror a local or mounted location (NFS, SMB,
+    FUSE-mounted buckets) should materialize through
+    ``ddoc.core.sync_service.sync_tree`` — the engine behind the
+    built-in adapter — so repeat fetches only transfer changed files.
+    Its counters (``files_unchanged``, ``files_linked``, ...) can be
+    merged into the returned envelope.
+
     Returns
     -------
     ``{status, scheme, source_uri, local_path, bytes_transferred,
@@ -25,6 +25,10 @@ def fetch(req: FetchRequest):
     ]
     if req.symlink:
         args.append("--symlink")
+    if req.link != "auto":
+        args += ["--link", req.link]
+    if req.checksum:
+        args.append("--checksum")
     if req.config:
         args += ["--config", json.dumps(req.config, default=str)]
     result = run(args, require_json=True, timeout=req.timeout_sec)
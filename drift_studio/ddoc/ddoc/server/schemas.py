@@ -85,6 +85,8 @@ class FetchRequest(BaseModel):
     source_uri: str = Field(..., description="file://, bare path, s3://, gs://, http(s)://, …")
     dest: str = Field(..., description="Local directory to materialize into.")
     symlink: bool = False
+    link: str = Field("auto", description="file:// sync link mode: auto | reflink | hardlink | copy")
+    checksum: bool = False
     config: Optional[Dict[str, Any]] = None
     timeout_sec: float = 120.0
 
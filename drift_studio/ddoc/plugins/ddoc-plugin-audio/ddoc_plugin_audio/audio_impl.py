@@ -19,10 +19,7 @@ except ImportError:
     def hookimpl(func):
         return func
 
-try:
-    import librosa
-except ImportError:
-    librosa = None
+from ddoc_plugin_audio.features import extract_features, extract_many
 
 
 class DOCAudioPlugin:
@@ -53,47 +50,9 @@ class DOCAudioPlugin:
         return audio_files
     
     def _analyze_audio_attributes(self, file_path: Path) -> Optional[Dict[str, Any]]:
-        """Calculate physical-based audio features"""
-        if librosa is None:
-            print("Warning: librosa not available")
-            return None
-        
-        try:
-            y, sr = librosa.load(str(file_path), sr=None, duration=30.0)  # Limit to 30s for speed
-            
-            # RMS energy
-            rms = librosa.feature.rms(y=y)[0]
-            rms_mean = float(np.mean(rms))
-            rms_std = float(np.std(rms))
-            
-            # Zero Crossing Rate
-            zcr = librosa.feature.zero_crossing_rate(y)[0]
-            zcr_mean = float(np.mean(zcr))
-            
-            # Spectral features
-            spectral_centroids = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
-            spectral_bandwidth = librosa.feature.spectral_bandwidth(y=y, sr=sr)[0]
-            spectral_rolloff = librosa.feature.spectral_rolloff(y=y, sr=sr)[0]
-            
-            # MFCC statistics
-            mfccs = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
-            mfcc_mean = [float(x) for x in np.mean(mfccs, axis=1)]
-            mfcc_std = [float(x) for x in np.std(mfccs, axis=1)]
-            
-            return {
-                'rms_energy_mean': rms_mean,
-                'rms_energy_std': rms_std,
-                'zcr_mean': zcr_mean,
-                'spectral_centroid_mean': float(np.mean(spectral_centroids)),
-                'spectral_bandwidth_mean': float(np.mean(spectral_bandwidth)),
-                'spectral_rolloff_mean': float(np.mean(spectral_rolloff)),
-                'mfcc_mean': mfcc_mean,
-                'mfcc_std': mfcc_std
-            }
-        except Exception as e:
-            print(f"Error analyzing {file_path}: {e}")
-            return None
-    
+        """Calculate physical-based audio features (whole file, segment-wise)"""
+        return extract_features(file_path)
+
     def _compute_attributes_from_path(self, data_path) -> Dict[str, Any]:
         """Walk ``data_path`` for ddoc.yaml-declared audio datasets and
         compute attributes inline. Round-7 — extracted from eda_run so
@@ -118,15 +77,12 @@ class DOCAudioPlugin:
             except Exception as e:
                 print(f"⚠️ Skipping {item}: {e}")
 
-        all_attributes: Dict[str, Any] = {}
-        for dataset_path, _config in audio_datasets:
-            audio_files = self._get_audio_files(dataset_path)
-            for audio_file in audio_files:
-                rel_path = str(audio_file.relative_to(input_path))
-                attrs = self._analyze_audio_attributes(audio_file)
-                if attrs:
-                    all_attributes[rel_path] = attrs
-        return all_attributes
+        files = [
+            (str(audio_file.relative_to(input_path)), audio_file)
+            for dataset_path, _config in audio_datasets
+            for audio_file in self._get_audio_files(dataset_path)
+        ]
+        return extract_many(files)
 
     @hookimpl
     def eda_run(self, snapshot_id, data_path, data_hash, output_path, invalidate_cache=False):
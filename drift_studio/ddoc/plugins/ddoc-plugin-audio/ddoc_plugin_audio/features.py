@@ -0,0 +1,284 @@
+"""
+Audio feature engine — one magnitude spectrogram per segment
+
+Every file is decoded in fixed-length segments (``segment_seconds``,
+soundfile block reads, librosa only as a fallback decoder) so memory stays
+bounded for hour-long recordings and the whole file is covered instead of
+the first 30 s. For each segment a single STFT magnitude ``S`` is computed
+and all spectral features are derived from it:
+
+- spectral centroid / bandwidth / rolloff — weighted moments of ``S``
+- MFCC                — mel filterbank on ``S**2`` → dB → DCT-II
+- RMS energy, zero-crossing rate — time domain, on the same frames
+
+Frame statistics are accumulated as running sums, so file-level means /
+stds are exact over all frames; segment means additionally give
+``*_seg_std`` (within-file variability). Files are processed in a process
+pool with a cooperative per-file time budget: a file that runs over is
+finalized with the segments done so far and flagged ``partial``.
+"""
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.fft import dct
+
+try:
+    import soundfile as sf
+except ImportError:  # pragma: no cover - optional fast path
+    sf = None
+
+N_FFT = 2048
+HOP_LENGTH = 512
+N_MELS = 128
+N_MFCC = 13
+ROLL_PERCENT = 0.85
+SEGMENT_SECONDS = 10.0
+TIME_BUDGET = float(os.getenv("DDOC_AUDIO_TIME_BUDGET", "120"))
+
+# soundfile (libsndfile) decodes these natively; the rest go through librosa
+_NATIVE_SUFFIXES = {".wav", ".flac", ".ogg", ".mp3", ".aiff", ".aif"}
+
+_SEGMENT_FEATURES = ("rms_energy", "zcr", "spectral_centroid")
+
+
+def default_workers() -> int:
+    env = os.getenv("DDOC_AUDIO_WORKERS")
+    return max(1, int(env)) if env else max(1, (os.cpu_count() or 2) - 1)
+
+
+# ── decoding ─────────────────────────────────────────────────────────
+
+
+def iter_segments(path: Path, segment_seconds: float = SEGMENT_SECONDS) -> Iterator[Tuple[np.ndarray, int]]:
+    """Yield ``(mono float32 samples, sample_rate)`` segments of a file."""
+    if sf is not None and path.suffix.lower() in _NATIVE_SUFFIXES:
+        try:
+            info = sf.info(str(path))
+            block = max(int(info.samplerate * segment_seconds), N_FFT)
+            for data in sf.blocks(str(path), blocksize=block, dtype="float32", always_2d=True):
+                yield data.mean(axis=1), info.samplerate
+            return
+        except RuntimeError:
+            pass  # unsupported by this libsndfile build → librosa
+
+    import librosa
+
+    y, sr = librosa.load(str(path), sr=None, mono=True)
+    block = max(int(sr * segment_seconds), N_FFT)
+    for start in range(0, len(y), block):
+        yield y[start:start + block], sr
+
+
+# ── spectral helpers ─────────────────────────────────────────────────
+
+
+def _frames(y: np.ndarray) -> np.ndarray:
+    """``(n_frames, N_FFT)`` strided view; short inputs are zero-padded to one frame."""
+    if len(y) < N_FFT:
+        y = np.pad(y, (0, N_FFT - len(y)))
+    n = 1 + (len(y) - N_FFT) // HOP_LENGTH
+    return np.lib.stride_tricks.as_strided(
+        y, shape=(n, N_FFT), strides=(y.strides[0] * HOP_LENGTH, y.strides[0]), writeable=False,
+    )
+
+
+_WINDOW = np.hanning(N_FFT + 1)[:-1].astype(np.float32)  # periodic Hann (librosa default)
+_MEL_CACHE: Dict[int, np.ndarray] = {}
+
+
+def _hz_to_mel(f):
+    f = np.asarray(f, dtype=np.float64)
+    mel = f / (200.0 / 3)
+    log_region = f >= 1000.0
+    return np.where(log_region, 15.0 + np.log(np.maximum(f, 1e-10) / 1000.0) / (np.log(6.4) / 27.0), mel)
+
+
+def _mel_to_hz(m):
+    m = np.asarray(m, dtype=np.float64)
+    f = m * (200.0 / 3)
+    log_region = m >= 15.0
+    return np.where(log_region, 1000.0 * np.exp((np.log(6.4) / 27.0) * (m - 15.0)), f)
+
+
+def mel_filterbank(sr: int) -> np.ndarray:
+    """Slaney mel filterbank ``(N_MELS, N_FFT//2+1)`` — same as ``librosa.filters.mel`` defaults."""
+    if sr not in _MEL_CACHE:
+        fft_freqs = np.linspace(0, sr / 2, N_FFT // 2 + 1)
+        mel_f = _mel_to_hz(np.linspace(_hz_to_mel(0.0), _hz_to_mel(sr / 2), N_MELS + 2))
+        fdiff = np.diff(mel_f)
+        ramps = mel_f[:, None] - fft_freqs[None, :]
+        lower = -ramps[:-2] / fdiff[:-1, None]
+        upper = ramps[2:] / fdiff[1:, None]
+        weights = np.maximum(0, np.minimum(lower, upper))
+        weights *= (2.0 / (mel_f[2:N_MELS + 2] - mel_f[:N_MELS]))[:, None]
+        _MEL_CACHE[sr] = weights.astype(np.float32)
+    return _MEL_CACHE[sr]
+
+
+def segment_features(y: np.ndarray, sr: int) -> Dict[str, np.ndarray]:
+    """Per-frame features of one segment, all from a single STFT."""
+    frames = _frames(np.ascontiguousarray(y, dtype=np.float32))
+    S = np.abs(np.fft.rfft(frames * _WINDOW, axis=1)).T  # (freq, frames)
+    freqs = np.linspace(0, sr / 2, S.shape[0])[:, None]
+
+    power = S ** 2
+    norm = S.sum(axis=0)
+    safe = np.where(norm > 0, norm, 1.0)
+    centroid = (freqs * S).sum(axis=0) / safe
+    bandwidth = np.sqrt((((freqs - centroid) ** 2) * S).sum(axis=0) / safe)
+    cumulative = np.cumsum(S, axis=0)
+    rolloff_idx = (cumulative < ROLL_PERCENT * cumulative[-1]).sum(axis=0)
+    rolloff = freqs[np.minimum(rolloff_idx, S.shape[0] - 1), 0]
+
+    mel = mel_filterbank(sr) @ power
+    log_mel = 10.0 * np.log10(np.maximum(mel, 1e-10))
+    log_mel = np.maximum(log_mel, log_mel.max() - 80.0)
+    mfcc = dct(log_mel, type=2, axis=0, norm="ortho")[:N_MFCC]
+
+    rms = np.sqrt(np.mean(np.square(frames, dtype=np.float64), axis=1))
+    signs = np.signbit(frames)
+    zcr = (signs[:, 1:] != signs[:, :-1]).mean(axis=1)
+
+    return {
+        "rms_energy": rms,
+        "zcr": zcr,
+        "spectral_centroid": centroid,
+        "spectral_bandwidth": bandwidth,
+        "spectral_rolloff": rolloff,
+        "mfcc": mfcc.T,  # (frames, N_MFCC)
+    }
+
+
+# ── per-file extraction ──────────────────────────────────────────────
+
+
+class _Running:
+    """Running sum / sum of squares over frames (vector-valued allowed)."""
+
+    def __init__(self):
+        self.n = 0
+        self.s = None
+        self.ss = None
+
+    def add(self, x: np.ndarray) -> None:
+        x = np.asarray(x, dtype=np.float64)
+        s, ss = x.sum(axis=0), (x * x).sum(axis=0)
+        self.s = s if self.s is None else self.s + s
+        self.ss = ss if self.ss is None else self.ss + ss
+        self.n += len(x)
+
+    def mean(self):
+        return self.s / self.n
+
+    def std(self):
+        return np.sqrt(np.maximum(self.ss / self.n - self.mean() ** 2, 0))
+
+
+def extract_features(
+    path,
+    segment_seconds: float = SEGMENT_SECONDS,
+    time_budget: Optional[float] = TIME_BUDGET,
+) -> Optional[Dict[str, Any]]:
+    """Compute file-level audio attributes (same keys as before plus segment stats).
+
+    Args:
+        path: Audio file.
+        segment_seconds: Decode / STFT segment length.
+        time_budget: Seconds per file; remaining segments are skipped once
+            exceeded (result flagged ``partial``). ``None`` disables it.
+
+    Returns:
+        Attribute dict, or ``None`` when the file cannot be decoded.
+    """
+    path = Path(path)
+    started = time.monotonic()
+    running: Dict[str, _Running] = {}
+    seg_means: Dict[str, List[float]] = {k: [] for k in _SEGMENT_FEATURES}
+    samples, sr, partial = 0, None, False
+
+    try:
+        for y, sr in iter_segments(path, segment_seconds):
+            if len(y) < N_FFT and samples:
+                samples += len(y)  # short tail: counted, too short for a frame of its own
+                continue
+            feats = segment_features(y, sr)
+            for key, values in feats.items():
+                running.setdefault(key, _Running()).add(values)
+            for key in _SEGMENT_FEATURES:
+                seg_means[key].append(float(feats[key].mean()))
+            samples += len(y)
+            if time_budget is not None and time.monotonic() - started > time_budget:
+                partial = True
+                break
+    except Exception as e:
+        print(f"Error analyzing {path}: {e}")
+        return None
+    if not samples:
+        return None
+
+    attrs: Dict[str, Any] = {
+        "rms_energy_mean": float(running["rms_energy"].mean()),
+        "rms_energy_std": float(running["rms_energy"].std()),
+        "zcr_mean": float(running["zcr"].mean()),
+        "spectral_centroid_mean": float(running["spectral_centroid"].mean()),
+        "spectral_bandwidth_mean": float(running["spectral_bandwidth"].mean()),
+        "spectral_rolloff_mean": float(running["spectral_rolloff"].mean()),
+        "mfcc_mean": [float(x) for x in running["mfcc"].mean()],
+        "mfcc_std": [float(x) for x in running["mfcc"].std()],
+        "duration_sec": samples / sr,
+        "sample_rate": int(sr),
+        "num_segments": len(seg_means["rms_energy"]),
+    }
+    for key in _SEGMENT_FEATURES:
+        attrs[f"{key}_seg_std"] = float(np.std(seg_means[key]))
+    if partial:
+        attrs["partial"] = True
+    return attrs
+
+
+def _extract_worker(args) -> Tuple[str, Optional[Dict[str, Any]]]:
+    key, path, segment_seconds, time_budget = args
+    return key, extract_features(path, segment_seconds, time_budget)
+
+
+def extract_many(
+    files: Sequence[Tuple[str, Path]],
+    workers: Optional[int] = None,
+    segment_seconds: float = SEGMENT_SECONDS,
+    time_budget: Optional[float] = TIME_BUDGET,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Extract attributes for ``(key, path)`` pairs, fanned out over processes.
+
+    Longest files are submitted first so one large recording does not end
+    up alone at the tail of the run.
+
+    Returns:
+        ``{key: attributes}`` for every file that decoded.
+    """
+    workers = workers or default_workers()
+    jobs = [(key, Path(path), segment_seconds, time_budget) for key, path in files]
+    jobs.sort(key=lambda j: j[1].stat().st_size if j[1].exists() else 0, reverse=True)
+    total = len(jobs)
+    results: Dict[str, Dict[str, Any]] = {}
+
+    def _collect(done: int, key: str, attrs) -> None:
+        if attrs:
+            results[key] = attrs
+        if progress:
+            progress(done, total)
+
+    if workers <= 1 or total <= 1:
+        for i, job in enumerate(jobs, 1):
+            _collect(i, *_extract_worker(job))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, total)) as pool:
+            for i, (key, attrs) in enumerate(pool.map(_extract_worker, jobs), 1):
+                _collect(i, key, attrs)
+    return {key: results[key] for key, _ in files if key in results}
@@ -0,0 +1,277 @@
+"""
+코퍼스 단위 텍스트 변환 (스트리밍 + 프로세스 병렬 + 변환 체인)
+
+``transform_apply``가 파일 하나를 통째로 읽어 처리하던 것을 코퍼스 단위로
+확장합니다.
+
+- 입력: 파일, 디렉토리(``pattern``으로 재귀 검색), glob 패턴
+- 파일은 ``chunk_size`` 문자씩 읽고 청크 경계에 걸친 단어만 이어 붙이므로
+  메모리 사용량은 파일 크기와 무관합니다 (줄바꿈이 없는 파일도 동일)
+- 여러 변환을 ``text.normalize,text.tokenize``처럼 한 번에 연결해
+  중간 파일 없이 한 번의 읽기/쓰기로 적용합니다
+- 파일들은 프로세스 풀에서 병렬로 처리합니다 (``DDOC_NLP_WORKERS``)
+- 입력 크기/수정 시각과 변환 체인이 같은 출력은 건너뜁니다
+  (``<output_dir>/.ddoc_transform.json``)
+
+모든 변환은 "텍스트 → 공백 기준 단어 목록" 함수와 출력 구분자로 정의되고
+청크는 항상 공백 경계에서 끊기므로, 청크 단위 결과가 파일 전체를 한 번에
+처리한 결과와 같습니다.
+"""
+import glob
+import json
+import multiprocessing as mp
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+CORPUS_VERSION = "1"  # 변환 결과가 바뀌면 올려서 기존 출력을 다시 생성
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024  # 문자 수
+MANIFEST_NAME = ".ddoc_transform.json"
+
+
+class TextTransform(NamedTuple):
+    """텍스트 청크 → 단어 목록 변환과 출력 구분자"""
+    split: Callable[[str], List[str]]
+    separator: str
+    summary: str
+
+
+TRANSFORMS: Dict[str, TextTransform] = {
+    # 소문자 변환 후 마침표를 공백으로 바꿔 분리, 토큰을 줄 단위로 출력
+    "text.tokenize": TextTransform(lambda text: text.lower().replace('.', ' ').split(), "\n",
+                                   "Generated {count} tokens"),
+    # 다중 공백 및 양쪽 끝 공백 제거
+    "text.normalize": TextTransform(str.split, " ", "Text normalization complete"),
+}
+
+
+def parse_chain(transform: Union[str, Sequence[str]]) -> List[str]:
+    """``"text.normalize,text.tokenize"`` 형태의 변환 체인을 목록으로 변환"""
+    names = transform.split(",") if isinstance(transform, str) else list(transform)
+    return [name.strip() for name in names if name.strip()]
+
+
+def is_supported(chain: Sequence[str]) -> bool:
+    return bool(chain) and all(name in TRANSFORMS for name in chain)
+
+
+def corpus_workers(workers: Optional[int] = None) -> int:
+    """변환 프로세스 수 (인자 → DDOC_NLP_WORKERS → min(4, CPU 수))"""
+    if workers is None:
+        workers = int(os.getenv('DDOC_NLP_WORKERS', '0')) or min(4, mp.cpu_count())
+    return max(1, int(workers))
+
+
+def iter_chunks(fp, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """텍스트 스트림을 공백 경계에서 끊은 청크로 읽기 (청크 끝에 걸친 단어는 다음 청크로 이월)"""
+    carry = ''
+    while True:
+        block = fp.read(chunk_size)
+        if not block:
+            break
+        block = carry + block
+        carry = ''
+        if not block[-1].isspace():
+            # 마지막 공백 뒤의 단어만 뒤에서부터 찾아 이월
+            parts = block.rsplit(None, 1)
+            if len(parts) == 2:
+                block, carry = parts
+            else:
+                block, carry = '', block
+        if block:
+            yield block
+    if carry:
+        yield carry
+
+
+def transform_file(input_path: str, output_path: str, chain: Sequence[str],
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    파일 하나에 변환 체인을 스트리밍으로 적용 (임시 파일에 쓴 뒤 원자적 교체)
+
+    Args:
+        input_path: 입력 텍스트 파일 (UTF-8)
+        output_path: 출력 파일
+        chain: 변환 이름 목록 (순서대로 적용)
+        chunk_size: 한 번에 읽을 문자 수
+
+    Returns:
+        Dict: ``{"ok", "written", "count", "bytes_in"}`` 또는 ``{"ok": False, "error"}``
+    """
+    steps = [TRANSFORMS[name] for name in chain]
+    separator = steps[-1].separator
+    output_path = Path(output_path)
+    count = 0
+    try:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=output_path.parent, prefix=f".{output_path.name}.", suffix=".tmp")
+        try:
+            with open(input_path, 'r', encoding='utf-8') as src, \
+                    os.fdopen(fd, 'w', encoding='utf-8') as dst:
+                for chunk in iter_chunks(src, chunk_size):
+                    words = steps[0].split(chunk)
+                    for step in steps[1:]:
+                        words = step.split(" ".join(words))
+                    if not words:
+                        continue
+                    if count:
+                        dst.write(separator)
+                    dst.write(separator.join(words))
+                    count += len(words)
+            os.replace(tmp, output_path)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+    except FileNotFoundError:
+        return {"ok": False, "error": f"Input file not found: {input_path}"}
+    except (OSError, UnicodeDecodeError) as e:
+        return {"ok": False, "error": f"{input_path}: {e}"}
+    return {"ok": True, "written": str(output_path), "count": count, "bytes_in": os.path.getsize(input_path)}
+
+
+def _transform_job(job: Tuple[str, str, Tuple[str, ...], int]) -> Dict[str, Any]:
+    """프로세스 풀 작업 (전역 함수)"""
+    input_path, output_path, chain, chunk_size = job
+    result = transform_file(input_path, output_path, chain, chunk_size)
+    result["input"] = input_path
+    return result
+
+
+def resolve_inputs(inputs: Union[str, Iterable[str]], pattern: str = "*.txt") -> List[Tuple[Path, Path]]:
+    """
+    입력(파일 / 디렉토리 / glob)을 (파일 경로, 출력 상대 경로) 목록으로 변환
+
+    디렉토리는 ``pattern``으로 재귀 검색하고 디렉토리 기준 상대 경로를 유지합니다.
+    glob은 패턴 앞의 고정 경로 기준, 단일 파일은 파일 이름만 사용합니다.
+    """
+    if isinstance(inputs, (str, os.PathLike)):
+        inputs = [inputs]
+    resolved: Dict[Path, Path] = {}
+    for spec in inputs:
+        spec = str(spec)
+        path = Path(spec)
+        if path.is_dir():
+            for file in sorted(path.rglob(pattern)):
+                if file.is_file() and not file.name.startswith('.'):
+                    resolved.setdefault(file, file.relative_to(path))
+        elif glob.has_magic(spec):
+            parts = path.parts
+            fixed = next((i for i, part in enumerate(parts) if glob.has_magic(part)), len(parts))
+            base = Path(*parts[:fixed]) if fixed else Path('.')
+            for match in sorted(glob.glob(spec, recursive=True)):
+                file = Path(match)
+                if file.is_file():
+                    resolved.setdefault(file, file.relative_to(base))
+        else:
+            resolved.setdefault(path, Path(path.name))
+    return list(resolved.items())
+
+
+def _source_stamp(path: Path) -> Optional[List[int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _load_manifest(output_dir: Path) -> Dict[str, Any]:
+    try:
+        with open(output_dir / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return manifest if manifest.get("version") == CORPUS_VERSION else {}
+
+
+def _save_manifest(output_dir: Path, files: Dict[str, Any]) -> None:
+    try:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=output_dir, prefix=".manifest.", suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({"version": CORPUS_VERSION, "files": files}, f)
+        os.replace(tmp, output_dir / MANIFEST_NAME)
+    except OSError as e:
+        print(f"⚠️  Could not write transform manifest: {e}")
+
+
+def transform_corpus(inputs: Union[str, Iterable[str]], transform: Union[str, Sequence[str]], output_dir: str,
+                     pattern: str = "*.txt", workers: Optional[int] = None,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE, force: bool = False) -> Dict[str, Any]:
+    """
+    코퍼스(여러 파일)에 변환 체인을 적용
+
+    Args:
+        inputs: 파일, 디렉토리, glob 패턴 (또는 그 목록)
+        transform: 변환 이름 또는 체인 (``"text.normalize,text.tokenize"``)
+        output_dir: 출력 디렉토리 (입력의 상대 경로 구조 유지)
+        pattern: 디렉토리 입력의 파일 패턴
+        workers: 프로세스 수 (None → DDOC_NLP_WORKERS 또는 min(4, CPU 수))
+        chunk_size: 한 번에 읽을 문자 수
+        force: 최신 출력도 다시 생성
+
+    Returns:
+        Dict: transform_apply 결과 형식 (``ok``, ``written``, ``summary``, 파일별 통계)
+    """
+    chain = parse_chain(transform)
+    if not is_supported(chain):
+        unknown = [name for name in chain if name not in TRANSFORMS] or chain
+        return {"ok": False, "error": f"Unsupported transform: {', '.join(unknown) or transform}"}
+
+    output_dir = Path(output_dir)
+    # 출력 디렉토리가 입력 디렉토리 안에 있으면 이전 출력은 입력에서 제외
+    output_root = output_dir.resolve()
+    files = [(source, relative) for source, relative in resolve_inputs(inputs, pattern)
+             if output_root not in source.resolve().parents]
+    if not files:
+        return {"ok": False, "error": f"No input files matched: {inputs}"}
+
+    previous = {} if force else _load_manifest(output_dir).get("files", {})
+    manifest: Dict[str, Any] = {}
+    jobs = []
+    skipped = 0
+    for source, relative in files:
+        key = relative.as_posix()
+        entry = {"source": str(source.resolve()), "stamp": _source_stamp(source), "chain": chain}
+        if previous.get(key) == entry and (output_dir / relative).exists():
+            manifest[key] = entry
+            skipped += 1
+            continue
+        jobs.append((key, entry, (str(source), str(output_dir / relative), tuple(chain), chunk_size)))
+
+    num_workers = min(corpus_workers(workers), len(jobs))
+    print(f"📝 Text transform {'+'.join(chain)}: {len(jobs)} files to process, {skipped} up to date"
+          + (f" ({num_workers} workers)" if num_workers > 1 else ""))
+
+    errors = []
+    count = bytes_in = 0
+    if num_workers > 1:
+        with ProcessPoolExecutor(max_workers=num_workers) as pool:
+            results = list(pool.map(_transform_job, [job for _, _, job in jobs]))
+    else:
+        results = [_transform_job(job) for _, _, job in jobs]
+    for (key, entry, _), result in zip(jobs, results):
+        if result.get("ok"):
+            manifest[key] = entry
+            count += result["count"]
+            bytes_in += result["bytes_in"]
+        else:
+            errors.append(result["error"])
+    _save_manifest(output_dir, manifest)
+
+    step = TRANSFORMS[chain[-1]]
+    return {
+        "ok": not errors,
+        "written": str(output_dir),
+        "transform": ",".join(chain),
+        "files": len(files),
+        "processed": len(jobs) - len(errors),
+        "skipped": skipped,
+        "bytes_in": bytes_in,
+        "errors": errors,
+        "summary": f"{len(jobs) - len(errors)} files transformed, {skipped} up to date"
+                   + (f"; {step.summary.format(count=count)}" if len(jobs) > len(errors) else ""),
+        **({"error": f"{len(errors)} files failed: {errors[0]}"} if errors else {}),
+    }
@@ -1,7 +1,10 @@
+import glob
 import pluggy
 from typing import Any, Dict, Optional
 from pathlib import Path
 
+from .corpus import DEFAULT_CHUNK_SIZE, TRANSFORMS, is_supported, parse_chain, transform_corpus, transform_file
+
 # ddoc용 hookimpl 마커 정의
 hookimpl = pluggy.HookimplMarker("ddoc")
 
@@ -12,30 +15,40 @@ class DDOCNlpPlugin:
     def transform_apply(self, input_path: str, transform: str, args: Dict[str, Any], output_path: str) -> Optional[Dict[str, Any]]:
         """
         NLP 변환: text.tokenize, text.normalize (예시 구현).
+        
+        ``"text.normalize,text.tokenize"``처럼 여러 변환을 연결하면 중간 파일 없이
+        한 번에 적용합니다. 입력이 디렉토리나 glob 패턴이면 코퍼스 모드로
+        동작하며 output_path는 출력 디렉토리입니다 (``corpus.transform_corpus``).
+        
+        args:
+            pattern: 디렉토리 입력의 파일 패턴 (기본 ``*.txt``)
+            workers: 프로세스 수 (기본 DDOC_NLP_WORKERS 또는 min(4, CPU 수))
+            chunk_size: 한 번에 읽을 문자 수
+            force: 최신 출력도 다시 생성
         """
-        if transform not in {"text.tokenize", "text.normalize"}:
+        chain = parse_chain(transform)
+        if not is_supported(chain):
             return None  # 이 플러그인에서 처리하지 않는 변환은 None 반환 (다음 플러그인으로 처리가 넘어감)
-    
-        try:
-            # 입력 파일을 읽습니다.
-            text = Path(input_path).read_text(encoding="utf-8")
-        except FileNotFoundError:
-            return {"ok": False, "error": f"Input file not found: {input_path}", "provider": "ddoc_nlp"}
-
-        result = None
-        if transform == "text.tokenize":
-            # 텍스트를 공백 기준으로 단순 토큰화 및 소문자 변환
-            tokens = text.lower().replace('.', ' ').split()
-            Path(output_path).write_text("\n".join(tokens), encoding="utf-8")
-            result = {"ok": True, "written": output_path, "transform": transform, "provider": "ddoc_nlp", "summary": f"Generated {len(tokens)} tokens"}
+        args = args or {}
+        chunk_size = int(args.get("chunk_size") or DEFAULT_CHUNK_SIZE)
         
-        elif transform == "text.normalize":
-            # 다중 공백 및 양쪽 끝 공백 제거
-            norm = " ".join(text.split())
-            Path(output_path).write_text(norm, encoding="utf-8")
-            result = {"ok": True, "written": output_path, "transform": transform, "provider": "ddoc_nlp", "summary": "Text normalization complete"}
+        # 디렉토리 / glob 입력 → 코퍼스 모드
+        if Path(input_path).is_dir() or glob.has_magic(str(input_path)):
+            result = transform_corpus(
+                input_path, chain, output_path,
+                pattern=args.get("pattern", "*.txt"),
+                workers=args.get("workers"),
+                chunk_size=chunk_size,
+                force=bool(args.get("force", False)),
+            )
+            return {**result, "transform": transform, "provider": "ddoc_nlp"}
         
-        return result
+        # 단일 파일: 청크 단위로 읽고 쓰기
+        result = transform_file(input_path, output_path, chain, chunk_size)
+        if not result["ok"]:
+            return {"ok": False, "error": result["error"], "provider": "ddoc_nlp"}
+        summary = TRANSFORMS[chain[-1]].summary.format(count=result["count"])
+        return {"ok": True, "written": output_path, "transform": transform, "provider": "ddoc_nlp", "summary": summary}
 
     @hookimpl
     def ddoc_get_metadata(self) -> Dict[str, Any]:
@@ -0,0 +1,253 @@
+"""
+Streaming text dataset reader — CSVs and ZIP members in bounded batches
+
+``iter_text_batches`` walks a text dataset directory the same way the
+plugin always has (ZIP archives first, then root CSVs, then a recursive
+search), but never materializes the corpus:
+
+- CSV members are read straight out of ZIP archives (no temp extraction)
+- only the text, id and label columns are parsed (header is peeked first)
+- rows are read in chunks with pyarrow's streaming CSV reader when
+  pyarrow is installed, falling back to ``pd.read_csv(chunksize=...)``
+- rows are yielded as ``TextBatch`` records of at most ``batch_size`` rows,
+  so peak memory is bounded by the batch size, not the corpus size
+
+Record keys are ``<dataset>/<source file>/<row id>``, the format the
+attribute / embedding caches already use. Row ids come from ``id_column``,
+else the first common id column (``id``, ``ID``, ``index``, ...), else
+``<file stem>_<row number>``; all are read as strings.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import os
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pa_csv = None
+
+DEFAULT_BATCH_SIZE = 4096
+COMMON_ID_COLUMNS = ("id", "ID", "index", "INDEX", "idx")
+_READ_BLOCK_SIZE = 4 * 1024 * 1024  # bytes per pyarrow read block
+
+
+class TextBatch(NamedTuple):
+    """One bounded slice of a text dataset"""
+
+    source_file: str                 # path relative to the dataset dir or ZIP root
+    keys: List[str]                  # "<dataset>/<source_file>/<row_id>"
+    texts: List[Any]                 # str, or None for empty / NA cells
+    labels: Optional[List[Any]]      # only when ``label_column`` is configured
+
+
+class CsvMember(NamedTuple):
+    """A CSV on disk (``archive_member`` is None) or inside a ZIP archive"""
+
+    name: str                        # relative path used in record keys
+    path: Path                       # file on disk, or the archive
+    archive_member: Optional[str] = None
+
+    def open(self):
+        """Binary stream of the CSV (ZIP members are decompressed on the fly)"""
+        if self.archive_member is None:
+            return open(self.path, "rb")
+        archive = zipfile.ZipFile(self.path)
+        try:
+            stream = archive.open(self.archive_member)
+        except Exception:
+            archive.close()
+            raise
+        return _ArchiveStream(archive, stream)
+
+
+class _ArchiveStream(io.RawIOBase):
+    """ZIP member stream that closes its archive when it is closed"""
+
+    def __init__(self, archive: zipfile.ZipFile, stream):
+        self._archive = archive
+        self._stream = stream
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def read(self, size: int = -1) -> bytes:
+        return self._stream.read(size)
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+            self._archive.close()
+        finally:
+            super().close()
+
+
+def find_csv_members(dataset_path: Path) -> List[CsvMember]:
+    """
+    CSV sources of a dataset, in the plugin's lookup order
+
+    ZIP archives in the dataset root win; otherwise root CSVs, otherwise
+    a recursive search. ``__MACOSX`` metadata inside archives is skipped.
+    """
+    dataset_path = Path(dataset_path)
+    members: List[CsvMember] = []
+    for zip_file in sorted(dataset_path.glob("*.zip")):
+        print(f"   Found ZIP file: {zip_file.name}")
+        try:
+            with zipfile.ZipFile(zip_file) as archive:
+                names = sorted(
+                    info.filename for info in archive.infolist()
+                    if not info.is_dir()
+                    and info.filename.lower().endswith(".csv")
+                    and not info.filename.startswith("__MACOSX/")
+                )
+        except (OSError, zipfile.BadZipFile) as e:
+            print(f"   ⚠️ Error reading {zip_file.name}: {e}")
+            continue
+        if names:
+            print(f"   Found {len(names)} CSV files in ZIP")
+            for name in names:
+                print(f"      - {name}")
+            members.extend(CsvMember(name, zip_file, name) for name in names)
+        else:
+            print(f"   ⚠️ No CSV files found in ZIP")
+
+    if not members:
+        root_csvs = sorted(dataset_path.glob("*.csv"))
+        if root_csvs:
+            print(f"   Found {len(root_csvs)} CSV file(s) in root")
+            csvs = root_csvs
+        else:
+            csvs = sorted(dataset_path.rglob("*.csv"))
+            if csvs:
+                print(f"   Found {len(csvs)} CSV file(s) recursively")
+        members = [CsvMember(csv_file.relative_to(dataset_path).as_posix(), csv_file) for csv_file in csvs]
+    return sorted(members, key=lambda member: member.name)
+
+
+def _read_header(member: CsvMember) -> List[str]:
+    with member.open() as raw:
+        text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+        return next(csv.reader(text), [])
+
+
+def _iter_frames_arrow(member: CsvMember, columns: Sequence[str]) -> Iterator[pd.DataFrame]:
+    convert = pa_csv.ConvertOptions(
+        include_columns=list(columns),
+        column_types={name: pa.string() for name in columns},
+        strings_can_be_null=True,
+    )
+    read = pa_csv.ReadOptions(block_size=_READ_BLOCK_SIZE)
+    # Quoted text cells may span lines, as with the pandas reader
+    parse = pa_csv.ParseOptions(newlines_in_values=True)
+    with member.open() as raw:
+        reader = pa_csv.open_csv(raw, read_options=read, parse_options=parse, convert_options=convert)
+        for record_batch in reader:
+            if record_batch.num_rows:
+                yield record_batch.to_pandas()
+
+
+def _iter_frames_pandas(member: CsvMember, columns: Sequence[str], chunk_rows: int) -> Iterator[pd.DataFrame]:
+    with member.open() as raw:
+        for frame in pd.read_csv(raw, usecols=list(columns), dtype=str, chunksize=chunk_rows):
+            yield frame
+
+
+def _none_if_na(values) -> List[Any]:
+    return [None if pd.isna(value) else value for value in values]
+
+
+def iter_member_batches(dataset_name: str, member: CsvMember, text_column: str,
+                        id_column: Optional[str] = None, label_column: Optional[str] = None,
+                        batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[TextBatch]:
+    """``TextBatch`` records of one CSV (nothing if the text column is missing)"""
+    batch_size = max(1, int(batch_size))
+    header = _read_header(member)
+    if text_column not in header:
+        print(f"   ⚠️ Text column '{text_column}' not found in {member.name}")
+        return
+
+    row_id_column = id_column if id_column in header else None
+    if row_id_column is None and not id_column:
+        row_id_column = next((col for col in COMMON_ID_COLUMNS if col in header), None)
+    columns = [text_column]
+    for col in (row_id_column, label_column if label_column in header else None):
+        if col and col not in columns:
+            columns.append(col)
+
+    frames = (_iter_frames_arrow(member, columns) if pa_csv is not None
+              else _iter_frames_pandas(member, columns, batch_size))
+    stem = PurePosixPath(member.name).stem
+    prefix = f"{dataset_name}/{member.name}/"
+    row = 0
+    for frame in frames:
+        for start in range(0, len(frame), batch_size):
+            part = frame.iloc[start:start + batch_size]
+            if row_id_column:
+                ids = [str(value) for value in part[row_id_column]]
+            else:
+                ids = [f"{stem}_{i}" for i in range(row, row + len(part))]
+            yield TextBatch(
+                source_file=member.name,
+                keys=[prefix + row_id for row_id in ids],
+                texts=_none_if_na(part[text_column]),
+                labels=_none_if_na(part[label_column]) if label_column in part.columns else None,
+            )
+            row += len(part)
+    print(f"   Loaded {row} rows from {member.name}")
+
+
+def iter_text_batches(dataset_path: Path, config: Dict[str, Any],
+                      batch_size: Optional[int] = None) -> Iterator[TextBatch]:
+    """
+    Stream a text dataset as bounded record batches
+
+    Args:
+        dataset_path: Dataset directory (with ``ddoc.yaml``)
+        config: Parsed ``ddoc.yaml`` (``text_column``, optional
+            ``id_column`` / ``label_column`` / ``batch_size``)
+        batch_size: Rows per batch (None → ``DDOC_TEXT_BATCH_SIZE``, then
+            ``config['batch_size']``, then 4096)
+
+    Yields:
+        TextBatch
+
+    Raises:
+        RuntimeError: A CSV failed after some of its rows were yielded
+            (a CSV that cannot be read at all is skipped with a warning)
+    """
+    dataset_path = Path(dataset_path)
+    if batch_size is None:
+        batch_size = int(os.getenv("DDOC_TEXT_BATCH_SIZE", "0")) or config.get("batch_size") or DEFAULT_BATCH_SIZE
+    total = 0
+    for member in find_csv_members(dataset_path):
+        rows = 0
+        try:
+            for batch in iter_member_batches(
+                dataset_path.name, member, config["text_column"],
+                config.get("id_column"), config.get("label_column"), batch_size,
+            ):
+                rows += len(batch.keys)
+                yield batch
+        except Exception as e:
+            if rows:
+                # Part of the file is already consumed; skipping would leave a silent gap
+                raise RuntimeError(f"Error loading {member.name} after {rows} rows: {e}") from e
+            print(f"   ⚠️ Error loading {member.name}: {e}")
+            continue
+        total += rows
+    if total:
+        print(f"   ✅ Total: {total} rows")
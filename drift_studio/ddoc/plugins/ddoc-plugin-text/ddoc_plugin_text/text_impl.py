@@ -9,15 +9,14 @@ import os
 import yaml
 import json
 import re
-import zipfile
-import shutil
-import tempfile
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, Optional, List, Tuple
 import numpy as np
 import pandas as pd
 
+from .stream import iter_text_batches
+
 try:
     from ddoc.plugins.hookspecs import hookimpl
 except ImportError:
@@ -77,128 +76,6 @@ class DOCTextPlugin:
         
         return config
     
-    def _find_csv_files(self, dataset_path: Path) -> Tuple[List[Path], Optional[Path]]:
-        """
-        Find CSV files in dataset directory.
-        - If single CSV file exists, return it
-        - If ZIP file exists, extract to temp directory and recursively find all CSV files
-        - Otherwise, recursively find all CSV files in directory
-        
-        Returns:
-            (csv_files, temp_extract_dir): List of CSV file paths and optional temp directory for ZIP extraction
-        """
-        csv_files = []
-        temp_extract_dir = None
-        
-        # Check for ZIP files first
-        zip_files = list(dataset_path.glob("*.zip"))
-        if zip_files:
-            # Extract ZIP and find CSV files recursively
-            for zip_file in zip_files:
-                print(f"   Found ZIP file: {zip_file.name}")
-                # Create temporary directory for extraction (will be cleaned up later)
-                temp_extract_dir = Path(tempfile.mkdtemp(prefix="ddoc_text_"))
-                try:
-                    with zipfile.ZipFile(zip_file, 'r') as zip_ref:
-                        zip_ref.extractall(temp_extract_dir)
-                        # Remove macOS metadata if present
-                        macosx_dir = temp_extract_dir / "__MACOSX"
-                        if macosx_dir.exists():
-                            shutil.rmtree(macosx_dir)
-                        
-                        # Find all CSV files recursively in extracted directory
-                        extracted_csvs = list(temp_extract_dir.rglob("*.csv"))
-                        if extracted_csvs:
-                            csv_files.extend(extracted_csvs)
-                            print(f"   Found {len(extracted_csvs)} CSV files in ZIP")
-                            for csv_path in extracted_csvs:
-                                rel_path = csv_path.relative_to(temp_extract_dir)
-                                print(f"      - {rel_path}")
-                        else:
-                            print(f"   ⚠️ No CSV files found in ZIP")
-                except Exception as e:
-                    print(f"   ⚠️ Error extracting {zip_file.name}: {e}")
-                    if temp_extract_dir and temp_extract_dir.exists():
-                        shutil.rmtree(temp_extract_dir)
-                    temp_extract_dir = None
-                    continue
-        
-        # If no ZIP files or no CSV found in ZIP, look for CSV files directly
-        if not csv_files:
-            # Check for single CSV file in root
-            root_csvs = list(dataset_path.glob("*.csv"))
-            if root_csvs:
-                csv_files.extend(root_csvs)
-                print(f"   Found {len(root_csvs)} CSV file(s) in root")
-            else:
-                # Recursively find all CSV files
-                csv_files = list(dataset_path.rglob("*.csv"))
-                if csv_files:
-                    print(f"   Found {len(csv_files)} CSV file(s) recursively")
-        
-        return sorted(csv_files), temp_extract_dir
-    
-    def _load_and_combine_csvs(self, csv_files: List[Path], text_column: str, id_column: Optional[str] = None, base_path: Optional[Path] = None) -> pd.DataFrame:
-        """Load and combine multiple CSV files into a single DataFrame"""
-        dfs = []
-        
-        for csv_file in csv_files:
-            try:
-                df = pd.read_csv(csv_file)
-                
-                if text_column not in df.columns:
-                    # Try to get relative path for display
-                    if base_path and csv_file.is_relative_to(base_path):
-                        rel_path = csv_file.relative_to(base_path)
-                    else:
-                        rel_path = csv_file.name
-                    print(f"   ⚠️ Text column '{text_column}' not found in {rel_path}")
-                    continue
-                
-                # Add source file info for tracking
-                if base_path and csv_file.is_relative_to(base_path):
-                    rel_path = csv_file.relative_to(base_path)
-                else:
-                    rel_path = Path(csv_file.name)
-                df['_source_file'] = str(rel_path)
-                
-                # Ensure ID column exists or create one
-                if id_column and id_column in df.columns:
-                    pass  # Use existing ID column
-                elif id_column:
-                    # ID column specified but not found, create sequential IDs
-                    df[id_column] = [f"{rel_path.stem}_{i}" for i in range(len(df))]
-                else:
-                    # No ID column specified, try to find common ID columns
-                    common_id_cols = ['id', 'ID', 'index', 'INDEX', 'idx']
-                    found_id = None
-                    for col in common_id_cols:
-                        if col in df.columns:
-                            found_id = col
-                            break
-                    if found_id:
-                        id_column = found_id
-                    else:
-                        # Create sequential IDs
-                        df['_auto_id'] = [f"{rel_path.stem}_{i}" for i in range(len(df))]
-                        id_column = '_auto_id'
-                
-                dfs.append(df)
-                print(f"   Loaded {len(df)} rows from {rel_path}")
-                
-            except Exception as e:
-                print(f"   ⚠️ Error loading {csv_file}: {e}")
-                continue
-        
-        if not dfs:
-            return pd.DataFrame()
-        
-        # Combine all DataFrames
-        combined_df = pd.concat(dfs, ignore_index=True)
-        print(f"   ✅ Total: {len(combined_df)} rows from {len(dfs)} files")
-        
-        return combined_df
-    
     def _analyze_text_attributes(self, text: str, language: str = 'english') -> Dict[str, Any]:
         """Calculate physical-based text metrics"""
         if not text or pd.isna(text):
@@ -406,7 +283,6 @@ class DOCTextPlugin:
         not have loaded; ``drift_detect`` then falls back to attribute-
         only drift (overall_score = 0.5 * attr + 0.5 * 0).
         """
-        import shutil
         input_path = Path(data_path)
         if not input_path.exists() or not input_path.is_dir():
             return {}
@@ -427,41 +303,10 @@ class DOCTextPlugin:
 
         all_attributes: Dict[str, Any] = {}
         for dataset_path, config in text_datasets:
-            text_column = config['text_column']
-            id_column = config.get('id_column', None)
             language = config.get('language', 'english')
-
-            csv_files, temp_extract_dir = self._find_csv_files(dataset_path)
-            if not csv_files:
-                if temp_extract_dir and temp_extract_dir.exists():
-                    shutil.rmtree(temp_extract_dir)
-                continue
-            base_path = temp_extract_dir if temp_extract_dir else dataset_path
-            df = self._load_and_combine_csvs(csv_files, text_column, id_column, base_path)
-            if temp_extract_dir and temp_extract_dir.exists():
-                try:
-                    shutil.rmtree(temp_extract_dir)
-                except Exception:
-                    pass
-            if df.empty:
-                continue
-
-            actual_id_column = id_column
-            if not actual_id_column:
-                for col in ['id', 'ID', 'index', 'INDEX', 'idx', '_auto_id']:
-                    if col in df.columns:
-                        actual_id_column = col
-                        break
-
-            for idx, row in df.iterrows():
-                text = row[text_column]
-                if actual_id_column and actual_id_column in df.columns:
-                    row_id = str(row[actual_id_column])
-                else:
-                    row_id = f"row_{idx}"
-                source_file = row.get('_source_file', dataset_path.name)
-                cache_key = f"{dataset_path.name}/{source_file}/{row_id}"
-                all_attributes[cache_key] = self._analyze_text_attributes(text, language)
+            for batch in iter_text_batches(dataset_path, config):
+                for cache_key, text in zip(batch.keys, batch.texts):
+                    all_attributes[cache_key] = self._analyze_text_attributes(text, language)
         return all_attributes
 
     def _compute_embeddings_from_path(self, data_path) -> Dict[str, Any]:
@@ -474,7 +319,6 @@ class DOCTextPlugin:
         cache would (``{cache_key: {embedding: [...], text_length: n}}``)
         so ``drift_detect`` doesn't need to branch on source.
         """
-        import shutil
         input_path = Path(data_path)
         if not input_path.exists() or not input_path.is_dir():
             return {}
@@ -503,44 +347,14 @@ class DOCTextPlugin:
 
         all_embeddings: Dict[str, Any] = {}
         for dataset_path, config in text_datasets:
-            text_column = config['text_column']
-            id_column = config.get('id_column', None)
-            csv_files, temp_extract_dir = self._find_csv_files(dataset_path)
-            if not csv_files:
-                if temp_extract_dir and temp_extract_dir.exists():
-                    shutil.rmtree(temp_extract_dir)
-                continue
-            base_path = temp_extract_dir if temp_extract_dir else dataset_path
-            df = self._load_and_combine_csvs(csv_files, text_column, id_column, base_path)
-            if temp_extract_dir and temp_extract_dir.exists():
-                try:
-                    shutil.rmtree(temp_extract_dir)
-                except Exception:
-                    pass
-            if df.empty:
-                continue
-
-            actual_id_column = id_column
-            if not actual_id_column:
-                for col in ['id', 'ID', 'index', 'INDEX', 'idx', '_auto_id']:
-                    if col in df.columns:
-                        actual_id_column = col
-                        break
-
-            for idx, row in df.iterrows():
-                text = row[text_column]
-                if actual_id_column and actual_id_column in df.columns:
-                    row_id = str(row[actual_id_column])
-                else:
-                    row_id = f"row_{idx}"
-                source_file = row.get('_source_file', dataset_path.name)
-                cache_key = f"{dataset_path.name}/{source_file}/{row_id}"
-                emb = self._extract_text_embedding(text)
-                if emb is not None:
-                    all_embeddings[cache_key] = {
-                        'embedding': emb.tolist(),
-                        'text_length': len(str(text)),
-                    }
+            for batch in iter_text_batches(dataset_path, config):
+                for cache_key, text in zip(batch.keys, batch.texts):
+                    emb = self._extract_text_embedding(text)
+                    if emb is not None:
+                        all_embeddings[cache_key] = {
+                            'embedding': emb.tolist(),
+                            'text_length': len(str(text)),
+                        }
         return all_embeddings
 
     @hookimpl
@@ -616,74 +430,30 @@ class DOCTextPlugin:
             print(f"\n📊 Processing dataset: {dataset_path.name}")
             print("-" * 80)
             
-            text_column = config['text_column']
-            id_column = config.get('id_column', None)
             language = config.get('language', 'english')
             
-            # Find CSV files (handles single CSV, ZIP files, or recursive search)
-            csv_files, temp_extract_dir = self._find_csv_files(dataset_path)
+            # Stream CSVs (single CSV, ZIP members, or recursive search) in bounded batches
+            num_texts = 0
+            for batch in iter_text_batches(dataset_path, config):
+                for cache_key, text in zip(batch.keys, batch.texts):
+                    # Attributes
+                    attrs = self._analyze_text_attributes(text, language)
+                    all_attributes[cache_key] = attrs
+                    
+                    # Embedding
+                    embedding = self._extract_text_embedding(text)
+                    if embedding is not None:
+                        all_embeddings[cache_key] = {
+                            'embedding': embedding.tolist(),
+                            'text_length': len(str(text))
+                        }
+                num_texts += len(batch.keys)
             
-            if not csv_files:
-                print(f"⚠️ No CSV files found in {dataset_path}")
-                if temp_extract_dir and temp_extract_dir.exists():
-                    shutil.rmtree(temp_extract_dir)
-                continue
-            
-            # Determine base path for relative path calculation
-            base_path = temp_extract_dir if temp_extract_dir else dataset_path
-            
-            # Load and combine all CSV files
-            df = self._load_and_combine_csvs(csv_files, text_column, id_column, base_path)
-            
-            # Clean up temporary directory if created
-            if temp_extract_dir and temp_extract_dir.exists():
-                try:
-                    shutil.rmtree(temp_extract_dir)
-                except:
-                    pass
-            
-            if df.empty:
+            if not num_texts:
                 print(f"⚠️ No valid data loaded from {dataset_path}")
                 continue
             
-            # Determine actual ID column to use
-            actual_id_column = id_column
-            if not actual_id_column:
-                # Try to find common ID columns
-                common_id_cols = ['id', 'ID', 'index', 'INDEX', 'idx', '_auto_id']
-                for col in common_id_cols:
-                    if col in df.columns:
-                        actual_id_column = col
-                        break
-            
-            # Analyze attributes
-            print(f"   Analyzing {len(df)} texts...")
-            for idx, row in df.iterrows():
-                text = row[text_column]
-                
-                # Generate row ID
-                if actual_id_column and actual_id_column in df.columns:
-                    row_id = str(row[actual_id_column])
-                else:
-                    row_id = f"row_{idx}"
-                
-                # Include source file in cache key for better tracking
-                source_file = row.get('_source_file', dataset_path.name)
-                cache_key = f"{dataset_path.name}/{source_file}/{row_id}"
-                
-                # Attributes
-                attrs = self._analyze_text_attributes(text, language)
-                all_attributes[cache_key] = attrs
-                
-                # Embedding
-                embedding = self._extract_text_embedding(text)
-                if embedding is not None:
-                    all_embeddings[cache_key] = {
-                        'embedding': embedding.tolist(),
-                        'text_length': len(str(text))
-                    }
-            
-            print(f"   ✅ Analyzed {len(df)} texts")
+            print(f"   ✅ Analyzed {num_texts} texts")
         
         # Save caches
         if all_attributes:
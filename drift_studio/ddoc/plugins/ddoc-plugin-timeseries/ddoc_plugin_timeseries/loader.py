@@ -0,0 +1,242 @@
+"""
+Columnar loading of declared timeseries datasets
+
+``load_frame`` reads one ``ddoc.yaml`` -declared dataset and returns only
+the columns the plugin uses — the timestamp, ``numeric_columns`` and
+``categorical_columns`` — with explicit dtypes (float64 / category):
+
+- Parquet (``parquet_file``) and Feather / Arrow IPC (``feather_file``)
+  inputs are read column-selectively
+- CSV (``csv_file``) goes through the pyarrow engine; CSVs larger than
+  ``DDOC_TS_CONVERT_MB`` are converted once (streamed, declared columns
+  only) into a Parquet file under ``.ddoc/cache/timeseries/columnar``
+  that later runs read instead, until the CSV changes
+- timestamps are parsed with ``timestamp_format`` from ``ddoc.yaml`` or
+  a format inferred from the first value, and the frame is only sorted
+  when the timestamps are not already monotonic
+
+Without pyarrow everything falls back to ``pd.read_csv`` (C engine).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional fast path
+    pa = None
+
+_ARROW_ERRORS = (pa.ArrowInvalid,) if pa is not None else ()
+
+CONVERT_MB = float(os.getenv("DDOC_TS_CONVERT_MB", "64"))
+BLOCK_SIZE = 8 * 1024 * 1024
+
+PARQUET_SUFFIXES = {".parquet", ".pq"}
+FEATHER_SUFFIXES = {".feather", ".arrow", ".ipc"}
+DATA_FILE_KEYS = ("parquet_file", "feather_file", "csv_file")
+
+
+def data_file(dataset_path: Path, config: Dict[str, Any]) -> Optional[Path]:
+    """Declared data file of a dataset (first of parquet / feather / csv)"""
+    for key in DATA_FILE_KEYS:
+        if config.get(key):
+            return dataset_path / config[key]
+    return None
+
+
+def _unique(columns: List[str]) -> List[str]:
+    return list(dict.fromkeys(columns))
+
+
+def _finish(df: pd.DataFrame, config: Dict[str, Any]) -> pd.DataFrame:
+    """Apply dtypes, parse timestamps and sort only if needed"""
+    timestamp_col = config['timestamp_column']
+    for col in config.get('numeric_columns', []):
+        if col in df.columns and not pd.api.types.is_float_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+    for col in config.get('categorical_columns', []):
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+
+    df[timestamp_col] = parse_timestamps(df[timestamp_col], config.get('timestamp_format'))
+    if not df[timestamp_col].is_monotonic_increasing:
+        df = df.sort_values(timestamp_col, kind='stable')
+    return df
+
+
+def parse_timestamps(values: pd.Series, fmt: Optional[str] = None) -> pd.Series:
+    """Datetime series; ``fmt`` explicit, else inferred from the first value"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    if fmt is None:
+        first = values.dropna()
+        if not first.empty and isinstance(first.iloc[0], str):
+            from pandas.tseries.api import guess_datetime_format
+
+            fmt = guess_datetime_format(first.iloc[0])
+    if fmt:
+        try:
+            return pd.to_datetime(values, format=fmt)
+        except (TypeError, ValueError):
+            pass  # inferred format does not fit every row
+    return pd.to_datetime(values)
+
+
+def _to_numeric(batch: "pa.RecordBatch", schema: "pa.Schema", numeric: set) -> "pa.RecordBatch":
+    """Cast the numeric string columns of a batch to float64 (non-numeric cells → NaN)"""
+    arrays = []
+    for array, field in zip(batch.columns, schema):
+        if field.name in numeric:
+            try:
+                array = array.cast(pa.float64())
+            except _ARROW_ERRORS:
+                values = pd.to_numeric(array.to_pandas(), errors='coerce')
+                array = pa.array(values, type=pa.float64(), from_pandas=True)
+        arrays.append(array)
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class ColumnarCache:
+    """CSV → Parquet conversions under ``.ddoc/cache/timeseries/columnar``"""
+
+    def __init__(self, project_root: Optional[str] = None):
+        root = Path(project_root) if project_root else Path.cwd()
+        self.root = root / ".ddoc" / "cache" / "timeseries" / "columnar"
+
+    def path_for(self, csv_file: Path, columns: List[str], config: Dict[str, Any]) -> Path:
+        """Parquet path for this CSV version and column declaration"""
+        st = csv_file.stat()
+        key = json.dumps({
+            "file": str(csv_file.resolve()),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "columns": columns,
+            "numeric": sorted(config.get('numeric_columns', [])),
+            "timestamp_format": config.get('timestamp_format'),
+        }, sort_keys=True)
+        return self.root / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.parquet"
+
+    def convert(self, csv_file: Path, target: Path, columns: List[str], config: Dict[str, Any]) -> None:
+        """Stream the declared columns of ``csv_file`` into ``target``
+
+        Numeric columns are read as strings and cast to float64 per batch;
+        a batch with non-numeric cells is coerced like ``_finish`` does
+        (bad cells become NaN), so one stray value cannot fail the
+        conversion on every run.
+        """
+        numeric = set(config.get('numeric_columns', []))
+        timestamp_col = config['timestamp_column']
+        column_types = {col: pa.string() for col in columns}
+        if config.get('timestamp_format'):
+            convert = pacsv.ConvertOptions(
+                include_columns=columns,
+                column_types={k: v for k, v in column_types.items() if k != timestamp_col},
+                timestamp_parsers=[config['timestamp_format']],
+                strings_can_be_null=True,
+            )
+        else:
+            convert = pacsv.ConvertOptions(include_columns=columns, column_types=column_types,
+                                           strings_can_be_null=True)
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            reader = pacsv.open_csv(
+                csv_file, read_options=pacsv.ReadOptions(block_size=BLOCK_SIZE), convert_options=convert,
+            )
+            schema = pa.schema([
+                field.with_type(pa.float64()) if field.name in numeric else field for field in reader.schema
+            ])
+            with pq.ParquetWriter(tmp, schema, compression="zstd") as writer:
+                for batch in reader:
+                    if batch.num_rows:
+                        writer.write_batch(_to_numeric(batch, schema, numeric))
+            os.replace(tmp, target)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def prune(self, keep: Path, csv_file: Path) -> None:
+        """Delete the previous conversion of the same CSV (tracked in a marker file)"""
+        marker = self.root / f"{hashlib.sha256(str(csv_file.resolve()).encode('utf-8')).hexdigest()}.latest"
+        try:
+            previous = Path(marker.read_text().strip())
+            if previous != keep:
+                previous.unlink(missing_ok=True)
+        except OSError:
+            pass
+        try:
+            marker.write_text(str(keep))
+        except OSError:
+            pass
+
+
+def _read_csv(csv_file: Path, columns: List[str], config: Dict[str, Any]) -> pd.DataFrame:
+    header = pd.read_csv(csv_file, nrows=0).columns
+    columns = [col for col in columns if col in header]
+    numeric = set(config.get('numeric_columns', []))
+    dtypes = {col: 'float64' for col in columns if col in numeric}
+    engine = 'pyarrow' if pa is not None else 'c'
+    try:
+        return pd.read_csv(csv_file, usecols=columns, dtype=dtypes, engine=engine)
+    except (TypeError, ValueError) + _ARROW_ERRORS:
+        # Non-numeric entries in a numeric column → read as-is, coerce later
+        return pd.read_csv(csv_file, usecols=columns, engine=engine)
+
+
+def load_frame(dataset_path: Path, config: Dict[str, Any], cache: Optional[ColumnarCache] = None) -> pd.DataFrame:
+    """
+    Declared columns of a timeseries dataset, typed and time-ordered
+
+    Args:
+        dataset_path: Dataset directory (holding ``ddoc.yaml``)
+        config: Parsed ``ddoc.yaml``
+        cache: Conversion cache for large CSVs (``None`` → a cache in the
+            current project)
+
+    Returns:
+        DataFrame with the timestamp, numeric (float64) and categorical
+        (category) columns, sorted by timestamp
+    """
+    path = data_file(dataset_path, config)
+    if path is None or not path.exists():
+        raise FileNotFoundError(f"data file not found for {dataset_path}")
+    columns = _unique(
+        [config['timestamp_column']]
+        + list(config.get('numeric_columns', []))
+        + list(config.get('categorical_columns', []))
+    )
+    suffix = path.suffix.lower()
+
+    if pa is not None and suffix in PARQUET_SUFFIXES | FEATHER_SUFFIXES:
+        if suffix in PARQUET_SUFFIXES:
+            available = set(pq.read_schema(path).names)
+            table = pq.read_table(path, columns=[col for col in columns if col in available])
+        else:
+            table = feather.read_table(path, memory_map=True)
+            table = table.select([col for col in columns if col in table.column_names])
+        return _finish(table.to_pandas(), config)
+
+    if pa is not None and path.stat().st_size >= CONVERT_MB * 1024 * 1024:
+        cache = cache or ColumnarCache()
+        header = pd.read_csv(path, nrows=0).columns
+        columns = [col for col in columns if col in header]
+        target = cache.path_for(path, columns, config)
+        if not target.exists():
+            try:
+                cache.convert(path, target, columns, config)
+                cache.prune(target, path)
+            except (OSError,) + _ARROW_ERRORS as e:
+                print(f"⚠️ Columnar conversion of {path.name} failed, reading CSV directly: {e}")
+                return _finish(_read_csv(path, columns, config), config)
+        return _finish(pq.read_table(target).to_pandas(), config)
+
+    return _finish(_read_csv(path, columns, config), config)
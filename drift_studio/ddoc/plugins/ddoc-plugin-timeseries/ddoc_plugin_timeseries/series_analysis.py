@@ -0,0 +1,270 @@
+"""
+Per-column series analysis — process fan-out, sampled stationarity tests
+
+``analyze_numeric`` computes the numeric attributes of one column
+(moments, seasonal decomposition strengths, ADF / KPSS stationarity).
+``analyze_columns`` runs it for many columns at once:
+
+- columns are fanned out over a process pool (``workers``)
+- ADF / KPSS can run on a deterministic subsample of at most
+  ``max_length`` points — every k-th value (``stride``) or an
+  anti-aliased ``scipy.signal.decimate`` (``decimate``); moments and the
+  decomposition always use the full series
+- ADF can use a fixed lag order (an int, or ``"schwert"`` for
+  ``12 * (n / 100) ** 0.25``) instead of fitting one regression per
+  candidate lag (``autolag``)
+- results are cached per column, keyed by a hash of the column values
+  and the settings, so unchanged sensors are skipped on re-runs
+
+Settings come from ``ddoc.yaml: analysis`` and the ``DDOC_TS_*``
+environment variables; the defaults reproduce the original sequential,
+full-length, autolag analysis.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+ANALYSIS_VERSION = "1"  # bump when the computed attributes change
+SAMPLING_METHODS = ("stride", "decimate")
+
+
+@dataclass
+class AnalysisConfig:
+    """How numeric columns are analyzed (``ddoc.yaml: analysis``)"""
+
+    workers: int = 1
+    max_length: Optional[int] = None          # stationarity tests only; None → full series
+    sampling: str = "stride"                  # stride | decimate
+    adf_lag: Optional[Union[int, str]] = None  # None → autolag (AIC); int or "schwert" → fixed
+    cache: bool = True
+
+    @classmethod
+    def from_sources(cls, *sources: Optional[Dict[str, Any]]) -> "AnalysisConfig":
+        """Environment first, then ``sources`` in order (later wins)"""
+        merged: Dict[str, Any] = {}
+        env = {
+            "workers": os.getenv("DDOC_TS_WORKERS"),
+            "max_length": os.getenv("DDOC_TS_MAX_LENGTH"),
+            "sampling": os.getenv("DDOC_TS_SAMPLING"),
+            "adf_lag": os.getenv("DDOC_TS_ADF_LAG"),
+        }
+        for source in (env,) + sources:
+            for key, value in (source or {}).items():
+                if key in cls.__dataclass_fields__ and value is not None:
+                    merged[key] = value
+        config = cls(**merged)
+        config.workers = max(1, int(config.workers))
+        config.max_length = int(config.max_length) if config.max_length else None
+        if isinstance(config.adf_lag, str) and config.adf_lag.isdigit():
+            config.adf_lag = int(config.adf_lag)
+        if config.adf_lag not in (None, "schwert") and not isinstance(config.adf_lag, int):
+            raise ValueError(f"adf_lag must be an int, 'schwert' or unset; got {config.adf_lag!r}")
+        if config.sampling not in SAMPLING_METHODS:
+            raise ValueError(f"sampling must be one of {SAMPLING_METHODS}; got {config.sampling!r}")
+        return config
+
+    def signature(self) -> Dict[str, Any]:
+        """Settings that change results (``workers`` / ``cache`` do not)"""
+        return {
+            "version": ANALYSIS_VERSION,
+            "max_length": self.max_length,
+            "sampling": self.sampling if self.max_length else None,
+            "adf_lag": self.adf_lag,
+        }
+
+
+def subsample(values: np.ndarray, max_length: Optional[int], method: str = "stride") -> np.ndarray:
+    """Deterministic subsample of at most ``max_length`` points"""
+    if not max_length or len(values) <= max_length:
+        return values
+    factor = int(np.ceil(len(values) / max_length))
+    if method == "stride":
+        return values[::factor]
+    from scipy.signal import decimate
+
+    # decimate() is only well-behaved for factors up to ~13 per stage
+    out = values
+    while factor > 1:
+        q = min(factor, 13)
+        out = decimate(out, q, ftype="fir", zero_phase=True)
+        factor = int(np.ceil(factor / q))
+    return out[:max_length]
+
+
+def _adf_lag(n: int, adf_lag: Union[int, str]) -> int:
+    if adf_lag == "schwert":
+        adf_lag = int(12 * (n / 100.0) ** 0.25)
+    return max(0, min(int(adf_lag), n // 2 - 2))
+
+
+def analyze_numeric(values: np.ndarray, config: Optional[AnalysisConfig] = None) -> Dict[str, Any]:
+    """Numeric time series attributes of one column (NaNs are dropped)"""
+    from scipy import stats
+
+    config = config or AnalysisConfig()
+    series = np.asarray(values, dtype=np.float64)
+    series = series[~np.isnan(series)]
+    if series.size == 0:
+        return {}
+
+    metrics: Dict[str, Any] = {
+        'mean': float(series.mean()),
+        'variance': float(series.var(ddof=1)) if series.size > 1 else float('nan'),
+        'skewness': float(stats.skew(series)),
+        'kurtosis': float(stats.kurtosis(series)),
+    }
+    total_var = np.var(series) + 1e-10
+
+    # Trend, seasonality, residual (if enough data)
+    if len(series) >= 24:  # Minimum for decomposition
+        try:
+            from statsmodels.tsa.seasonal import seasonal_decompose
+
+            decomposition = seasonal_decompose(series, model='additive', period=min(12, len(series) // 2))
+            for name, part in (('trend', decomposition.trend), ('seasonal', decomposition.seasonal),
+                               ('residual', decomposition.resid)):
+                part = part[~np.isnan(part)]
+                metrics[f'{name}_strength'] = float(np.var(part) / total_var)
+        except Exception:
+            pass
+
+    # Stationarity tests, optionally on a subsample with a fixed ADF lag
+    tested = subsample(series, config.max_length, config.sampling)
+    if tested.size != series.size:
+        metrics['stationarity_sample_size'] = int(tested.size)
+    try:
+        from statsmodels.tsa.stattools import adfuller, kpss
+    except ImportError:
+        return metrics
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        try:
+            if config.adf_lag is None:
+                adf_result = adfuller(tested)
+            else:
+                lag = _adf_lag(tested.size, config.adf_lag)
+                adf_result = adfuller(tested, maxlag=lag, autolag=None)
+                metrics['adf_lag'] = lag
+            metrics['adf_statistic'] = float(adf_result[0])
+            metrics['adf_pvalue'] = float(adf_result[1])
+            metrics['is_stationary_adf'] = bool(adf_result[1] < 0.05)
+        except Exception:
+            pass
+
+        try:
+            kpss_result = kpss(tested, regression='c')
+            metrics['kpss_statistic'] = float(kpss_result[0])
+            metrics['kpss_pvalue'] = float(kpss_result[1])
+            metrics['is_stationary_kpss'] = bool(kpss_result[1] > 0.05)
+        except Exception:
+            pass
+
+    return metrics
+
+
+def column_hash(values: np.ndarray, config: AnalysisConfig) -> str:
+    """Content hash of a column's values plus the result-changing settings"""
+    digest = hashlib.sha256(json.dumps(config.signature(), sort_keys=True).encode("utf-8"))
+    digest.update(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+class ColumnResultCache:
+    """Per-column attribute store under ``.ddoc/cache/timeseries/columns``"""
+
+    def __init__(self, project_root: Optional[str] = None):
+        root = Path(project_root) if project_root else Path.cwd()
+        self.root = root / ".ddoc" / "cache" / "timeseries" / "columns"
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def put(self, key: str, metrics: Dict[str, Any]) -> None:
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(metrics, f)
+            os.replace(tmp, path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"⚠️ Could not cache column analysis: {e}")
+
+
+Column = Tuple[str, np.ndarray, AnalysisConfig]
+
+
+def _analyze_worker(job: Column) -> Tuple[str, Dict[str, Any]]:
+    key, values, config = job
+    return key, analyze_numeric(values, config)
+
+
+def analyze_columns(
+    columns: Sequence[Column],
+    workers: int = 1,
+    cache: Optional[ColumnResultCache] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Analyze many numeric columns
+
+    Args:
+        columns: ``(key, float64 values, config)`` triples, keyed like
+            the attributes (``"<dataset>/<col>"``)
+        workers: Processes to fan columns out over (1 → in-process)
+        cache: Per-column result cache; ``None`` disables caching
+
+    Returns:
+        ``{key: metrics}`` in the input order
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    pending: List[Column] = []
+    hashes: Dict[str, str] = {}
+
+    for key, values, config in columns:
+        if cache is not None and config.cache:
+            hashes[key] = column_hash(values, config)
+            hit = cache.get(hashes[key])
+            if hit is not None:
+                results[key] = hit
+                continue
+        pending.append((key, values, config))
+
+    def _collect(key: str, metrics: Dict[str, Any]) -> None:
+        results[key] = metrics
+        if key in hashes and metrics:
+            cache.put(hashes[key], metrics)
+
+    # Longest columns first so one huge sensor does not finish last alone
+    pending.sort(key=lambda job: len(job[1]), reverse=True)
+    if workers <= 1 or len(pending) <= 1:
+        for job in pending:
+            _collect(*_analyze_worker(job))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+            for key, metrics in pool.map(_analyze_worker, pending):
+                _collect(key, metrics)
+
+    return {key: results[key] for key, _, _ in columns if key in results}
+
+
+def numeric_values(series: pd.Series) -> np.ndarray:
+    """Column as float64 (non-numeric entries become NaN)"""
+    return pd.to_numeric(series, errors='coerce').to_numpy(dtype='float64')
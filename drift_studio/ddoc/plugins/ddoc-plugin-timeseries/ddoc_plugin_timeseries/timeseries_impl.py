@@ -14,6 +14,8 @@ from typing import Dict, Any, Optional
 import numpy as np
 import pandas as pd
 
+from .loader import DATA_FILE_KEYS, ColumnarCache, data_file, load_frame
+
 try:
     from ddoc.plugins.hookspecs import hookimpl
 except ImportError:
@@ -43,57 +45,18 @@ class DOCTimeSeriesPlugin:
         if config.get('modality') != 'timeseries':
             raise ValueError(f"Dataset {dataset_path} is not configured as timeseries modality")
         
-        if 'csv_file' not in config:
-            raise ValueError("ddoc.yaml must specify 'csv_file'")
+        if not any(config.get(key) for key in DATA_FILE_KEYS):
+            raise ValueError("ddoc.yaml must specify one of 'csv_file', 'parquet_file', 'feather_file'")
         if 'timestamp_column' not in config:
             raise ValueError("ddoc.yaml must specify 'timestamp_column'")
         
         return config
     
-    def _analyze_numeric_series(self, series: pd.Series) -> Dict[str, Any]:
-        """Calculate numeric time series metrics"""
-        if series.empty or series.isna().all():
-            return {}
-        
-        series_clean = series.dropna()
-        if series_clean.empty:
-            return {}
-        
-        metrics = {
-            'mean': float(series_clean.mean()),
-            'variance': float(series_clean.var()),
-            'skewness': float(stats.skew(series_clean)),
-            'kurtosis': float(stats.kurtosis(series_clean))
-        }
-        
-        # Trend, seasonality, residual (if enough data)
-        if len(series_clean) >= 24:  # Minimum for decomposition
-            try:
-                decomposition = seasonal_decompose(series_clean, model='additive', period=min(12, len(series_clean)//2))
-                metrics['trend_strength'] = float(np.var(decomposition.trend.dropna()) / (np.var(series_clean) + 1e-10))
-                metrics['seasonal_strength'] = float(np.var(decomposition.seasonal.dropna()) / (np.var(series_clean) + 1e-10))
-                metrics['residual_strength'] = float(np.var(decomposition.resid.dropna()) / (np.var(series_clean) + 1e-10))
-            except:
-                pass
-        
-        # Stationarity tests
-        try:
-            adf_result = adfuller(series_clean)
-            metrics['adf_statistic'] = float(adf_result[0])
-            metrics['adf_pvalue'] = float(adf_result[1])
-            metrics['is_stationary_adf'] = adf_result[1] < 0.05
-        except:
-            pass
-        
-        try:
-            kpss_result = kpss(series_clean, regression='c')
-            metrics['kpss_statistic'] = float(kpss_result[0])
-            metrics['kpss_pvalue'] = float(kpss_result[1])
-            metrics['is_stationary_kpss'] = kpss_result[1] > 0.05
-        except:
-            pass
-        
-        return metrics
+    def _analyze_numeric_series(self, series: pd.Series, config=None) -> Dict[str, Any]:
+        """Calculate numeric time series metrics (see ``series_analysis``)"""
+        from .series_analysis import analyze_numeric, numeric_values
+
+        return analyze_numeric(numeric_values(series), config)
     
     def _analyze_categorical_series(self, series: pd.Series) -> Dict[str, Any]:
         """Calculate categorical time series metrics"""
@@ -113,19 +76,27 @@ class DOCTimeSeriesPlugin:
             'unique_count': len(value_counts)
         }
     
-    def _compute_attributes_from_path(self, data_path) -> Dict[str, Any]:
-        """Walk ``data_path`` for ``ddoc.yaml`` -declared timeseries
-        datasets and compute the per-column attributes dict in-process.
+    def _profile_columns(self, profile, dataset_name, df, numeric_cols, categorical_cols):
+        """Add one sketch per declared column of ``df`` to ``profile``"""
+        from ddoc.core.sketches import CategoricalSketch, NumericSketch
 
-        Round-6 (2026-05-08) — extracted from ``eda_run`` so that
-        ``drift_detect`` path mode (where no analysis cache exists) can
-        reuse the exact same attribute computation. Returns the same
-        ``{<dataset>/<col>: {...metrics...}}`` shape that the cache
-        would normally hold; empty dict when no datasets are found.
-        """
+        for col in numeric_cols:
+            if col in df.columns:
+                values = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype='float64')
+                profile.features[f"{dataset_name}/{col}"] = NumericSketch().update(values)
+        for col in categorical_cols:
+            if col in df.columns:
+                profile.features[f"{dataset_name}/{col}"] = CategoricalSketch().update(df[col])
+        profile.count += len(df)
+
+    def _load_frames(self, data_path):
+        """Yield ``(dataset_path, config, df)`` for every ``ddoc.yaml``
+        -declared timeseries dataset under ``data_path``; ``df`` holds the
+        declared columns only, sorted by the timestamp column (see
+        ``loader.load_frame``)."""
         input_path = Path(data_path)
         if not input_path.exists() or not input_path.is_dir():
-            return {}
+            return
 
         ts_datasets = []
         for item in input_path.iterdir():
@@ -141,35 +112,156 @@ class DOCTimeSeriesPlugin:
             except Exception as e:
                 print(f"⚠️ Skipping {item}: {e}")
 
-        all_attributes: Dict[str, Any] = {}
+        cache = ColumnarCache()
         for dataset_path, config in ts_datasets:
-            csv_file = dataset_path / config['csv_file']
-            if not csv_file.exists():
+            path = data_file(dataset_path, config)
+            if path is None or not path.exists():
                 continue
-            timestamp_col = config['timestamp_column']
-            numeric_cols = config.get('numeric_columns', [])
-            categorical_cols = config.get('categorical_columns', [])
             try:
-                df = pd.read_csv(csv_file)
-                df[timestamp_col] = pd.to_datetime(df[timestamp_col])
-                df = df.sort_values(timestamp_col)
+                df = load_frame(dataset_path, config, cache)
             except Exception as e:
-                print(f"⚠️ Error loading CSV: {e}")
+                print(f"⚠️ Error loading {path.name}: {e}")
                 continue
+            yield dataset_path, config, df
+
+    def _compute_attributes_from_path(self, data_path, profile=None) -> Dict[str, Any]:
+        """Walk ``data_path`` for ``ddoc.yaml`` -declared timeseries
+        datasets and compute the per-column attributes dict in-process.
+
+        Round-6 (2026-05-08) — extracted from ``eda_run`` so that
+        ``drift_detect`` path mode (where no analysis cache exists) can
+        reuse the exact same attribute computation. Returns the same
+        ``{<dataset>/<col>: {...metrics...}}`` shape that the cache
+        would normally hold; empty dict when no datasets are found.
+
+        When ``profile`` (a ``ReferenceProfile``) is given, the same pass
+        also fills it with per-column sketches keyed like the attributes.
+
+        Numeric columns of all datasets are analyzed together at the end
+        (``series_analysis.analyze_columns``): fanned out over processes,
+        with sampled stationarity tests / fixed ADF lag and the
+        per-column result cache as configured in ``ddoc.yaml: analysis``.
+        """
+        from .series_analysis import AnalysisConfig, ColumnResultCache, analyze_columns, numeric_values
+
+        all_attributes: Dict[str, Any] = {}
+        numeric_jobs = []
+        for dataset_path, config, df in self._load_frames(data_path):
+            numeric_cols = config.get('numeric_columns', [])
+            categorical_cols = config.get('categorical_columns', [])
+            try:
+                analysis_cfg = AnalysisConfig.from_sources(config.get('analysis'))
+            except (TypeError, ValueError) as e:
+                print(f"⚠️ Invalid analysis settings for {dataset_path.name}, using defaults: {e}")
+                analysis_cfg = AnalysisConfig.from_sources()
             for col in numeric_cols:
                 if col in df.columns:
                     key = f"{dataset_path.name}/{col}"
-                    all_attributes[key] = self._analyze_numeric_series(df[col])
+                    all_attributes[key] = {}  # keeps the declared column order
+                    numeric_jobs.append((key, numeric_values(df[col]), analysis_cfg))
             for col in categorical_cols:
                 if col in df.columns:
                     key = f"{dataset_path.name}/{col}"
                     all_attributes[key] = self._analyze_categorical_series(df[col])
+            if profile is not None:
+                self._profile_columns(profile, dataset_path.name, df, numeric_cols, categorical_cols)
+
+        if numeric_jobs:
+            workers = max(job[2].workers for job in numeric_jobs)
+            all_attributes.update(analyze_columns(numeric_jobs, workers=workers, cache=ColumnResultCache()))
         return all_attributes
 
+    def _declares_window(self, data_path) -> bool:
+        """True when a dataset under ``data_path`` sets ``drift_window``"""
+        input_path = Path(data_path)
+        if not input_path.is_dir():
+            return False
+        for yaml_path in input_path.glob("*/ddoc.yaml"):
+            try:
+                with open(yaml_path, 'r') as f:
+                    if (yaml.safe_load(f) or {}).get('drift_window'):
+                        return True
+            except Exception:
+                continue
+        return False
+
+    def _windowed_drift(self, data_path_ref, data_path_cur, data_hash_ref, data_hash_cur,
+                        window_cfg, force) -> Dict[str, Any]:
+        """Per-window drift of every numeric column (see ``windowed.py``).
+
+        Window settings come from ``ddoc.yaml: drift_window`` overridden
+        by ``cfg['window']`` (CLI ``--window`` / ``--window-step``). The
+        per-column state is kept in the drift result cache, keyed by the
+        reference data and the window settings, so a re-run over a grown
+        current series only evaluates the new windows. Two different
+        snapshots read from one directory are skipped: the series would be
+        compared with itself and cached under the reference hash.
+        """
+        from ddoc.core.drift_cache import drift_cache_key, get_drift_result_cache
+        from .windowed import ReferenceGrid, WindowConfig, WindowedDriftEngine
+
+        if not data_path_ref or not data_path_cur:
+            return {}
+        if (data_hash_ref and data_hash_cur and data_hash_ref != data_hash_cur
+                and Path(data_path_ref).resolve() == Path(data_path_cur).resolve()):
+            print(f"⚠️ Windowed drift skipped: both snapshots point at {data_path_cur}")
+            return {}
+        reference = {path.name: df for path, _, df in self._load_frames(data_path_ref)}
+        if not reference:
+            return {}
+        try:
+            cache = get_drift_result_cache()
+            ref_id = data_hash_ref or cache.fingerprint(data_path_ref)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Windowed drift state unavailable, evaluating from scratch: {e}")
+            cache, ref_id = None, None
+
+        results: Dict[str, Any] = {}
+        for dataset_path, config, df in self._load_frames(data_path_cur):
+            name = dataset_path.name
+            if name not in reference or not (force or config.get('drift_window')):
+                continue
+            try:
+                settings = WindowConfig.from_sources(config.get('drift_window'), window_cfg)
+            except ValueError as e:
+                print(f"⚠️ Invalid drift window for {name}: {e}")
+                continue
+            engine = WindowedDriftEngine(settings)
+            timestamps = df[config['timestamp_column']]
+            if timestamps.dt.tz is not None:
+                timestamps = timestamps.dt.tz_convert(None)
+            valid = timestamps.notna().to_numpy()
+            ts = timestamps.to_numpy(dtype='datetime64[ns]').view('int64')[valid]
+            ref_df = reference[name]
+
+            for col in config.get('numeric_columns', []):
+                if col not in df.columns or col not in ref_df.columns:
+                    continue
+                try:
+                    grid = ReferenceGrid(pd.to_numeric(ref_df[col], errors='coerce').to_numpy(dtype='float64'), settings)
+                except ValueError:
+                    continue
+                values = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype='float64')[valid]
+                key = state = None
+                if cache is not None:
+                    key = drift_cache_key(
+                        ref_id, f"stream:{name}/{col}",
+                        plugin="ddoc_timeseries.windowed", detector="windowed",
+                        options=settings.signature(),
+                    )
+                    entry = cache.get(key)
+                    state = entry["result"] if entry else None
+                result, state = engine.evaluate(grid, ts, values, state)
+                if key is not None:
+                    cache.put(key, state, params={"stream": f"{name}/{col}", **settings.signature()})
+                results[f"{name}/{col}"] = result
+        return results
+
     @hookimpl
     def eda_run(self, snapshot_id, data_path, data_hash, output_path, invalidate_cache=False):
         """Run EDA for time series datasets"""
         from ddoc.core.cache_service import get_cache_service
+        from ddoc.core.reference_profile import ReferenceProfile
 
         cache_service = get_cache_service()
         output_path = Path(output_path)
@@ -186,7 +278,8 @@ class DOCTimeSeriesPlugin:
             'modality': 'timeseries'
         }
 
-        all_attributes = self._compute_attributes_from_path(data_path)
+        profile = ReferenceProfile(modality='timeseries')
+        all_attributes = self._compute_attributes_from_path(data_path, profile=profile)
         if not all_attributes:
             print("⚠️ No time series datasets found")
             return None
@@ -201,6 +294,9 @@ class DOCTimeSeriesPlugin:
                 cache_type="attributes_timeseries",
                 data=all_attributes
             )
+            # Reference profile: lets later drift checks against this
+            # snapshot skip the baseline-side pass entirely
+            cache_service.save_reference_profile(snapshot_id, data_hash, profile)
         
         metrics['num_series'] = len(all_attributes)
         metrics_file = output_path / "metrics.json"
@@ -232,6 +328,7 @@ class DOCTimeSeriesPlugin:
     ) -> Optional[Dict[str, Any]]:
         """Detect drift between two time series snapshots"""
         from ddoc.core.cache_service import get_cache_service
+        from ddoc.core.reference_profile import ReferenceProfile, compare_reference, load_profile
         
         cache_service = get_cache_service()
         output_path = Path(output_path)
@@ -246,25 +343,31 @@ class DOCTimeSeriesPlugin:
         #    inline from data_path_*. This is what makes
         #    ``ddoc analyze drift --data-path-ref X --data-path-cur Y``
         #    actually work without any project / snapshot context.
+        #
+        # Reference profiles (per-column sketches saved by ``eda_run``)
+        # are resolved alongside: from cfg, from the cache, or filled in
+        # by the same path-mode pass that computes the attributes.
         def _resolve(cfg_key, snap_id, data_hash, data_path):
-            attrs = cfg.get(cfg_key)
-            if attrs:
-                return attrs
-            attrs = cache_service.load_analysis_cache(
+            profile = load_profile(cfg.get(cfg_key.replace('_cache', '_profile')))
+            if profile is None:
+                profile = cache_service.load_reference_profile(
+                    'timeseries', snapshot_id=snap_id, data_hash=data_hash,
+                )
+            attrs = cfg.get(cfg_key) or cache_service.load_analysis_cache(
                 snapshot_id=snap_id,
                 data_hash=data_hash,
                 cache_type="attributes_timeseries",
             )
-            if attrs:
-                return attrs
-            if data_path:
-                return self._compute_attributes_from_path(data_path)
-            return None
+            if not attrs and data_path:
+                collected = ReferenceProfile(modality='timeseries')
+                attrs = self._compute_attributes_from_path(data_path, profile=collected)
+                profile = profile or collected
+            return attrs or None, profile
 
-        baseline_attr = _resolve(
+        baseline_attr, baseline_profile = _resolve(
             'baseline_cache', snapshot_id_ref, data_hash_ref, data_path_ref,
         )
-        current_attr = _resolve(
+        current_attr, current_profile = _resolve(
             'current_cache', snapshot_id_cur, data_hash_cur, data_path_cur,
         )
 
@@ -273,8 +376,9 @@ class DOCTimeSeriesPlugin:
 
         # Round-11 (Track B) — detector validation only fires when this
         # plugin actually has data to process. Default / mmd / attributes
-        # all alias to "abs Δ on mean/var/skew/kurt".
-        _SUPPORTED_DETECTORS = {"default", "mmd", "attributes"}
+        # all alias to "abs Δ on mean/var/skew/kurt"; windowed scores the
+        # latest time window per column (see ``windowed.py``).
+        _SUPPORTED_DETECTORS = {"default", "mmd", "attributes", "windowed"}
         _strategy = (detector or "default").lower()
         if _strategy not in _SUPPORTED_DETECTORS:
             return {
@@ -306,6 +410,31 @@ class DOCTimeSeriesPlugin:
         
         drift_metrics['overall_score'] = float(np.mean(drift_scores)) if drift_scores else 0.0
 
+        # Windowed drift — on request (detector / cfg['window']) or when a
+        # dataset declares ``drift_window`` in its ddoc.yaml
+        windowed_requested = _strategy == "windowed" or bool(cfg.get('window'))
+        if windowed_requested or self._declares_window(data_path_cur):
+            windowed = self._windowed_drift(
+                data_path_ref, data_path_cur, data_hash_ref, data_hash_cur, cfg.get('window'),
+                force=windowed_requested,
+            )
+            if windowed:
+                drift_metrics['windowed'] = windowed
+            if _strategy == "windowed":
+                latest = [r['latest']['psi'] for r in windowed.values() if r.get('latest')]
+                drift_metrics['overall_score'] = float(max(latest)) if latest else 0.0
+
+        # Distribution drift (PSI / KS / JS per column) from reference
+        # profiles. With a stored baseline profile only the current side
+        # is ever read from disk.
+        if baseline_profile is not None and current_profile is None and data_path_cur:
+            current_profile = ReferenceProfile(modality='timeseries')
+            self._compute_attributes_from_path(data_path_cur, profile=current_profile)
+        if baseline_profile is not None and current_profile is not None and current_profile.features:
+            report = compare_reference(baseline_profile, current_profile)
+            drift_metrics['column_drift'] = report['features']
+            drift_metrics['column_drift_summary'] = report['summary']
+
         metrics_file = output_path / 'metrics.json'
         with open(metrics_file, 'w') as f:
             json.dump(drift_metrics, f, indent=2)
@@ -318,12 +447,14 @@ class DOCTimeSeriesPlugin:
         return {
             "modality": "timeseries",
             "default": "attributes",
-            "supported": ["default", "mmd", "attributes"],
+            "supported": ["default", "mmd", "attributes", "windowed"],
             "notes": (
-                "abs Δ on mean / variance / skewness / kurtosis. All "
-                "three CLI values are aliases for the same single "
-                "strategy. Embedding-based timeseries drift is not in "
-                "scope for this plugin."
+                "abs Δ on mean / variance / skewness / kurtosis; default, "
+                "mmd and attributes are aliases for that strategy. "
+                "windowed scores per-window PSI / KS / Wasserstein / CUSUM "
+                "against the reference (--window, --window-step). "
+                "Embedding-based timeseries drift is not in scope for "
+                "this plugin."
             ),
         }
 
@@ -0,0 +1,314 @@
+"""
+Windowed drift engine for time series
+
+The current series is cut into epoch-aligned time windows (tumbling, or
+sliding when ``step`` < ``size``) and every window of every numeric
+column is compared against the whole reference series:
+
+- PSI on reference deciles
+- Kolmogorov–Smirnov and Wasserstein-1 on a fine reference quantile grid
+- change-point statistics: standardized mean shift per window and a
+  two-sided Page CUSUM over the window sequence
+
+Everything is computed from additive per-block summaries (one block =
+``step``): each value is binned once into the reference grid, blocks are
+aggregated with ``bincount`` and windows are rolling sums of ``size /
+step`` blocks, so sliding windows cost no more than tumbling ones and the
+work is linear in the number of rows.
+
+Runs are incremental: the per-column state (evaluated windows, CUSUM
+position, last data timestamp) is returned to the caller, and the next
+run only re-evaluates windows that were still open or are new. The last
+reused window is recomputed as a consistency check; if it no longer
+matches (history rewritten), the column is evaluated from scratch.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ddoc.core.sketches import PSI_WARNING, drift_status
+
+STATE_VERSION = 1
+_EPS = 1e-4  # same floor as ddoc.core.sketches PSI
+
+
+@dataclass
+class WindowConfig:
+    """Window layout and detector settings (``ddoc.yaml: drift_window`` / ``cfg['window']``)"""
+
+    size: str = "1D"
+    step: Optional[str] = None  # None → tumbling (step == size)
+    bins: int = 10              # PSI bins (reference quantiles)
+    grid: int = 100             # reference quantile grid for KS / Wasserstein
+    min_count: int = 30         # windows with fewer values are reported as insufficient
+    cusum_k: float = 0.5        # CUSUM slack (in reference standard deviations)
+    cusum_h: float = 5.0        # CUSUM alarm threshold
+    report_windows: int = 100   # most recent windows included in the result
+
+    @classmethod
+    def from_sources(cls, *sources: Optional[Dict[str, Any]]) -> "WindowConfig":
+        """Merge settings; later sources win, ``None`` values are ignored"""
+        merged: Dict[str, Any] = {}
+        for source in sources:
+            for key, value in (source or {}).items():
+                if key in cls.__dataclass_fields__ and value is not None:
+                    merged[key] = value
+        config = cls(**merged)
+        config.validate()
+        return config
+
+    @property
+    def size_ns(self) -> int:
+        return pd.Timedelta(self.size).value
+
+    @property
+    def step_ns(self) -> int:
+        return pd.Timedelta(self.step).value if self.step else self.size_ns
+
+    @property
+    def blocks_per_window(self) -> int:
+        return self.size_ns // self.step_ns
+
+    def validate(self) -> None:
+        if self.size_ns <= 0 or self.step_ns <= 0:
+            raise ValueError("window size and step must be positive")
+        if self.size_ns % self.step_ns:
+            raise ValueError(f"window size {self.size} must be a multiple of step {self.step}")
+
+    def signature(self) -> Dict[str, Any]:
+        """Settings that change window results (``report_windows`` does not)"""
+        sig = asdict(self)
+        sig.pop("report_windows")
+        return sig
+
+
+class ReferenceGrid:
+    """Reference distribution of one column on a quantile grid"""
+
+    def __init__(self, values: np.ndarray, config: WindowConfig):
+        ref = np.sort(values[np.isfinite(values)])
+        if ref.size < 2:
+            raise ValueError("reference needs at least two finite values")
+        self.n = ref.size
+        self.mean = float(ref.mean())
+        self.std = float(ref.std()) or 1.0
+        probs = np.linspace(0, 1, config.grid + 1)[1:-1]
+        self.edges = np.unique(np.quantile(ref, probs))
+        # Exact reference CDF at the edges and mass per fine bin (incl. both tails)
+        self.cdf = np.searchsorted(ref, self.edges, side="right") / self.n
+        self.mass = np.diff(np.concatenate(([0.0], self.cdf, [1.0])))
+        # Fine bin → PSI bin, grouped by reference probability mass
+        left_cdf = np.concatenate(([0.0], self.cdf))
+        self.psi_group = np.minimum((left_cdf * config.bins + 1e-9).astype(int), config.bins - 1)
+        self.psi_ref = np.bincount(self.psi_group, weights=self.mass, minlength=config.bins)
+
+    def bin_index(self, values: np.ndarray) -> np.ndarray:
+        # bin j holds (edges[j-1], edges[j]] so cumulative counts match ``cdf``
+        return np.searchsorted(self.edges, values, side="left")
+
+
+class WindowedDriftEngine:
+    """Evaluate per-window drift of one column against a ``ReferenceGrid``"""
+
+    def __init__(self, config: WindowConfig):
+        self.config = config
+
+    # ------------------------------------------------------------------
+
+    def _block_stats(self, grid: ReferenceGrid, ts: np.ndarray, values: np.ndarray, first_block: int, n_blocks: int):
+        """Additive summaries per block: fine-bin counts, sums, tail sums"""
+        block = (ts // self.config.step_ns) - first_block
+        n_bins = grid.edges.size + 1
+        bins = grid.bin_index(values)
+        counts = np.bincount(block * n_bins + bins, minlength=n_blocks * n_bins).reshape(n_blocks, n_bins)
+        s = np.bincount(block, weights=values, minlength=n_blocks)
+        ss = np.bincount(block, weights=values * values, minlength=n_blocks)
+        low, high = bins == 0, bins == n_bins - 1
+        low_s = np.bincount(block[low], weights=values[low], minlength=n_blocks)
+        high_s = np.bincount(block[high], weights=values[high], minlength=n_blocks)
+        return counts, s, ss, low_s, high_s
+
+    @staticmethod
+    def _rolling(x: np.ndarray, r: int) -> np.ndarray:
+        c = np.concatenate((np.zeros((1,) + x.shape[1:], dtype=np.float64), np.cumsum(x, axis=0, dtype=np.float64)))
+        return c[r:] - c[:-r]
+
+    def _window_metrics(self, grid: ReferenceGrid, ts: np.ndarray, values: np.ndarray, first_start: int) -> Dict[str, np.ndarray]:
+        """Vectorized metrics for every window starting at or after ``first_start``"""
+        cfg = self.config
+        r = cfg.blocks_per_window
+        first_block = first_start // cfg.step_ns
+        last_block = int(ts.max() // cfg.step_ns)
+        n_blocks = last_block - first_block + 1
+        counts, s, ss, low_s, high_s = self._block_stats(grid, ts, values, first_block, n_blocks)
+        # Pad r-1 empty blocks so trailing (still open) windows exist too
+        pad = r - 1
+        counts = np.vstack((counts, np.zeros((pad, counts.shape[1]), dtype=counts.dtype)))
+        s, ss, low_s, high_s = (np.concatenate((a, np.zeros(pad))) for a in (s, ss, low_s, high_s))
+
+        W = self._rolling(counts, r)[: n_blocks]      # (K, fine bins)
+        n = W.sum(axis=1)
+        safe = np.where(n > 0, n, 1.0)
+        mean = self._rolling(s, r)[: n_blocks] / safe
+        var = np.maximum(self._rolling(ss, r)[: n_blocks] / safe - mean ** 2, 0)
+
+        props = W / safe[:, None]
+        cdf = np.cumsum(props, axis=1)[:, :-1]         # window CDF at the reference edges
+        ks = np.abs(cdf - grid.cdf).max(axis=1) if grid.edges.size else np.zeros(len(n))
+        widths = np.diff(grid.edges)
+        inner = (np.abs(cdf[:, :-1] - grid.cdf[:-1]) * widths).sum(axis=1) if widths.size else 0.0
+        n_low, n_high = W[:, 0], W[:, -1]
+        # Tails beyond the grid: E[(e0 - X)+] and E[(X - e_last)+] of the window
+        tails = ((n_low * grid.edges[0] - self._rolling(low_s, r)[: n_blocks])
+                 + (self._rolling(high_s, r)[: n_blocks] - n_high * grid.edges[-1])) / safe
+        wasserstein = inner + np.maximum(tails, 0)
+
+        psi_cur = props @ np.eye(cfg.bins)[grid.psi_group]
+        ref = np.clip(grid.psi_ref, _EPS, None)
+        cur = np.clip(psi_cur, _EPS, None)
+        psi = ((cur - ref) * np.log(cur / ref)).sum(axis=1)
+
+        starts = (first_block + np.arange(n_blocks)) * cfg.step_ns
+        return {
+            "start": starts, "n": n, "mean": mean, "std": np.sqrt(var),
+            "psi": psi, "ks": ks, "wasserstein": wasserstein,
+            "sum": self._rolling(s, r)[: n_blocks],
+        }
+
+    # ------------------------------------------------------------------
+
+    def evaluate(
+        self,
+        grid: ReferenceGrid,
+        ts: np.ndarray,
+        values: np.ndarray,
+        state: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Windowed drift of one column
+
+        Args:
+            grid: Reference distribution
+            ts: Timestamps as int64 nanoseconds (any order)
+            values: Values aligned with ``ts`` (NaN allowed)
+            state: State returned by the previous run for this column
+
+        Returns:
+            ``(result, state)`` — ``result`` holds the most recent
+            windows, change points and a summary; ``state`` feeds the next run
+        """
+        cfg = self.config
+        mask = np.isfinite(values)
+        ts, values = ts[mask], values[mask].astype(np.float64)
+        if ts.size == 0:
+            return {"windows": [], "evaluated": 0, "reused": 0, "summary": {}}, state or {}
+
+        windows: List[Dict[str, Any]] = []
+        cusum = (0.0, 0.0)
+        first_start = (int(ts.min()) // cfg.step_ns) * cfg.step_ns
+        check = None
+        if (
+            state and state.get("version") == STATE_VERSION
+            and state.get("config") == cfg.signature()
+            and state.get("last_ts", np.inf) <= ts.max()  # a shorter series is a rewrite
+        ):
+            kept = [w for w in state["windows"] if w["end"] <= state["last_ts"]]
+            if kept:
+                check = kept.pop()
+                windows, cusum = kept, tuple(check["cusum_before"])
+                first_start = max(first_start, check["start"])
+
+        sel = ts >= first_start
+        metrics = self._window_metrics(grid, ts[sel], values[sel], first_start)
+        if check is not None:
+            same = (
+                metrics["start"].size and metrics["start"][0] == check["start"]
+                and int(metrics["n"][0]) == check["n"]
+                and np.isclose(metrics["sum"][0], check["sum"], rtol=1e-9, atol=1e-9)
+            )
+            if not same:  # history changed under us → full re-evaluation
+                return self.evaluate(grid, ts, values, state=None)
+
+        new = self._sequence(grid, metrics, cusum)
+        windows = windows + new
+        last_ts = int(ts.max())
+        state = {
+            "version": STATE_VERSION,
+            "config": cfg.signature(),
+            "last_ts": last_ts,
+            "windows": windows,
+        }
+        return self._result(windows, len(new), last_ts), state
+
+    def _sequence(self, grid: ReferenceGrid, m: Dict[str, np.ndarray], cusum: Tuple[float, float]) -> List[Dict[str, Any]]:
+        """Window dicts in time order with the CUSUM recurrence applied"""
+        cfg = self.config
+        pos, neg = cusum
+        out = []
+        for i in range(m["start"].size):
+            n = int(m["n"][i])
+            start = int(m["start"][i])
+            window = {
+                "start": start,
+                "end": start + cfg.size_ns,
+                "n": n,
+                "sum": float(m["sum"][i]),
+                "cusum_before": [pos, neg],
+            }
+            if n < cfg.min_count:
+                window["status"] = "INSUFFICIENT"
+                out.append(window)
+                continue
+            effect = (m["mean"][i] - grid.mean) / grid.std
+            pos = max(0.0, pos + effect - cfg.cusum_k)
+            neg = max(0.0, neg - effect - cfg.cusum_k)
+            psi = float(m["psi"][i])
+            window.update({
+                "mean": float(m["mean"][i]),
+                "std": float(m["std"][i]),
+                "psi": psi,
+                "ks": float(m["ks"][i]),
+                "wasserstein": float(m["wasserstein"][i]),
+                "mean_shift_z": float(effect * np.sqrt(n)),
+                "cusum_pos": pos,
+                "cusum_neg": neg,
+                "change_point": bool(max(pos, neg) > cfg.cusum_h),
+                "status": drift_status(psi),
+            })
+            if window["change_point"]:
+                pos, neg = 0.0, 0.0  # restart after an alarm
+            out.append(window)
+        return out
+
+    def _result(self, windows: List[Dict[str, Any]], evaluated: int, last_ts: int) -> Dict[str, Any]:
+        scored = [w for w in windows if "psi" in w]
+        latest = scored[-1] if scored else None
+        report = [_public(w) for w in windows[-self.config.report_windows:]]
+        return {
+            "windows": report,
+            "latest": _public(latest) if latest else None,
+            "change_points": [_iso(w["start"]) for w in scored if w["change_point"]],
+            "evaluated": evaluated,
+            "reused": len(windows) - evaluated,
+            "summary": {
+                "windows": len(windows),
+                "scored_windows": len(scored),
+                "max_psi": max((w["psi"] for w in scored), default=None),
+                "drifted_windows": sum(w["psi"] >= PSI_WARNING for w in scored),
+                "last_timestamp": _iso(last_ts),
+            },
+        }
+
+
+def _iso(ns: int) -> str:
+    return pd.Timestamp(ns).isoformat()
+
+
+def _public(window: Dict[str, Any]) -> Dict[str, Any]:
+    out = {k: v for k, v in window.items() if k not in ("sum", "cusum_before")}
+    out["start"], out["end"] = _iso(window["start"]), _iso(window["end"])
+    return out
@@ -17,6 +17,7 @@ from .cache_manager import (
     export_local_cache_to_repository,
     import_repository_cache_to_local,
     repository_has_cache,
+    analysis_cache_path,
 )
 from .cache_repository import CacheRepository
 
@@ -34,4 +35,5 @@ __all__ = [
     'export_local_cache_to_repository',
     'import_repository_cache_to_local',
     'repository_has_cache',
+    'analysis_cache_path',
 ] 
\ No newline at end of file
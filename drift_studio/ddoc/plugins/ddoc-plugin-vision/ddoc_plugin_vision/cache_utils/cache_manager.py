@@ -334,11 +334,9 @@ def get_latest_cached_content_by_prefix(directory, identifier_prefix: str, exclu
 def _build_identifier(dir_name: str, data_type: str, version: Optional[str] = None) -> str:
     return f"{data_type}_{dir_name}_{version}" if version else f"{data_type}_{dir_name}"
 
-def _validate_cache_integrity(directory, cached_data, data_type):
-    """캐시 데이터의 무결성을 검증"""
+def _current_image_files(directory) -> set:
+    """데이터셋의 현재 이미지 파일명 목록 (flat + YOLO 구조)"""
     directory = Path(directory)
-    
-    # 현재 실제 파일 목록 수집
     formats = ('.jpg', '.jpeg', '.png', '.JPG', '.JPEG', '.PNG')
     current_files = set()
     
@@ -353,6 +351,22 @@ def _validate_cache_integrity(directory, cached_data, data_type):
         if subdir_path.exists():
             for fmt in formats:
                 current_files.update(f.name for f in subdir_path.glob(f"*{fmt}"))
+    return current_files
+
+
+def analysis_cache_path(directory, data_type: str, version: Optional[str] = None) -> Path:
+    """분석 데이터 캐시 파일 경로 (save_analysis_data가 쓰는 파일)"""
+    cache_manager = get_cache_manager(directory)
+    identifier = _build_identifier(os.path.basename(directory), data_type, version)
+    return cache_manager._get_cache_path(cache_manager._get_cache_key(identifier, ""))
+
+
+def _validate_cache_integrity(directory, cached_data, data_type):
+    """캐시 데이터의 무결성을 검증"""
+    directory = Path(directory)
+    
+    # 현재 실제 파일 목록 수집
+    current_files = _current_image_files(directory)
     
     # 캐시된 파일 목록
     cached_files = set(cached_data.keys())
@@ -0,0 +1,396 @@
+"""
+CAM 후처리 지표 (벡터화 경로)
+
+CAM 한 장에 대해 정렬 배열, 백분위수 임계값, 라벨링 결과, 양자화(uint8)
+배열 등을 ``CamContext`` 에 한 번만 계산해 두고, 임계값 탐색 /
+Connected Components / centroid / 엔트로피 / bbox overlap 지표가 이를 공유합니다.
+
+- 모든 백분위수는 한 번의 정렬 결과에서 ``np.percentile`` (linear) 과
+  동일한 보간으로 계산
+- 여러 임계값의 Connected Components 는 임계값 축으로 쌓은 3D 마스크를
+  ``ndimage.label`` 한 번으로 라벨링 (임계값 사이는 연결하지 않음)
+- 컴포넌트 크기 / 중심 / bbox 는 ``bincount`` · ``center_of_mass`` ·
+  ``find_objects`` 로 한 번에 계산하고, 원형도는 컴포넌트 bbox 크롭에서만
+  윤곽선을 추출
+- 엔트로피는 ``np.unique`` 대신 uint8 ``bincount`` 로 계산
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+from scipy import ndimage
+from scipy.stats import entropy
+
+_CROSS = ndimage.generate_binary_structure(2, 1)  # ndimage.label 기본 연결성 (4-이웃)
+
+
+def _lerp_percentiles(sorted_values: np.ndarray, percentiles: Sequence[float]) -> np.ndarray:
+    """정렬된 배열에서 ``np.percentile(method='linear')`` 와 동일한 값을 계산합니다."""
+    n = sorted_values.size
+    q = np.true_divide(np.asarray(percentiles, dtype=np.float64), 100)
+    virtual = (n - 1) * q
+    previous = np.floor(virtual).astype(np.intp)
+    following = np.minimum(previous + 1, n - 1)
+    gamma = virtual - previous
+    a, b = sorted_values[previous], sorted_values[following]
+    diff = b - a
+    return np.where(gamma >= 0.5, b - diff * (1 - gamma), a + diff * gamma).astype(sorted_values.dtype)
+
+
+def uint8_entropy(counts: np.ndarray) -> float:
+    """uint8 히스토그램의 Shannon 엔트로피 (bits) — ``skimage.measure.shannon_entropy`` 와 동일"""
+    counts = counts[counts > 0]
+    return entropy(counts, base=2) if counts.size else 0.0
+
+
+def _uint8_counts(values: np.ndarray) -> np.ndarray:
+    return np.bincount(values.ravel(), minlength=256)
+
+
+class CamContext:
+    """
+    CAM 한 장에 대한 공유 중간 결과
+
+    Args:
+        cam: CAM 데이터 (2D numpy array)
+    """
+
+    def __init__(self, cam: np.ndarray):
+        self.cam = np.asarray(cam)
+        self.size = self.cam.size
+        self.sorted = np.sort(self.cam, axis=None)
+        self.max = self.sorted[-1]
+        self.min = self.sorted[0]
+        self.mean = np.mean(self.cam)
+        self._labels: Dict[float, Tuple[np.ndarray, int]] = {}
+        self._masks: Dict[float, np.ndarray] = {}
+        self._quantized_sorted: Optional[np.ndarray] = None
+        self._positive: Optional[np.ndarray] = None
+
+    # ── 임계값 ───────────────────────────────────────────
+
+    def percentile(self, p: float):
+        return _lerp_percentiles(self.sorted, [p])[0]
+
+    def percentiles(self, ps: Sequence[float]) -> np.ndarray:
+        return _lerp_percentiles(self.sorted, ps)
+
+    def count_above(self, threshold) -> int:
+        """``np.sum(cam > threshold)`` (정렬 배열 이분 탐색)"""
+        return int(self.size - np.searchsorted(self.sorted, threshold, side='right'))
+
+    def mask_above(self, threshold) -> np.ndarray:
+        key = float(threshold)
+        if key not in self._masks:
+            self._masks[key] = self.cam > threshold
+        return self._masks[key]
+
+    @property
+    def positive_mask(self) -> np.ndarray:
+        if self._positive is None:
+            self._positive = self.cam > 0
+        return self._positive
+
+    @property
+    def positive_sorted(self) -> np.ndarray:
+        """0보다 큰 값들 (정렬됨)"""
+        return self.sorted[np.searchsorted(self.sorted, 0, side='right'):]
+
+    @property
+    def quantized_sorted(self) -> np.ndarray:
+        """``(sorted * 255).astype(uint8)`` — 조건부 엔트로피용"""
+        if self._quantized_sorted is None:
+            self._quantized_sorted = (self.sorted * 255).astype(np.uint8)
+        return self._quantized_sorted
+
+    # ── 라벨링 ───────────────────────────────────────────
+
+    def label(self, threshold) -> Tuple[np.ndarray, int]:
+        """``ndimage.label(cam > threshold)`` (캐시)"""
+        key = float(threshold)
+        if key not in self._labels:
+            self._labels[key] = ndimage.label(self.mask_above(threshold))
+        return self._labels[key]
+
+    def label_many(self, thresholds: Sequence[float]) -> List[int]:
+        """여러 임계값의 컴포넌트 수 — 3D 스택을 한 번에 라벨링합니다.
+
+        임계값 축으로는 연결하지 않으므로 각 평면은 독립적으로 라벨링되고,
+        라벨은 평면 순서대로 증가합니다. 평면별 라벨 결과는 캐시에 남겨
+        이후 분석(최적 임계값의 컴포넌트 분석 등)에서 재사용합니다.
+        """
+        thresholds = list(thresholds)
+        todo = [t for t in dict.fromkeys(float(t) for t in thresholds) if t not in self._labels]
+        if todo:
+            masks = self.cam[None, :, :] > np.asarray(todo, dtype=self.cam.dtype)[:, None, None]
+            structure = np.zeros((3, 3, 3), dtype=bool)
+            structure[1] = _CROSS
+            stacked, _ = ndimage.label(masks, structure=structure)
+            plane_max = np.maximum.accumulate(stacked.reshape(len(todo), -1).max(axis=1))
+            offsets = np.concatenate(([0], plane_max[:-1]))
+            for i, t in enumerate(todo):
+                labeled = stacked[i]
+                if offsets[i]:
+                    labeled = np.where(labeled > 0, labeled - offsets[i], 0).astype(stacked.dtype)
+                self._masks.setdefault(t, masks[i])
+                self._labels[t] = (labeled, int(plane_max[i] - offsets[i]))
+        return [self._labels[float(t)][1] for t in thresholds]
+
+    def components(self, threshold) -> Dict[str, np.ndarray]:
+        """임계값 이상 영역의 컴포넌트 크기 / 중심 / bbox (한 번에 계산)"""
+        labeled, num = self.label(threshold)
+        if num == 0:
+            return {'num': 0}
+        index = np.arange(1, num + 1)
+        sizes = np.bincount(labeled.ravel(), minlength=num + 1)[1:]
+        centers = np.asarray(ndimage.center_of_mass(self.mask_above(threshold), labeled, index))
+        objects = ndimage.find_objects(labeled)
+        return {
+            'num': num,
+            'labeled': labeled,
+            'sizes': sizes,
+            'centers_yx': centers,
+            'objects': objects,
+        }
+
+
+def _circularity(labeled: np.ndarray, obj: Tuple[slice, slice], label: int) -> float:
+    """컴포넌트 bbox 크롭(1px 패딩)에서 외곽 윤곽선 기반 원형도"""
+    crop = np.pad((labeled[obj] == label).astype(np.uint8), 1)
+    contours, _ = cv2.findContours(crop, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        return 0
+    area = cv2.contourArea(contours[0])
+    perimeter = cv2.arcLength(contours[0], True)
+    return 4 * np.pi * area / (perimeter ** 2) if perimeter > 0 else 0
+
+
+# ── 지표 ────────────────────────────────────────────────
+
+
+def adaptive_thresholding(ctx: CamContext, percentile: int = 85) -> np.ndarray:
+    threshold = ctx.percentile(percentile)
+    cam_filtered = np.where(ctx.mask_above(threshold), ctx.cam, 0)
+    peak = cam_filtered.max()
+    return cam_filtered / peak if peak > 0 else cam_filtered
+
+
+def find_optimal_threshold_for_components(ctx: CamContext, percentile_range: tuple = (50, 95)) -> Dict:
+    min_percentile, max_percentile = percentile_range
+    percentiles = range(min_percentile, max_percentile + 1, 5)  # 5% 간격으로 탐색
+    thresholds = ctx.percentiles(list(percentiles))
+    counts = ctx.label_many(thresholds)
+
+    best = int(np.argmax(counts)) if counts and max(counts) > 0 else None
+    return {
+        'optimal_percentile': percentiles[best] if best is not None else 0,
+        'optimal_threshold': thresholds[best] if best is not None else 0,
+        'max_components': counts[best] if best is not None else 0,
+        'percentiles_tested': list(percentiles),
+        'component_counts': counts,
+    }
+
+
+def analyze_connected_components(ctx: CamContext, threshold_percentile: int = 85) -> Dict:
+    threshold = ctx.percentile(threshold_percentile)
+    binary_mask = ctx.mask_above(threshold)
+    active_pixels = np.sum(binary_mask)
+    labeled_mask, num_components = ctx.label(threshold)
+
+    result = {
+        'threshold': threshold,
+        'active_pixels': active_pixels,
+        'active_ratio': active_pixels / ctx.size * 100,
+        'num_components': num_components,
+        'binary_mask': binary_mask,
+        'labeled_mask': labeled_mask,
+    }
+    if num_components == 0:
+        return result
+
+    comps = ctx.components(threshold)
+    sizes = comps['sizes']
+    bboxes, densities, circularities = [], [], []
+    for label, (rows, cols) in enumerate(comps['objects'], start=1):
+        min_y, max_y, min_x, max_x = rows.start, rows.stop - 1, cols.start, cols.stop - 1
+        bboxes.append((min_x, min_y, max_x, max_y))
+        densities.append(sizes[label - 1] / ((max_y - min_y + 1) * (max_x - min_x + 1)))
+        circularities.append(_circularity(labeled_mask, (rows, cols), label))
+
+    result.update({
+        'component_sizes': sizes,
+        'component_centroids': [(x, y) for y, x in comps['centers_yx']],
+        'component_bboxes': bboxes,
+        'component_densities': np.array(densities),
+        'circularities': np.array(circularities),
+        'size_stats': {
+            'max': np.max(sizes),
+            'min': np.min(sizes),
+            'mean': np.mean(sizes),
+            'median': np.median(sizes),
+            'std': np.std(sizes),
+        },
+    })
+    return result
+
+
+def calculate_cam_centroids(ctx: CamContext, methods: Optional[List[str]] = None) -> Dict:
+    if methods is None:
+        methods = ['weighted', 'threshold', 'max', 'components']
+    cam = ctx.cam
+    height, width = cam.shape
+    center = (width / 2, height / 2)
+    centroids = {}
+
+    # 1. 활성도 가중 평균 centroid (행/열 주변합으로 계산)
+    if 'weighted' in methods:
+        total_weight = np.sum(cam)
+        if total_weight > 0:
+            weighted_x = cam.sum(axis=0, dtype=np.float64) @ np.arange(width) / total_weight
+            weighted_y = cam.sum(axis=1, dtype=np.float64) @ np.arange(height) / total_weight
+            confidence = ctx.mean / ctx.max if ctx.max > 0 else 0
+        else:
+            (weighted_x, weighted_y), confidence = center, 0
+        centroids['weighted'] = {
+            'x': weighted_x,
+            'y': weighted_y,
+            'confidence': confidence,
+            'description': 'Weighted average based on activation intensity',
+        }
+
+    # 2. 임계값 기반 centroid
+    if 'threshold' in methods:
+        threshold = ctx.percentile(85)
+        active_count = ctx.count_above(threshold)
+        if active_count > 0:
+            active_mask = ctx.mask_above(threshold)
+            threshold_x = active_mask.sum(axis=0) @ np.arange(width) / active_count
+            threshold_y = active_mask.sum(axis=1) @ np.arange(height) / active_count
+            active_values = ctx.sorted[ctx.size - active_count:]  # 임계값 초과 값 = 정렬 배열의 꼬리
+            active_intensity = np.mean(active_values) / ctx.max if ctx.max > 0 else 0
+            confidence = np.float64(active_count) / ctx.size * active_intensity
+        else:
+            (threshold_x, threshold_y), confidence = center, 0
+        centroids['threshold'] = {
+            'x': threshold_x,
+            'y': threshold_y,
+            'confidence': confidence,
+            'description': 'Centroid of pixels above 85th percentile threshold',
+        }
+
+    # 3. 최대 활성도 위치
+    if 'max' in methods:
+        max_y, max_x = np.unravel_index(np.argmax(cam), cam.shape)
+        centroids['max'] = {
+            'x': max_x,
+            'y': max_y,
+            'confidence': (ctx.max - ctx.mean) / ctx.max if ctx.max > 0 else 0,
+            'description': 'Location of maximum activation value',
+        }
+
+    # 4. Connected Components 기반 centroid (가장 큰 컴포넌트)
+    if 'components' in methods:
+        threshold = ctx.percentile(85)
+        comps = ctx.components(threshold)
+        if comps['num'] > 0:
+            largest = int(np.argmax(comps['sizes']))
+            largest_y, largest_x = comps['centers_yx'][largest]
+            total_active_pixels = ctx.count_above(threshold)
+            confidence = comps['sizes'][largest] / total_active_pixels if total_active_pixels > 0 else 0
+        else:
+            (largest_x, largest_y), confidence = center, 0
+        centroids['components'] = {
+            'x': largest_x,
+            'y': largest_y,
+            'confidence': confidence,
+            'description': 'Centroid of largest connected component',
+        }
+
+    return centroids
+
+
+def calculate_cam_entropy(ctx: CamContext, methods: Optional[List[str]] = None) -> Dict:
+    if methods is None:
+        methods = ['shannon', 'spatial', 'histogram', 'conditional']
+    cam = ctx.cam
+    entropy_results = {}
+
+    # 1. Shannon 엔트로피
+    if 'shannon' in methods:
+        cam_normalized = (cam - ctx.min) / (ctx.max - ctx.min)
+        entropy_results['shannon'] = uint8_entropy(_uint8_counts((cam_normalized * 255).astype(np.uint8)))
+
+    # 2. 공간적 엔트로피 (중앙 차분 그래디언트)
+    if 'spatial' in methods:
+        gx = np.zeros_like(cam)
+        gy = np.zeros_like(cam)
+        gx[:, 1:-1] = (cam[:, 2:] - cam[:, :-2]) / 2.0
+        gy[1:-1, :] = (cam[2:, :] - cam[:-2, :]) / 2.0
+        gradient_magnitude = np.sqrt(gx ** 2 + gy ** 2)
+
+        gx_ent = uint8_entropy(_uint8_counts((gx * 255).astype(np.uint8)))
+        gy_ent = uint8_entropy(_uint8_counts((gy * 255).astype(np.uint8)))
+        magnitude_ent = uint8_entropy(_uint8_counts((gradient_magnitude * 255).astype(np.uint8)))
+        entropy_results['spatial'] = 0.4 * gx_ent + 0.4 * gy_ent + 0.2 * magnitude_ent
+        entropy_results['spatial_directions'] = {
+            'horizontal': gx_ent,
+            'vertical': gy_ent,
+            'magnitude': magnitude_ent,
+        }
+
+    # 3. 히스토그램 엔트로피 (0보다 큰 값)
+    if 'histogram' in methods:
+        non_zero_cam = ctx.positive_sorted
+        if len(non_zero_cam) > 0:
+            hist, _ = np.histogram(non_zero_cam, bins=50, density=True)
+            entropy_results['histogram'] = entropy(hist[hist > 0])
+            entropy_results['activation_ratio'] = len(non_zero_cam) / ctx.size
+            entropy_results['non_zero_count'] = len(non_zero_cam)
+        else:
+            entropy_results['histogram'] = 0.0
+            entropy_results['activation_ratio'] = 0.0
+            entropy_results['non_zero_count'] = 0
+
+    # 4. 조건부 엔트로피 — 활성 영역 = 정렬 배열의 꼬리, 비활성 = 전체 히스토그램 - 활성
+    if 'conditional' in methods:
+        thresholds = [50, 75, 85, 90, 95]
+        quantized = ctx.quantized_sorted
+        all_counts = _uint8_counts(quantized)
+        conditional_ents = {}
+        for thresh, threshold_val in zip(thresholds, ctx.percentiles(thresholds)):
+            active_count = ctx.count_above(threshold_val)
+            active_counts = _uint8_counts(quantized[ctx.size - active_count:])
+            active_ent = uint8_entropy(active_counts) if active_count > 0 else 0
+            inactive_ent = uint8_entropy(all_counts - active_counts) if active_count < ctx.size else 0
+            active_ratio = active_count / ctx.size
+            conditional_ents[thresh] = active_ratio * active_ent + (1 - active_ratio) * inactive_ent
+        entropy_results['conditional'] = conditional_ents
+
+    return entropy_results
+
+
+def bbox_overlap(ctx: CamContext, bbox: Tuple[int, int, int, int]) -> Dict:
+    """이미 이미지 경계로 잘린 bbox ``(x1, y1, x2, y2)`` 와 CAM 활성(>0) 영역의 overlap"""
+    x1, y1, x2, y2 = bbox
+    cam_active_mask = ctx.positive_mask
+    bbox_mask = np.zeros_like(cam_active_mask)
+    bbox_mask[y1:y2 + 1, x1:x2 + 1] = True
+    intersection = np.zeros_like(cam_active_mask)
+    intersection[y1:y2 + 1, x1:x2 + 1] = cam_active_mask[y1:y2 + 1, x1:x2 + 1]
+
+    intersection_area = np.sum(intersection[y1:y2 + 1, x1:x2 + 1])
+    bbox_area = np.sum(bbox_mask[y1:y2 + 1, x1:x2 + 1])
+    cam_active_area = ctx.size - np.searchsorted(ctx.sorted, 0, side='right')
+    union_area = bbox_area + cam_active_area - intersection_area
+    return {
+        'iou': intersection_area / union_area if union_area > 0 else 0,
+        'cam_coverage': intersection_area / bbox_area if bbox_area > 0 else 0,
+        'bbox_coverage': intersection_area / cam_active_area if cam_active_area > 0 else 0,
+        'intersection_area': intersection_area,
+        'bbox_area': bbox_area,
+        'cam_active_area': cam_active_area,
+        'union_area': union_area,
+        'bbox_mask': bbox_mask,
+        'cam_active_mask': cam_active_mask,
+        'intersection_mask': intersection,
+    }
@@ -0,0 +1,167 @@
+"""
+XAI 시각화 이미지 저장소 (CAM 해시 기반 콘텐츠 주소 지정)
+
+시각화 결과를 base64로 HTML에 인라인하지 않고, 입력(CAM 파일, 원본 이미지,
+분석 결과)의 해시를 키로 하는 WebP/PNG 파일로 저장합니다. 같은 입력의
+시각화는 다시 렌더링하지 않고 저장된 파일을 재사용합니다.
+
+    <dataset>/cache/xai_figures/<hash[:2]>/<hash>/<viz_type>.webp
+    <dataset>/cache/xai_figures/<hash[:2]>/<hash>/manifest.json
+"""
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+from urllib.parse import quote
+
+import numpy as np
+
+RENDER_VERSION = "1"  # 시각화 코드가 바뀌면 올려서 기존 이미지를 무효화
+FIGURE_FORMATS = ("webp", "png")
+MIME_TYPES = {"webp": "image/webp", "png": "image/png"}
+
+
+class FigureRef(NamedTuple):
+    """저장된 시각화 이미지 참조 (HTML에서는 ``src``로 링크)"""
+    path: str
+    src: str
+    mime: str
+
+
+def _webp_available() -> bool:
+    try:
+        from PIL import features
+        return bool(features.check("webp"))
+    except Exception:
+        return False
+
+
+def _hash_file(digest, path: str) -> None:
+    """파일 내용을 digest에 추가 (없으면 경로만)"""
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+    except (OSError, TypeError):
+        digest.update(str(path).encode("utf-8"))
+
+
+def _json_default(value):
+    if isinstance(value, np.ndarray):
+        return hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def input_hash(comprehensive_result: Dict, fmt: str, dpi: int) -> str:
+    """
+    시각화 입력의 해시 (CAM 파일 내용 + 원본 이미지 + 분석 결과 + 렌더링 설정)
+
+    Args:
+        comprehensive_result: ``comprehensive_cam_analysis`` 결과
+        fmt: 이미지 형식 (webp / png)
+        dpi: 저장 해상도
+
+    Returns:
+        str: sha256 hex digest
+    """
+    digest = hashlib.sha256(f"{RENDER_VERSION}:{fmt}:{dpi}".encode("utf-8"))
+    cam_file_path = comprehensive_result.get("cam_file_path")
+    if cam_file_path:
+        _hash_file(digest, cam_file_path)
+    image_path = comprehensive_result.get("image_path")
+    if image_path:
+        _hash_file(digest, image_path)
+    digest.update(json.dumps(comprehensive_result, sort_keys=True, default=_json_default).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class FigureStore:
+    """콘텐츠 주소 기반 XAI 시각화 파일 저장소"""
+
+    def __init__(self, root, fmt: Optional[str] = None, dpi: int = 150,
+                 base_url: Optional[str] = None, link_dir=None):
+        """
+        Args:
+            root: 저장 디렉토리
+            fmt: 이미지 형식 (None → ``DDOC_XAI_FIGURE_FORMAT``, 기본 webp;
+                Pillow WebP 지원이 없으면 png)
+            dpi: 저장 해상도
+            base_url: HTML 링크 접두사 (None → ``DDOC_XAI_FIGURE_URL``).
+                없으면 ``link_dir`` 기준 상대 경로로 링크
+            link_dir: 리포트 HTML 파일이 있는 디렉토리 (None → ``root``)
+        """
+        self.root = Path(root)
+        fmt = (fmt or os.getenv("DDOC_XAI_FIGURE_FORMAT", "webp")).lower()
+        if fmt not in FIGURE_FORMATS:
+            raise ValueError(f"figure format must be one of {FIGURE_FORMATS}; got {fmt!r}")
+        if fmt == "webp" and not _webp_available():
+            fmt = "png"
+        self.fmt = fmt
+        self.dpi = dpi
+        self.base_url = base_url if base_url is not None else os.getenv("DDOC_XAI_FIGURE_URL")
+        self.link_dir = Path(link_dir) if link_dir is not None else self.root
+
+    @classmethod
+    def for_dataset(cls, dataset_directory, **kwargs) -> "FigureStore":
+        """데이터셋 캐시 디렉토리(``<dataset>/cache/xai_figures``)의 저장소"""
+        return cls(Path(dataset_directory) / "cache" / "xai_figures", **kwargs)
+
+    def key(self, comprehensive_result: Dict) -> str:
+        return input_hash(comprehensive_result, self.fmt, self.dpi)
+
+    def _dir(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def ref(self, path: Path) -> FigureRef:
+        """링크 참조 (리포트를 옮기거나 HTTP로 서빙해도 깨지지 않도록 상대 경로)"""
+        if self.base_url:
+            src = f"{self.base_url.rstrip('/')}/{path.relative_to(self.root).as_posix()}"
+        else:
+            relative = os.path.relpath(os.path.abspath(path), os.path.abspath(self.link_dir))
+            src = quote(Path(relative).as_posix())
+        return FigureRef(str(path), src, MIME_TYPES[path.suffix.lstrip('.')])
+
+    def lookup(self, key: str) -> Optional[Dict[str, FigureRef]]:
+        """저장된 시각화 목록 (manifest나 파일이 하나라도 없으면 None)"""
+        try:
+            with open(self._dir(key) / "manifest.json", "r", encoding="utf-8") as f:
+                names = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        paths = {viz_type: self._dir(key) / name for viz_type, name in names.items()}
+        if not all(path.exists() for path in paths.values()):
+            return None
+        return {viz_type: self.ref(path) for viz_type, path in paths.items()}
+
+    def save_figure(self, fig, key: str, viz_type: str) -> FigureRef:
+        """figure를 압축 이미지로 저장 (원자적 교체)"""
+        directory = self._dir(key)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{viz_type}.{self.fmt}"
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=f".{viz_type}.", suffix=f".{self.fmt}")
+        try:
+            pil_kwargs = {"quality": 85, "method": 4} if self.fmt == "webp" else {"optimize": True}
+            with os.fdopen(fd, "wb") as f:
+                fig.savefig(f, format=self.fmt, dpi=self.dpi, bbox_inches='tight',
+                            facecolor='white', edgecolor='none', pil_kwargs=pil_kwargs)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+        return self.ref(path)
+
+    def write_manifest(self, key: str, refs: Dict[str, FigureRef]) -> None:
+        """렌더링이 끝난 시각화 목록 기록 (이후 lookup 적중)"""
+        directory = self._dir(key)
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".manifest.", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({viz_type: Path(ref.path).name for viz_type, ref in refs.items()}, f)
+            os.replace(tmp, directory / "manifest.json")
+        except OSError as e:
+            print(f"    ⚠️  Could not write figure manifest: {e}")
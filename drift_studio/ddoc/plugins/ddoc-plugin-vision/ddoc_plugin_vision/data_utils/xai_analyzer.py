@@ -13,9 +13,8 @@ import torch
 from yolo_cam.eigen_cam import EigenCAM as YOLO_EigenCAM
 from yolo_cam.utils.image import scale_cam_image as scale_yolocam_image
 
-from scipy import ndimage
-from scipy.stats import entropy
-from skimage.measure import shannon_entropy
+from .cam_metrics import CamContext
+from . import cam_metrics
 
 from datetime import datetime
 
@@ -591,377 +590,89 @@ class XAIAnalyzer:
     
 
     
-    def adaptive_thresholding(self, cam: np.ndarray, percentile: int = 85) -> np.ndarray:
+    def adaptive_thresholding(self, cam: np.ndarray, percentile: int = 85,
+                              context: Optional[CamContext] = None) -> np.ndarray:
         """
         Adaptive 쓰레스홀딩을 적용한 CAM을 생성합니다.
         
         Args:
             cam: CAM 데이터
             percentile: 임계값 백분위수
+            context: 공유 중간 결과 (없으면 새로 계산)
             
         Returns:
             np.ndarray: Adaptive 쓰레스홀딩 적용된 CAM
         """
-        threshold = np.percentile(cam, percentile)
-        cam_filtered = np.where(cam > threshold, cam, 0)
-        
-        if cam_filtered.max() > 0:
-            adaptive_cam = cam_filtered / cam_filtered.max()
-        else:
-            adaptive_cam = cam_filtered
-        
-        return adaptive_cam
+        return cam_metrics.adaptive_thresholding(context or CamContext(cam), percentile)
     
-    def find_optimal_threshold_for_components(self, cam: np.ndarray, percentile_range: tuple = (50, 95)) -> Dict:
+    def find_optimal_threshold_for_components(self, cam: np.ndarray, percentile_range: tuple = (50, 95),
+                                              context: Optional[CamContext] = None) -> Dict:
         """
         컴포넌트 개수가 최대가 되는 최적 임계값을 찾습니다.
         
+        모든 백분위수 임계값은 한 번의 정렬에서, 컴포넌트 수는 임계값별
+        마스크를 쌓은 3D 배열의 라벨링 한 번으로 계산합니다.
+        
         Args:
             cam: CAM 데이터
             percentile_range: 탐색할 백분위수 범위 (min, max)
+            context: 공유 중간 결과 (없으면 새로 계산)
             
         Returns:
             Dict: 최적 임계값 정보
         """
-        min_percentile, max_percentile = percentile_range
-        percentiles = range(min_percentile, max_percentile + 1, 5)  # 5% 간격으로 탐색
-        
-        best_num_components = 0
-        best_threshold = 0
-        best_percentile = 0
-        component_counts = []
-        
-        for percentile in percentiles:
-            threshold = np.percentile(cam, percentile)
-            binary_mask = cam > threshold
-            labeled_mask, num_components = ndimage.label(binary_mask)
-            
-            component_counts.append(num_components)
-            
-            if num_components > best_num_components:
-                best_num_components = num_components
-                best_threshold = threshold
-                best_percentile = percentile
-        
-        return {
-            'optimal_percentile': best_percentile,
-            'optimal_threshold': best_threshold,
-            'max_components': best_num_components,
-            'percentiles_tested': list(percentiles),
-            'component_counts': component_counts
-        }
+        return cam_metrics.find_optimal_threshold_for_components(context or CamContext(cam), percentile_range)
     
-    def analyze_connected_components(self, cam: np.ndarray, threshold_percentile: int = 85) -> Dict:
+    def analyze_connected_components(self, cam: np.ndarray, threshold_percentile: int = 85,
+                                     context: Optional[CamContext] = None) -> Dict:
         """
         Connected Components Analysis를 통한 활성화 영역 구조 분석
         
+        컴포넌트 크기 / 중심 / bbox 는 bincount · center_of_mass ·
+        find_objects 로 한 번에 계산합니다.
+        
         Args:
             cam: CAM 데이터
             threshold_percentile: 임계값 백분위수
+            context: 공유 중간 결과 (없으면 새로 계산)
             
         Returns:
             Dict: 연결된 컴포넌트 분석 결과
         """
-        threshold = np.percentile(cam, threshold_percentile)
-        binary_mask = cam > threshold
-        
-        # 기본 활성화 영역 통계
-        active_pixels = np.sum(binary_mask)
-        active_ratio = active_pixels / cam.size * 100
-        
-        # Connected Components 분석
-        labeled_mask, num_components = ndimage.label(binary_mask)
-        
-        result = {
-            'threshold': threshold,
-            'active_pixels': active_pixels,
-            'active_ratio': active_ratio,
-            'num_components': num_components,
-            'binary_mask': binary_mask,
-            'labeled_mask': labeled_mask
-        }
-        
-        if num_components > 0:
-            # 각 컴포넌트 분석
-            component_sizes = []
-            component_centroids = []
-            component_bboxes = []
-            component_densities = []
-            circularities = []
-            
-            for i in range(1, num_components + 1):
-                component_mask = labeled_mask == i
-                size = np.sum(component_mask)
-                component_sizes.append(size)
-                
-                # 중심점 계산
-                y_coords, x_coords = np.where(component_mask)
-                centroid_y = np.mean(y_coords)
-                centroid_x = np.mean(x_coords)
-                component_centroids.append((centroid_x, centroid_y))
-                
-                # 바운딩 박스 계산
-                min_y, max_y = np.min(y_coords), np.max(y_coords)
-                min_x, max_x = np.min(x_coords), np.max(x_coords)
-                bbox_area = (max_y - min_y + 1) * (max_x - min_x + 1)
-                component_bboxes.append((min_x, min_y, max_x, max_y))
-                component_densities.append(size / bbox_area)
-                
-                # 원형도 계산
-                contours, _ = cv2.findContours(component_mask.astype(np.uint8), 
-                                             cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-                if contours:
-                    contour = contours[0]
-                    area = cv2.contourArea(contour)
-                    perimeter = cv2.arcLength(contour, True)
-                    if perimeter > 0:
-                        circularity = 4 * np.pi * area / (perimeter ** 2)
-                        circularities.append(circularity)
-                    else:
-                        circularities.append(0)
-                else:
-                    circularities.append(0)
-            
-            result.update({
-                'component_sizes': np.array(component_sizes),
-                'component_centroids': component_centroids,
-                'component_bboxes': component_bboxes,
-                'component_densities': np.array(component_densities),
-                'circularities': np.array(circularities),
-                'size_stats': {
-                    'max': np.max(component_sizes),
-                    'min': np.min(component_sizes),
-                    'mean': np.mean(component_sizes),
-                    'median': np.median(component_sizes),
-                    'std': np.std(component_sizes)
-                }
-            })
-        
-        return result
+        return cam_metrics.analyze_connected_components(context or CamContext(cam), threshold_percentile)
     
-    def calculate_cam_centroids(self, cam: np.ndarray, methods: List[str] = None) -> Dict:
+    def calculate_cam_centroids(self, cam: np.ndarray, methods: List[str] = None,
+                                context: Optional[CamContext] = None) -> Dict:
         """
         CAM의 centroid 좌표를 다양한 방법으로 계산하고 confidence score도 함께 제공
         
         Args:
             cam: CAM 데이터
             methods: 사용할 방법 리스트 ['weighted', 'threshold', 'max', 'components']
+            context: 공유 중간 결과 (없으면 새로 계산)
             
         Returns:
             Dict: 각 방법별 centroid 좌표와 confidence score
         """
-        if methods is None:
-            methods = ['weighted', 'threshold', 'max', 'components']
-        
-        centroids = {}
-        
-        # 1. 활성도 가중 평균 centroid
-        if 'weighted' in methods:
-            y_coords, x_coords = np.meshgrid(np.arange(cam.shape[0]), np.arange(cam.shape[1]), indexing='ij')
-            total_weight = np.sum(cam)
-            if total_weight > 0:
-                weighted_x = np.sum(x_coords * cam) / total_weight
-                weighted_y = np.sum(y_coords * cam) / total_weight
-                
-                # Confidence: 전체 활성화 강도 대비 평균 활성화 강도
-                # 높은 값 = 활성화가 집중되어 있음, 낮은 값 = 활성화가 분산되어 있음
-                mean_activation = np.mean(cam)
-                max_activation = np.max(cam)
-                confidence = mean_activation / max_activation if max_activation > 0 else 0
-            else:
-                weighted_x, weighted_y = cam.shape[1] / 2, cam.shape[0] / 2
-                confidence = 0
-            
-            centroids['weighted'] = {
-                'x': weighted_x,
-                'y': weighted_y,
-                'confidence': confidence,
-                'description': 'Weighted average based on activation intensity'
-            }
-        
-        # 2. 임계값 기반 centroid
-        if 'threshold' in methods:
-            threshold = np.percentile(cam, 85)
-            active_mask = cam > threshold
-            if np.sum(active_mask) > 0:
-                y_coords, x_coords = np.where(active_mask)
-                threshold_x = np.mean(x_coords)
-                threshold_y = np.mean(y_coords)
-                
-                # Confidence: 임계값 이상 활성화된 영역의 비율과 강도
-                # 높은 값 = 명확한 활성화 영역, 낮은 값 = 흐릿한 활성화 패턴
-                active_ratio = np.sum(active_mask) / cam.size
-                active_intensity = np.mean(cam[active_mask]) / np.max(cam) if np.max(cam) > 0 else 0
-                confidence = active_ratio * active_intensity
-            else:
-                threshold_x, threshold_y = cam.shape[1] / 2, cam.shape[0] / 2
-                confidence = 0
-            
-            centroids['threshold'] = {
-                'x': threshold_x,
-                'y': threshold_y,
-                'confidence': confidence,
-                'description': 'Centroid of pixels above 85th percentile threshold'
-            }
-        
-        # 3. 최대 활성도 위치
-        if 'max' in methods:
-            max_idx = np.unravel_index(np.argmax(cam), cam.shape)
-            max_y, max_x = max_idx
-            
-            # Confidence: 최대값과 평균값의 차이 (피크의 뾰족함)
-            # 높은 값 = 뚜렷한 피크, 낮은 값 = 평평한 활성화 패턴
-            max_val = np.max(cam)
-            mean_val = np.mean(cam)
-            confidence = (max_val - mean_val) / max_val if max_val > 0 else 0
-            
-            centroids['max'] = {
-                'x': max_x,
-                'y': max_y,
-                'confidence': confidence,
-                'description': 'Location of maximum activation value'
-            }
-        
-        # 4. Connected Components 기반 centroid
-        if 'components' in methods:
-            threshold = np.percentile(cam, 85)
-            binary_mask = cam > threshold
-            labeled_mask, num_components = ndimage.label(binary_mask)
-            
-            if num_components > 0:
-                component_sizes = []
-                component_centroids = []
-                
-                for i in range(1, num_components + 1):
-                    component_mask = labeled_mask == i
-                    size = np.sum(component_mask)
-                    component_sizes.append(size)
-                    
-                    y_coords, x_coords = np.where(component_mask)
-                    centroid_y = np.mean(y_coords)
-                    centroid_x = np.mean(x_coords)
-                    component_centroids.append((centroid_x, centroid_y))
-                
-                largest_idx = np.argmax(component_sizes)
-                largest_x, largest_y = component_centroids[largest_idx]
-                
-                # Confidence: 가장 큰 연결 컴포넌트의 비율
-                # 높은 값 = 하나의 큰 활성화 영역, 낮은 값 = 여러 개의 작은 활성화 영역
-                total_active_pixels = np.sum(binary_mask)
-                largest_component_size = component_sizes[largest_idx]
-                confidence = largest_component_size / total_active_pixels if total_active_pixels > 0 else 0
-            else:
-                largest_x, largest_y = cam.shape[1] / 2, cam.shape[0] / 2
-                confidence = 0
-            
-            centroids['components'] = {
-                'x': largest_x,
-                'y': largest_y,
-                'confidence': confidence,
-                'description': 'Centroid of largest connected component'
-            }
-        
-        return centroids
+        return cam_metrics.calculate_cam_centroids(context or CamContext(cam), methods)
     
-    def calculate_cam_entropy(self, cam: np.ndarray, methods: List[str] = None) -> Dict:
+    def calculate_cam_entropy(self, cam: np.ndarray, methods: List[str] = None,
+                              context: Optional[CamContext] = None) -> Dict:
         """
         CAM 데이터의 다양한 엔트로피 계산
         
         Args:
             cam: CAM 데이터
             methods: 사용할 엔트로피 방법 리스트
+            context: 공유 중간 결과 (없으면 새로 계산)
             
         Returns:
             Dict: 엔트로피 분석 결과
         """
-        if methods is None:
-            methods = ['shannon', 'spatial', 'histogram', 'conditional']
-        
-        entropy_results = {}
-        
-        # 1. Shannon 엔트로피
-        if 'shannon' in methods:
-            cam_normalized = (cam - cam.min()) / (cam.max() - cam.min())
-            cam_discrete = (cam_normalized * 255).astype(np.uint8)
-            shannon_ent = shannon_entropy(cam_discrete)
-            entropy_results['shannon'] = shannon_ent
-        
-        # 2. 공간적 엔트로피 (그래디언트 방식)
-        if 'spatial' in methods:
-            # 그래디언트 계산 (중앙 차분 방식)
-            gx = np.zeros_like(cam)
-            gy = np.zeros_like(cam)
-            
-            # 수평 그래디언트 (Gx) - 중앙 차분
-            gx[:, 1:-1] = (cam[:, 2:] - cam[:, :-2]) / 2.0
-            
-            # 수직 그래디언트 (Gy) - 중앙 차분
-            gy[1:-1, :] = (cam[2:, :] - cam[:-2, :]) / 2.0
-            
-            # 그래디언트 크기 (magnitude)
-            gradient_magnitude = np.sqrt(gx**2 + gy**2)
-            
-            # 각 방향별 엔트로피 계산
-            gx_ent = shannon_entropy((gx * 255).astype(np.uint8))
-            gy_ent = shannon_entropy((gy * 255).astype(np.uint8))
-            magnitude_ent = shannon_entropy((gradient_magnitude * 255).astype(np.uint8))
-            
-            # 평균 공간 엔트로피 (그래디언트 크기에 더 높은 가중치)
-            spatial_ent = 0.4 * gx_ent + 0.4 * gy_ent + 0.2 * magnitude_ent
-            entropy_results['spatial'] = spatial_ent
-            entropy_results['spatial_directions'] = {
-                'horizontal': gx_ent, 
-                'vertical': gy_ent, 
-                'magnitude': magnitude_ent
-            }
-        
-        # 3. 히스토그램 엔트로피
-        if 'histogram' in methods:
-            non_zero_cam = cam.flatten()[cam.flatten() > 0]
-            if len(non_zero_cam) > 0:
-                activation_ratio = len(non_zero_cam) / len(cam.flatten())
-                hist, bins = np.histogram(non_zero_cam, bins=50, density=True)
-                hist = hist[hist > 0]
-                hist_ent = entropy(hist)
-                
-                entropy_results['histogram'] = hist_ent
-                entropy_results['activation_ratio'] = activation_ratio
-                entropy_results['non_zero_count'] = len(non_zero_cam)
-            else:
-                entropy_results['histogram'] = 0.0
-                entropy_results['activation_ratio'] = 0.0
-                entropy_results['non_zero_count'] = 0
-        
-        # 4. 조건부 엔트로피
-        if 'conditional' in methods:
-            thresholds = [50, 75, 85, 90, 95]
-            conditional_ents = {}
-            
-            for thresh in thresholds:
-                threshold_val = np.percentile(cam, thresh)
-                active_mask = cam > threshold_val
-                inactive_mask = cam <= threshold_val
-                
-                if np.sum(active_mask) > 0:
-                    active_ent = shannon_entropy((cam[active_mask] * 255).astype(np.uint8))
-                else:
-                    active_ent = 0
-                    
-                if np.sum(inactive_mask) > 0:
-                    inactive_ent = shannon_entropy((cam[inactive_mask] * 255).astype(np.uint8))
-                else:
-                    inactive_ent = 0
-                
-                active_ratio = np.sum(active_mask) / cam.size
-                conditional_ent = active_ratio * active_ent + (1 - active_ratio) * inactive_ent
-                conditional_ents[thresh] = conditional_ent
-            
-            entropy_results['conditional'] = conditional_ents
-        
-        return entropy_results
+        return cam_metrics.calculate_cam_entropy(context or CamContext(cam), methods)
     
     def calculate_cam_bbox_overlap(self, cam: np.ndarray, boxes: np.ndarray, 
-                                  names: List[str]) -> Dict:
+                                  names: List[str], context: Optional[CamContext] = None) -> Dict:
         """
         CAM 활성 영역과 가장 큰 bbox 간의 overlap 계산 (임계값 없이 모든 활성화 값 활용)
         
@@ -969,6 +680,7 @@ class XAIAnalyzer:
             cam: CAM 데이터
             boxes: 검출된 박스 좌표
             names: 클래스명과 신뢰도가 포함된 리스트 (예: "car 0.95")
+            context: 공유 중간 결과 (없으면 새로 계산)
             
         Returns:
             Dict: Overlap 분석 결과
@@ -1014,39 +726,21 @@ class XAIAnalyzer:
         x2 = max(0, min(int(x2), img_width-1))
         y2 = max(0, min(int(y2), img_height-1))
         
-        # bbox 마스크 생성
-        bbox_mask = np.zeros_like(cam, dtype=bool)
-        bbox_mask[y1:y2+1, x1:x2+1] = True
-        
-        # CAM 활성 영역 마스크 생성 (임계값 없이 모든 활성화 값 활용)
-        cam_active_mask = cam > 0  # 0보다 큰 모든 값을 활성 영역으로 간주
-        
-        # Overlap 계산
-        intersection = np.logical_and(bbox_mask, cam_active_mask)
-        union = np.logical_or(bbox_mask, cam_active_mask)
-        
-        intersection_area = np.sum(intersection)
-        union_area = np.sum(union)
-        iou = intersection_area / union_area if union_area > 0 else 0
-        
-        bbox_area = np.sum(bbox_mask)
-        cam_active_area = np.sum(cam_active_mask)
-        
-        cam_coverage = intersection_area / bbox_area if bbox_area > 0 else 0
-        bbox_coverage = intersection_area / cam_active_area if cam_active_area > 0 else 0
+        # CAM 활성 영역(> 0)과의 overlap (마스크 / 면적)
+        overlap = cam_metrics.bbox_overlap(context or CamContext(cam), (x1, y1, x2, y2))
         
         return {
-            'iou': iou,
-            'cam_coverage': cam_coverage,
-            'bbox_coverage': bbox_coverage,
-            'intersection_area': intersection_area,
-            'bbox_area': bbox_area,
-            'cam_active_area': cam_active_area,
-            'union_area': union_area,
+            'iou': overlap['iou'],
+            'cam_coverage': overlap['cam_coverage'],
+            'bbox_coverage': overlap['bbox_coverage'],
+            'intersection_area': overlap['intersection_area'],
+            'bbox_area': overlap['bbox_area'],
+            'cam_active_area': overlap['cam_active_area'],
+            'union_area': overlap['union_area'],
             'bbox_coords': (x1, y1, x2, y2),
-            'bbox_mask': bbox_mask,
-            'cam_active_mask': cam_active_mask,
-            'intersection_mask': intersection,
+            'bbox_mask': overlap['bbox_mask'],
+            'cam_active_mask': overlap['cam_active_mask'],
+            'intersection_mask': overlap['intersection_mask'],
             'largest_bbox_idx': largest_idx,
             'all_areas': areas,
             'largest_class_name': largest_name,
@@ -1090,22 +784,22 @@ class XAIAnalyzer:
             return None
         
         grayscale_cam = cam_result['grayscale_cam']
+        # 정렬 배열 / 임계값 / 라벨링 결과를 아래 지표들이 공유
+        context = CamContext(grayscale_cam)
         
         # 1. 기본 통계 (Percentile과 Skewness 분석 포함)
         cam_stats = self.calculate_cam_statistics(grayscale_cam)
         
-        # 2. Adaptive 쓰레스홀딩
-        adaptive_cam = self.adaptive_thresholding(grayscale_cam)
-        
-        # 3. 최적 임계값 찾기 및 Connected Components 분석
-        optimal_threshold_info = self.find_optimal_threshold_for_components(grayscale_cam)
-        components_analysis = self.analyze_connected_components(grayscale_cam, optimal_threshold_info['optimal_percentile'])
+        # 2. 최적 임계값 찾기 및 Connected Components 분석
+        optimal_threshold_info = self.find_optimal_threshold_for_components(grayscale_cam, context=context)
+        components_analysis = self.analyze_connected_components(
+            grayscale_cam, optimal_threshold_info['optimal_percentile'], context=context)
         
-        # 4. Centroid 계산
-        centroids = self.calculate_cam_centroids(grayscale_cam)
+        # 3. Centroid 계산
+        centroids = self.calculate_cam_centroids(grayscale_cam, context=context)
         
-        # 5. 엔트로피 분석
-        entropy_results = self.calculate_cam_entropy(grayscale_cam)
+        # 4. 엔트로피 분석
+        entropy_results = self.calculate_cam_entropy(grayscale_cam, context=context)
         
         # 6. 객체 검출 및 Overlap 분석
         # 원본 이미지 로드
@@ -1115,7 +809,7 @@ class XAIAnalyzer:
         
         overlap_results = None
         if len(boxes) > 0:
-            overlap_results = self.calculate_cam_bbox_overlap(grayscale_cam, boxes, names)
+            overlap_results = self.calculate_cam_bbox_overlap(grayscale_cam, boxes, names, context=context)
         
         # 시각화 결과 저장 (선택사항) - 원본 이미지 경로만 저장
         visualization_paths = {}
@@ -1146,8 +840,8 @@ class XAIAnalyzer:
             'cam_stats': cam_stats,
             'adaptive_thresholding': {
                 'percentile': 85,
-                'threshold': float(np.percentile(grayscale_cam, 85)),
-                'active_ratio': float(np.sum(grayscale_cam > np.percentile(grayscale_cam, 85)) / grayscale_cam.size * 100)
+                'threshold': float(context.percentile(85)),
+                'active_ratio': float(context.count_above(context.percentile(85)) / grayscale_cam.size * 100)
             },
             'components_analysis': {
                 'threshold': components_analysis['threshold'],
@@ -11,34 +11,59 @@ import os
 import multiprocessing as mp
 from functools import partial
 
+from .figure_store import FigureStore
 
-# 전역 함수로 정의 (병렬 처리용)
-def process_single_visualization_wrapper(filename_xai_tuple):
-    """단일 XAI 결과를 처리하는 전역 함수 (병렬 처리용)"""
-    filename, xai_result = filename_xai_tuple
+
+# 워커 프로세스별 시각화기 (initializer에서 한 번만 생성)
+_WORKER_VISUALIZER = None
+
+
+def _init_render_worker():
+    """워커 프로세스 초기화: matplotlib 설정과 XAIVisualizer를 한 번만 준비"""
+    global _WORKER_VISUALIZER
+    import sys
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+    _WORKER_VISUALIZER = XAIVisualizer()
+
+
+def _render_worker(job):
+    """단일 XAI 결과 렌더링 (병렬 처리용, 저장소가 있으면 파일로 저장)"""
+    filename, xai_result, figure_store = job
+    visualizer = _WORKER_VISUALIZER or XAIVisualizer()
     try:
-        # 병렬 처리에서 필요한 import들을 명시적으로 추가
-        import sys
-        import os
-        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        if project_root not in sys.path:
-            sys.path.insert(0, project_root)
-        
-        # 각 프로세스에서 새로운 XAIVisualizer 인스턴스 생성
-        visualizer = XAIVisualizer()
-        # 개별 시각화 생성
-        visualizations = visualizer.create_comprehensive_visualization(xai_result)
-        return filename, visualizations
+        if figure_store is not None:
+            return filename, visualizer.render_to_store(xai_result, figure_store)
+        return filename, visualizer.create_comprehensive_visualization(xai_result)
     except Exception as e:
         print(f"    ❌ Error processing {filename}: {e}")
         return filename, {}
 
 
+# 전역 함수로 정의 (병렬 처리용)
+def process_single_visualization_wrapper(filename_xai_tuple):
+    """단일 XAI 결과를 처리하는 전역 함수 (병렬 처리용)"""
+    filename, xai_result = filename_xai_tuple
+    return _render_worker((filename, xai_result, None))
+
+
+def render_workers(workers: Optional[int] = None) -> int:
+    """렌더링 워커 수 (인자 → DDOC_XAI_RENDER_WORKERS → min(4, CPU 수))"""
+    if workers is None:
+        workers = int(os.getenv('DDOC_XAI_RENDER_WORKERS', '0')) or min(4, mp.cpu_count())
+    return max(1, int(workers))
+
+
 class XAIVisualizer:
     """XAI 분석 결과를 시각화하는 클래스"""
     
     def __init__(self):
         """XAI 시각화기 초기화"""
+        # 파일 저장 모드 상태 (render_to_store에서 설정)
+        self._figure_store = None
+        self._figure_key = None
+        self._current_viz_type = None
         plt.style.use('default')
         plt.rcParams['font.size'] = 14
         # 메모리 최적화를 위한 설정
@@ -82,23 +107,84 @@ class XAIVisualizer:
             plt.close(fig)
             raise e
     
-    def create_comprehensive_visualization_batch(self, xai_results: List[Tuple[str, Dict]]) -> Dict[str, str]:
-        """여러 XAI 결과를 배치로 처리하여 시각화 생성 (병렬 처리)"""
-        if not xai_results:
-            return {}
+    def _figure_output(self, fig: plt.Figure):
+        """figure 출력: 저장소 모드면 압축 이미지 파일(FigureRef), 아니면 base64"""
+        if self._figure_store is None or self._current_viz_type is None:
+            return self.fig_to_base64(fig)
+        try:
+            return self._figure_store.save_figure(fig, self._figure_key, self._current_viz_type)
+        finally:
+            plt.close(fig)
+    
+    def render_to_store(self, comprehensive_result: Dict, figure_store: FigureStore) -> Dict:
+        """
+        포괄적 시각화를 저장소에 파일로 렌더링 (같은 입력이면 렌더링 생략)
         
-        # CPU 코어 수에 따라 워커 수 결정 (최대 4개)
-        num_workers = min(4, mp.cpu_count())
+        Args:
+            comprehensive_result: CAM 분석 결과
+            figure_store: 시각화 이미지 저장소
+            
+        Returns:
+            Dict[str, FigureRef]: 시각화 타입별 이미지 참조
+        """
+        key = figure_store.key(comprehensive_result)
+        cached = figure_store.lookup(key)
+        if cached is not None:
+            return cached
         
-        print(f"    🔄 Starting batch visualization with {num_workers} workers...")
+        self._figure_store, self._figure_key = figure_store, key
+        try:
+            visualizations = self.create_comprehensive_visualization(comprehensive_result)
+        finally:
+            self._figure_store = self._figure_key = self._current_viz_type = None
+        # 실패한 시각화(None)가 있으면 다음 실행에서 다시 렌더링하도록 manifest 생략
+        rendered = {viz_type: ref for viz_type, ref in visualizations.items() if ref is not None}
+        if rendered and len(rendered) == len(visualizations):
+            figure_store.write_manifest(key, rendered)
+        return rendered
+    
+    def create_comprehensive_visualization_batch(self, xai_results: List[Tuple[str, Dict]],
+                                                 figure_store: Optional[FigureStore] = None,
+                                                 workers: Optional[int] = None) -> Dict:
+        """
+        여러 XAI 결과를 배치로 처리하여 시각화 생성 (병렬 처리)
         
-        # 병렬 처리 실행 (전역 함수 사용)
-        with mp.Pool(processes=num_workers) as pool:
-            results = pool.map(process_single_visualization_wrapper, xai_results)
+        Args:
+            xai_results: (파일명, CAM 분석 결과) 목록
+            figure_store: 이미지 저장소 (None이면 base64 문자열 반환)
+            workers: 렌더링 프로세스 수 (None → DDOC_XAI_RENDER_WORKERS 또는 min(4, CPU 수))
+            
+        Returns:
+            Dict: "파일명_시각화타입" → FigureRef 또는 base64 문자열
+        """
+        if not xai_results:
+            return {}
         
-        # 결과 병합
+        # 저장소에 이미 있는 시각화는 렌더링하지 않음
+        results = []
+        pending = []
+        for filename, xai_result in xai_results:
+            cached = figure_store.lookup(figure_store.key(xai_result)) if figure_store is not None else None
+            if cached is not None:
+                results.append((filename, cached))
+            else:
+                pending.append((filename, xai_result, figure_store))
+        if len(pending) < len(xai_results):
+            print(f"    ♻️  Reusing stored figures for {len(xai_results) - len(pending)} images")
+        
+        num_workers = min(render_workers(workers), len(pending)) if pending else 0
+        if num_workers > 1:
+            print(f"    🔄 Starting batch visualization with {num_workers} workers...")
+            # 워커마다 initializer로 matplotlib/시각화기를 한 번만 준비
+            with mp.Pool(processes=num_workers, initializer=_init_render_worker) as pool:
+                results.extend(pool.imap(_render_worker, pending))
+        elif pending:
+            results.extend(_render_worker((filename, xai_result, store)) for filename, xai_result, store in pending)
+        
+        # 결과 병합 (입력 순서 유지)
+        order = {filename: i for i, (filename, _) in enumerate(xai_results)}
         all_visualizations = {}
-        for filename, visualizations in results:
+        for filename, visualizations in sorted(results, key=lambda item: order[item[0]]):
             if visualizations:
                 for viz_type, viz_data in visualizations.items():
                     key = f"{filename}_{viz_type}"
@@ -220,7 +306,7 @@ Average Size: {active_pixels/num_components if num_components > 0 else 0:.1f} pi
         axes[1, 1].axis('off')
         
         self._safe_tight_layout(fig)
-        return self.fig_to_base64(fig)
+        return self._figure_output(fig)
     
     def visualize_entropy_analysis(self, entropy_results: Dict, cam_data: np.ndarray = None) -> str:
         """엔트로피 분석 결과 시각화 - 실제 CAM 데이터 사용"""
@@ -436,7 +522,7 @@ Activation Ratio: {entropy_results.get('activation_ratio', 0):.3f}"""
             axes[1, 1].axis('off')
         
         self._safe_tight_layout(fig)
-        return self.fig_to_base64(fig)
+        return self._figure_output(fig)
     
     def visualize_centroid_analysis(self, centroids: Dict, cam_result: Dict = None) -> str:
         """Centroid 분석 결과 시각화 - CAM overlay 위에 센트로이드 표시"""
@@ -628,7 +714,7 @@ Method Descriptions:"""
             axes[1, 1].set_title('Coordinate Distribution', fontsize=12, fontweight='bold')
         
         self._safe_tight_layout(fig)
-        return self.fig_to_base64(fig)
+        return self._figure_output(fig)
     
 
     
@@ -699,6 +785,7 @@ Method Descriptions:"""
             # 1. CAM 히트맵 시각화 (원본, CAM, 오버레이)
             if cam_result['image_path'] and cam_result['grayscale_cam'] is not None:
                 try:
+                    self._current_viz_type = 'cam_heatmap'
                     visualizations['cam_heatmap'] = self.visualize_cam_heatmap(cam_result)
                 except Exception as e:
                     print(f"    ⚠️  Failed to generate CAM heatmap: {e}")
@@ -706,12 +793,14 @@ Method Descriptions:"""
             # 2. 임계값 기반 활성 영역 시각화
             if cam_result['image_path'] and cam_result['grayscale_cam'] is not None:
                 try:
+                    self._current_viz_type = 'cam_threshold_analysis'
                     visualizations['cam_threshold_analysis'] = self.visualize_cam_threshold_analysis(cam_result)
                 except Exception as e:
                     print(f"    ⚠️  Failed to generate CAM threshold analysis: {e}")
             
             # 3. CAM 통계 시각화 (실제 CAM 데이터 사용)
             if comprehensive_result.get('cam_stats'):
+                self._current_viz_type = 'cam_statistics'
                 visualizations['cam_statistics'] = self.visualize_cam_statistics(
                     comprehensive_result['cam_stats'],
                     cam_data=grayscale_cam  # 실제 CAM 데이터 전달
@@ -719,12 +808,14 @@ Method Descriptions:"""
             
             # 5. Connected Components 시각화
             if comprehensive_result.get('components_analysis'):
+                self._current_viz_type = 'connected_components'
                 visualizations['connected_components'] = self.visualize_connected_components(
                     comprehensive_result['components_analysis']
                 )
             
             # 6. 엔트로피 분석 시각화
             if comprehensive_result.get('entropy_results'):
+                self._current_viz_type = 'entropy_analysis'
                 visualizations['entropy_analysis'] = self.visualize_entropy_analysis(
                     comprehensive_result['entropy_results'], 
                     cam_data=grayscale_cam  # 실제 CAM 데이터 전달
@@ -732,16 +823,19 @@ Method Descriptions:"""
             
             # 7. Centroid 분석 시각화
             if comprehensive_result.get('centroids'):
+                self._current_viz_type = 'centroid_analysis'
                 visualizations['centroid_analysis'] = self.visualize_centroid_analysis(
                     comprehensive_result['centroids'], cam_result
                 )
             
             # 8. Overlap 분석 시각화
             if comprehensive_result.get('overlap_results'):
+                self._current_viz_type = 'overlap_analysis'
                 visualizations['overlap_analysis'] = self.visualize_overlap_analysis(
                     comprehensive_result['overlap_results'], cam_result
                 )
                 # Overlap 통계 시각화도 추가
+                self._current_viz_type = 'overlap_statistics'
                 visualizations['overlap_statistics'] = self.visualize_overlap_statistics(
                     comprehensive_result['overlap_results']
                 )
@@ -823,7 +917,7 @@ Method Descriptions:"""
                 bbox=dict(boxstyle='round,pad=0.3', facecolor='lightblue', alpha=0.7))
         
         self._safe_tight_layout(fig)
-        return self.fig_to_base64(fig)
+        return self._figure_output(fig)
     
     def visualize_cam_threshold_analysis(self, cam_result: Dict, 
                                        percentiles: List[int] = [80, 85, 90, 95]) -> str:
@@ -894,7 +988,7 @@ Method Descriptions:"""
             axes[2, i].axis('off')
         
         self._safe_tight_layout(fig)
-        return self.fig_to_base64(fig)
+        return self._figure_output(fig)
     
 
     
@@ -1229,7 +1323,7 @@ Distribution:
                 ax.axis('off')
         
         self._safe_tight_layout(fig)
-        return self.fig_to_base64(fig)
+        return self._figure_output(fig)
     
 
     def visualize_overlap_statistics(self, overlap_results: Dict) -> str:
@@ -1404,7 +1498,7 @@ Assessment:
                 ax.axis('off')
         
         self._safe_tight_layout(fig)
-        return self.fig_to_base64(fig)
+        return self._figure_output(fig)
 
     def visualize_overlap_analysis(self, overlap_results: Dict, cam_result: Dict = None) -> str:
         """
@@ -1602,4 +1696,4 @@ Assessment:
                 ax.axis('off')
         
         self._safe_tight_layout(fig)
-        return self.fig_to_base64(fig)
\ No newline at end of file
+        return self._figure_output(fig)
\ No newline at end of file
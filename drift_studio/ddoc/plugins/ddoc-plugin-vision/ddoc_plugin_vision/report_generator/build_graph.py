@@ -0,0 +1,214 @@
+"""
+리포트 빌드 그래프 (입력 해시 기반 증분 재생성)
+
+이미지 분석 리포트를 독립적인 섹션 노드로 나누고, 각 노드가 읽는 분석
+캐시(attribute_analysis, embedding_analysis, ...)를 선언합니다. 노드의 키는
+입력 캐시 파일 내용 해시 + 데이터셋 이미지 목록 + 노드 버전으로 만들어지며,
+키가 바뀐 노드만 다시 렌더링합니다. 다시 렌더링할 노드가 여러 개이면
+프로세스 풀에서 병렬로 렌더링합니다 (pyplot 전역 상태 때문에 스레드 대신 프로세스).
+
+    <dataset>/cache/report_sections/<node>.json         {"key", "html", "files"}
+    <dataset>/cache/report_sections/<node>.files.json   차트를 파일로 링크하는 모드
+    <dataset>/cache/report_sections/charts/              그 모드의 차트 이미지
+"""
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from cache_utils.cache_manager import _current_image_files, analysis_cache_path
+
+GRAPH_VERSION = "1"  # 섹션 HTML 구조가 바뀌면 올려서 전체 재빌드
+
+
+@dataclass(frozen=True)
+class SectionNode:
+    """리포트 섹션 노드"""
+    name: str
+    inputs: Tuple[str, ...]   # 읽는 분석 캐시 data_type
+    render: str               # ImageAnalysisReport 메서드 이름 → (html, 참조 파일 목록)
+    env: Tuple[str, ...] = () # 출력에 영향을 주는 환경 변수
+    version: str = "1"
+
+
+# generate_html_body의 섹션 순서
+REPORT_SECTIONS: Tuple[SectionNode, ...] = (
+    SectionNode("attributes", ("attribute_analysis",), "render_attribute_sections",
+                env=("DDOC_REPORT_POINT_BUDGET",)),
+    SectionNode("embedding", ("embedding_analysis",), "render_embedding_section",
+                env=("DDOC_REPORT_POINT_BUDGET",)),
+    SectionNode("clustering", ("clustering_analysis", "embedding_analysis"), "render_clustering_section",
+                env=("DDOC_REPORT_POINT_BUDGET",)),
+    SectionNode("xai", ("xai_analysis",), "render_xai_section",
+                env=("DDOC_XAI_INLINE_FIGURES", "DDOC_XAI_FIGURE_FORMAT", "DDOC_XAI_FIGURE_URL")),
+)
+
+
+def report_workers(workers: Optional[int] = None) -> int:
+    """섹션 렌더링 프로세스 수 (인자 → DDOC_REPORT_WORKERS → min(4, CPU 수))"""
+    if workers is None:
+        workers = int(os.getenv('DDOC_REPORT_WORKERS', '0')) or min(4, mp.cpu_count())
+    return max(1, int(workers))
+
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+    except OSError:
+        return "missing"
+    return digest.hexdigest()
+
+
+def _render_node(directory: str, render: str, chart_root: Optional[str] = None,
+                 key: Optional[str] = None, link_dir: Optional[str] = None) -> Tuple[str, List[str]]:
+    """노드 렌더링 (워커 프로세스에서도 호출되는 전역 함수)"""
+    from report_generator.create_report import ImageAnalysisReport
+
+    report = ImageAnalysisReport(directory)
+    report.link_dir = link_dir
+    if chart_root is not None:
+        from data_utils.figure_store import FigureStore
+
+        # 차트를 base64 대신 노드 키 디렉토리의 이미지 파일로 저장 (리포트 기준 상대 링크)
+        report.chart_store = FigureStore(chart_root, fmt="png", base_url="", link_dir=link_dir)
+        report.chart_key = key
+    html, files = getattr(report, render)()
+    return html or '', [str(f) for f in files]
+
+
+class ReportBuildGraph:
+    """입력 캐시 해시로 섹션을 캐시하고 바뀐 섹션만 다시 렌더링"""
+
+    def __init__(self, directory, sections: Sequence[SectionNode] = REPORT_SECTIONS,
+                 workers: Optional[int] = None, chart_files: bool = False,
+                 link_dir: Optional[str] = None):
+        """
+        Args:
+            directory: 데이터셋 디렉토리
+            sections: 섹션 노드 (출력 순서)
+            workers: 렌더링 프로세스 수
+            chart_files: 차트를 이미지 파일로 저장하고 링크 (False → base64 인라인)
+            link_dir: 리포트 HTML이 놓일 디렉토리. 이미지 링크는 이 기준
+                상대 경로 (None → 데이터셋 디렉토리)
+        """
+        self.directory = str(directory)
+        self.sections = tuple(sections)
+        self.workers = report_workers(workers)
+        self.chart_files = chart_files
+        self.link_dir = os.path.abspath(link_dir if link_dir is not None else directory)
+        self.root = Path(directory) / 'cache' / 'report_sections'
+        self._input_hashes: Dict[str, str] = {}
+
+    def input_hash(self, data_type: str) -> str:
+        """분석 캐시 파일 내용 해시 (없으면 "missing")"""
+        if data_type not in self._input_hashes:
+            self._input_hashes[data_type] = _file_hash(analysis_cache_path(self.directory, data_type))
+        return self._input_hashes[data_type]
+
+    def node_key(self, node: SectionNode, image_files: str) -> str:
+        payload = {
+            "graph": GRAPH_VERSION,
+            "node": node.name,
+            "version": node.version,
+            "inputs": {data_type: self.input_hash(data_type) for data_type in node.inputs},
+            "env": {name: os.getenv(name) for name in node.env},
+            # 캐시 무결성 검증(이미지 목록 비교) 결과가 바뀌면 섹션도 바뀜
+            "images": image_files,
+            "charts": "files" if self.chart_files else "inline",
+            # 이미지 링크는 리포트 위치 기준 상대 경로
+            "links": self.link_dir,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _path(self, node: SectionNode) -> Path:
+        return self.root / (f"{node.name}.files.json" if self.chart_files else f"{node.name}.json")
+
+    def _load(self, node: SectionNode, key: str) -> Optional[str]:
+        try:
+            with open(self._path(node), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if entry.get('key') != key:
+            return None
+        # 링크된 파일(XAI 이미지 등)이 지워졌으면 다시 렌더링
+        if not all(os.path.exists(path) for path in entry.get('files', [])):
+            return None
+        return entry.get('html')
+
+    def _save(self, node: SectionNode, key: str, html: str, files: List[str]) -> None:
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.root, prefix=f".{node.name}.", suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'key': key, 'html': html, 'files': files}, f)
+            os.replace(tmp, self._path(node))
+        except OSError as e:
+            print(f"⚠️  Could not cache report section {node.name}: {e}")
+
+    def iter_build(self) -> Iterator[Tuple[str, str]]:
+        """
+        섹션 HTML을 섹션 순서대로 생성 (바뀐 섹션만 렌더링)
+
+        워커가 1개면 섹션을 하나씩 렌더링해서 바로 내보내므로, 스트리밍
+        출력에서는 한 번에 한 섹션만 메모리에 있습니다.
+
+        Yields:
+            (노드 이름, 섹션 HTML)
+        """
+        image_files = hashlib.sha256(
+            "\n".join(sorted(_current_image_files(self.directory))).encode('utf-8')
+        ).hexdigest()
+        keys = {node.name: self.node_key(node, image_files) for node in self.sections}
+        chart_root = str(self.root / 'charts') if self.chart_files else None
+
+        cached: Dict[str, str] = {}
+        stale: List[SectionNode] = []
+        for node in self.sections:
+            html = self._load(node, keys[node.name])
+            if html is None:
+                stale.append(node)
+            else:
+                cached[node.name] = html
+        print(f"🧩 Report sections: {len(cached)} reused, {len(stale)} to render"
+              + (f" ({', '.join(node.name for node in stale)})" if stale else ""))
+
+        num_workers = min(self.workers, len(stale))
+        pool = ProcessPoolExecutor(max_workers=num_workers) if num_workers > 1 else None
+        try:
+            futures = {
+                node.name: pool.submit(_render_node, self.directory, node.render, chart_root, keys[node.name],
+                                         self.link_dir)
+                for node in stale
+            } if pool is not None else {}
+            for node in self.sections:
+                if node.name in cached:
+                    yield node.name, cached.pop(node.name)
+                    continue
+                if pool is not None:
+                    html, files = futures[node.name].result()
+                else:
+                    html, files = _render_node(self.directory, node.render, chart_root, keys[node.name],
+                                               self.link_dir)
+                self._save(node, keys[node.name], html, files)
+                yield node.name, html
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+    def build(self) -> Dict[str, str]:
+        """
+        모든 섹션 HTML 생성 (바뀐 섹션만 렌더링)
+
+        Returns:
+            Dict[str, str]: 노드 이름 → 섹션 HTML (섹션 순서 유지)
+        """
+        return dict(self.iter_build())
@@ -4,6 +4,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime
+from functools import cached_property
 import base64
 from io import BytesIO
 import pandas as pd
@@ -20,6 +21,7 @@ project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 from cache_utils.cache_manager import get_cached_analysis_data
+from ddoc.core.report_stream import DEFAULT_POINT_BUDGET, StreamedHtmlWriter, reservoir_sample
 
 # 차트 설명 생성기 import
 try:
@@ -93,16 +95,39 @@ except ImportError:
 '''
 
 class ImageAnalysisReport:
-    def __init__(self, directory):
+    def __init__(self, directory, point_budget=None):
         self.directory = directory
-        # 데이터를 컨텐츠별로 분리하여 저장
-        self.attr_data = self.load_attribute_data()
-        self.embed_data = self.load_embedding_data()
-        self.xai_data = self.load_xai_data()
-        self.clustering_data = self.load_clustering_data()
-        
+        # 산점도/임베딩 플롯의 최대 점 수 (넘으면 샘플링 또는 hexbin)
+        self.point_budget = int(point_budget or os.getenv('DDOC_REPORT_POINT_BUDGET', DEFAULT_POINT_BUDGET))
+        # 차트 파일 저장소 (None이면 base64 인라인, build_graph가 설정)
+        self.chart_store = None
+        self.chart_key = None
+        # 이미지 링크 기준 디렉토리 (리포트 HTML 위치, None이면 데이터셋 디렉토리)
+        self.link_dir = None
+        self._chart_files = []
+    
+    # 데이터를 컨텐츠별로 분리하여 처음 접근할 때 로드
+    # (리포트 빌드 그래프의 각 섹션은 자신이 선언한 입력만 읽음)
+    @cached_property
+    def attr_data(self):
+        return self.load_attribute_data()
+    
+    @cached_property
+    def embed_data(self):
+        return self.load_embedding_data()
+    
+    @cached_property
+    def xai_data(self):
+        return self.load_xai_data()
+    
+    @cached_property
+    def clustering_data(self):
+        return self.load_clustering_data()
+    
+    @cached_property
+    def data(self):
         # 기존 호환성을 위한 병합 데이터 (필요시에만 사용)
-        self.data = self._merge_data_for_compatibility()
+        return self._merge_data_for_compatibility()
         
     def load_attribute_data(self):
         """속성 분석 데이터를 로드합니다."""
@@ -258,19 +283,19 @@ class ImageAnalysisReport:
         charts = {}
         
         # 1. 파일 크기 분포 히스토그램
-        sizes = [item['size'] for item in self.data.values()]
+        sizes = [item['size'] for item in self.attr_data.values()]
         plt.figure(figsize=(10, 6))
         plt.hist(sizes, bins=30, alpha=0.7, color='skyblue', edgecolor='black')
         plt.title('File Size Distribution', fontsize=14, fontweight='bold')
         plt.xlabel('File Size (MB)')
         plt.ylabel('Frequency')
         plt.grid(True, alpha=0.3)
-        charts['size_distribution'] = self.fig_to_base64()
+        charts['size_distribution'] = self._emit_chart('size_distribution')
         plt.close()
         
         # 2. 형식별 분포 파이 차트
         formats = {}
-        for item in self.data.values():
+        for item in self.attr_data.values():
             fmt = item['format']
             formats[fmt] = formats.get(fmt, 0) + 1
         
@@ -278,12 +303,12 @@ class ImageAnalysisReport:
             plt.figure(figsize=(8, 8))
             plt.pie(formats.values(), labels=formats.keys(), autopct='%1.1f%%', startangle=90)
             plt.title('Image Format Distribution', fontsize=14, fontweight='bold')
-            charts['format_distribution'] = self.fig_to_base64()
+            charts['format_distribution'] = self._emit_chart('format_distribution')
             plt.close()
         
         # 3. 해상도별 분포 (상위 10개)
         resolutions = {}
-        for item in self.data.values():
+        for item in self.attr_data.values():
             res = item['resolution']
             resolutions[res] = resolutions.get(res, 0) + 1
         
@@ -297,7 +322,7 @@ class ImageAnalysisReport:
             plt.ylabel('Count')
             plt.xticks(range(len(top_resolutions)), list(top_resolutions.keys()), rotation=45, ha='right')
             plt.grid(True, alpha=0.3)
-            charts['resolution_distribution'] = self.fig_to_base64()
+            charts['resolution_distribution'] = self._emit_chart('resolution_distribution')
             plt.close()
         
         return charts
@@ -307,16 +332,21 @@ class ImageAnalysisReport:
         charts = {}
         
         # 노이즈 vs 선명도 산점도
-        noise_levels = [item['noise_level'] for item in self.data.values()]
-        sharpness_values = [item['sharpness'] for item in self.data.values()]
+        noise_levels = [item['noise_level'] for item in self.attr_data.values()]
+        sharpness_values = [item['sharpness'] for item in self.attr_data.values()]
         
         plt.figure(figsize=(10, 6))
-        plt.scatter(noise_levels, sharpness_values, alpha=0.6, color='coral')
+        if len(noise_levels) > self.point_budget:
+            # 점이 너무 많으면 밀도(hexbin)로 집계
+            plt.hexbin(noise_levels, sharpness_values, gridsize=60, cmap='Oranges', mincnt=1)
+            plt.colorbar(label='Count')
+        else:
+            plt.scatter(noise_levels, sharpness_values, alpha=0.6, color='coral')
         plt.title('Noise Level vs Edgeness', fontsize=14, fontweight='bold')
         plt.xlabel('Noise Level')
         plt.ylabel('Edgeness')
         plt.grid(True, alpha=0.3)
-        charts['noise_vs_sharpness'] = self.fig_to_base64()
+        charts['noise_vs_sharpness'] = self._emit_chart('noise_vs_sharpness')
         plt.close()
         
         return charts
@@ -327,17 +357,25 @@ class ImageAnalysisReport:
         
         # 임베딩 공간 시각화 (PCA)
         if self.embed_data and len(self.embed_data) > 1:
-            embeddings = np.array([item['embedding'] for item in self.embed_data.values()])
+            # 점 예산을 넘으면 reservoir 샘플만 행렬로 만들어 PCA
+            total = len(self.embed_data)
+            items = self.embed_data.values()
+            if total > self.point_budget:
+                items = reservoir_sample(items, self.point_budget)
+            embeddings = np.array([item['embedding'] for item in items])
             pca = PCA(n_components=2)
             embeddings_2d = pca.fit_transform(embeddings)
             
             plt.figure(figsize=(10, 8))
             plt.scatter(embeddings_2d[:, 0], embeddings_2d[:, 1], alpha=0.6, color='purple')
-            plt.title('Image Embeddings (PCA 2D)', fontsize=14, fontweight='bold')
+            title = 'Image Embeddings (PCA 2D)'
+            if total > self.point_budget:
+                title += f' — sample {len(embeddings):,} / {total:,}'
+            plt.title(title, fontsize=14, fontweight='bold')
             plt.xlabel(f'PC1 ({pca.explained_variance_ratio_[0]:.2%} variance)')
             plt.ylabel(f'PC2 ({pca.explained_variance_ratio_[1]:.2%} variance)')
             plt.grid(True, alpha=0.3)
-            charts['embeddings_pca'] = self.fig_to_base64()
+            charts['embeddings_pca'] = self._emit_chart('embeddings_pca')
             plt.close()
         
         return charts
@@ -354,8 +392,12 @@ class ImageAnalysisReport:
             
             # 클러스터링 결과 시각화
             plt.figure(figsize=(12, 8))
-            scatter = plt.scatter(embeddings_2d[:, 0], embeddings_2d[:, 1], 
-                                c=cluster_labels, cmap='viridis', alpha=0.6)
+            # 점 예산을 넘으면 균등 샘플만 그림 (중심점은 전체 기준 그대로)
+            shown = np.arange(len(embeddings_2d))
+            if len(shown) > self.point_budget:
+                shown = np.sort(reservoir_sample(shown, self.point_budget))
+            scatter = plt.scatter(embeddings_2d[shown, 0], embeddings_2d[shown, 1], 
+                                c=cluster_labels[shown], cmap='viridis', alpha=0.6)
             
             # 클러스터 중심점 표시 (클러스터별 색상으로 구분)
             if 'centroids' in self.clustering_data and self.clustering_data['centroids']:
@@ -474,7 +516,7 @@ class ImageAnalysisReport:
             plt.colorbar(scatter, label='Cluster')
             plt.legend()
             plt.grid(True, alpha=0.3)
-            charts['clustering_results'] = self.fig_to_base64()
+            charts['clustering_results'] = self._emit_chart('clustering_results')
             plt.close()
             
             # 클러스터 크기 분포
@@ -499,7 +541,7 @@ class ImageAnalysisReport:
                 for i, v in enumerate(cluster_sizes):
                     plt.text(i, v + max(cluster_sizes) * 0.01, str(v), ha='center', va='bottom')
                 
-                charts['cluster_size_distribution'] = self.fig_to_base64()
+                charts['cluster_size_distribution'] = self._emit_chart('cluster_size_distribution')
                 plt.close()
         
         return charts
@@ -550,8 +592,14 @@ class ImageAnalysisReport:
             if project_root not in sys.path:
                 sys.path.insert(0, project_root)
             from data_utils.xai_visualizer import XAIVisualizer
+            from data_utils.figure_store import FigureStore
             
             visualizer = XAIVisualizer()
+            # 시각화는 CAM 해시 기반 파일로 저장하고 HTML에서는 링크
+            # (DDOC_XAI_INLINE_FIGURES=1이면 기존처럼 base64 인라인)
+            figure_store = None
+            if os.getenv('DDOC_XAI_INLINE_FIGURES', '0') != '1':
+                figure_store = FigureStore.for_dataset(self.directory, link_dir=self.link_dir or self.directory)
             
             # 클러스터별 대표 이미지 선택
             representative_images = self._select_representative_images()
@@ -581,7 +629,7 @@ class ImageAnalysisReport:
             
             # 배치 시각화 생성 (병렬 처리)
             print(f"🔄 Starting batch visualization for {len(xai_batch)} images...")
-            visualizations = visualizer.create_comprehensive_visualization_batch(xai_batch)
+            visualizations = visualizer.create_comprehensive_visualization_batch(xai_batch, figure_store=figure_store)
             
             print(f"🎨 Generated {len(visualizations)} XAI visualizations from {len(representative_images)} representative image")
             return visualizations
@@ -718,6 +766,14 @@ class ImageAnalysisReport:
             }
         }
     
+    def _emit_chart(self, name):
+        """현재 figure 출력: 차트 저장소가 있으면 파일(FigureRef), 아니면 base64"""
+        if self.chart_store is None:
+            return self.fig_to_base64()
+        ref = self.chart_store.save_figure(plt.gcf(), self.chart_key, name)
+        self._chart_files.append(os.path.abspath(ref.path))
+        return ref
+    
     def fig_to_base64(self):
         """matplotlib figure를 base64 인코딩된 이미지로 변환합니다."""
         buf = BytesIO()
@@ -750,117 +806,127 @@ class ImageAnalysisReport:
         
         return sample_data
     
-    def generate_html_body(self):
-        """report_layout.py에 맞는 HTML 본문만 생성합니다."""
-        if not self.attr_data and not self.embed_data and not self.xai_data:
-            print("❌ No analysis data found. Please run analysis first.")
-            return None
-        
-        # 데이터 준비
+    def render_attribute_sections(self):
+        """속성 분석 섹션들 (요약, 샘플, 형식, 해상도, 품질) HTML"""
+        from report_generator.report_layout import (
+            generate_summary_statistics_section,
+            generate_format_distribution_section,
+            generate_sample_images_section,
+            generate_detailed_statistics_section,
+            generate_resolution_info_section,
+        )
         summary = self.create_summary_stats()
         samples = self.create_sample_images_table()
-        
-        # 각 섹션별 차트 생성
         basic_charts = self.create_basic_attribute_charts()
         quality_charts = self.create_quality_attribute_charts()
+        print(f"  - Attribute section: summary {'✅' if summary else '❌'}, "
+              f"{len(basic_charts) + len(quality_charts)} charts, {len(samples)} samples")
+        
+        html_parts = []
+        # ===== 1. 기본 속성 분석 =====
+        # 1-1. 요약 통계 섹션 (파일 크기 차트 포함)
+        html_parts.append(generate_summary_statistics_section(summary, basic_charts.get('size_distribution')))
+        
+        # 1-2. 샘플 이미지 테이블 섹션 (파일 크기 차트 바로 아래)
+        html_parts.append(generate_sample_images_section(samples))
+        
+        # 1-3. 형식별 분포 섹션 (형식별 분포 차트 포함)
+        html_parts.append(generate_format_distribution_section(summary, basic_charts.get('format_distribution')))
+        
+        # 1-4. 해상도 정보 섹션 (해상도 분포 차트 포함)
+        html_parts.append(generate_resolution_info_section(summary, basic_charts.get('resolution_distribution')))
+        
+        # ===== 2. 이미지 품질 속성 =====
+        # 2-1. 상세 통계 섹션 (품질 속성 차트 포함)
+        html_parts.append(generate_detailed_statistics_section(summary, quality_charts.get('noise_vs_sharpness')))
+        return ''.join(html_parts), self._chart_files
+    
+    def render_embedding_section(self):
+        """임베딩 정보 섹션 HTML"""
+        from report_generator.report_layout import generate_embedding_info_section
         embedding_charts = self.create_embedding_charts()
+        print(f"  - Embedding section: {len(embedding_charts)} charts")
+        # ===== 3. 임베딩 분석 =====
+        return generate_embedding_info_section(self.embed_data, embedding_charts.get('embeddings_pca')), self._chart_files
+    
+    def render_clustering_section(self):
+        """클러스터링 요약 섹션 HTML"""
+        from report_generator.report_layout import generate_clustering_summary_section
         clustering_charts = self.create_clustering_charts()
-        
+        clustering_summary = self.create_clustering_summary()
+        print(f"  - Clustering section: {len(clustering_charts)} charts")
+        # ===== 4. 클러스터링 분석 =====
+        return generate_clustering_summary_section(clustering_summary, clustering_charts), self._chart_files
+    
+    def render_xai_section(self):
+        """XAI 분석 섹션 HTML과 링크된 이미지 파일 목록"""
+        from report_generator.report_layout import generate_xai_analysis_section
         # XAI 시각화 및 요약 통계 생성 (대표 이미지 선택은 한 번만)
         xai_charts = self.create_xai_visualizations()
         xai_summary = self.create_xai_summary_stats()
         
-        print(f"📊 Report data summary:")
-        print(f"  - Summary stats: {'✅' if summary else '❌'}")
-        print(f"  - Basic charts: {len(basic_charts)} charts")
-        print(f"  - Quality charts: {len(quality_charts)} charts")
-        print(f"  - Embedding charts: {len(embedding_charts)} charts")
-        print(f"  - Clustering charts: {len(clustering_charts)} charts")
-        print(f"  - Samples: {len(samples)} sample images")
-        print(f"  - XAI charts: {len(xai_charts)} XAI visualizations")
-        print(f"  - XAI summary: {'✅' if xai_summary else '❌'}")
-        
-        # report_layout 모듈의 함수들을 사용하여 HTML 생성
-        try:
-            from report_generator.report_layout import (
-                generate_summary_statistics_section,
-                generate_format_distribution_section,
-                generate_visualizations_section,
-                generate_sample_images_section,
-                generate_detailed_statistics_section,
-                generate_embedding_info_section,
-                generate_resolution_info_section,
-                generate_clustering_summary_section,
-                generate_xai_analysis_section
-            )
-            
-            # HTML 파트들을 동적으로 생성
-            html_parts = []
-            
-            # ===== 속성 및 임베딩 분석 섹션 시작 =====
-            html_parts.append("""
+        if not (xai_summary or xai_charts):
+            print("ℹ️  No XAI data available, skipping XAI section")
+            return '', []
+        print(f"🎨 Adding XAI section with {len(xai_charts)} visualizations and summary stats")
+        
+        files = [os.path.abspath(viz.path) for viz in xai_charts.values() if hasattr(viz, 'path')]
+        html = f"""
+            <div style="margin-bottom: 40px; padding: 25px; background: #fff3cd; border-radius: 12px; border: 2px solid #ffc107;">
+                <h2 style="color: #495057; margin-bottom: 20px; padding-bottom: 12px; border-bottom: 3px solid #ffc107; font-size: 1.6em;">
+                    🧠 XAI (Explainable AI) Analysis Results
+                </h2>
+            {generate_xai_analysis_section(xai_summary, xai_charts)}
+            </div>
+            """
+        return html, files
+    
+    def _iter_body_parts(self, graph):
+        """빌드 그래프 섹션을 리포트 본문 순서대로 HTML 조각으로 생성"""
+        sections = graph.iter_build()
+        
+        # ===== 속성 및 임베딩 분석 섹션 시작 =====
+        yield """
             <div style="margin-bottom: 40px; padding: 25px; background: #f8f9fa; border-radius: 12px; border: 2px solid #e9ecef;">
                 <h2 style="color: #495057; margin-bottom: 20px; padding-bottom: 12px; border-bottom: 3px solid #007bff; font-size: 1.6em;">
                     🖼️ Image Analysis Results (속성 및 임베딩 분석)
                 </h2>
-            """)
-            
-            # ===== 1. 기본 속성 분석 =====
-            # 1-1. 요약 통계 섹션 (파일 크기 차트 포함)
-            html_parts.append(generate_summary_statistics_section(summary, basic_charts.get('size_distribution')))
-            
-            # 1-2. 샘플 이미지 테이블 섹션 (파일 크기 차트 바로 아래)
-            html_parts.append(generate_sample_images_section(samples))
-            
-            # 1-3. 형식별 분포 섹션 (형식별 분포 차트 포함)
-            html_parts.append(generate_format_distribution_section(summary, basic_charts.get('format_distribution')))
-            
-            # 1-4. 해상도 정보 섹션 (해상도 분포 차트 포함)
-            html_parts.append(generate_resolution_info_section(summary, basic_charts.get('resolution_distribution')))
-            
-            # ===== 2. 이미지 품질 속성 =====
-            # 2-1. 상세 통계 섹션 (품질 속성 차트 포함)
-            html_parts.append(generate_detailed_statistics_section(summary, quality_charts.get('noise_vs_sharpness')))
-            
-            # ===== 3. 임베딩 분석 =====
-            # 3-1. 임베딩 정보 섹션 (임베딩 차트 포함)
-            html_parts.append(generate_embedding_info_section(self.embed_data, embedding_charts.get('embeddings_pca')))
-            
-            # ===== 4. 클러스터링 분석 =====
-            # 4-1. 클러스터링 요약 섹션 (클러스터링 차트 포함)
-            clustering_summary = self.create_clustering_summary()
-            html_parts.append(generate_clustering_summary_section(clustering_summary, clustering_charts))
-            
-            # ===== 속성 및 임베딩 분석 섹션 종료 =====
-            html_parts.append("""
+            """
+        # attributes → embedding → clustering → xai (REPORT_SECTIONS 순서)
+        closed = False
+        for name, html in sections:
+            if name == 'xai':
+                # ===== 속성 및 임베딩 분석 섹션 종료 =====
+                yield """
             </div>
-            """)
-            
-            # ===== XAI 분석 섹션 시작 =====
-            # 9. XAI 분석 결과 섹션 (report_layout 모듈 사용)
-            if xai_summary or xai_charts:
-                print(f"🎨 Adding XAI section with {len(xai_charts)} visualizations and summary stats")
-            else:
-                print("ℹ️  No XAI data available, skipping XAI section")
-                
-            if xai_summary or xai_charts:
-                html_parts.append("""
-            <div style="margin-bottom: 40px; padding: 25px; background: #fff3cd; border-radius: 12px; border: 2px solid #ffc107;">
-                <h2 style="color: #495057; margin-bottom: 20px; padding-bottom: 12px; border-bottom: 3px solid #ffc107; font-size: 1.6em;">
-                    🧠 XAI (Explainable AI) Analysis Results
-                </h2>
-            """)
-                    
-                # XAI 분석 결과 섹션 (report_layout 모듈 사용)
-                html_parts.append(generate_xai_analysis_section(xai_summary, xai_charts))
-                    
-                html_parts.append("""
+            """
+                closed = True
+            # ===== XAI 분석 섹션 =====
+            yield html
+        if not closed:
+            yield """
             </div>
-            """)
-                
-            # ===== XAI 분석 섹션 종료 =====
+            """
+    
+    def generate_html_body(self, workers=None):
+        """
+        report_layout.py에 맞는 HTML 본문만 생성합니다.
+        
+        섹션은 리포트 빌드 그래프(build_graph.py)로 생성되어, 입력 분석 캐시가
+        바뀐 섹션만 다시 렌더링되고 나머지는 저장된 HTML을 재사용합니다.
+        
+        Args:
+            workers: 섹션 렌더링 프로세스 수 (None → DDOC_REPORT_WORKERS 또는 min(4, CPU 수))
+        """
+        if not self.attr_data and not self.embed_data and not self.xai_data:
+            print("❌ No analysis data found. Please run analysis first.")
+            return None
+        
+        try:
+            from report_generator.build_graph import ReportBuildGraph
             
-            return ''.join(html_parts)
+            graph = ReportBuildGraph(self.directory, workers=workers)
+            return ''.join(self._iter_body_parts(graph))
                 
         except ImportError as e:
             print(f"❌ Error importing report_layout functions: {e}")
@@ -868,6 +934,43 @@ class ImageAnalysisReport:
         except Exception as e:
             print(f"❌ Error generating HTML: {e}")
             return None
+    
+    def write_html_report(self, output_path, workers=None):
+        """
+        리포트를 파일로 스트리밍 출력합니다.
+        
+        문서 앞부분, 섹션, 뒷부분을 차례로 파일에 쓰므로 전체 HTML 문자열을
+        메모리에 만들지 않습니다. 차트는 base64 대신 PNG 파일
+        (``cache/report_sections/charts``)로 저장되어 ``loading="lazy"``로 링크됩니다.
+        링크는 출력 HTML 위치 기준 상대 경로이므로 리포트를 데이터셋과 함께
+        옮기거나 HTTP로 서빙해도 유지됩니다.
+        
+        Args:
+            output_path: 출력 HTML 경로
+            workers: 섹션 렌더링 프로세스 수
+        
+        Returns:
+            Dict: 출력 경로, 파일 크기 등 (분석 데이터가 없으면 None)
+        """
+        if not self.attr_data and not self.embed_data and not self.xai_data:
+            print("❌ No analysis data found. Please run analysis first.")
+            return None
+        
+        from report_generator.build_graph import ReportBuildGraph
+        from report_generator.report_layout import generate_document_shell
+        
+        dataset_name = os.path.basename(os.path.normpath(self.directory))
+        head, tail = generate_document_shell(dataset_name, datetime.now().strftime('%Y년 %m월 %d일 %H시 %M분'))
+        graph = ReportBuildGraph(self.directory, workers=workers, chart_files=True,
+                                 link_dir=os.path.dirname(os.path.abspath(output_path)))
+        with StreamedHtmlWriter(output_path) as writer:
+            writer.write(head)
+            for part in self._iter_body_parts(graph):
+                writer.write(part)
+            writer.write(tail)
+        summary = writer.summary()
+        print(f"📝 Report written: {summary['output_path']} ({summary['size_bytes'] / 1024:.1f} KB)")
+        return summary
 
 def create_report_body(directory):
     """report_layout.py에 맞는 HTML 본문만 생성합니다."""
@@ -897,7 +1000,7 @@ def create_xai_guideline_report(output_dir="."):
 if __name__ == "__main__":
     import sys
     if len(sys.argv) < 2:
-        print("Usage: python create_report.py <directory> [--guideline]")
+        print("Usage: python create_report.py <directory> [--guideline] [--out <report.html>]")
         sys.exit(1)
     
     directory = sys.argv[1]
@@ -905,6 +1008,13 @@ if __name__ == "__main__":
     # 가이드라인 생성 옵션 확인
     generate_guideline = "--guideline" in sys.argv
     
+    # 파일 스트리밍 출력 옵션
+    if "--out" in sys.argv:
+        ImageAnalysisReport(directory).write_html_report(sys.argv[sys.argv.index("--out") + 1])
+        if generate_guideline:
+            create_xai_guideline_report()
+        sys.exit(0)
+    
     # 메인 보고서 생성
     body_content = create_report_body(directory)
     print("Generated HTML body content:")
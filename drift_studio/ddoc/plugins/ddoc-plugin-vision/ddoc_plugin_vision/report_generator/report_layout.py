@@ -136,6 +136,91 @@ def get_cached_html(cache_key, generator_func, *args, dataset_directory=None):
     """기존 호환성을 위한 함수 (내부적으로 새로운 캐시 매니저 사용)"""
     return get_cached_html_content(cache_key, generator_func, *args, dataset_directory=dataset_directory)
 
+def generate_document_shell(dataset_name, timestamp):
+    """
+    통합 리포트 문서의 앞부분(head ~ header)과 뒷부분(footer ~ </html>)
+    
+    섹션 HTML을 그 사이에 넣거나, 스트리밍 출력에서는 앞부분 → 섹션 → 뒷부분
+    순서로 파일에 바로 씁니다.
+    """
+    head = f"""<!DOCTYPE html>
+                        <html lang="ko">
+                        <head>
+                            <meta charset="utf-8">
+                            <title>{dataset_name} - 통합 분석 리포트</title>
+                            <style>
+                                * {{ margin: 0; padding: 0; box-sizing: border-box; }}
+                                body {{ 
+                                    font-family: 'Malgun Gothic', sans-serif; 
+                                    line-height: 1.6; color: #2c3e50; 
+                                    background: #f8f9fa; padding: 30px;
+                                }}
+                                .container {{ 
+                                    max-width: 1200px; margin: 0 auto; 
+                                    background: white; padding: 30px; 
+                                    border-radius: 10px; box-shadow: 0 5px 15px rgba(0,0,0,0.1);
+                                }}
+                                .header {{ 
+                                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                                    color: white; padding: 25px; border-radius: 8px; 
+                                    margin-bottom: 25px; text-align: center;
+                                }}
+                                .title {{ font-size: 2em; margin-bottom: 5px; }}
+                                .subtitle {{ font-size: 1.1em; opacity: 0.9; }}
+                                .section {{ 
+                                    margin: 30px 0; padding: 25px; 
+                                    border: 2px solid #e9ecef; border-radius: 12px;
+                                    background: white; box-shadow: 0 4px 12px rgba(0,0,0,0.1);
+                                }}
+                                .section-title {{ 
+                                    font-size: 1.5em; color: #495057; 
+                                    margin-bottom: 20px; padding-bottom: 12px;
+                                    border-bottom: 3px solid #007bff; font-weight: bold;
+                                }}
+                                table {{ 
+                                    width: 100%; border-collapse: collapse; margin: 15px 0;
+                                    border-radius: 5px; overflow: hidden;
+                                }}
+                                th {{ 
+                                    background: #6c757d; color: white; 
+                                    padding: 10px; text-align: left;
+                                }}
+                                td {{ padding: 8px; border-bottom: 1px solid #dee2e6; }}
+                                img {{ max-width: 100%; height: auto; margin: 10px 0; }}
+                                pre {{ 
+                                    background: #f8f9fa; padding: 15px; 
+                                    border-radius: 5px; overflow-x: auto;
+                                }}
+                                .footer {{ 
+                                    text-align: center; margin-top: 30px; 
+                                    padding: 15px; background: #f8f9fa; 
+                                    border-radius: 5px; color: #6c757d;
+                                }}
+                            </style>
+                            {generate_chart_description_css()}
+                        </head>
+                        <body>
+                            <div class="container">
+                                <div class="header">
+                                    <div class="title">{dataset_name} 통합 분석 리포트</div>
+                                    <div class="subtitle">데이터 드리프트 분석 보고서</div>
+                                    <div style="margin-top: 10px; font-size: 0.9em;">생성일시: {timestamp}</div>
+                                </div>
+                                
+                                """
+    tail = f"""
+                                
+                                <div class="footer">
+                                    <strong>
+                                        <a href="https://github.com/keti-datadrift/datadrift_dataclinic" target="_blank" style="color: #3498db; text-decoration: none;">DataDrift Dataclinic System</a>
+                                    </strong><br>
+                                    @2025 KETI, Korea Electronics Technology Institute<br>
+                                </div>
+                            </div>
+                        </body>
+                        </html>"""
+    return head, tail
+
 # main HTML 생성 함수
 def generate_combined_html(dataset_name=None, database_export_report=None, drift_export_report=None, dataset_directory=None):
     """최적화된 HTML 생성 (파일 기반 캐시 활용)"""
@@ -213,81 +298,8 @@ def generate_combined_html(dataset_name=None, database_export_report=None, drift
     # 모든 섹션을 하나로 결합
     all_sections = '\n'.join(sections)
     
-    combined_html = f"""<!DOCTYPE html>
-                        <html lang="ko">
-                        <head>
-                            <meta charset="utf-8">
-                            <title>{dataset_name} - 통합 분석 리포트</title>
-                            <style>
-                                * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-                                body {{ 
-                                    font-family: 'Malgun Gothic', sans-serif; 
-                                    line-height: 1.6; color: #2c3e50; 
-                                    background: #f8f9fa; padding: 30px;
-                                }}
-                                .container {{ 
-                                    max-width: 1200px; margin: 0 auto; 
-                                    background: white; padding: 30px; 
-                                    border-radius: 10px; box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-                                }}
-                                .header {{ 
-                                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                                    color: white; padding: 25px; border-radius: 8px; 
-                                    margin-bottom: 25px; text-align: center;
-                                }}
-                                .title {{ font-size: 2em; margin-bottom: 5px; }}
-                                .subtitle {{ font-size: 1.1em; opacity: 0.9; }}
-                                .section {{ 
-                                    margin: 30px 0; padding: 25px; 
-                                    border: 2px solid #e9ecef; border-radius: 12px;
-                                    background: white; box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-                                }}
-                                .section-title {{ 
-                                    font-size: 1.5em; color: #495057; 
-                                    margin-bottom: 20px; padding-bottom: 12px;
-                                    border-bottom: 3px solid #007bff; font-weight: bold;
-                                }}
-                                table {{ 
-                                    width: 100%; border-collapse: collapse; margin: 15px 0;
-                                    border-radius: 5px; overflow: hidden;
-                                }}
-                                th {{ 
-                                    background: #6c757d; color: white; 
-                                    padding: 10px; text-align: left;
-                                }}
-                                td {{ padding: 8px; border-bottom: 1px solid #dee2e6; }}
-                                img {{ max-width: 100%; height: auto; margin: 10px 0; }}
-                                pre {{ 
-                                    background: #f8f9fa; padding: 15px; 
-                                    border-radius: 5px; overflow-x: auto;
-                                }}
-                                .footer {{ 
-                                    text-align: center; margin-top: 30px; 
-                                    padding: 15px; background: #f8f9fa; 
-                                    border-radius: 5px; color: #6c757d;
-                                }}
-                            </style>
-                            {generate_chart_description_css()}
-                        </head>
-                        <body>
-                            <div class="container">
-                                <div class="header">
-                                    <div class="title">{dataset_name} 통합 분석 리포트</div>
-                                    <div class="subtitle">데이터 드리프트 분석 보고서</div>
-                                    <div style="margin-top: 10px; font-size: 0.9em;">생성일시: {timestamp}</div>
-                                </div>
-                                
-                                {all_sections}
-                                
-                                <div class="footer">
-                                    <strong>
-                                        <a href="https://github.com/keti-datadrift/datadrift_dataclinic" target="_blank" style="color: #3498db; text-decoration: none;">DataDrift Dataclinic System</a>
-                                    </strong><br>
-                                    @2025 KETI, Korea Electronics Technology Institute<br>
-                                </div>
-                            </div>
-                        </body>
-                        </html>"""
+    head, tail = generate_document_shell(dataset_name, timestamp)
+    combined_html = f"{head}{all_sections}{tail}"
     return combined_html
 
 # 캐시 관리 유틸리티 함수들
@@ -425,7 +437,7 @@ def generate_summary_statistics_section(summary_data, size_chart=None):
     if size_chart:
         chart_html = f"""
         <div style="text-align: center; margin: 20px 0;">
-            <img src="data:image/png;base64,{size_chart}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
+            <img loading="lazy" src="{chart_src(size_chart)}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
         </div>
         """
     
@@ -483,7 +495,7 @@ def generate_format_distribution_section(summary_data, format_chart=None):
     if format_chart:
         chart_html = f"""
         <div style="text-align: center; margin: 20px 0;">
-            <img src="data:image/png;base64,{format_chart}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
+            <img loading="lazy" src="{chart_src(format_chart)}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
         </div>
         """
     
@@ -515,7 +527,7 @@ def generate_visualizations_section(charts_data):
     if 'size_distribution' in charts_data:
         chart_items.append(f"""
         <div style="text-align: center; margin: 20px 0;">
-            <img src="data:image/png;base64,{charts_data['size_distribution']}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
+            <img loading="lazy" src="{chart_src(charts_data['size_distribution'])}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
         </div>
         """)
     
@@ -523,7 +535,7 @@ def generate_visualizations_section(charts_data):
     if 'format_distribution' in charts_data:
         chart_items.append(f"""
         <div style="text-align: center; margin: 20px 0;">
-            <img src="data:image/png;base64,{charts_data['format_distribution']}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
+            <img loading="lazy" src="{chart_src(charts_data['format_distribution'])}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
         </div>
         """)
     
@@ -531,7 +543,7 @@ def generate_visualizations_section(charts_data):
     if 'noise_vs_sharpness' in charts_data:
         chart_items.append(f"""
         <div style="text-align: center; margin: 20px 0;">
-            <img src="data:image/png;base64,{charts_data['noise_vs_sharpness']}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
+            <img loading="lazy" src="{chart_src(charts_data['noise_vs_sharpness'])}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
         </div>
         """)
     
@@ -539,7 +551,7 @@ def generate_visualizations_section(charts_data):
     if 'resolution_distribution' in charts_data:
         chart_items.append(f"""
         <div style="text-align: center; margin: 20px 0;">
-            <img src="data:image/png;base64,{charts_data['resolution_distribution']}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
+            <img loading="lazy" src="{chart_src(charts_data['resolution_distribution'])}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
         </div>
         """)
     
@@ -547,7 +559,7 @@ def generate_visualizations_section(charts_data):
     if 'embeddings_pca' in charts_data:
         chart_items.append(f"""
         <div style="text-align: center; margin: 20px 0;">
-            <img src="data:image/png;base64,{charts_data['embeddings_pca']}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
+            <img loading="lazy" src="{chart_src(charts_data['embeddings_pca'])}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
         </div>
         """)
     
@@ -555,7 +567,7 @@ def generate_visualizations_section(charts_data):
     if 'clustering_results' in charts_data:
         chart_items.append(f"""
         <div style="text-align: center; margin: 20px 0;">
-            <img src="data:image/png;base64,{charts_data['clustering_results']}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
+            <img loading="lazy" src="{chart_src(charts_data['clustering_results'])}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
         </div>
         """)
     
@@ -563,7 +575,7 @@ def generate_visualizations_section(charts_data):
     if 'cluster_size_distribution' in charts_data:
         chart_items.append(f"""
         <div style="text-align: center; margin: 20px 0;">
-            <img src="data:image/png;base64,{charts_data['cluster_size_distribution']}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
+            <img loading="lazy" src="{chart_src(charts_data['cluster_size_distribution'])}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
         </div>
         """)
     
@@ -662,7 +674,7 @@ def generate_detailed_statistics_section(summary_data, quality_chart=None):
     if quality_chart:
         chart_html = f"""
         <div style="text-align: center; margin: 20px 0;">
-            <img src="data:image/png;base64,{quality_chart}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
+            <img loading="lazy" src="{chart_src(quality_chart)}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
         </div>
         """
     
@@ -696,7 +708,7 @@ def generate_embedding_info_section(embed_data, embedding_chart=None):
     if embedding_chart:
         chart_html = f"""
         <div style="text-align:center; margin: 20px 0;">
-            <img src="data:image/png;base64,{embedding_chart}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
+            <img loading="lazy" src="{chart_src(embedding_chart)}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
         </div>
         """
     
@@ -746,7 +758,7 @@ def generate_resolution_info_section(summary_data, resolution_chart=None):
     if resolution_chart:
         chart_html = f"""
         <div style="text-align: center; margin: 20px 0;">
-            <img src="data:image/png;base64,{resolution_chart}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
+            <img loading="lazy" src="{chart_src(resolution_chart)}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
         </div>
         """
     
@@ -802,7 +814,7 @@ def generate_clustering_summary_section(clustering_summary, clustering_charts=No
                 chart_description = chart_description_generator.generate_description_html('clustering_results')
             charts_html += f"""
             <div style="text-align: center; margin: 20px 0;">
-                <img src="data:image/png;base64,{clustering_charts['clustering_results']}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
+                <img loading="lazy" src="{chart_src(clustering_charts['clustering_results'])}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
             </div>
             {chart_description}
             """
@@ -812,7 +824,7 @@ def generate_clustering_summary_section(clustering_summary, clustering_charts=No
                 chart_description = chart_description_generator.generate_description_html('cluster_size_distribution')
             charts_html += f"""
             <div style="text-align: center; margin: 20px 0;">
-                <img src="data:image/png;base64,{clustering_charts['cluster_size_distribution']}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
+                <img loading="lazy" src="{chart_src(clustering_charts['cluster_size_distribution'])}" style="max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
             </div>
             {chart_description}
             """
@@ -856,6 +868,19 @@ def generate_clustering_summary_section(clustering_summary, clustering_charts=No
     return summary_html + charts_html
 
 
+def chart_src(chart):
+    """차트 <img> src (저장된 파일 참조면 링크, 아니면 base64 PNG data URI)"""
+    return getattr(chart, 'src', None) or f'data:image/png;base64,{chart}'
+
+
+def xai_figure_img(viz_data):
+    """XAI 시각화 <img> 태그 (저장된 파일이면 지연 로딩 링크, 아니면 base64 인라인)"""
+    style = "max-width: 100%; height: auto; border-radius: 6px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);"
+    if getattr(viz_data, 'src', None):
+        return f'<img src="{viz_data.src}" loading="lazy" decoding="async" style="{style}">'
+    return f'<img loading="lazy" src="{chart_src(viz_data)}" style="{style}">'
+
+
 def generate_xai_visualizations_container(xai_charts, title="🔬 Representative Sample Report", include_descriptions=True):
     """XAI 시각화 컨테이너 HTML 생성 (공통 함수)"""
     if not xai_charts:
@@ -957,8 +982,7 @@ def generate_xai_visualizations_container(xai_charts, title="🔬 Representative
         <div style="background: #f8f9fa; padding: 15px; border-radius: 8px; border: 1px solid #dee2e6;">
             <h5 style="color: #495057; margin-bottom: 10px; font-size: 1.1em;">{title}</h5>
             <div style="text-align: center;">
-                <img src="data:image/png;base64,{viz_data}" 
-                     style="max-width: 100%; height: auto; border-radius: 6px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
+                {xai_figure_img(viz_data)}
             </div>
             {chart_description}
         </div>
@@ -992,8 +1016,7 @@ def generate_xai_visualizations_container(xai_charts, title="🔬 Representative
         <div style="background: #f8f9fa; padding: 15px; border-radius: 8px; border: 1px solid #dee2e6;">
             <h5 style="color: #495057; margin-bottom: 10px; font-size: 1.1em;">{title}</h5>
             <div style="text-align: center;">
-                <img src="data:image/png;base64,{viz_data}" 
-                     style="max-width: 100%; height: auto; border-radius: 6px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
+                {xai_figure_img(viz_data)}
             </div>
             {chart_description}
         </div>
@@ -448,6 +448,15 @@ class DDOCVisionPlugin:
                 plot_csv_dir, plot_images_dir, inner_clustering_results, embeddings_data
             )
         
+        # Reference profile (attribute sketches + embedding projections)
+        # so drift checks against this snapshot can skip the baseline pass
+        if attr_cache:
+            from ddoc.core.reference_profile import build_profile
+
+            profile = build_profile('image', attributes=attr_cache, embeddings=emb_cache or None)
+            cache_service.save_reference_profile(snapshot_id, data_hash, profile)
+            print(f"💾 Saved reference profile: {len(profile.features)} attributes")
+
         # Save metrics
         metrics_file = output_path / "metrics.json"
         with open(metrics_file, 'w') as f:
@@ -525,6 +534,8 @@ class DDOCVisionPlugin:
         threshold_warning = cfg.get('threshold_warning', 0.15)
         threshold_critical = cfg.get('threshold_critical', 0.25)
         
+        _strategy = (detector or "default").lower()
+
         # Load caches from CacheService (use namespaced cache types)
         baseline_attr = cfg.get('baseline_cache') or cache_service.load_analysis_cache(
             snapshot_id=snapshot_id_ref,
@@ -562,6 +573,25 @@ class DDOCVisionPlugin:
         if not current_emb:
             current_emb = get_cached_analysis_data(cur_dataset_path, "embedding_analysis")
 
+        # Reference profile saved at EDA time. Its sketches only stand in for
+        # raw baseline caches that are gone (e.g. pruned): profile PSI is
+        # binned differently and MMD needs raw samples, so scores from the
+        # two sources are not interchangeable. Permutation tests and the
+        # single-metric MMD detector always need raw baseline samples.
+        baseline_profile = cache_service.load_reference_profile(
+            'image', snapshot_id=snapshot_id_ref, data_hash=data_hash_ref
+        )
+        profile_usable = baseline_profile is not None and not cfg.get('significance')
+        profile_attr = profile_usable and not baseline_attr and bool(baseline_profile.features)
+        profile_emb = (
+            profile_usable and not baseline_emb and baseline_profile.embedding is not None
+            and _strategy != "mmd"
+        )
+        if profile_attr or profile_emb:
+            print(f"📦 Baseline reference profile: {baseline_profile.count} files ("
+                  + ", ".join(name for name, used in (("attributes", profile_attr), ("embeddings", profile_emb)) if used)
+                  + ")")
+
         # Round-7 path-mode fallback — when no cache (new ddoc cache,
         # legacy cache, or at all) is available but the orchestrator
         # passed concrete data paths, compute attributes inline. Drift
@@ -570,7 +600,7 @@ class DDOCVisionPlugin:
         # --data-path-cur Y`` work without project / snapshot context.
         # Embeddings stay None — drift's overall_score then weights
         # them as 0 and returns attribute-only drift.
-        if not baseline_attr and data_path_ref:
+        if not baseline_attr and not profile_attr and data_path_ref:
             baseline_attr = self._compute_attributes_from_path(data_path_ref)
         if not current_attr and data_path_cur:
             current_attr = self._compute_attributes_from_path(data_path_cur)
@@ -582,13 +612,13 @@ class DDOCVisionPlugin:
         # attribute-only drift (path-mode default) so the embedding-
         # heavy CLIP load (~5 s, ~600 MB RAM) stays explicit.
         _with_embeddings = bool(cfg.get('with_embeddings', False))
-        if _with_embeddings and not baseline_emb and data_path_ref:
+        if _with_embeddings and not baseline_emb and not profile_emb and data_path_ref:
             baseline_emb = self._compute_embeddings_from_path(data_path_ref)
         if _with_embeddings and not current_emb and data_path_cur:
             current_emb = self._compute_embeddings_from_path(data_path_cur)
 
         # If no baseline, set current as baseline (only for same snapshot comparison)
-        if not baseline_attr and current_attr and snapshot_id_ref == snapshot_id_cur:
+        if not baseline_attr and not profile_attr and current_attr and snapshot_id_ref == snapshot_id_cur:
             print("⚠️ No baseline found. Setting current as baseline.")
             # Save to cache service (use namespaced cache types)
             cache_service.save_analysis_cache(
@@ -633,7 +663,7 @@ class DDOCVisionPlugin:
             }
         
         # Drift analysis
-        if not baseline_attr or not current_attr:
+        if not (baseline_attr or profile_attr) or not current_attr:
             print("❌ Missing baseline or current data")
             return None  # no image data — silently defer to other plugins
 
@@ -646,7 +676,6 @@ class DDOCVisionPlugin:
             "default", "ensemble", "mmd", "mean_shift",
             "wasserstein", "psi", "cosine",
         }
-        _strategy = (detector or "default").lower()
         if _strategy not in _SUPPORTED_DETECTORS:
             return {
                 "status": "error",
@@ -658,24 +687,58 @@ class DDOCVisionPlugin:
                 ),
             }
 
-        # File changes
-        ref_files = set(baseline_attr.keys())
-        cur_files = set(current_attr.keys())
-        added = cur_files - ref_files
-        removed = ref_files - cur_files
-        common = ref_files & cur_files
-        
-        print(f"📊 File changes:")
-        print(f"   Added: {len(added)}")
-        print(f"   Removed: {len(removed)}")
-        print(f"   Common: {len(common)}")
-        print()
+        # Current side as a profile, compared against the baseline profile
+        current_profile = profile_report = None
+        if baseline_profile is not None:
+            from ddoc.core.reference_profile import build_profile, compare_reference
+
+            try:
+                current_profile = build_profile(
+                    'image', attributes=current_attr,
+                    embeddings=current_emb if baseline_profile.embedding is not None else None,
+                )
+                profile_report = compare_reference(baseline_profile, current_profile)
+            except ValueError as e:
+                print(f"   ⚠️ Reference profile comparison skipped: {e}")
+                if profile_attr or profile_emb:
+                    # Embedding sketches disagree (e.g. another encoder):
+                    # keep the attribute comparison only
+                    profile_emb = False
+                    profile_report = compare_reference(
+                        baseline_profile, build_profile('image', attributes=current_attr)
+                    )
         
-        drift_metrics = {
-            'files_added': len(added),
-            'files_removed': len(removed),
-            'files_common': len(common)
-        }
+        # File changes (file names are not part of a reference profile)
+        if profile_attr:
+            added = removed = common = set()
+            drift_metrics = {
+                'files_added': None,
+                'files_removed': None,
+                'files_common': None,
+                'files_baseline': baseline_profile.count,
+                'files_current': len(current_attr),
+                'baseline_source': 'reference_profile',
+            }
+            print(f"📊 Files: baseline {baseline_profile.count} (profile), current {len(current_attr)}")
+            print()
+        else:
+            ref_files = set(baseline_attr.keys())
+            cur_files = set(current_attr.keys())
+            added = cur_files - ref_files
+            removed = ref_files - cur_files
+            common = ref_files & cur_files
+            
+            print(f"📊 File changes:")
+            print(f"   Added: {len(added)}")
+            print(f"   Removed: {len(removed)}")
+            print(f"   Common: {len(common)}")
+            print()
+            
+            drift_metrics = {
+                'files_added': len(added),
+                'files_removed': len(removed),
+                'files_common': len(common)
+            }
         
         # Attribute drift (compare distributions of all 9 metrics)
         print("📈 Attribute Drift (9 metrics):")
@@ -705,8 +768,22 @@ class DDOCVisionPlugin:
             'gaussian_noise_level': ('gaussian_noise_level', 'noise_level')  # Fallback to legacy
         }
         
+        def profile_psi(key, fallback=None):
+            """PSI of one attribute from the baseline profile report (None if absent)"""
+            features = profile_report['features'] if profile_report else {}
+            for name in (key, fallback):
+                if name and (features.get(name) or {}).get('psi') is not None:
+                    return float(features[name]['psi'])
+            return None
+        
         attribute_drifts = {}
         for metric_name, (key, fallback) in metric_extractors.items():
+            if profile_attr:
+                drift_score = profile_psi(key, fallback)
+                attribute_drifts[metric_name] = drift_score or 0.0
+                if drift_score is not None:
+                    print(f"   {metric_name:20s} Drift (PSI): {drift_score:.4f}")
+                continue
             ref_values = extract_metric(baseline_attr, key, fallback)
             cur_values = extract_metric(current_attr, key, fallback)
             
@@ -728,14 +805,40 @@ class DDOCVisionPlugin:
         drift_metrics['attribute_drift_overall'] = np.mean(list(attribute_drifts.values())) if attribute_drifts else 0.0
         
         # Legacy metrics for backward compatibility
-        ref_sizes = extract_metric(baseline_attr, 'size')
-        cur_sizes = extract_metric(current_attr, 'size')
-        drift_metrics['size_drift'] = self._calculate_psi(np.array(ref_sizes), np.array(cur_sizes)) if ref_sizes and cur_sizes else 0
+        if profile_attr:
+            drift_metrics['size_drift'] = profile_psi('size') or 0
+        else:
+            ref_sizes = extract_metric(baseline_attr, 'size')
+            cur_sizes = extract_metric(current_attr, 'size')
+            drift_metrics['size_drift'] = self._calculate_psi(np.array(ref_sizes), np.array(cur_sizes)) if ref_sizes and cur_sizes else 0
         drift_metrics['noise_drift'] = attribute_drifts.get('gaussian_noise_level', 0)
         drift_metrics['sharpness_drift'] = attribute_drifts.get('sharpness', 0)
         
+        # Embedding drift against the baseline embedding profile (no MMD:
+        # it needs raw baseline samples)
+        profile_embedding = (profile_report or {}).get('embedding') if profile_emb else None
+        if profile_embedding:
+            print("\n🧠 Embedding Drift (reference profile):")
+            print("-" * 80)
+            embedding_drift_metrics = self._calculate_profile_embedding_drift(profile_embedding)
+            _STRATEGIES = {
+                "default": embedding_drift_metrics["ensemble_score"],
+                "ensemble": embedding_drift_metrics["ensemble_score"],
+                "mean_shift": embedding_drift_metrics["normalized_scores"]["mean_shift"],
+                "wasserstein": embedding_drift_metrics["normalized_scores"]["wasserstein"],
+                "psi": embedding_drift_metrics["normalized_scores"]["psi"],
+                "cosine": embedding_drift_metrics["normalized_scores"]["cosine_distance"],
+            }
+            drift_metrics['embedding_drift'] = float(_STRATEGIES[_strategy])
+            drift_metrics['embedding_drift_detector'] = _strategy
+            drift_metrics['embedding_drift_detailed'] = embedding_drift_metrics
+            for metric_name, score in embedding_drift_metrics['normalized_scores'].items():
+                weight = embedding_drift_metrics['weights'][metric_name]
+                print(f"   {metric_name:20s}: {score:.4f} (weight: {weight:.2f})")
+            print(f"   ⚖️  Ensemble Score:      {embedding_drift_metrics['ensemble_score']:.4f}")
+        
         # Embedding drift (compare distributions even if files are different)
-        if baseline_emb and current_emb:
+        elif baseline_emb and current_emb:
             print("\n🧠 Embedding Drift (Multi-Metric Analysis):")
             print("-" * 80)
             
@@ -806,6 +909,57 @@ class DDOCVisionPlugin:
                 drift_metrics['embedding_drift_detailed'] = None
                 print(f"   Embedding Drift: 0.0000 (no embeddings found)")
         
+        # Optional permutation-test p-values (``--significance``). Scores and
+        # status above stay threshold-based; this only adds whether each
+        # statistic is distinguishable from sampling noise at ``alpha``.
+        significance_cfg = cfg.get('significance')
+        if significance_cfg:
+            from ddoc.core.significance import attribute_significance, mmd_permutation_test
+
+            sig_kwargs = {
+                'n_permutations': int(significance_cfg.get('permutations', 1000)),
+                'alpha': float(significance_cfg.get('alpha', 0.05)),
+                'seed': int(significance_cfg.get('seed', 0)),
+            }
+            significance = {
+                'attributes': attribute_significance(
+                    {
+                        name: (extract_metric(baseline_attr, key, fallback), extract_metric(current_attr, key, fallback))
+                        for name, (key, fallback) in metric_extractors.items()
+                    },
+                    statistic='psi',
+                    **sig_kwargs,
+                ),
+                'embedding': None,
+            }
+            if baseline_emb and current_emb:
+                try:
+                    significance['embedding'] = mmd_permutation_test(
+                        [baseline_emb[f]['embedding'] for f in baseline_emb],
+                        [current_emb[f]['embedding'] for f in current_emb],
+                        **sig_kwargs,
+                    )
+                except ValueError as e:
+                    significance['embedding'] = {'statistic': 'mmd', 'error': str(e)}
+            significance['any_significant'] = any(
+                r.get('significant', False)
+                for r in [*significance['attributes'].values(), significance['embedding'] or {}]
+            )
+            drift_metrics['significance'] = significance
+            print(f"\n🎲 Permutation tests (alpha={sig_kwargs['alpha']}):")
+            for name, r in significance['attributes'].items():
+                if 'p_value' in r:
+                    print(f"   {name:20s} p={r['p_value']:.4f} ({r['permutations']} perms)")
+            if significance['embedding'] and 'p_value' in significance['embedding']:
+                r = significance['embedding']
+                print(f"   {'embedding (MMD)':20s} p={r['p_value']:.4f} ({r['permutations']} perms)")
+
+        # Reference-profile drift (PSI / KS / JS per attribute, projected
+        # embedding drift). The baseline side comes from the profile saved
+        # at EDA time; only the current side is summarized here.
+        if profile_report is not None:
+            drift_metrics['profile_drift'] = profile_report
+
         # Overall score (weighted average: attributes 45%, embedding 55%)
         # Attributes: average of all 9 metrics
         attr_score = drift_metrics.get('attribute_drift_overall', 0)
@@ -835,15 +989,16 @@ class DDOCVisionPlugin:
         # Update timeline
         timeline_file = output_path / "timeline.tsv"
         with open(timeline_file, 'a') as f:
-            f.write(f"{drift_metrics['timestamp']}\t{overall:.4f}\t{status}\t{len(added)}\t{len(removed)}\n")
+            files_added, files_removed = ('-', '-') if profile_attr else (len(added), len(removed))
+            f.write(f"{drift_metrics['timestamp']}\t{overall:.4f}\t{status}\t{files_added}\t{files_removed}\n")
         
         # Extract dataset names from paths
         ref_dataset_name = ref_dataset_path.name
         cur_dataset_name = cur_dataset_path.name
         
-        # Generate drift plots
+        # Generate drift plots (a profile baseline only gets the summary plot)
         self._generate_drift_plots(
-            plot_dir, baseline_attr, current_attr, baseline_emb, current_emb, 
+            plot_dir, baseline_attr or {}, current_attr, baseline_emb, current_emb, 
             common, drift_metrics, ref_dataset_name, cur_dataset_name
         )
         
@@ -1164,6 +1319,45 @@ class DDOCVisionPlugin:
         
         return metrics
     
+    def _calculate_profile_embedding_drift(self, profile_embedding):
+        """
+        Ensemble embedding drift from a reference-profile comparison
+
+        Uses the thresholds and weights of ``_calculate_embedding_drift_ensemble``
+        without MMD (which needs raw baseline samples); the remaining weights
+        are rescaled to sum to 1. PSI is taken over the profile's random
+        projections instead of PCA components.
+
+        Args:
+            profile_embedding: ``compare_reference(...)['embedding']``
+
+        Returns:
+            dict: Same keys as ``_calculate_embedding_drift_ensemble`` minus the MMD fields
+        """
+        metrics = {
+            key: float(profile_embedding.get(key) or 0.0)
+            for key in ('mean_shift', 'wasserstein', 'psi', 'psi_max', 'cosine_distance')
+        }
+        weights = {
+            'mean_shift': 0.25,
+            'wasserstein': 0.20,
+            'psi': 0.15,
+            'cosine_distance': 0.10
+        }
+        total = sum(weights.values())
+        weights = {k: w / total for k, w in weights.items()}
+        normalized_scores = {
+            'mean_shift': min(metrics['mean_shift'] / 0.1, 1.0),
+            'wasserstein': min(metrics['wasserstein'] / 1.0, 1.0),
+            'psi': min(metrics['psi'] / 0.25, 1.0),
+            'cosine_distance': min(metrics['cosine_distance'], 1.0)
+        }
+        metrics['ensemble_score'] = float(sum(weights[k] * normalized_scores[k] for k in weights))
+        metrics['normalized_scores'] = normalized_scores
+        metrics['weights'] = weights
+        metrics['source'] = 'reference_profile'
+        return metrics
+    
     def _create_placeholder_plots(self, plot_dir):
         """Create placeholder plots for baseline"""
         plot_names = [
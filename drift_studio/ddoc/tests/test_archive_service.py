@@ -0,0 +1,122 @@
+"""
+Tests for parallel / streaming archive extraction (ddoc add <archive>)
+"""
+import hashlib
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from ddoc.core.archive_service import ArchiveService, UnsafeArchiveError
+from ddoc.core.file_service import FileService
+
+
+def _md5(data: bytes) -> str:
+    return hashlib.md5(data).hexdigest()
+
+
+def test_zip_flattens_single_folder_and_hashes(tmp_path):
+    """A lone top-level folder named like the archive is stripped on the fly"""
+    archive = tmp_path / "yolo_reference.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("yolo_reference/train/a.txt", b"alpha")
+        zf.writestr("yolo_reference/val/b.txt", b"beta")
+        zf.writestr("__MACOSX/yolo_reference/._a.txt", b"junk")
+
+    out = tmp_path / "data" / "yolo_reference"
+    result = ArchiveService(max_workers=4).extract_zip(archive, out)
+
+    assert (out / "train" / "a.txt").read_bytes() == b"alpha"
+    assert (out / "val" / "b.txt").read_bytes() == b"beta"
+    assert not (out / "yolo_reference").exists()
+    assert not (out / "__MACOSX").exists()
+    assert result["hashes"] == {
+        "train/a.txt": {"md5": _md5(b"alpha"), "size": 5},
+        "val/b.txt": {"md5": _md5(b"beta"), "size": 4},
+    }
+
+
+def test_zip_rejects_path_traversal(tmp_path):
+    """Members escaping the extraction directory are refused"""
+    archive = tmp_path / "evil.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("../escape.txt", b"nope")
+
+    with pytest.raises(UnsafeArchiveError):
+        ArchiveService().extract_zip(archive, tmp_path / "data" / "evil")
+    assert not (tmp_path / "data" / "escape.txt").exists()
+
+
+def _add_file(tar: tarfile.TarFile, name: str, data: bytes) -> None:
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    tar.addfile(info, io.BytesIO(data))
+
+
+def test_tar_gz_streams_and_flattens(tmp_path):
+    """tar.gz members are streamed, flattened and hashed in one pass"""
+    archive = tmp_path / "sensors.tar.gz"
+    with tarfile.open(archive, "w:gz") as tar:
+        _add_file(tar, "sensors/a.csv", b"t,v\n1,2\n")
+        _add_file(tar, "sensors/sub/b.csv", b"t,v\n3,4\n")
+
+    out = tmp_path / "data" / "sensors"
+    result = ArchiveService().extract_tar(archive, out)
+
+    assert (out / "a.csv").read_bytes() == b"t,v\n1,2\n"
+    assert (out / "sub" / "b.csv").exists()
+    assert set(result["hashes"]) == {"a.csv", "sub/b.csv"}
+
+
+def test_tar_with_several_roots_is_not_flattened(tmp_path):
+    """Flattening is undone when a second top-level entry appears later"""
+    archive = tmp_path / "mixed.tar"
+    with tarfile.open(archive, "w") as tar:
+        _add_file(tar, "mixed/a.txt", b"a")
+        _add_file(tar, "other/b.txt", b"b")
+
+    out = tmp_path / "data" / "mixed"
+    result = ArchiveService().extract_tar(archive, out)
+
+    assert (out / "mixed" / "a.txt").read_bytes() == b"a"
+    assert (out / "other" / "b.txt").read_bytes() == b"b"
+    assert set(result["hashes"]) == {"mixed/a.txt", "other/b.txt"}
+
+
+def test_tar_rejects_symlink_escape(tmp_path):
+    """Symlinks pointing outside the extraction directory are refused"""
+    archive = tmp_path / "links.tar"
+    with tarfile.open(archive, "w") as tar:
+        info = tarfile.TarInfo("links/passwd")
+        info.type = tarfile.SYMTYPE
+        info.linkname = "../../../etc/passwd"
+        tar.addfile(info)
+
+    with pytest.raises(UnsafeArchiveError):
+        ArchiveService().extract_tar(archive, tmp_path / "data" / "links")
+
+
+def test_tar_hardlink_to_symlink_has_no_digest(tmp_path):
+    """A hardlink to a symlink member is copied but carries no md5"""
+    archive = tmp_path / "links.tar"
+    with tarfile.open(archive, "w") as tar:
+        data = b"payload"
+        info = tarfile.TarInfo("links/file.txt")
+        info.size = len(data)
+        tar.addfile(info, io.BytesIO(data))
+        info = tarfile.TarInfo("links/alias.txt")
+        info.type = tarfile.SYMTYPE
+        info.linkname = "file.txt"
+        tar.addfile(info)
+        info = tarfile.TarInfo("links/hard.txt")
+        info.type = tarfile.LNKTYPE
+        info.linkname = "links/alias.txt"
+        tar.addfile(info)
+
+    service = FileService(str(tmp_path))
+    out = service._extract_tar(archive, service.data_dir)
+
+    assert (out / "hard.txt").read_bytes() == b"payload"
+    assert "links/hard.txt" not in service._extracted_hashes
+    assert service._extracted_hashes["links/file.txt"] == _md5(b"payload")
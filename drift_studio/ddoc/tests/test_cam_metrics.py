@@ -0,0 +1,193 @@
+"""
+Tests for the vectorized CAM metrics (ddoc-plugin-vision,
+ddoc_plugin_vision/data_utils/cam_metrics.py) against the per-label loop
+implementation they replaced
+"""
+import numpy as np
+import pytest
+
+cam_metrics = pytest.importorskip("ddoc_plugin_vision.data_utils.cam_metrics")
+cv2 = pytest.importorskip("cv2")
+from scipy import ndimage  # noqa: E402
+from scipy.stats import entropy  # noqa: E402
+
+# Thresholds come from a float64 interpolation cast back to float32, which
+# can sit 1 ulp away from ``np.percentile`` on float32 input
+TOL = dict(rtol=1e-5, atol=1e-6)
+APPROX = dict(rel=1e-5, abs=1e-6)
+
+
+def _cams():
+    rng = np.random.default_rng(7)
+    cams = []
+    for shape, sigma in (((40, 56), 2.0), ((64, 64), 3.5), ((33, 47), 1.0)):
+        blobs = ndimage.gaussian_filter(rng.random(shape), sigma)
+        cam = np.clip((blobs - blobs.mean()) / blobs.std() * 0.3 + 0.3, 0, None)
+        cams.append((cam / cam.max()).astype(np.float32))
+    return cams
+
+
+CAMS = _cams()
+
+
+# ── Previous implementation (per-label masks, np.percentile, np.unique) ──
+
+def _shannon(values):
+    _, counts = np.unique(values, return_counts=True)
+    return entropy(counts, base=2)
+
+
+def _old_optimal_threshold(cam, percentile_range=(50, 95)):
+    percentiles = range(percentile_range[0], percentile_range[1] + 1, 5)
+    best = (0, 0, 0)
+    counts = []
+    for percentile in percentiles:
+        threshold = np.percentile(cam, percentile)
+        _, num = ndimage.label(cam > threshold)
+        counts.append(num)
+        if num > best[0]:
+            best = (num, threshold, percentile)
+    return {"max_components": best[0], "optimal_threshold": best[1],
+            "optimal_percentile": best[2], "component_counts": counts}
+
+
+def _old_components(cam, threshold_percentile=85):
+    threshold = np.percentile(cam, threshold_percentile)
+    binary_mask = cam > threshold
+    labeled_mask, num = ndimage.label(binary_mask)
+    sizes, centroids, bboxes, densities, circularities = [], [], [], [], []
+    for i in range(1, num + 1):
+        component_mask = labeled_mask == i
+        size = np.sum(component_mask)
+        sizes.append(size)
+        y_coords, x_coords = np.where(component_mask)
+        centroids.append((np.mean(x_coords), np.mean(y_coords)))
+        min_y, max_y, min_x, max_x = y_coords.min(), y_coords.max(), x_coords.min(), x_coords.max()
+        bboxes.append((min_x, min_y, max_x, max_y))
+        densities.append(size / ((max_y - min_y + 1) * (max_x - min_x + 1)))
+        contours, _ = cv2.findContours(component_mask.astype(np.uint8), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        area, perimeter = cv2.contourArea(contours[0]), cv2.arcLength(contours[0], True)
+        circularities.append(4 * np.pi * area / perimeter ** 2 if perimeter > 0 else 0)
+    return {"threshold": threshold, "active_pixels": np.sum(binary_mask), "num_components": num,
+            "binary_mask": binary_mask, "labeled_mask": labeled_mask, "component_sizes": sizes,
+            "component_centroids": centroids, "component_bboxes": bboxes,
+            "component_densities": densities, "circularities": circularities}
+
+
+def _old_centroids(cam):
+    height, width = cam.shape
+    y_coords, x_coords = np.meshgrid(np.arange(height), np.arange(width), indexing="ij")
+    total = np.sum(cam)
+    weighted = (np.sum(x_coords * cam) / total, np.sum(y_coords * cam) / total, np.mean(cam) / np.max(cam))
+
+    active = cam > np.percentile(cam, 85)
+    ys, xs = np.where(active)
+    threshold = (np.mean(xs), np.mean(ys), np.sum(active) / cam.size * (np.mean(cam[active]) / np.max(cam)))
+
+    max_y, max_x = np.unravel_index(np.argmax(cam), cam.shape)
+    peak = (max_x, max_y, (np.max(cam) - np.mean(cam)) / np.max(cam))
+
+    labeled, num = ndimage.label(active)
+    sizes = [np.sum(labeled == i) for i in range(1, num + 1)]
+    largest = int(np.argmax(sizes)) + 1
+    ly, lx = np.where(labeled == largest)
+    components = (np.mean(lx), np.mean(ly), sizes[largest - 1] / np.sum(active))
+    return {"weighted": weighted, "threshold": threshold, "max": peak, "components": components}
+
+
+def _old_entropy(cam):
+    cam_normalized = (cam - cam.min()) / (cam.max() - cam.min())
+    gx, gy = np.zeros_like(cam), np.zeros_like(cam)
+    gx[:, 1:-1] = (cam[:, 2:] - cam[:, :-2]) / 2.0
+    gy[1:-1, :] = (cam[2:, :] - cam[:-2, :]) / 2.0
+    magnitude = np.sqrt(gx ** 2 + gy ** 2)
+    directions = {
+        "horizontal": _shannon((gx * 255).astype(np.uint8)),
+        "vertical": _shannon((gy * 255).astype(np.uint8)),
+        "magnitude": _shannon((magnitude * 255).astype(np.uint8)),
+    }
+    non_zero = cam.flatten()[cam.flatten() > 0]
+    hist, _ = np.histogram(non_zero, bins=50, density=True)
+    conditional = {}
+    for thresh in (50, 75, 85, 90, 95):
+        value = np.percentile(cam, thresh)
+        active, inactive = cam > value, cam <= value
+        active_ent = _shannon((cam[active] * 255).astype(np.uint8)) if active.any() else 0
+        inactive_ent = _shannon((cam[inactive] * 255).astype(np.uint8)) if inactive.any() else 0
+        ratio = np.sum(active) / cam.size
+        conditional[thresh] = ratio * active_ent + (1 - ratio) * inactive_ent
+    return {
+        "shannon": _shannon((cam_normalized * 255).astype(np.uint8)),
+        "spatial": 0.4 * directions["horizontal"] + 0.4 * directions["vertical"] + 0.2 * directions["magnitude"],
+        "spatial_directions": directions,
+        "histogram": entropy(hist[hist > 0]),
+        "activation_ratio": len(non_zero) / cam.size,
+        "non_zero_count": len(non_zero),
+        "conditional": conditional,
+    }
+
+
+# ── Equivalence ──────────────────────────────────────────
+
+@pytest.mark.parametrize("cam", CAMS)
+def test_percentiles_match_numpy(cam):
+    ctx = cam_metrics.CamContext(cam)
+    ps = [0, 5, 12.5, 50, 85, 99.9, 100]
+    np.testing.assert_allclose(ctx.percentiles(ps), np.percentile(cam, ps), **TOL)
+    for p in ps:
+        threshold = ctx.percentile(p)
+        assert ctx.count_above(threshold) == np.sum(cam > threshold)
+
+
+@pytest.mark.parametrize("cam", CAMS)
+def test_threshold_sweep_and_adaptive_map_match(cam):
+    ctx = cam_metrics.CamContext(cam)
+    new = cam_metrics.find_optimal_threshold_for_components(ctx)
+    old = _old_optimal_threshold(cam)
+    assert new["component_counts"] == old["component_counts"]
+    assert new["max_components"] == old["max_components"] > 1
+    assert new["optimal_percentile"] == old["optimal_percentile"]
+    assert new["optimal_threshold"] == pytest.approx(old["optimal_threshold"], **APPROX)
+
+    threshold = np.percentile(cam, 85)
+    expected = np.where(cam > threshold, cam, 0)
+    np.testing.assert_allclose(cam_metrics.adaptive_thresholding(ctx), expected / expected.max(), **TOL)
+
+
+@pytest.mark.parametrize("cam", CAMS)
+def test_connected_components_match(cam):
+    # Sweep first, so the 85th percentile labels come from the stacked 3D labeling
+    ctx = cam_metrics.CamContext(cam)
+    cam_metrics.find_optimal_threshold_for_components(ctx)
+    new = cam_metrics.analyze_connected_components(ctx)
+    old = _old_components(cam)
+
+    assert new["threshold"] == pytest.approx(old["threshold"], **APPROX)
+    assert new["active_pixels"] == old["active_pixels"]
+    assert new["num_components"] == old["num_components"] > 1
+    np.testing.assert_array_equal(new["binary_mask"], old["binary_mask"])
+    np.testing.assert_array_equal(new["labeled_mask"], old["labeled_mask"])
+    np.testing.assert_array_equal(new["component_sizes"], old["component_sizes"])
+    np.testing.assert_allclose(new["component_centroids"], old["component_centroids"], **TOL)
+    assert [tuple(map(int, b)) for b in new["component_bboxes"]] == [tuple(map(int, b)) for b in old["component_bboxes"]]
+    np.testing.assert_allclose(new["component_densities"], old["component_densities"], **TOL)
+    np.testing.assert_allclose(new["circularities"], old["circularities"], **TOL)
+
+
+@pytest.mark.parametrize("cam", CAMS)
+def test_centroids_match(cam):
+    new = cam_metrics.calculate_cam_centroids(cam_metrics.CamContext(cam))
+    for method, (x, y, confidence) in _old_centroids(cam).items():
+        assert new[method]["x"] == pytest.approx(x, **APPROX), method
+        assert new[method]["y"] == pytest.approx(y, **APPROX), method
+        assert new[method]["confidence"] == pytest.approx(confidence, **APPROX), method
+
+
+@pytest.mark.parametrize("cam", CAMS)
+def test_entropies_match(cam):
+    new = cam_metrics.calculate_cam_entropy(cam_metrics.CamContext(cam))
+    old = _old_entropy(cam)
+    for key in ("shannon", "spatial", "histogram", "activation_ratio", "non_zero_count"):
+        assert new[key] == pytest.approx(old[key], **APPROX), key
+    assert new["spatial_directions"] == pytest.approx(old["spatial_directions"], **APPROX)
+    assert new["conditional"] == pytest.approx(old["conditional"], **APPROX)
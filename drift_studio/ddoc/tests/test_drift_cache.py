@@ -0,0 +1,146 @@
+"""
+Tests for the drift result cache (ddoc/core/drift_cache.py)
+"""
+import json
+from pathlib import Path
+
+from ddoc.core.drift_cache import DriftResultCache, drift_cache_key
+from ddoc.plugins.hookspecs import hookimpl
+
+
+def _tree(root, files):
+    for rel, data in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+
+def test_key_covers_every_setting():
+    base = drift_cache_key("r", "c", "vision==1", "default", "none")
+    assert base == drift_cache_key("r", "c", "vision==1", "DEFAULT", "none")
+    assert base != drift_cache_key("c", "r", "vision==1", "default", "none")
+    assert base != drift_cache_key("r", "c", "vision==2", "default", "none")
+    assert base != drift_cache_key("r", "c", "vision==1", "mmd", "none")
+    assert base != drift_cache_key("r", "c", "vision==1", "default", "max")
+    assert base != drift_cache_key("r", "c", "vision==1", "default", "none", analyzer_version="0")
+
+
+def test_fingerprint_follows_content_not_location(tmp_path):
+    """Same bytes under another directory name share a fingerprint"""
+    cache = DriftResultCache(project_root=str(tmp_path))
+    files = {"a.txt": b"alpha", "sub/b.txt": b"beta", "raw.zip_extracted/x": b"derived"}
+    _tree(tmp_path / "ds_v1", files)
+    _tree(tmp_path / "renamed", files)
+
+    first = cache.fingerprint(str(tmp_path / "ds_v1"), exclude_suffixes=("_extracted",))
+    assert first == cache.fingerprint(str(tmp_path / "renamed"), exclude_suffixes=("_extracted",))
+    assert first != cache.fingerprint(str(tmp_path / "ds_v1"))
+
+    (tmp_path / "ds_v1" / "a.txt").write_bytes(b"ALPHA")
+    assert cache.fingerprint(str(tmp_path / "ds_v1"), exclude_suffixes=("_extracted",)) != first
+
+
+def test_version_bump_drops_results(tmp_path):
+    cache = DriftResultCache(project_root=str(tmp_path), analyzer_version="1")
+    key = drift_cache_key("r", "c", "p", analyzer_version="1")
+    assert cache.put(key, {"overall_score": 0.3})["success"]
+    assert cache.get(key)["result"] == {"overall_score": 0.3}
+
+    bumped = DriftResultCache(project_root=str(tmp_path), analyzer_version="2")
+    assert bumped.get(key) is None
+    assert not list((tmp_path / ".ddoc/cache/drift").glob("??/*.json"))
+
+
+class _CountingPlugin:
+    calls = 0
+
+    @hookimpl
+    def drift_detect(self, snapshot_id_ref, snapshot_id_cur, data_path_ref, data_path_cur,
+                     data_hash_ref, data_hash_cur, detector, cfg, output_path):
+        _CountingPlugin.calls += 1
+        return {"modality": "toy", "overall_score": 0.42}
+
+
+def test_cli_reuses_cached_result(tmp_path, monkeypatch, capsys):
+    """Second identical path-mode run is served from the cache; --no-cache recomputes"""
+    from ddoc.cli.commands.analyze.drift import analyze_drift_command
+    from ddoc.cli.commands.utils import get_pmgr
+
+    monkeypatch.chdir(tmp_path)
+    _tree(tmp_path / "ref", {"a.csv": b"x\n1\n"})
+    _tree(tmp_path / "cur", {"a.csv": b"x\n2\n"})
+    pm = get_pmgr().pm
+    plugin = _CountingPlugin()
+    pm.register(plugin, name="toy_drift")
+    _CountingPlugin.calls = 0
+
+    def run(no_cache=False):
+        analyze_drift_command(
+            None, None, detector="default",
+            data_path_ref=str(tmp_path / "ref"), data_path_cur=str(tmp_path / "cur"),
+            json_out=True, ndjson_progress=False, quiet=True, with_embeddings=False,
+            fusion="none", fusion_weights=None, no_cache=no_cache,
+            significance=False, permutations=1000, alpha=0.05,
+        )
+        return json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+
+    try:
+        first = run()
+        second = run()
+        third = run(no_cache=True)
+    finally:
+        pm.unregister(plugin)
+
+    assert first["overall_score"] == second["overall_score"] == 0.42
+    assert first["drift_cache"]["hit"] is False
+    assert second["drift_cache"]["hit"] is True
+    assert "drift_cache" not in third
+    assert _CountingPlugin.calls == 2
+
+
+class _MetricsPlugin(_CountingPlugin):
+    @hookimpl
+    def drift_detect(self, snapshot_id_ref, snapshot_id_cur, data_path_ref, data_path_cur,
+                     data_hash_ref, data_hash_cur, detector, cfg, output_path):
+        _CountingPlugin.calls += 1
+        out = Path(output_path)
+        out.mkdir(parents=True, exist_ok=True)
+        (out / "metrics.json").write_text('{"overall_score": 0.42}')
+        return {"modality": "toy", "overall_score": 0.42}
+
+
+def test_cli_recomputes_when_side_outputs_are_gone(tmp_path, monkeypatch, capsys):
+    """A cache hit is only served while the plugin's output files still exist"""
+    from ddoc.cli.commands.analyze.drift import analyze_drift_command
+    from ddoc.cli.commands.utils import get_pmgr
+
+    monkeypatch.chdir(tmp_path)
+    _tree(tmp_path / "ref", {"a.csv": b"x\n1\n"})
+    _tree(tmp_path / "cur", {"a.csv": b"x\n2\n"})
+    pm = get_pmgr().pm
+    plugin = _MetricsPlugin()
+    pm.register(plugin, name="toy_metrics_drift")
+    _CountingPlugin.calls = 0
+    metrics = tmp_path / "analysis" / "drift_path_default" / "metrics.json"
+
+    def run():
+        analyze_drift_command(
+            None, None, detector="default",
+            data_path_ref=str(tmp_path / "ref"), data_path_cur=str(tmp_path / "cur"),
+            json_out=True, ndjson_progress=False, quiet=True, with_embeddings=False,
+            fusion="none", fusion_weights=None, no_cache=False,
+            significance=False, permutations=1000, alpha=0.05,
+        )
+        return json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+
+    try:
+        assert run()["drift_cache"]["hit"] is False
+        assert run()["drift_cache"]["hit"] is True
+        metrics.unlink()
+        assert run()["drift_cache"]["hit"] is False
+        assert metrics.exists()
+        assert run()["drift_cache"]["hit"] is True
+    finally:
+        pm.unregister(plugin)
+
+    assert _CountingPlugin.calls == 2
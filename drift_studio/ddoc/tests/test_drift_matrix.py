@@ -0,0 +1,80 @@
+"""
+Tests for the pairwise drift matrix (ddoc/core/drift_matrix.py)
+"""
+import numpy as np
+
+from ddoc.core.cache_service import CacheService
+from ddoc.core.drift_matrix import GramCache, SnapshotSide, drift_matrix, load_snapshot_sides
+
+
+def _seed_snapshot(service, snapshot_id, data_hash, rng, mean, n=200):
+    attrs = {f"img_{i}.jpg": {"size": float(rng.normal(mean, 1)), "format": "JPEG"} for i in range(n)}
+    embs = {f"img_{i}.jpg": {"embedding": rng.normal(mean / 10, 1, 8).tolist()} for i in range(n)}
+    service.save_analysis_cache(snapshot_id, data_hash, "attributes_image", attrs)
+    service.save_analysis_cache(snapshot_id, data_hash, "embedding_image", embs)
+
+
+def _naive_mmd(x, y, gamma):
+    def k(a, b):
+        d = (a * a).sum(1)[:, None] + (b * b).sum(1)[None, :] - 2 * a @ b.T
+        return np.exp(-gamma * np.maximum(d, 0))
+    kxx, kyy = k(x, x), k(y, y)
+    m, n = len(x), len(y)
+    value = ((kxx.sum() - np.trace(kxx)) / (m * (m - 1)) + (kyy.sum() - np.trace(kyy)) / (n * (n - 1))
+             - 2 * k(x, y).mean())
+    return np.sqrt(max(value, 0))
+
+
+def test_shared_gram_blocks_match_pairwise_mmd():
+    rng = np.random.default_rng(0)
+    samples = {"a": rng.normal(0, 1, (60, 5)), "b": rng.normal(0.5, 1, (50, 5)), "c": rng.normal(0, 2, (40, 5))}
+    gram = GramCache(samples).prepare()
+    for a, b in (("a", "b"), ("a", "c"), ("b", "c")):
+        assert np.isclose(gram.mmd(a, b), _naive_mmd(gram.z[a], gram.z[b], gram.gamma))
+
+
+def test_matrix_ranks_most_drifted_pair(tmp_path):
+    rng = np.random.default_rng(1)
+    service = CacheService(project_root=str(tmp_path))
+    for sid, mean in (("v01", 10), ("v02", 10), ("v03", 14)):
+        _seed_snapshot(service, sid, f"hash_{sid}", rng, mean)
+
+    sides = load_snapshot_sides(service, [("v01", "hash_v01"), ("v02", "hash_v02"), ("v03", "hash_v03")])
+    assert all(set(s.samples) == {"image"} for s in sides)
+
+    calls = []
+    res = drift_matrix(sides, top=2, progress=lambda done, total: calls.append((done, total)))
+    assert res["snapshots"] == ["v01", "v02", "v03"]
+    assert calls[-1] == (3, 3)
+    matrix = np.array(res["matrix"], dtype=float)
+    assert np.allclose(matrix, matrix.T) and np.allclose(np.diag(matrix), 0)
+    assert matrix[0, 1] < matrix[0, 2] and matrix[0, 1] < matrix[1, 2]
+    assert {p["cur"] for p in res["top_pairs"]} == {"v03"}
+    assert res["pairs"][1]["modalities"]["image"]["status"] == "CRITICAL"
+
+    by_psi = drift_matrix(sides, metric="psi_mean")
+    assert by_psi["modality_matrices"]["image"][0][2] == by_psi["pairs"][1]["modalities"]["image"]["psi_mean"]
+
+
+def test_auto_metric_never_mixes_mmd_and_psi(tmp_path):
+    """A modality without embeddings switches the whole matrix to PSI"""
+    rng = np.random.default_rng(2)
+    service = CacheService(project_root=str(tmp_path))
+    for sid, mean in (("v01", 10), ("v02", 12), ("v03", 14)):
+        _seed_snapshot(service, sid, f"hash_{sid}", rng, mean)
+        text = {f"doc_{i}.txt": {"length": float(rng.normal(mean * 5, 3))} for i in range(200)}
+        service.save_analysis_cache(sid, f"hash_{sid}", "attributes_text", text)
+
+    sides = load_snapshot_sides(service, [(sid, f"hash_{sid}") for sid in ("v01", "v02", "v03")])
+    res = drift_matrix(sides)
+    assert res["metric"] == "psi_mean"
+    assert res["modality_metrics"] == {"image": "mmd", "text": "psi_mean"}
+    for pair in res["pairs"]:
+        assert pair["score"] == max(r["psi_mean"] for r in pair["modalities"].values())
+    assert res["modality_matrices"]["image"][0][2] == res["pairs"][1]["modalities"]["image"]["mmd"]
+
+    image_only = drift_matrix([
+        SnapshotSide(s.snapshot_id, s.data_hash, {"image": s.profiles["image"]}, s.samples) for s in sides
+    ])
+    assert image_only["metric"] == "mmd"
+    assert image_only["matrix"][0][2] == image_only["pairs"][1]["modalities"]["image"]["mmd"]
@@ -229,3 +229,108 @@ def test_ingest_invalid_mode_rejects(tmp_path):
     export_dir.mkdir()
     with pytest.raises(ValueError, match="mode"):
         ingest_directory(from_dir=export_dir, workspace_root=workspace, mode="bogus")
+
+
+# ── Incremental / parallel / partitioned ingest ──────────────────────
+
+
+def _envelope(i: int, app_id: str = "site-p", day: str = "2026-05-07") -> dict:
+    return {
+        "protocol_version": "1.1",
+        "source": {"app_id": app_id},
+        "payload_kinds": ["decision_batch"],
+        "decision_batch": [{
+            "id": f"d-{i}",
+            "created_at": f"{day}T08:00:{i % 60:02d}+00:00",
+            "decision_type": "detection_accept",
+            "decision": "accept",
+            "threshold_applied": 0.5,
+            "scores": {"conf": i / 100},
+        }],
+    }
+
+
+def test_ingest_skips_already_ingested_content(tmp_path):
+    """Re-dropped envelopes are consumed without new rows (content hash)."""
+    export_dir = tmp_path / "export"
+    export_dir.mkdir()
+    workspace = tmp_path / "ws"
+    shutil.copy(FIXTURE, export_dir / "env.json")
+    first = ingest_directory(from_dir=export_dir, workspace_root=workspace)
+    assert first.decision_rows == 3
+
+    # Same content arrives again under a different name
+    shutil.copy(FIXTURE, export_dir / "env_resent.json")
+    second = ingest_directory(from_dir=export_dir, workspace_root=workspace)
+    assert second.files_processed == 0
+    assert second.files_duplicate == 1
+    assert second.decision_rows == 0
+    assert not (export_dir / "env_resent.json").exists()
+
+    index = Path(first.inbox_dir) / "_ingested.jsonl"
+    assert len(index.read_text(encoding="utf-8").splitlines()) == 1
+
+    shutil.copy(FIXTURE, export_dir / "env_forced.json")
+    forced = ingest_directory(
+        from_dir=export_dir, workspace_root=workspace, incremental=False,
+    )
+    assert forced.decision_rows == 3
+
+
+def test_ingest_parallel_matches_serial(tmp_path):
+    """Process-pool parsing yields the same rows, in file order."""
+    rows_by_mode = {}
+    for workers in (1, 2):
+        export_dir = tmp_path / f"export_{workers}"
+        export_dir.mkdir()
+        for i in range(40):
+            (export_dir / f"env_{i:03d}.json").write_text(
+                json.dumps(_envelope(i)), encoding="utf-8",
+            )
+        (export_dir / "env_bad.json").write_text("{", encoding="utf-8")
+        outcome = ingest_directory(
+            from_dir=export_dir,
+            workspace_root=tmp_path / f"ws_{workers}",
+            workers=workers,
+        )
+        assert outcome.files_processed == 40
+        assert [s["file"] for s in outcome.files_skipped] == ["env_bad.json"]
+        with Path(outcome.decisions_path).open(encoding="utf-8") as fh:
+            rows_by_mode[workers] = [
+                (r["id"], r["scores_json"], r["source_file"])
+                for r in csv.DictReader(fh)
+            ]
+    assert rows_by_mode[1] == rows_by_mode[2]
+    assert rows_by_mode[1][0][0] == "d-0"
+
+
+def test_ingest_partitioned_parquet(tmp_path):
+    """partition_by=date writes one parquet part per decision day."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    export_dir = tmp_path / "export"
+    export_dir.mkdir()
+    for i, day in enumerate(["2026-05-06", "2026-05-07", "2026-05-07"]):
+        (export_dir / f"env_{i}.json").write_text(
+            json.dumps(_envelope(i, day=day)), encoding="utf-8",
+        )
+
+    outcome = ingest_directory(
+        from_dir=export_dir, workspace_root=tmp_path / "ws", partition_by="date",
+    )
+    parts = sorted(Path(p).parent.name for p in outcome.parquet_paths)
+    assert parts == ["date=2026-05-06", "date=2026-05-07"]
+    table = pq.read_table(
+        next(p for p in outcome.parquet_paths if "2026-05-07" in p)
+    )
+    assert table.num_rows == 2
+    assert table.column("threshold_applied").to_pylist() == [0.5, 0.5]
+    assert set(table.column("source_file").to_pylist()) == {"env_1.json", "env_2.json"}
+
+
+def test_ingest_invalid_partition_rejects(tmp_path):
+    export_dir = tmp_path / "export"
+    export_dir.mkdir()
+    with pytest.raises(ValueError, match="partition_by"):
+        ingest_directory(
+            from_dir=export_dir, workspace_root=tmp_path / "ws", partition_by="hour",
+        )
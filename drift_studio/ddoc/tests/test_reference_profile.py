@@ -0,0 +1,126 @@
+"""
+Tests for reference profiles (ddoc/core/reference_profile.py)
+"""
+import numpy as np
+import pytest
+
+from ddoc.core.cache_service import CacheService
+from ddoc.core.reference_profile import (
+    ReferenceProfile,
+    build_profile,
+    compare_reference,
+)
+
+
+def _attrs(rng, mean, n=500):
+    return {
+        f"img_{i}.jpg": {
+            "size": float(rng.normal(mean, 1)),
+            "sharpness": float(rng.normal(50, 5)),
+            "format": "JPEG" if i % 3 else "PNG",
+            "file_mtime": 1700000000 + i,
+            "histogram": [1, 2, 3],
+        }
+        for i in range(n)
+    }
+
+
+def test_profile_merge_matches_single_pass():
+    """Profiles built per batch and merged equal one profile over everything"""
+    rng = np.random.default_rng(0)
+    attrs = _attrs(rng, 10)
+    embs = rng.normal(0, 1, (200, 24))
+
+    whole = build_profile("image", attributes=attrs, embeddings=embs)
+    items = list(attrs.items())
+    merged = build_profile("image", attributes=dict(items[:123]), embeddings=embs[:77])
+    merged.merge(build_profile("image", attributes=dict(items[123:]), embeddings=embs[77:]))
+
+    assert set(whole.features) == {"size", "sharpness", "format"}
+    assert whole.features["format"].kind == "categorical"
+    assert merged.count == whole.count == 500
+    assert merged.features["size"].positive == whole.features["size"].positive
+    assert np.allclose(merged.embedding.mean, embs.mean(axis=0))
+    assert np.allclose(merged.embedding.variance, embs.var(axis=0))
+    for a, b in zip(merged.embedding.projections, whole.embedding.projections):
+        assert a.to_dict()["positive"] == b.to_dict()["positive"]
+
+
+def test_compare_reference_detects_shift():
+    rng = np.random.default_rng(1)
+    ref = build_profile("image", attributes=_attrs(rng, 10), embeddings=rng.normal(0, 1, (300, 16)))
+    same = build_profile("image", attributes=_attrs(rng, 10), embeddings=rng.normal(0, 1, (300, 16)))
+    cur_embs = rng.normal(0.5, 1, (300, 16))
+    shifted = build_profile("image", attributes=_attrs(rng, 13), embeddings=cur_embs)
+
+    stable = compare_reference(ref, same)
+    assert stable["summary"]["status"] == "NORMAL"
+    assert stable["embedding"]["psi"] < 0.1
+
+    report = compare_reference(ref, shifted)
+    assert report["features"]["size"]["status"] == "CRITICAL"
+    assert report["features"]["sharpness"]["status"] == "NORMAL"
+    assert report["features"]["size"]["kl"] > 1
+    expected_shift = np.linalg.norm(ref.embedding.mean - cur_embs.mean(axis=0)) / 4
+    assert abs(report["embedding"]["mean_shift"] - expected_shift) < 1e-3
+    assert report["embedding"]["psi_max"] > 0.25
+
+
+def test_cache_round_trip(tmp_path):
+    """Profiles persist as profile_<modality>.json and reload by snapshot or hash"""
+    rng = np.random.default_rng(2)
+    service = CacheService(project_root=str(tmp_path))
+    profile = build_profile("image", attributes=_attrs(rng, 10, n=50), embeddings=rng.normal(0, 1, (50, 8)))
+
+    result = service.save_reference_profile("v01", "abc123", profile)
+    assert result["success"]
+    assert (tmp_path / ".ddoc/cache/data/abc123/profile_image.json").exists()
+
+    loaded = service.load_reference_profile("image", snapshot_id="v01")
+    assert isinstance(loaded, ReferenceProfile)
+    assert loaded.data_hash == "abc123"
+    assert loaded.to_dict()["features"] == profile.to_dict()["features"]
+    assert compare_reference(loaded, profile)["embedding"]["mean_shift"] == 0
+    assert service.load_reference_profile("timeseries", data_hash="abc123") is None
+
+
+def test_vision_drift_scores_do_not_depend_on_a_saved_profile(tmp_path, monkeypatch):
+    """With raw baseline caches, a saved profile leaves every drift score unchanged"""
+    vision_impl = pytest.importorskip("ddoc_plugin_vision.vision_impl")
+    import ddoc.core.cache_service as cache_module
+
+    rng = np.random.default_rng(3)
+    names = ["brightness", "exposure", "contrast", "dynamic_range", "colorfulness",
+             "edge_density", "sharpness", "entropy", "gaussian_noise_level", "size"]
+    service = CacheService(project_root=str(tmp_path))
+    monkeypatch.setattr(cache_module, "get_cache_service", lambda *args, **kwargs: service)
+    caches = {}
+    for snapshot, data_hash in (("v01", "h1"), ("v02", "h2")):
+        # Same distribution on both sides, small samples (where profile PSI used to diverge)
+        attrs = {f"{snapshot}_{i}.jpg": {name: float(rng.normal(100, 10)) for name in names} for i in range(20)}
+        embs = {f"{snapshot}_{i}.jpg": {"embedding": rng.normal(0, 1, 8).tolist()} for i in range(20)}
+        service.save_analysis_cache(snapshot, data_hash, "attributes_image", attrs)
+        service.save_analysis_cache(snapshot, data_hash, "embedding_image", embs)
+        caches[snapshot] = (attrs, embs)
+
+    def run(name):
+        return vision_impl.DDOCVisionPlugin().drift_detect(
+            "v01", "v02", str(tmp_path / "ref"), str(tmp_path / "cur"), "h1", "h2",
+            "default", {}, str(tmp_path / name),
+        )
+
+    raw = run("raw")
+    attrs, embs = caches["v01"]
+    service.save_reference_profile("v01", "h1", build_profile(
+        "image", attributes=attrs, embeddings=[e["embedding"] for e in embs.values()],
+    ))
+    with_profile = run("profile")
+
+    assert "baseline_source" not in with_profile
+    assert with_profile["attribute_drifts"] == raw["attribute_drifts"]
+    assert with_profile["embedding_drift_detailed"]["weights"] == raw["embedding_drift_detailed"]["weights"]
+    for key in ("ensemble_score", "mmd_multiscale"):
+        assert with_profile["embedding_drift_detailed"][key] == raw["embedding_drift_detailed"][key]
+    assert with_profile["overall_score"] == raw["overall_score"]
+    assert with_profile["status"] == raw["status"]
+    assert "profile_drift" in with_profile
@@ -0,0 +1,85 @@
+"""
+Tests for the shared metadata registry (ddoc/core/registry.py)
+"""
+import json
+import os
+
+from ddoc.core.registry import MetadataRegistry
+
+
+def test_read_is_cached_until_file_changes(tmp_path, monkeypatch):
+    """Parsed content is reused until the file's signature changes"""
+    registry = MetadataRegistry()
+    target = tmp_path / "dataset_versions.json"
+    target.write_text(json.dumps({"a": 1}))
+
+    parses = []
+    original_parse = registry._parse
+
+    def counting_parse(path):
+        parses.append(path)
+        return original_parse(path)
+
+    monkeypatch.setattr(registry, "_parse", counting_parse)
+
+    assert registry.read_json(target) == {"a": 1}
+    assert registry.read_json(target) == {"a": 1}
+    assert len(parses) == 1
+
+    # External writer (another process) changes the file
+    target.write_text(json.dumps({"a": 2, "b": 3}))
+    assert registry.read_json(target) == {"a": 2, "b": 3}
+    assert len(parses) == 2
+
+
+def test_missing_and_corrupt_files_return_default(tmp_path):
+    """Missing or unparsable files fall back to the default"""
+    registry = MetadataRegistry()
+    assert registry.read_json(tmp_path / "missing.json", default={}) == {}
+
+    corrupt = tmp_path / "params.yaml"
+    corrupt.write_text("key: [unclosed")
+    assert registry.read_yaml(corrupt, default={"x": 1}) == {"x": 1}
+
+
+def test_write_is_atomic_and_write_through(tmp_path):
+    """Writes replace the file in one rename and refresh the cache"""
+    registry = MetadataRegistry()
+    target = tmp_path / "staging.json"
+    target.write_text("{}")
+    inode_before = os.stat(target).st_ino
+
+    registry.write(target, {"staged_datasets": {"d": {}}})
+
+    assert os.stat(target).st_ino != inode_before
+    assert json.loads(target.read_text()) == {"staged_datasets": {"d": {}}}
+    assert registry.read_json(target) == {"staged_datasets": {"d": {}}}
+    assert not [p for p in tmp_path.iterdir() if p.name.endswith(".tmp")]
+
+
+def test_transaction_returns_private_copy(tmp_path):
+    """Mutations only become visible once the transaction commits"""
+    registry = MetadataRegistry()
+    target = tmp_path / "params.yaml"
+    registry.write(target, {"datasets": {}})
+    shared = registry.read_yaml(target)
+
+    with registry.transaction(target, default={}) as params:
+        params["datasets"]["train"] = {"path": "data/train"}
+        assert shared == {"datasets": {}}
+
+    assert registry.read_yaml(target) == {"datasets": {"train": {"path": "data/train"}}}
+
+
+def test_derived_values_follow_their_key(tmp_path):
+    """Derived values are recomputed only when the validity key changes"""
+    registry = MetadataRegistry()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert registry.derived("formats", "ds", ("k", 1), compute) == 1
+    assert registry.derived("formats", "ds", ("k", 1), compute) == 1
+    assert registry.derived("formats", "ds", ("k", 2), compute) == 2
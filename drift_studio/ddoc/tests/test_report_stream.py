@@ -0,0 +1,69 @@
+"""
+Tests for streamed, paginated report output (ddoc/core/report_stream.py)
+"""
+import json
+
+import pytest
+
+from ddoc.core.report_stream import StreamedHtmlWriter, reservoir_sample
+
+
+def test_table_pages_beyond_page_size(tmp_path):
+    out = tmp_path / "report.html"
+    with StreamedHtmlWriter(out, page_size=10) as writer:
+        writer.write("<html><body>")
+        writer.table("rows", ["i", "value"], ((i, f"<{i}>") for i in range(25)))
+        writer.write("</body></html>")
+
+    html = out.read_text(encoding="utf-8")
+    assert html.count("<tr><td>") == 10
+    assert "&lt;0&gt;" in html  # cells are escaped
+    assert html.count('<iframe loading="lazy"') == 2
+    assert "Rows 21–25" in html
+
+    pages = sorted(p.name for p in (tmp_path / "report_files").iterdir())
+    assert pages == ["rows-2.html", "rows-3.html"]
+    assert (tmp_path / "report_files" / "rows-3.html").read_text(encoding="utf-8").count("<tr><td>") == 5
+    assert writer.summary()["pages"] == 2
+
+
+def test_failed_write_leaves_no_partial_report(tmp_path):
+    out = tmp_path / "report.html"
+    try:
+        with StreamedHtmlWriter(out) as writer:
+            writer.write("<html>")
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert not out.exists()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_reservoir_sample_is_bounded_uniform_and_seeded():
+    assert reservoir_sample(range(5), 10) == [0, 1, 2, 3, 4]
+    sample = reservoir_sample(iter(range(100_000)), 1000, seed=3)
+    assert len(sample) == 1000 and len(set(sample)) == 1000
+    assert sample == reservoir_sample(range(100_000), 1000, seed=3)
+    assert 40_000 < sum(sample) / len(sample) < 60_000
+
+
+def test_cli_stream_mode_links_envelope(tmp_path):
+    pytest.importorskip("jinja2")
+    from ddoc.cli.commands.report import _builtin_render
+
+    drift = {
+        "modality": "tabular",
+        "overall_score": 0.3,
+        "attribute_drifts": {f"col{i}": i / 1000 for i in range(1200)},
+    }
+    inline = _builtin_render(drift, None, "html", str(tmp_path / "inline.html"), {"title": "t"})
+    streamed = _builtin_render(drift, None, "html", str(tmp_path / "streamed.html"),
+                               {"title": "t", "stream": True, "page_size": 500})
+
+    assert streamed["streamed"] is True and streamed["pages"] == 2
+    assert streamed["size_bytes"] < inline["size_bytes"] / 2
+    html = (tmp_path / "streamed.html").read_text(encoding="utf-8")
+    assert 'href="streamed_files/envelope.json"' in html
+    assert "<code>col0</code>" not in html and "<td>col0</td>" in html
+    envelope = json.loads((tmp_path / "streamed_files" / "envelope.json").read_text(encoding="utf-8"))
+    assert envelope == drift
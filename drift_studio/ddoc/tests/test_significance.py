@@ -0,0 +1,55 @@
+"""
+Tests for permutation-test significance (ddoc/core/significance.py)
+"""
+import numpy as np
+from scipy import stats
+
+from ddoc.core.significance import attribute_significance, mmd_permutation_test, univariate_permutation_test
+
+
+def test_ks_statistic_matches_scipy_and_detects_shift():
+    rng = np.random.default_rng(0)
+    ref = rng.normal(0, 1, 300)
+    same = univariate_permutation_test(ref, rng.normal(0, 1, 250), "ks", max_workers=1, early_stop=False)
+    assert same["permutations"] == 1000
+    assert not same["significant"]
+
+    shifted_values = rng.normal(0.5, 1, 250)
+    shifted = univariate_permutation_test(ref, shifted_values, "ks", max_workers=1)
+    assert np.isclose(shifted["observed"], stats.ks_2samp(ref, shifted_values).statistic, atol=1e-6)
+    assert shifted["significant"] and shifted["early_stopped"]
+    assert shifted["permutations"] < 1000
+
+    ties = univariate_permutation_test([1, 1, 2, 2, 3] * 20, [1, 2, 2, 3, 3] * 20, "ks", max_workers=1)
+    assert np.isclose(ties["observed"], 0.2)
+
+
+def test_mmd_is_deterministic_across_worker_counts():
+    rng = np.random.default_rng(1)
+    X = rng.normal(0, 1, (250, 8))
+    Y = rng.normal(0, 1, (250, 8))
+    serial = mmd_permutation_test(X, Y, n_permutations=300, max_workers=1, early_stop=False)
+    parallel = mmd_permutation_test(X, Y, n_permutations=300, max_workers=2, early_stop=False)
+    assert serial == parallel
+    assert not serial["significant"]
+
+    drifted = mmd_permutation_test(X, Y + 0.3, max_workers=1)
+    assert drifted["significant"] and drifted["p_value"] < 0.01
+
+
+def test_attributes_share_a_pool_and_cap_samples():
+    rng = np.random.default_rng(2)
+    attributes = {
+        "same": (rng.normal(0, 1, 3000), rng.normal(0, 1, 3000)),
+        "shifted": (rng.normal(0, 1, 3000), rng.normal(0.3, 1, 3000)),
+        "tiny": ([1.0], [2.0]),
+    }
+    serial = attribute_significance(attributes, "ks", n_permutations=300, max_samples=500, max_workers=1)
+    shared = attribute_significance(attributes, "ks", n_permutations=300, max_samples=500, max_workers=2)
+    assert serial == shared
+    assert "error" in serial["tiny"]
+    assert serial["shifted"]["significant"] and not serial["same"]["significant"]
+
+    ref, cur = attributes["shifted"]
+    capped = univariate_permutation_test(ref[:500], cur[:500], "ks", n_permutations=300, max_workers=1)
+    assert serial["shifted"]["observed"] == capped["observed"]
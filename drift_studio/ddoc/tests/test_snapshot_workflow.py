@@ -585,6 +585,122 @@ class TestCacheService:
         assert cache_service.cache_exists("v01", "summary") is True
 
 
+class TestFastRestore:
+    """Test manifest-diff restore (ddoc snapshot checkout --fast)"""
+    
+    def test_diff_manifests(self):
+        """Test file-level manifest diff"""
+        from ddoc.core.restore_service import diff_manifests
+        
+        current = {"a.txt": "1", "b.txt": "2", "sub/c.txt": "3"}
+        target = {"a.txt": "1", "b.txt": "9", "d.txt": "4"}
+        diff = diff_manifests(current, target)
+        
+        assert diff == {"added": ["d.txt"], "modified": ["b.txt"], "removed": ["sub/c.txt"]}
+    
+    def test_fast_restore_only_touches_changed_files(self, temp_workspace, sample_data_dir, sample_code_file):
+        """Test that fast restore rewrites changed files and prunes emptied dirs"""
+        project_path = temp_workspace / "project"
+        workspace_service = get_workspace_service()
+        workspace_service.init_workspace(str(project_path))
+        
+        file_service = get_file_service(str(project_path))
+        file_service.add_data(str(sample_data_dir))
+        file_service.add_code(str(sample_code_file))
+        
+        git_service = get_git_service(str(project_path))
+        git_service.add(["."])
+        git_service.commit("Initial commit")
+        
+        snapshot_service = get_snapshot_service(str(project_path))
+        assert snapshot_service.create_snapshot(message="v1")["success"] is True
+        
+        data_root = project_path / "data" / "sample_data"
+        untouched = data_root / "file1.txt"
+        untouched_ino = untouched.stat().st_ino
+        (data_root / "file2.txt").write_text("Changed data 2")
+        (data_root / "nested" / "deep").mkdir(parents=True)
+        (data_root / "nested" / "deep" / "file3.txt").write_text("New file")
+        assert snapshot_service.create_snapshot(message="v2")["success"] is True
+        
+        result = snapshot_service.restore_snapshot("v01", fast=True)
+        assert result["success"] is True
+        assert result["fast"] is True
+        
+        assert (data_root / "file2.txt").read_text() == "Sample data 2"
+        assert not (data_root / "nested").exists()
+        assert untouched.stat().st_ino == untouched_ino
+        
+        result = snapshot_service.restore_snapshot("v02", fast=True)
+        assert result["success"] is True
+        assert (data_root / "nested" / "deep" / "file3.txt").read_text() == "New file"
+        assert (data_root / "file2.txt").read_text() == "Changed data 2"
+    
+    def test_fast_restore_refuses_to_overwrite_local_edits(self, temp_workspace, sample_data_dir, sample_code_file):
+        """Test that uncommitted data edits block fast restore without --force"""
+        project_path = temp_workspace / "project"
+        workspace_service = get_workspace_service()
+        workspace_service.init_workspace(str(project_path))
+        
+        file_service = get_file_service(str(project_path))
+        file_service.add_data(str(sample_data_dir))
+        file_service.add_code(str(sample_code_file))
+        
+        git_service = get_git_service(str(project_path))
+        git_service.add(["."])
+        git_service.commit("Initial commit")
+        
+        snapshot_service = get_snapshot_service(str(project_path))
+        snapshot_service.create_snapshot(message="v1")
+        data_file = project_path / "data" / "sample_data" / "file2.txt"
+        data_file.write_text("Changed data 2")
+        snapshot_service.create_snapshot(message="v2")
+        
+        data_file.write_text("Local edit")
+        head_before = git_service.get_current_commit()
+        data_dvc_before = (project_path / "data.dvc").read_text()
+        result = snapshot_service.restore_snapshot("v01", fast=True)
+        assert result["success"] is False
+        assert "uncommitted" in result["error"]
+        # Refused before git checkout: workspace is not half-switched
+        assert result["git_restored"] is False
+        assert git_service.get_current_commit() == head_before
+        assert (project_path / "data.dvc").read_text() == data_dvc_before
+        
+        result = snapshot_service.restore_snapshot("v01", force=True, fast=True)
+        assert result["success"] is True
+        assert data_file.read_text() == "Sample data 2"
+
+    
+    def test_snapshot_view_reads_each_snapshot_from_the_cache(self, temp_workspace, sample_data_dir, sample_code_file):
+        """Test that snapshot views hold each snapshot's own data, not the workspace's"""
+        from ddoc.core.restore_service import get_restore_service
+        
+        project_path = temp_workspace / "project"
+        workspace_service = get_workspace_service()
+        workspace_service.init_workspace(str(project_path))
+        
+        file_service = get_file_service(str(project_path))
+        file_service.add_data(str(sample_data_dir))
+        file_service.add_code(str(sample_code_file))
+        
+        git_service = get_git_service(str(project_path))
+        git_service.add(["."])
+        git_service.commit("Initial commit")
+        
+        snapshot_service = get_snapshot_service(str(project_path))
+        snapshot_service.create_snapshot(message="v1")
+        (project_path / "data" / "sample_data" / "file2.txt").write_text("Changed data 2")
+        snapshot_service.create_snapshot(message="v2")
+        
+        restore_service = get_restore_service(str(project_path))
+        v1 = restore_service.snapshot_view(snapshot_service._load_snapshot("v01").data.dvc_hash)
+        v2 = restore_service.snapshot_view(snapshot_service._load_snapshot("v02").data.dvc_hash)
+        assert v1 != v2
+        assert (v1 / "sample_data" / "file2.txt").read_text() == "Sample data 2"
+        assert (v2 / "sample_data" / "file2.txt").read_text() == "Changed data 2"
+        assert restore_service.snapshot_view("0" * 32 + ".dir") is None
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
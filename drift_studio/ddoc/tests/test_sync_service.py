@@ -0,0 +1,118 @@
+"""
+Tests for the incremental fetch engine (ddoc/core/sync_service.py)
+"""
+import os
+
+import pytest
+
+from ddoc.core.sync_service import SyncService
+
+
+def _tree(root, files):
+    for rel, data in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+
+def test_second_sync_transfers_nothing(tmp_path):
+    """Unchanged files are skipped by size + mtime on repeat syncs"""
+    src = tmp_path / "src"
+    _tree(src, {"a.bin": b"a" * 100, "sub/b.bin": b"b" * 50})
+    dest = tmp_path / "dest" / "src"
+    service = SyncService(max_workers=4)
+
+    first = service.sync(src, dest, link="copy")
+    assert first["files_copied"] == 2
+    assert first["bytes_transferred"] == 150
+    assert (dest / "sub" / "b.bin").read_bytes() == b"b" * 50
+
+    second = service.sync(src, dest, link="copy")
+    assert second["files_unchanged"] == 2
+    assert second["bytes_transferred"] == 0
+
+    (src / "a.bin").write_bytes(b"c" * 120)
+    (src / "sub" / "b.bin").unlink()
+    third = service.sync(src, dest, link="copy")
+    assert third["files_copied"] == 1
+    assert third["files_deleted"] == 1
+    assert (dest / "a.bin").read_bytes() == b"c" * 120
+    assert not (dest / "sub" / "b.bin").exists()
+
+
+def test_hardlinks_on_same_filesystem_never_write_through(tmp_path):
+    """Hard-linked mirrors are replaced by rename, leaving the source intact"""
+    src = tmp_path / "src"
+    _tree(src, {"a.txt": b"v1"})
+    dest = tmp_path / "dest"
+
+    result = SyncService().sync(src, dest, link="hardlink")
+    assert result["files_linked"] == 1
+    assert os.stat(dest / "a.txt").st_ino == os.stat(src / "a.txt").st_ino
+
+    # Destination edited out of band → next sync relinks, source untouched
+    (dest / "a.txt").unlink()
+    (dest / "a.txt").write_bytes(b"local edit")
+    SyncService().sync(src, dest, link="hardlink")
+    assert (src / "a.txt").read_bytes() == b"v1"
+    assert (dest / "a.txt").read_bytes() == b"v1"
+
+
+def test_auto_link_never_hardlinks(tmp_path):
+    """The default mode reflinks or copies; hard links are opt-in"""
+    src = tmp_path / "src"
+    _tree(src, {"a.txt": b"v1"})
+    dest = tmp_path / "dest"
+
+    SyncService().sync(src, dest)
+    assert os.stat(dest / "a.txt").st_ino != os.stat(src / "a.txt").st_ino
+    assert (dest / "a.txt").read_bytes() == b"v1"
+
+
+def test_interrupted_copy_resumes(tmp_path):
+    """A partial file keyed by the source signature is continued, not restarted"""
+    src = tmp_path / "src"
+    payload = bytes(range(256)) * 64
+    _tree(src, {"big.bin": payload})
+    dest = tmp_path / "dest"
+    dest.mkdir()
+
+    service = SyncService()
+    partial = service._partial_path(dest / "big.bin", os.stat(src / "big.bin"))
+    partial.write_bytes(payload[:4096])
+
+    result = service.sync(src, dest, link="copy")
+    assert result["bytes_resumed"] == 4096
+    assert result["bytes_transferred"] == len(payload) - 4096
+    assert (dest / "big.bin").read_bytes() == payload
+    assert not partial.exists()
+
+
+def test_checksum_mode_skips_touched_files(tmp_path):
+    """Same size, new mtime, same content → no copy with checksum=True"""
+    src = tmp_path / "src"
+    _tree(src, {"a.txt": b"same"})
+    dest = tmp_path / "dest"
+    service = SyncService()
+    service.sync(src, dest, link="copy")
+
+    st = os.stat(src / "a.txt")
+    os.utime(src / "a.txt", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    result = service.sync(src, dest, link="copy", checksum=True)
+    assert result["files_unchanged"] == 1
+    assert result["bytes_transferred"] == 0
+
+
+def test_progress_reports_completion(tmp_path):
+    """The progress callback ends at 100% of bytes and files"""
+    src = tmp_path / "src"
+    _tree(src, {f"f{i}.txt": b"x" * i for i in range(1, 6)})
+    events = []
+    SyncService().sync(src, tmp_path / "dest", link="copy",
+                       progress=lambda *args: events.append(args))
+    assert events[-1] == (15, 15, 5, 5)
+
+
+def test_unknown_link_mode_rejected(tmp_path):
+    with pytest.raises(ValueError, match="link"):
+        SyncService().sync(tmp_path, tmp_path / "dest", link="teleport")
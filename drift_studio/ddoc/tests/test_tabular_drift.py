@@ -0,0 +1,109 @@
+"""
+Tests for mergeable sketches and the chunked tabular drift engine
+"""
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from ddoc.core.sketches import (
+    CategoricalSketch,
+    NumericSketch,
+    compare_numeric,
+    sketch_from_dict,
+)
+from ddoc.core.tabular_drift import TableProfile, profile_csv, tabular_drift
+
+
+def test_numeric_sketch_merge_equals_single_pass():
+    """Chunked + merged sketches match one sketch over all values"""
+    rng = np.random.default_rng(0)
+    values = rng.normal(5, 2, 10_000)
+
+    whole = NumericSketch().update(values)
+    merged = NumericSketch()
+    for chunk in np.array_split(values, 7):
+        merged.merge(NumericSketch().update(chunk))
+
+    assert merged.count == whole.count == 10_000
+    assert merged.positive == whole.positive and merged.negative == whole.negative
+    assert abs(merged.mean - values.mean()) < 1e-9
+    assert abs(merged.std - values.std()) < 1e-9
+    median = merged.quantiles([0.5])[0]
+    assert abs(median - np.median(values)) / abs(np.median(values)) < 0.02
+
+
+def test_numeric_metrics_track_exact_ks():
+    """Sketch KS is close to scipy's exact statistic; identical data has no drift"""
+    rng = np.random.default_rng(1)
+    ref = rng.normal(0, 1, 20_000)
+    cur = rng.normal(0.5, 1, 20_000)
+
+    same = compare_numeric(NumericSketch().update(ref), NumericSketch().update(ref))
+    assert same["psi"] < 1e-6 and same["ks"] == 0 and same["status"] == "NORMAL"
+
+    shifted = compare_numeric(NumericSketch().update(ref), NumericSketch().update(cur))
+    exact = stats.ks_2samp(ref, cur).statistic
+    assert abs(shifted["ks"] - exact) < 0.02
+    assert shifted["psi"] > 0.1
+    assert shifted["ks_pvalue"] < 1e-6
+    assert shifted["status"] in ("WARNING", "CRITICAL")
+
+
+def test_sketches_round_trip_through_dict():
+    numeric = NumericSketch().update([1.0, -2.5, 0.0, np.nan, 1e6])
+    categorical = CategoricalSketch().update(pd.Series(["a", "b", "a", None]))
+
+    numeric2 = sketch_from_dict(numeric.to_dict())
+    categorical2 = sketch_from_dict(categorical.to_dict())
+    assert numeric2.to_dict() == numeric.to_dict()
+    assert categorical2.counts == {"a": 2, "b": 1}
+    assert categorical2.nulls == 1
+
+
+def test_profile_csv_is_chunk_invariant(tmp_path):
+    """Small chunks give the same profile as one big chunk"""
+    path = tmp_path / "data.csv"
+    pd.DataFrame({
+        "x": np.arange(1000, dtype=float),
+        "c": ["a", "b", "c", "d"] * 250,
+    }).to_csv(path, index=False)
+
+    small = profile_csv(str(path), chunk_rows=37)
+    big = profile_csv(str(path), chunk_rows=10_000)
+    assert small.rows == big.rows == 1000
+    assert small.columns["c"].counts == big.columns["c"].counts
+    assert small.columns["x"].positive == big.columns["x"].positive
+    assert abs(small.columns["x"].mean - big.columns["x"].mean) < 1e-9
+    assert TableProfile.from_dict(small.to_dict()).kinds == {"x": "numeric", "c": "categorical"}
+
+
+def test_tabular_drift_reports_all_metrics(tmp_path):
+    rng = np.random.default_rng(2)
+    base = tmp_path / "base.csv"
+    target = tmp_path / "target.csv"
+    pd.DataFrame({
+        "stable": rng.normal(0, 1, 5000),
+        "shifted": rng.normal(0, 1, 5000),
+        "color": rng.choice(["red", "green"], 5000),
+        "gone": 1,
+    }).to_csv(base, index=False)
+    shifted = rng.normal(2, 1, 5000)
+    shifted[:1000] = np.nan
+    pd.DataFrame({
+        "stable": rng.normal(0, 1, 5000),
+        "shifted": shifted,
+        "color": rng.choice(["red", "green", "blue"], 5000),
+    }).to_csv(target, index=False)
+
+    report = tabular_drift(str(base), str(target), chunk_rows=700, max_workers=4)
+    cols = report["columns"]
+
+    assert report["rows"] == {"base": 5000, "target": 5000}
+    assert cols["stable"]["status"] == "NORMAL"
+    assert cols["shifted"]["status"] == "CRITICAL"
+    assert cols["shifted"]["null_rate_target"] == 0.2
+    assert cols["color"]["kind"] == "categorical"
+    assert cols["color"]["new_categories"] == ["blue"]
+    assert cols["gone"]["status"] == "MISSING_IN_TARGET"
+    assert "shifted" in report["summary"]["drifted_columns"]
+    assert report["summary"]["status"] == "CRITICAL"
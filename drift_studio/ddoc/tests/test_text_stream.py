@@ -0,0 +1,75 @@
+"""
+Tests for the streaming text dataset reader (ddoc-plugin-text, ddoc_plugin_text/stream.py)
+"""
+import zipfile
+
+import pytest
+
+stream = pytest.importorskip("ddoc_plugin_text.stream")
+
+CSV = 'id,text,label\n1,"first line\nsecond line",pos\n2,plain,neg\n3,,pos\n4,"quoted, ""comma""",neg\n'
+EXPECTED_TEXTS = ["first line\nsecond line", "plain", None, 'quoted, "comma"']
+
+
+def _layout(root, name):
+    """Dataset directory ``root/ds`` in one of the supported layouts"""
+    ds = root / "ds"
+    ds.mkdir()
+    if name == "single":
+        (ds / "data.csv").write_text(CSV, newline="")
+        return ds, ["ds/data.csv/1", "ds/data.csv/2", "ds/data.csv/3", "ds/data.csv/4"]
+    if name == "bom":
+        (ds / "data.csv").write_bytes(b"\xef\xbb\xbf" + CSV.encode("utf-8"))
+        return ds, ["ds/data.csv/1", "ds/data.csv/2", "ds/data.csv/3", "ds/data.csv/4"]
+    if name == "recursive":
+        (ds / "a" / "b").mkdir(parents=True)
+        (ds / "a" / "b" / "part.csv").write_text(CSV, newline="")
+        return ds, ["ds/a/b/part.csv/1", "ds/a/b/part.csv/2", "ds/a/b/part.csv/3", "ds/a/b/part.csv/4"]
+    if name == "zip":
+        (ds / "ignored.csv").write_text("id,text\n9,root csv loses to the archive\n")
+        with zipfile.ZipFile(ds / "data.zip", "w") as archive:
+            archive.writestr("inner/data.csv", CSV)
+            archive.writestr("__MACOSX/inner/._data.csv", "junk")
+        return ds, ["ds/inner/data.csv/1", "ds/inner/data.csv/2", "ds/inner/data.csv/3", "ds/inner/data.csv/4"]
+    raise ValueError(name)
+
+
+def _read(ds, batch_size=3, **config):
+    keys, texts, labels = [], [], []
+    for batch in stream.iter_text_batches(ds, {"text_column": "text", **config}, batch_size=batch_size):
+        assert len(batch.keys) <= batch_size
+        keys += batch.keys
+        texts += batch.texts
+        labels += batch.labels or []
+    return keys, texts, labels
+
+
+@pytest.mark.parametrize("reader", ["pyarrow", "pandas"])
+@pytest.mark.parametrize("layout", ["single", "bom", "recursive", "zip"])
+def test_keys_and_texts_per_layout(tmp_path, monkeypatch, layout, reader):
+    if reader == "pyarrow":
+        pytest.importorskip("pyarrow.csv")
+    else:
+        monkeypatch.setattr(stream, "pa_csv", None)
+    ds, expected_keys = _layout(tmp_path, layout)
+
+    keys, texts, labels = _read(ds, label_column="label")
+    assert keys == expected_keys
+    assert texts == EXPECTED_TEXTS
+    assert labels == ["pos", "neg", "pos", "neg"]
+
+
+def test_generated_keys_are_identical_across_readers(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow.csv")
+    ds = tmp_path / "ds"
+    ds.mkdir()
+    rows = "".join(f'"row {i}\ncontinued",x\n' for i in range(10))
+    (ds / "notes.csv").write_text("text,other\n" + rows, newline="")
+
+    arrow = _read(ds, batch_size=4)
+    monkeypatch.setattr(stream, "pa_csv", None)
+    pandas = _read(ds, batch_size=4)
+
+    assert arrow == pandas
+    assert arrow[0] == [f"ds/notes.csv/notes_{i}" for i in range(10)]
+    assert arrow[1][3] == "row 3\ncontinued"
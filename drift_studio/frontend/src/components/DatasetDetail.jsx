@@ -27,7 +27,7 @@ export default function DatasetDetail({
             <img
               src={`${backend}/files/raw?path=${encodeURIComponent(
                 thumb
-              )}`}
+              )}&w=256`}
               alt="thumbnail"
               className="w-full h-full object-cover rounded"
             />
@@ -254,7 +254,7 @@ export default function DatasetGrid({
                   <img
                     src={`${backend}/files/raw?path=${encodeURIComponent(
                       ds.preview.thumbnail
-                    )}`}
+                    )}&w=256`}
                     alt="thumb"
                     className="w-full h-24 object-cover transition-transform duration-300 hover:scale-105"
                     onClick={(e) => e.stopPropagation()}
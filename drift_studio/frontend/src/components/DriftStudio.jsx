@@ -57,16 +57,8 @@ export default function DriftStudio({ backend, baseDataset, targetDataset, onBac
       });
       const asyncData = await asyncRes.json();
 
-      if (asyncData.status === 'completed' && asyncData.cached) {
-        // 캐시된 결과가 있으면 바로 가져오기
-        const res = await axios.post(`${backend}/drift/v2`, {
-          base_id: baseDataset.id,
-          target_id: targetDataset.id,
-        });
-        setDrift(res.data);
-        setLoading(false);
-      } else if (asyncData.status === 'queued' || asyncData.status === 'already_running') {
-        // 작업 시작됨 - task ID 저장
+      if (asyncData.status === 'queued' || asyncData.status === 'already_running') {
+        // 작업 시작됨 - task ID 저장 (캐시된 결과도 작업이 곧바로 완료)
         setTaskId(asyncData.task_id);
       } else {
         // 기존 동기 API로 폴백